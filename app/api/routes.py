@@ -4,30 +4,62 @@ API Routes
 REST API endpoints for code review system.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Body, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+import asyncio
+import hmac
 import logging
 
 from app.models import (
     ReviewRequest,
     ReviewResult,
+    ReviewTimings,
     ValidateMRRequest,
     ValidationResult,
+    PrefetchRequest,
+    PrefetchResult,
+    WebhookResult,
+    CLIAgent,
     HealthCheckResponse,
-    ErrorResponse
+    ErrorResponse,
+    IssueSeverity,
+    ReviewType,
+    ReviewPage,
+    ReviewDetail,
+    IssuePage,
+    ProjectTrends
 )
 from app.services.review_service import ReviewService
 from app.services.gitlab_service import GitLabService
 from app.services.git_repository_manager import GitRepositoryManager
 from app.services.refactoring_classifier import RefactoringClassifier
 from app.services.mr_creator import MRCreator
+from app.services.inline_publisher import InlineDiscussionPublisher
+from app.services.summary_note_publisher import SummaryNotePublisher
+from app.services.finding_tracker import FindingTracker
+from app.services.health_monitor import HealthMonitor
+from app.services.prefetcher import RepositoryPrefetcher
+from app.services.review_debouncer import ReviewDebouncer
+from app.services.results_store import (
+    ReviewResultsStore,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    DEFAULT_TREND_WEEKS,
+    MAX_TREND_WEEKS
+)
+from app.utils.blocking_io import run_blocking
+from app.utils.cancellation import DisconnectWatch, cancel_on_disconnect
+from app.utils.metrics import REVIEWS_IN_FLIGHT
+from app.utils.phase_timings import collect_timings, format_timings, timed_phase
+from app.utils.tracing import Span, current_span, span, traced
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["review"])
 
-settings = get_settings()
-
 
 # Dependency injection
 def get_review_service() -> ReviewService:
@@ -38,6 +70,7 @@ def get_review_service() -> ReviewService:
 
 def get_gitlab_service() -> GitLabService:
     """Get GitLabService instance"""
+    settings = get_settings()
     return GitLabService(
         gitlab_url=settings.GITLAB_URL,
         gitlab_token=settings.GITLAB_TOKEN
@@ -46,7 +79,32 @@ def get_gitlab_service() -> GitLabService:
 
 def get_git_manager() -> GitRepositoryManager:
     """Get GitRepositoryManager instance"""
-    return GitRepositoryManager(work_dir=settings.WORK_DIR)
+    from app.dependencies import get_git_manager_instance
+    return get_git_manager_instance()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get HealthMonitor instance"""
+    from app.dependencies import get_health_monitor_instance
+    return get_health_monitor_instance()
+
+
+def get_prefetcher() -> RepositoryPrefetcher:
+    """Get RepositoryPrefetcher instance"""
+    from app.dependencies import get_prefetcher_instance
+    return get_prefetcher_instance()
+
+
+def get_review_debouncer() -> ReviewDebouncer:
+    """Get ReviewDebouncer instance"""
+    from app.dependencies import get_review_debouncer_instance
+    return get_review_debouncer_instance()
+
+
+def get_results_store() -> ReviewResultsStore:
+    """Get ReviewResultsStore instance"""
+    from app.dependencies import get_results_store_instance
+    return get_results_store_instance()
 
 
 @router.post(
@@ -56,9 +114,11 @@ def get_git_manager() -> GitRepositoryManager:
     summary="Execute Code Review",
     description="Выполнить code review для GitLab merge request с помощью CLI агентов"
 )
+@traced("review_merge_request")
 async def review_merge_request(
     request: ReviewRequest,
     background_tasks: BackgroundTasks,
+    http_request: Request,
     review_service: ReviewService = Depends(get_review_service),
     gitlab_service: GitLabService = Depends(get_gitlab_service),
     git_manager: GitRepositoryManager = Depends(get_git_manager)
@@ -73,8 +133,31 @@ async def review_merge_request(
     4. Создать documentation commit
     5. Создать fix и/или refactoring MRs
     6. Опубликовать результаты в комментарий MR
+    
+    Если клиент отключился до завершения review, review отменяется
+    (процессы CLI останавливаются, репозиторий очищается).
     """
+    async with cancel_on_disconnect(http_request) as disconnect:
+        return await _review_merge_request(
+            request, background_tasks, review_service, gitlab_service, git_manager, disconnect
+        )
+
+
+async def _review_merge_request(
+    request: ReviewRequest,
+    background_tasks: BackgroundTasks,
+    review_service: ReviewService,
+    gitlab_service: GitLabService,
+    git_manager: GitRepositoryManager,
+    disconnect: DisconnectWatch
+) -> ReviewResult:
     repo_path = None
+    timings = ReviewTimings()
+    REVIEWS_IN_FLIGHT.inc()
+    review_span = current_span()
+    review_span.set_attribute("project_id", request.project_id)
+    review_span.set_attribute("mr_iid", request.merge_request_iid)
+    review_span.set_attribute("agent", request.agent.value)
     
     try:
         logger.info(f"Starting review for project {request.project_id}, MR !{request.merge_request_iid}")
@@ -90,21 +173,23 @@ async def review_merge_request(
         clone_url = gitlab_service.get_clone_url(project_data)
         
         # Clone repository with target branch for diff
-        repo_path = await git_manager.clone_repository(
-            clone_url=clone_url,
-            branch=mr_data['source_branch'],
-            project_id=request.project_id,
-            mr_iid=request.merge_request_iid,
-            target_branch=mr_data['target_branch']  # For git diff comparison
-        )
+        with collect_timings(timings), timed_phase("clone"):
+            repo_path = await git_manager.clone_repository(
+                clone_url=clone_url,
+                branch=mr_data['source_branch'],
+                project_id=request.project_id,
+                mr_iid=request.merge_request_iid,
+                target_branch=mr_data['target_branch']  # For git diff comparison
+            )
         
         logger.info(f"Repository cloned to {repo_path}")
         
         # Execute review (CLI determines changed files automatically via git diff)
-        result = await review_service.execute_review(
-            request=request,
-            repo_path=repo_path
-        )
+        with collect_timings(timings):
+            result = await review_service.execute_review(
+                request=request,
+                repo_path=repo_path
+            )
         
         # Process results in background
         background_tasks.add_task(
@@ -114,18 +199,91 @@ async def review_merge_request(
             mr_data=mr_data,
             repo_path=repo_path,
             gitlab_service=gitlab_service,
-            git_manager=git_manager
+            git_manager=git_manager,
+            trace_parent=review_span
         )
         
         logger.info(f"Review completed: {result.summary.total_issues} issues found")
         return result
         
+    except asyncio.CancelledError:
+        # CLI process groups are stopped by now; release the checkout before giving up
+        if repo_path:
+            await git_manager.cleanup_repository(repo_path)
+        if not disconnect.disconnected:
+            raise
+        asyncio.current_task().uncancel()
+        logger.warning(f"Review of MR !{request.merge_request_iid} cancelled: client disconnected")
+        raise HTTPException(status_code=499, detail="Client closed request")
     except Exception as e:
         logger.error(f"Error during review: {str(e)}", exc_info=True)
         # Cleanup on error
         if repo_path:
             background_tasks.add_task(git_manager.cleanup_repository, repo_path)
         raise HTTPException(status_code=500, detail=f"Review failed: {str(e)}")
+    finally:
+        REVIEWS_IN_FLIGHT.dec()
+
+
+async def run_webhook_review(project_id: int, mr_iid: int, head_sha: str) -> None:
+    """
+    Review MR head in background (started by ReviewDebouncer)
+    
+    Same pipeline as /review with default agent and review types. The task
+    may be cancelled while cloning or reviewing (a newer push arrived);
+    the workspace and the MR's review lock are then released (during the
+    clone by clone_repository itself, as there is no repo_path yet), so
+    the review of the new head can start. Once review results exist, they are
+    published even if a newer push arrives meanwhile.
+    """
+    settings = get_settings()
+    request = ReviewRequest(
+        agent=CLIAgent(settings.DEFAULT_CLI_AGENT),
+        project_id=project_id,
+        merge_request_iid=mr_iid,
+        language=settings.DEFAULT_LANGUAGE
+    )
+    review_service = get_review_service()
+    gitlab_service = get_gitlab_service()
+    git_manager = get_git_manager()
+    repo_path = None
+    timings = ReviewTimings()
+    REVIEWS_IN_FLIGHT.inc()
+    try:
+        with span("webhook_review", project_id=project_id, mr_iid=mr_iid, head_sha=head_sha) as review_span:
+            mr_data = await gitlab_service.get_merge_request(project_id=project_id, mr_iid=mr_iid)
+            project_data = await gitlab_service.get_project(project_id)
+            with collect_timings(timings), timed_phase("clone"):
+                repo_path = await git_manager.clone_repository(
+                    clone_url=gitlab_service.get_clone_url(project_data),
+                    branch=mr_data['source_branch'],
+                    project_id=project_id,
+                    mr_iid=mr_iid,
+                    target_branch=mr_data['target_branch']
+                )
+            with collect_timings(timings):
+                result = await review_service.execute_review(request=request, repo_path=repo_path)
+            
+            # Post-processing owns the workspace from here and cleans it up
+            post_processing = asyncio.ensure_future(process_review_results(
+                result=result,
+                request=request,
+                mr_data=mr_data,
+                repo_path=repo_path,
+                gitlab_service=gitlab_service,
+                git_manager=git_manager,
+                trace_parent=review_span
+            ))
+            repo_path = None
+            try:
+                await asyncio.shield(post_processing)
+            except asyncio.CancelledError:
+                await post_processing
+                raise
+    finally:
+        if repo_path:
+            await git_manager.cleanup_repository(repo_path)
+        REVIEWS_IN_FLIGHT.dec()
 
 
 async def process_review_results(
@@ -134,87 +292,237 @@ async def process_review_results(
     mr_data: Dict[str, Any],
     repo_path: str,
     gitlab_service: GitLabService,
-    git_manager: GitRepositoryManager
+    git_manager: GitRepositoryManager,
+    trace_parent: Optional[Span] = None
 ):
     """
     Process review results (runs in background):
     - Commit documentation
     - Create fix/refactoring MRs
+    - Compare findings with the previous review (new/persisting/resolved; stored once published)
     - Post comment to original MR
+    - Publish inline discussions for new findings (if enabled)
+    - Persist result to the results store (if enabled)
     - Cleanup repository
+    
+    Every step runs in its own span of the review trace (trace_parent) and
+    is recorded in result.timings.post_actions.
     """
-    try:
-        # Initialize MR creator
-        mr_creator = MRCreator(gitlab_service, git_manager)
-        refactor_classifier = RefactoringClassifier()
-        
-        # 1. Commit documentation if any
-        if result.documentation_additions:
-            doc_sha = await mr_creator.create_documentation_commit(
-                repo_path=repo_path,
-                source_branch=mr_data['source_branch'],
-                documentation=result.documentation_additions,
-                project_id=request.project_id
+    settings = get_settings()
+    with span("process_review_results", parent=trace_parent), collect_timings(result.timings):
+        try:
+            # Initialize MR creator
+            mr_creator = MRCreator(gitlab_service, git_manager)
+            refactor_classifier = RefactoringClassifier()
+            
+            # 0. Fingerprint findings while the checkout is still the reviewed revision
+            # (a partial fail-fast review would report findings of skipped types as resolved)
+            tracker = None
+            if settings.FINDING_DIFF_ENABLED and not result.stopped_early:
+                with post_step("fingerprint_findings"):
+                    try:
+                        from app.dependencies import get_fingerprint_store_instance
+                        tracker = FindingTracker(get_fingerprint_store_instance())
+                        await run_blocking(tracker.fingerprint_issues, result.issues, repo_path)
+                    except Exception as e:
+                        tracker = None
+                        logger.error(f"Finding fingerprinting failed: {str(e)}", exc_info=True)
+            
+            # 1. Commit documentation if any
+            if result.documentation_additions:
+                with post_step("documentation_commit"):
+                    doc_sha = await mr_creator.create_documentation_commit(
+                        repo_path=repo_path,
+                        source_branch=mr_data['source_branch'],
+                        documentation=result.documentation_additions,
+                        project_id=request.project_id
+                    )
+                result.documentation_committed = True
+                result.doc_commit_sha = doc_sha
+                logger.info(f"Documentation committed: {doc_sha}")
+            
+            # 2. Classify refactoring
+            if result.refactoring_suggestions:
+                with post_step("classify_refactoring"):
+                    refactor_impact = refactor_classifier.classify(result.refactoring_suggestions)
+                    significant, minor = refactor_classifier.separate_refactorings(result.refactoring_suggestions)
+                
+                # 3. Create fixes MR (with minor refactoring if any)
+                if result.issues:
+                    with post_step("fixes_mr"):
+                        fix_mr_result = await mr_creator.create_fixes_mr(
+                            project_id=request.project_id,
+                            source_branch=mr_data['source_branch'],
+                            target_branch=mr_data['target_branch'],
+                            mr_iid=request.merge_request_iid,
+                            issues=result.issues,
+                            minor_refactoring=minor if minor else None
+                        )
+                    if fix_mr_result.success:
+                        result.fix_mr_created = True
+                        result.fix_mr_url = fix_mr_result.mr_url
+                        result.fix_mr_iid = fix_mr_result.mr_iid
+                        logger.info(f"Fixes MR created: !{fix_mr_result.mr_iid}")
+                
+                # 4. Create refactoring MR if significant
+                if significant:
+                    with post_step("refactoring_mr"):
+                        refactor_mr_result = await mr_creator.create_refactoring_mr(
+                            project_id=request.project_id,
+                            source_branch=mr_data['source_branch'],
+                            target_branch=mr_data['target_branch'],
+                            mr_iid=request.merge_request_iid,
+                            refactorings=significant
+                        )
+                    if refactor_mr_result.success:
+                        result.refactoring_mr_created = True
+                        result.refactoring_mr_url = refactor_mr_result.mr_url
+                        result.refactoring_mr_iid = refactor_mr_result.mr_iid
+                        logger.info(f"Refactoring MR created: !{refactor_mr_result.mr_iid}")
+            
+            # 5. MR diff for inline discussions (fetched once, reused by the publisher)
+            changes = None
+            if settings.INLINE_COMMENTS_ENABLED and result.issues:
+                with post_step("fetch_changes"):
+                    try:
+                        changes = await gitlab_service.get_mr_changes(
+                            project_id=request.project_id,
+                            mr_iid=request.merge_request_iid
+                        )
+                    except Exception as e:
+                        logger.warning(f"Could not fetch MR changes: {str(e)}")
+            
+            # Split findings into new / persisting / resolved since the previous run
+            if tracker is not None:
+                with post_step("finding_diff"):
+                    try:
+                        result.finding_delta = await tracker.compare(
+                            project_id=request.project_id,
+                            mr_iid=request.merge_request_iid,
+                            issues=result.issues
+                        )
+                    except Exception as e:
+                        # Fall back to publishing all findings
+                        tracker = None
+                        logger.error(f"Finding diffing failed: {str(e)}", exc_info=True)
+            
+            # 6. Post (or update in place) summary comment to original MR
+            with post_step("summary_comment"):
+                comment = generate_review_comment(result)
+                if settings.SUMMARY_NOTE_UPDATE_IN_PLACE:
+                    from app.dependencies import get_note_store_instance
+                    note_publisher = SummaryNotePublisher(gitlab_service, get_note_store_instance())
+                    await note_publisher.publish(
+                        project_id=request.project_id,
+                        mr_iid=request.merge_request_iid,
+                        comment=comment,
+                        content_key=generate_review_comment(result, include_timing=False)
+                    )
+                else:
+                    await gitlab_service.post_mr_comment(
+                        project_id=request.project_id,
+                        mr_iid=request.merge_request_iid,
+                        comment=comment
+                    )
+            logger.info(f"Posted review comment to MR !{request.merge_request_iid}")
+
+            # 7. Publish findings as inline discussions on the diff (only new ones on re-reviews)
+            inline_issues = (
+                result.finding_delta.new_issues if result.finding_delta is not None else result.issues
             )
-            result.documentation_committed = True
-            result.doc_commit_sha = doc_sha
-            logger.info(f"Documentation committed: {doc_sha}")
-        
-        # 2. Classify refactoring
-        if result.refactoring_suggestions:
-            refactor_impact = refactor_classifier.classify(result.refactoring_suggestions)
-            significant, minor = refactor_classifier.separate_refactorings(result.refactoring_suggestions)
+            if settings.INLINE_COMMENTS_ENABLED and inline_issues:
+                with post_step("inline_discussions", issues=len(inline_issues)):
+                    publisher = InlineDiscussionPublisher(
+                        gitlab_service,
+                        concurrency=settings.INLINE_COMMENTS_CONCURRENCY,
+                        max_retries=settings.INLINE_COMMENTS_MAX_RETRIES,
+                        min_severity=IssueSeverity(settings.INLINE_COMMENTS_MIN_SEVERITY)
+                    )
+                    inline_result = await publisher.publish(
+                        project_id=request.project_id,
+                        mr_iid=request.merge_request_iid,
+                        mr_data=mr_data,
+                        issues=inline_issues,
+                        changes=changes
+                    )
+                if inline_result.transient_error:
+                    # Unposted new findings would count as persisting next run and never be posted
+                    logger.warning(
+                        f"Inline discussions of MR !{request.merge_request_iid} incomplete, "
+                        f"keeping previous findings state"
+                    )
+                    tracker = None
+                elif inline_result.error or inline_result.drafts_rejected:
+                    # Permanent (no diff_refs, position refused): retrying would fail
+                    # the same way, so the findings count as skipped and are stored
+                    logger.warning(
+                        f"Inline discussions of MR !{request.merge_request_iid}: "
+                        f"{inline_result.drafts_rejected} findings rejected by GitLab, "
+                        f"error: {inline_result.error}"
+                    )
             
-            # 3. Create fixes MR (with minor refactoring if any)
-            if result.issues:
-                fix_mr_result = await mr_creator.create_fixes_mr(
-                    project_id=request.project_id,
-                    source_branch=mr_data['source_branch'],
-                    target_branch=mr_data['target_branch'],
-                    mr_iid=request.merge_request_iid,
-                    issues=result.issues,
-                    minor_refactoring=minor if minor else None
-                )
-                if fix_mr_result.success:
-                    result.fix_mr_created = True
-                    result.fix_mr_url = fix_mr_result.mr_url
-                    result.fix_mr_iid = fix_mr_result.mr_iid
-                    logger.info(f"Fixes MR created: !{fix_mr_result.mr_iid}")
+            # 8. Remember this run's findings once they are published
+            if tracker is not None:
+                with post_step("save_fingerprints"):
+                    await tracker.save(
+                        project_id=request.project_id,
+                        mr_iid=request.merge_request_iid,
+                        issues=result.issues
+                    )
+
+        except Exception as e:
+            logger.error(f"Error processing review results: {str(e)}", exc_info=True)
+        finally:
+            # Persist whatever was produced, even if a post-processing step failed
+            if settings.RESULTS_STORE_ENABLED:
+                with post_step("persist_result"):
+                    await persist_review_result(result, request)
             
-            # 4. Create refactoring MR if significant
-            if significant:
-                refactor_mr_result = await mr_creator.create_refactoring_mr(
-                    project_id=request.project_id,
-                    source_branch=mr_data['source_branch'],
-                    target_branch=mr_data['target_branch'],
-                    mr_iid=request.merge_request_iid,
-                    refactorings=significant
-                )
-                if refactor_mr_result.success:
-                    result.refactoring_mr_created = True
-                    result.refactoring_mr_url = refactor_mr_result.mr_url
-                    result.refactoring_mr_iid = refactor_mr_result.mr_iid
-                    logger.info(f"Refactoring MR created: !{refactor_mr_result.mr_iid}")
-        
-        # 5. Post summary comment to original MR
-        comment = generate_review_comment(result)
-        await gitlab_service.post_mr_comment(
-            project_id=request.project_id,
-            mr_iid=request.merge_request_iid,
-            comment=comment
+            # Always cleanup repository
+            with post_step("cleanup"):
+                await git_manager.cleanup_repository(repo_path)
+            logger.info(f"Cleaned up repository: {repo_path}")
+            logger.info(
+                f"Review timings for MR !{request.merge_request_iid}: "
+                f"total={result.timings.total:.1f}s {format_timings(result.timings)}"
+            )
+
+
+@contextmanager
+def post_step(name: str, **attributes: Any) -> Iterator[None]:
+    """Span and timing of one post-processing step"""
+    with span(f"post.{name}", **attributes), timed_phase("post_actions", name):
+        yield
+
+
+async def persist_review_result(result: ReviewResult, request: ReviewRequest) -> Optional[int]:
+    """
+    Write review result to the results store (off the event loop)
+    
+    Returns:
+        Stored review id or None if writing failed
+    """
+    try:
+        store = get_results_store()
+        review_id = await run_blocking(
+            store.save_review, request.project_id, request.merge_request_iid, result
         )
-        logger.info(f"Posted review comment to MR !{request.merge_request_iid}")
-        
+        logger.info(f"Stored review {review_id} for MR !{request.merge_request_iid}")
+        return review_id
     except Exception as e:
-        logger.error(f"Error processing review results: {str(e)}", exc_info=True)
-    finally:
-        # Always cleanup repository
-        await git_manager.cleanup_repository(repo_path)
-        logger.info(f"Cleaned up repository: {repo_path}")
+        logger.error(f"Failed to store review result: {str(e)}", exc_info=True)
+        return None
 
 
-def generate_review_comment(result: ReviewResult) -> str:
-    """Generate markdown comment for MR"""
+def generate_review_comment(result: ReviewResult, include_timing: bool = True) -> str:
+    """
+    Generate markdown comment for MR
+    
+    Args:
+        result: Review result
+        include_timing: Include execution time (disable to get a rendering
+            that only changes when findings/actions change)
+    """
     status_icon = "❌" if result.summary.critical > 0 else ("⚠️" if result.summary.high > 0 else "✅")
     status_text = "FAILED" if result.summary.critical > 0 else ("WARNING" if result.summary.high > 0 else "PASSED")
     
@@ -223,7 +531,13 @@ def generate_review_comment(result: ReviewResult) -> str:
         "",
         f"**Agent**: {result.agent.value}",
         f"**Review Types**: {result.review_type.value}",
-        f"**Execution Time**: {result.execution_time_seconds:.1f}s",
+    ]
+    if result.stopped_early:
+        skipped = ", ".join(rt.value for rt in result.skipped_review_types)
+        lines.append(f"**Stopped early** (fail-fast, blocking issues found), not run: {skipped}")
+    if include_timing:
+        lines.append(f"**Execution Time**: {result.execution_time_seconds:.1f}s")
+    lines += [
         "",
         "### Issue Summary",
         "",
@@ -236,11 +550,29 @@ def generate_review_comment(result: ReviewResult) -> str:
         f"| **Total** | **{result.summary.total_issues}** |",
         "",
     ]
+    if result.summary.duplicates_collapsed:
+        lines.append(
+            f"*{result.summary.duplicates_collapsed} duplicate findings reported by "
+            f"several review types were merged*"
+        )
+        lines.append("")
+    
+    delta = result.finding_delta
+    if delta is not None:
+        lines += [
+            "### Changes Since Last Review",
+            "",
+            f"- 🆕 New: {len(delta.new_issues)}",
+            f"- ♻️ Persisting: {len(delta.persisting_issues)}",
+            f"- ✅ Resolved: {len(delta.resolved_issues)}",
+            "",
+        ]
     
-    # Show first 5 critical issues
-    critical_issues = [i for i in result.issues if i.severity.value == "CRITICAL"]
+    # Show first 5 critical issues (only new ones on re-reviews)
+    shown_issues = delta.new_issues if delta is not None else result.issues
+    critical_issues = [i for i in shown_issues if i.severity.value == "CRITICAL"]
     if critical_issues:
-        lines.append("### 🔴 Critical Issues")
+        lines.append("### 🔴 New Critical Issues" if delta is not None else "### 🔴 Critical Issues")
         lines.append("")
         for issue in critical_issues[:5]:
             lines.append(f"#### {issue.category}")
@@ -252,6 +584,15 @@ def generate_review_comment(result: ReviewResult) -> str:
             lines.append(f"*... and {len(critical_issues) - 5} more critical issues*")
             lines.append("")
     
+    if delta is not None and delta.resolved_issues:
+        lines.append("### ✅ Resolved Since Last Review")
+        lines.append("")
+        for issue in delta.resolved_issues[:5]:
+            lines.append(f"- ~~{issue.category}~~ `{issue.file}` ({issue.severity.value})")
+        if len(delta.resolved_issues) > 5:
+            lines.append(f"- *... and {len(delta.resolved_issues) - 5} more*")
+        lines.append("")
+    
     # Actions taken
     lines.append("### Actions Taken")
     lines.append("")
@@ -265,12 +606,31 @@ def generate_review_comment(result: ReviewResult) -> str:
         lines.append("- ℹ️ No automated actions required")
     lines.append("")
     
+    if include_timing:
+        lines += format_timing_breakdown(result.timings)
+    
     lines.append("---")
     lines.append("*Powered by AI Code Review System v2.0.0*")
     
     return "\n".join(lines)
 
 
+def format_timing_breakdown(timings: ReviewTimings) -> List[str]:
+    """Collapsible markdown table of phase timings (empty if nothing was measured)"""
+    rows = [(phase, seconds) for phase, seconds in timings.flat().items() if seconds]
+    if not rows:
+        return []
+    lines = [
+        f"<details><summary>⏱️ Timing breakdown ({timings.total:.1f}s)</summary>",
+        "",
+        "| Phase | Seconds |",
+        "|-------|---------|",
+    ]
+    lines += [f"| {phase} | {seconds:.1f} |" for phase, seconds in rows]
+    lines += ["", "</details>", ""]
+    return lines
+
+
 @router.post(
     "/validate-mr",
     response_model=ValidationResult,
@@ -332,39 +692,234 @@ async def validate_merge_request(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/prefetch",
+    response_model=PrefetchResult,
+    status_code=202,
+    summary="Prefetch Repository",
+    description="Заранее загрузить ветки MR в пул рабочих копий (для n8n при событии MR)"
+)
+async def prefetch_repository(
+    request: PrefetchRequest,
+    prefetcher: RepositoryPrefetcher = Depends(get_prefetcher)
+) -> PrefetchResult:
+    """
+    Queue low-priority fetch of MR branches
+    Returns immediately; duplicate and too frequent requests are dropped
+    """
+    status = prefetcher.submit(
+        project_id=request.project_id,
+        source_branch=request.source_branch,
+        target_branch=request.target_branch
+    )
+    return PrefetchResult(status=status, pending=prefetcher.stats()["pending"])
+
+
+@router.post(
+    "/webhooks/gitlab",
+    response_model=WebhookResult,
+    status_code=202,
+    responses={401: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+    summary="GitLab Webhook",
+    description="Приём Merge Request Hook от GitLab: review запускается после паузы между push"
+)
+async def gitlab_webhook(
+    payload: Dict[str, Any] = Body(...),
+    x_gitlab_token: Optional[str] = Header(None),
+    debouncer: ReviewDebouncer = Depends(get_review_debouncer),
+    prefetcher: RepositoryPrefetcher = Depends(get_prefetcher)
+) -> WebhookResult:
+    """
+    Receive GitLab merge request events
+    
+    New commits (open, reopen, update with oldrev) schedule a debounced
+    review of the head SHA and prefetch the branches; close and merge
+    cancel the MR's pending review. Other events are ignored.
+    """
+    secret = get_settings().GITLAB_WEBHOOK_SECRET
+    if not secret:
+        raise HTTPException(status_code=503, detail="GitLab webhook receiver is not configured")
+    if not x_gitlab_token or not hmac.compare_digest(x_gitlab_token.encode(), secret.encode()):
+        raise HTTPException(status_code=401, detail="Invalid webhook token")
+    
+    if payload.get("object_kind") != "merge_request":
+        return WebhookResult(status="ignored", reason=f"event {payload.get('object_kind')}")
+    attributes = payload.get("object_attributes") or {}
+    project_id = (payload.get("project") or {}).get("id") or attributes.get("target_project_id")
+    mr_iid = attributes.get("iid")
+    action = attributes.get("action")
+    if not project_id or not mr_iid:
+        return WebhookResult(status="ignored", reason="missing project or MR")
+    
+    if action in ("close", "merge"):
+        cancelled = debouncer.cancel(project_id, mr_iid)
+        return WebhookResult(status="cancelled" if cancelled else "ignored", reason=f"MR {action}")
+    if attributes.get("draft") or attributes.get("work_in_progress"):
+        return WebhookResult(status="ignored", reason="draft MR")
+    if action not in ("open", "reopen") and not (action == "update" and attributes.get("oldrev")):
+        return WebhookResult(status="ignored", reason=f"no new commits ({action})")
+    head_sha = (attributes.get("last_commit") or {}).get("id")
+    if not head_sha:
+        return WebhookResult(status="ignored", reason="missing head commit")
+    
+    # Objects are fetched during the quiet period
+    if attributes.get("source_branch") and attributes.get("target_branch"):
+        prefetcher.submit(project_id, attributes["source_branch"], attributes["target_branch"])
+    return WebhookResult(status=debouncer.submit(project_id, mr_iid, head_sha))
+
+
+@router.get(
+    "/reviews",
+    response_model=ReviewPage,
+    summary="List Stored Reviews",
+    description="История review (новые первыми), keyset-пагинация через cursor"
+)
+async def list_reviews(
+    project_id: Optional[int] = Query(None, gt=0),
+    mr_iid: Optional[int] = Query(None, gt=0),
+    severity: Optional[IssueSeverity] = Query(None, description="Only reviews with issues of this severity"),
+    review_type: Optional[ReviewType] = Query(None, description="Only reviews with issues from this review type"),
+    file: Optional[str] = Query(None, description="Only reviews with issues in this file"),
+    cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    store: ReviewResultsStore = Depends(get_results_store)
+) -> ReviewPage:
+    """List stored reviews"""
+    items, next_cursor = await run_blocking(
+        store.list_reviews,
+        project_id=project_id,
+        mr_iid=mr_iid,
+        severity=severity.value if severity else None,
+        review_type=review_type.value if review_type else None,
+        file=file,
+        cursor=cursor,
+        limit=limit
+    )
+    return ReviewPage(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/reviews/issues",
+    response_model=IssuePage,
+    summary="List Stored Issues",
+    description="Найденные проблемы из истории review, keyset-пагинация через cursor"
+)
+async def list_issues(
+    project_id: Optional[int] = Query(None, gt=0),
+    mr_iid: Optional[int] = Query(None, gt=0),
+    severity: Optional[IssueSeverity] = Query(None),
+    review_type: Optional[ReviewType] = Query(None),
+    file: Optional[str] = Query(None),
+    cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    store: ReviewResultsStore = Depends(get_results_store)
+) -> IssuePage:
+    """List stored issues"""
+    items, next_cursor = await run_blocking(
+        store.list_issues,
+        project_id=project_id,
+        mr_iid=mr_iid,
+        severity=severity.value if severity else None,
+        review_type=review_type.value if review_type else None,
+        file=file,
+        cursor=cursor,
+        limit=limit
+    )
+    return IssuePage(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/reviews/{review_id}",
+    response_model=ReviewDetail,
+    responses={404: {"model": ErrorResponse}},
+    summary="Get Stored Review",
+    description="Review из истории со всеми проблемами, рефакторингами и таймингами"
+)
+async def get_review(
+    review_id: int,
+    store: ReviewResultsStore = Depends(get_results_store)
+) -> ReviewDetail:
+    """Get stored review by id"""
+    review = await run_blocking(store.get_review, review_id)
+    if review is None:
+        raise HTTPException(status_code=404, detail=f"Review {review_id} not found")
+    return ReviewDetail(**review)
+
+
+@router.get(
+    "/projects/{project_id}/trends",
+    response_model=ProjectTrends,
+    responses={404: {"model": ErrorResponse}},
+    summary="Project Quality Trends",
+    description="Проблемы по неделям, severity и категориям из предрассчитанных агрегатов"
+)
+async def get_project_trends(
+    project_id: int,
+    weeks: int = Query(DEFAULT_TREND_WEEKS, ge=1, le=MAX_TREND_WEEKS),
+    store: ReviewResultsStore = Depends(get_results_store)
+) -> ProjectTrends:
+    """Get project trends from rollups"""
+    trends = await run_blocking(store.get_trends, project_id, weeks)
+    if trends is None:
+        raise HTTPException(status_code=404, detail=f"No reviews stored for project {project_id}")
+    return ProjectTrends(**trends)
+
+
 @router.get(
     "/health",
     response_model=HealthCheckResponse,
     summary="Health Check",
-    description="Проверка работоспособности сервиса и зависимостей"
+    description="Состояние зависимостей из кэша фонового монитора (без вызова CLI и GitLab)"
 )
 async def health_check(
-    review_service: ReviewService = Depends(get_review_service),
-    gitlab_service: GitLabService = Depends(get_gitlab_service)
+    monitor: HealthMonitor = Depends(get_health_monitor)
 ) -> HealthCheckResponse:
-    """Health check endpoint"""
-    try:
-        # Check CLI agents
-        cli_health = await review_service.health_check()
-        
-        # Check GitLab connection
-        gitlab_connected = await gitlab_service.test_connection()
-        
-        status = "healthy" if all([
-            cli_health.get('cline_available') or cli_health.get('qwen_available'),
-            cli_health.get('model_api_connected'),
-            gitlab_connected
-        ]) else "unhealthy"
-        
+    """Cached dependency health (refreshed in background)"""
+    if monitor.state is None:
         return HealthCheckResponse(
-            status=status,
-            version=settings.VERSION,
-            cline_available=cli_health.get('cline_available', False),
-            qwen_available=cli_health.get('qwen_available', False),
-            model_api_connected=cli_health.get('model_api_connected', False),
-            gitlab_connected=gitlab_connected
+            status="unknown",
+            version=get_settings().VERSION,
+            cline_available=False,
+            qwen_available=False,
+            model_api_connected=False,
+            gitlab_connected=False
         )
-        
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(status_code=503, detail="Service unhealthy")
+    return monitor.state
+
+
+@router.get(
+    "/health/live",
+    summary="Liveness Probe",
+    description="Процесс отвечает (без проверки зависимостей)"
+)
+async def liveness_probe() -> Dict[str, str]:
+    """Liveness probe"""
+    return {"status": "alive"}
+
+
+@router.get(
+    "/health/ready",
+    summary="Readiness Probe",
+    description="Готовность пода: прогрев завершён, кэш свежий, CLI установлен (503 иначе; model API и GitLab проверяются в /health/deep)"
+)
+async def readiness_probe(
+    monitor: HealthMonitor = Depends(get_health_monitor)
+) -> JSONResponse:
+    """Readiness probe from warm-up status and cached state"""
+    return JSONResponse(
+        status_code=200 if monitor.is_ready() else 503,
+        content=jsonable_encoder(monitor.probe())
+    )
+
+
+@router.get(
+    "/health/deep",
+    response_model=HealthCheckResponse,
+    summary="Deep Health Check",
+    description="Проверка CLI, model API и GitLab прямо сейчас (обновляет кэш монитора)"
+)
+async def deep_health_check(
+    monitor: HealthMonitor = Depends(get_health_monitor)
+) -> HealthCheckResponse:
+    """Run deep dependency checks on demand"""
+    return await monitor.refresh()
@@ -5,7 +5,7 @@ Environment-based settings for code review system.
 """
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 from functools import lru_cache
 
 
@@ -30,16 +30,83 @@ class Settings(BaseSettings):
     DEFAULT_CLI_AGENT: str = "CLINE"  # CLINE or QWEN_CODE
     CLINE_PARALLEL_TASKS: int = 5
     QWEN_PARALLEL_TASKS: int = 3
+    ADAPTIVE_CONCURRENCY_ENABLED: bool = True  # *_PARALLEL_TASKS become the starting point of an AIMD limit per agent
+    CLINE_MAX_PARALLEL_TASKS: int = 10
+    QWEN_MAX_PARALLEL_TASKS: int = 6
+    ADAPTIVE_CONCURRENCY_BACKOFF: float = 0.5  # limit factor on timeout, HTTP 429 or latency spike
+    ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE: float = 2.0  # task latency / usual latency counted as a spike
     REVIEW_TIMEOUT: int = 300  # seconds
+    AGENT_WORKSPACE_ISOLATION: str = "auto"  # per-task copy-on-write view: auto (overlay/reflink, else shared), overlay, reflink, hardlink (full working-tree copy), off
+    AGENT_FAILOVER_ENABLED: bool = False  # hedge slow runs / retry failed runs on the other agent
+    HEDGE_QUANTILE: float = 0.95  # latency quantile (per agent and review type) after which a run is hedged
+    HEDGE_MIN_SAMPLES: int = 20  # successful runs needed before hedging
+    HEDGE_MAX_CONCURRENT: int = 2  # hedged runs in flight at once (0 disables hedging)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures that open an agent's circuit
+    CIRCUIT_RESET_SECONDS: float = 60  # open time before a trial run is let through
     
     # GitLab Configuration
     GITLAB_URL: str = "https://gitlab.example.com"
     GITLAB_TOKEN: str
-    
+    GITLAB_WEBHOOK_SECRET: str = ""  # X-Gitlab-Token of /webhooks/gitlab (receiver disabled if empty)
+    WEBHOOK_QUIET_SECONDS: float = 30  # pushes to an MR within this period collapse into one review
+    WEBHOOK_MAX_CONCURRENT_REVIEWS: int = 2
+
+    # Inline Discussions (findings as diff comments)
+    INLINE_COMMENTS_ENABLED: bool = False
+    INLINE_COMMENTS_MIN_SEVERITY: str = "MEDIUM"  # CRITICAL, HIGH, MEDIUM, LOW, INFO
+    INLINE_COMMENTS_CONCURRENCY: int = 5
+    INLINE_COMMENTS_MAX_RETRIES: int = 3
+
+    # Summary note: update one note per MR instead of posting a new one per run
+    SUMMARY_NOTE_UPDATE_IN_PLACE: bool = True
+
+    # Finding diffing: compare each run with the previous one, publish only deltas
+    FINDING_DIFF_ENABLED: bool = True
+
+    # Review results store (SQLite under DATA_DIR, queried via /api/v1/reviews)
+    RESULTS_STORE_ENABLED: bool = True
+
+    # Prometheus metrics at /metrics
+    METRICS_ENABLED: bool = True
+
+    # Background dependency health checks (probes answer from the cached state)
+    HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    HEALTH_CHECK_TTL_SECONDS: int = 90  # older cached state is stale -> not ready
+    HEALTH_CHECK_TIMEOUT_SECONDS: int = 20
+
+    # Startup warm-up: failed steps are retried, then the warm-up finishes degraded
+    WARMUP_MAX_ATTEMPTS: int = 3
+    WARMUP_RETRY_BACKOFF_SECONDS: float = 2.0
+
+    # Per-review tracing spans exported to a rotating JSONL file (OTLP span shape)
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATIO: float = 0.1  # fraction of reviews traced
+    TRACING_EXPORT_PATH: str = ""  # empty: DATA_DIR/traces.jsonl
+    TRACING_MAX_BYTES: int = 50 * 1024 * 1024
+    TRACING_BACKUP_COUNT: int = 5
+
+    # Logging pipeline (queue-backed, see app/utils/logger.py)
+    LOG_JSON: bool = False  # structured JSON lines on stdout
+    LOG_DIR: str = "logs"  # daily log files (empty: stdout only)
+    LOG_RATE_LIMIT_PER_MINUTE: int = 120  # records per call site below ERROR (0 = unlimited)
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # logger name prefix -> kept fraction of DEBUG/INFO
+
+    # Event loop responsiveness
+    BLOCKING_IO_WORKERS: int = 8  # thread pool for blocking file I/O (app/utils/blocking_io.py)
+    LOOP_LAG_CHECK_INTERVAL_SECONDS: float = 0.5
+    LOOP_LAG_WARN_SECONDS: float = 0.2  # log a warning when the loop was blocked this long
+
     # Paths
     WORK_DIR: str = "/tmp/review"
+    WORKSPACE_QUOTA_BYTES: int = 8 * 1024 ** 3  # evict idle workspaces above this (0 = unlimited)
+    WORKSPACE_JANITOR_INTERVAL_SECONDS: int = 60
+    WORKSPACE_POOL_SIZE: int = 2  # idle checkouts kept per project for reuse (0 = clone per review)
+    WORKSPACE_POOL_PROJECTS: int = 10  # projects with pooled checkouts (least recently used evicted)
+    PREFETCH_MIN_INTERVAL_SECONDS: int = 60  # per project; /prefetch requests in between are rejected
+    PREFETCH_MAX_QUEUED: int = 100
     PROMPTS_PATH: str = "prompts"
     DEFAULT_RULES_PATH: str = "rules/java-spring-boot"
+    DATA_DIR: str = "data"  # Local state (SQLite stores)
     
     # Default Language
     DEFAULT_LANGUAGE: str = "java"
@@ -3,13 +3,31 @@ Dependencies for FastAPI Dependency Injection
 """
 
 from functools import lru_cache
+from app.services.agent_failover import AgentFailover
 from app.services.review_service import ReviewService
 from app.services.cline_cli_manager import ClineCLIManager
 from app.services.qwen_code_cli_manager import QwenCodeCLIManager
 from app.services.custom_rules_loader import CustomRulesLoader
+from app.services.summary_note_publisher import MRNoteStore
+from app.services.finding_tracker import FingerprintStore
+from app.services.results_store import ReviewResultsStore
+from app.services.gitlab_service import GitLabService
+from app.services.git_repository_manager import GitRepositoryManager
+from app.services.health_monitor import HealthMonitor
+from app.services.prefetcher import RepositoryPrefetcher
+from app.services.review_debouncer import ReviewDebouncer
+from app.services.warmup import Warmup
+from app.services.workspace_janitor import WorkspaceJanitor
+from app.services.workspace_views import WorkspaceViewFactory
+from app.models import CLIAgent
+from app.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from app.utils.json_validator import get_validator
+from app.utils.loop_monitor import EventLoopLagMonitor
 from app.config import get_settings
+from pathlib import Path
+import logging
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 @lru_cache()
@@ -20,13 +38,39 @@ def get_review_service_instance() -> ReviewService:
     Returns:
         ReviewService configured with CLI managers and rules loader
     """
+    settings = get_settings()
+    # Private copy-on-write checkout view per parallel CLI task
+    workspace_views = None
+    if settings.AGENT_WORKSPACE_ISOLATION != "off":
+        workspace_views = WorkspaceViewFactory(mode=settings.AGENT_WORKSPACE_ISOLATION)
+    
+    # Adaptive parallel task limits (shared by all reviews of an agent)
+    cline_concurrency = qwen_concurrency = None
+    if settings.ADAPTIVE_CONCURRENCY_ENABLED:
+        cline_concurrency = AdaptiveConcurrencyLimiter(
+            CLIAgent.CLINE.value,
+            initial_limit=settings.CLINE_PARALLEL_TASKS,
+            max_limit=settings.CLINE_MAX_PARALLEL_TASKS,
+            backoff_ratio=settings.ADAPTIVE_CONCURRENCY_BACKOFF,
+            latency_tolerance=settings.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE
+        )
+        qwen_concurrency = AdaptiveConcurrencyLimiter(
+            CLIAgent.QWEN_CODE.value,
+            initial_limit=settings.QWEN_PARALLEL_TASKS,
+            max_limit=settings.QWEN_MAX_PARALLEL_TASKS,
+            backoff_ratio=settings.ADAPTIVE_CONCURRENCY_BACKOFF,
+            latency_tolerance=settings.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE
+        )
+    
     # Initialize CLI managers
     cline_manager = ClineCLIManager(
         model_api_url=settings.MODEL_API_URL,
         model_name=settings.DEEPSEEK_MODEL_NAME,
         api_key=settings.MODEL_API_KEY,
         parallel_tasks=settings.CLINE_PARALLEL_TASKS,
-        timeout_seconds=settings.REVIEW_TIMEOUT
+        timeout_seconds=settings.REVIEW_TIMEOUT,
+        workspace_views=workspace_views,
+        concurrency=cline_concurrency
     )
     
     qwen_manager = QwenCodeCLIManager(
@@ -34,7 +78,9 @@ def get_review_service_instance() -> ReviewService:
         model_name=settings.QWEN3_MODEL_NAME,
         api_key=settings.MODEL_API_KEY,
         parallel_tasks=settings.QWEN_PARALLEL_TASKS,
-        timeout_seconds=settings.REVIEW_TIMEOUT
+        timeout_seconds=settings.REVIEW_TIMEOUT,
+        workspace_views=workspace_views,
+        concurrency=qwen_concurrency
     )
     
     # Initialize rules loader
@@ -42,12 +88,200 @@ def get_review_service_instance() -> ReviewService:
         default_rules_path=settings.DEFAULT_RULES_PATH
     )
     
+    # Hedging and circuit breaking across the two agents
+    failover = None
+    if settings.AGENT_FAILOVER_ENABLED:
+        failover = AgentFailover(
+            hedge_quantile=settings.HEDGE_QUANTILE,
+            min_samples=settings.HEDGE_MIN_SAMPLES,
+            max_hedges=settings.HEDGE_MAX_CONCURRENT,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=settings.CIRCUIT_RESET_SECONDS
+        )
+    
     # Create ReviewService
     return ReviewService(
         cline_manager=cline_manager,
         qwen_manager=qwen_manager,
         rules_loader=rules_loader,
-        prompts_base_path=settings.PROMPTS_PATH
+        prompts_base_path=settings.PROMPTS_PATH,
+        failover=failover
+    )
+
+
+@lru_cache()
+def get_note_store_instance() -> MRNoteStore:
+    """
+    Get singleton MRNoteStore instance
+    
+    Returns:
+        MRNoteStore backed by DATA_DIR/review_state.db
+    """
+    settings = get_settings()
+    return MRNoteStore(str(Path(settings.DATA_DIR) / "review_state.db"))
+
+
+@lru_cache()
+def get_fingerprint_store_instance() -> FingerprintStore:
+    """
+    Get singleton FingerprintStore instance
+    
+    Returns:
+        FingerprintStore backed by DATA_DIR/review_state.db
+    """
+    settings = get_settings()
+    return FingerprintStore(str(Path(settings.DATA_DIR) / "review_state.db"))
+
+
+@lru_cache()
+def get_results_store_instance() -> ReviewResultsStore:
+    """
+    Get singleton ReviewResultsStore instance
+    
+    Returns:
+        ReviewResultsStore backed by DATA_DIR/results.db
+    """
+    settings = get_settings()
+    return ReviewResultsStore(str(Path(settings.DATA_DIR) / "results.db"))
+
+
+@lru_cache()
+def get_health_monitor_instance() -> HealthMonitor:
+    """
+    Get singleton HealthMonitor instance
+    
+    Returns:
+        HealthMonitor checking the shared ReviewService and GitLab, gated on warm-up
+    """
+    settings = get_settings()
+    return HealthMonitor(
+        review_service=get_review_service_instance(),
+        gitlab_service=GitLabService(
+            gitlab_url=settings.GITLAB_URL,
+            gitlab_token=settings.GITLAB_TOKEN
+        ),
+        version=settings.VERSION,
+        interval_seconds=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+        ttl_seconds=settings.HEALTH_CHECK_TTL_SECONDS,
+        check_timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+        warmup=get_warmup_instance()
+    )
+
+
+@lru_cache()
+def get_workspace_janitor_instance() -> WorkspaceJanitor:
+    """
+    Get singleton WorkspaceJanitor instance
+    
+    Returns:
+        WorkspaceJanitor for WORK_DIR with quota from settings
+    """
+    settings = get_settings()
+    return WorkspaceJanitor(
+        work_dir=settings.WORK_DIR,
+        quota_bytes=settings.WORKSPACE_QUOTA_BYTES,
+        interval_seconds=settings.WORKSPACE_JANITOR_INTERVAL_SECONDS
+    )
+
+
+@lru_cache()
+def get_git_manager_instance() -> GitRepositoryManager:
+    """
+    Get singleton GitRepositoryManager instance
+    
+    Returns:
+        GitRepositoryManager shared by all requests (active reviews and workspace pool)
+    """
+    settings = get_settings()
+    return GitRepositoryManager(
+        work_dir=settings.WORK_DIR,
+        janitor=get_workspace_janitor_instance(),
+        pool_size=settings.WORKSPACE_POOL_SIZE,
+        pool_projects=settings.WORKSPACE_POOL_PROJECTS
+    )
+
+
+@lru_cache()
+def get_prefetcher_instance() -> RepositoryPrefetcher:
+    """
+    Get singleton RepositoryPrefetcher instance
+    
+    Returns:
+        RepositoryPrefetcher filling the workspace pool of the shared GitRepositoryManager
+    """
+    settings = get_settings()
+    return RepositoryPrefetcher(
+        git_manager=get_git_manager_instance(),
+        gitlab_service=GitLabService(
+            gitlab_url=settings.GITLAB_URL,
+            gitlab_token=settings.GITLAB_TOKEN
+        ),
+        min_interval_seconds=settings.PREFETCH_MIN_INTERVAL_SECONDS,
+        max_queued=settings.PREFETCH_MAX_QUEUED
+    )
+
+
+@lru_cache()
+def get_review_debouncer_instance() -> ReviewDebouncer:
+    """
+    Get singleton ReviewDebouncer instance
+    
+    Returns:
+        ReviewDebouncer running webhook-triggered reviews after the quiet period
+    """
+    from app.api.routes import run_webhook_review
+    settings = get_settings()
+    return ReviewDebouncer(
+        run_review=run_webhook_review,
+        quiet_seconds=settings.WEBHOOK_QUIET_SECONDS,
+        max_concurrent=settings.WEBHOOK_MAX_CONCURRENT_REVIEWS
+    )
+
+
+@lru_cache()
+def get_loop_monitor_instance() -> EventLoopLagMonitor:
+    """
+    Get singleton EventLoopLagMonitor instance
+    
+    Returns:
+        EventLoopLagMonitor with interval and warning threshold from settings
+    """
+    settings = get_settings()
+    return EventLoopLagMonitor(
+        interval_seconds=settings.LOOP_LAG_CHECK_INTERVAL_SECONDS,
+        warn_seconds=settings.LOOP_LAG_WARN_SECONDS
+    )
+
+
+@lru_cache()
+def get_warmup_instance() -> Warmup:
+    """
+    Get singleton startup Warmup instance
+    
+    Returns:
+        Warmup loading CLI managers, prompts, rules and the JSON validator,
+        then running the first health check and starting the health monitor
+    """
+    settings = get_settings()
+    return Warmup(
+        [
+            ("cli_managers", get_review_service_instance),
+            ("prompts", lambda: get_review_service_instance().preload_prompts()),
+            ("rules", lambda: get_review_service_instance().rules_loader.load_rules(settings.DEFAULT_LANGUAGE)),
+            ("json_validator", get_validator),
+            ("health_monitor", _start_health_monitor),
+        ],
+        max_attempts=settings.WARMUP_MAX_ATTEMPTS,
+        retry_backoff_seconds=settings.WARMUP_RETRY_BACKOFF_SECONDS
     )
 
 
+async def _start_health_monitor() -> None:
+    """Run the first dependency check and keep it fresh in background"""
+    monitor = get_health_monitor_instance()
+    health = await monitor.refresh()
+    logger.info(f"Cline CLI available: {health.cline_available}")
+    logger.info(f"Qwen Code CLI available: {health.qwen_available}")
+    logger.info(f"Model API connected: {health.model_api_connected}")
+    logger.info(f"GitLab connected: {health.gitlab_connected}")
+    monitor.start()
@@ -2,14 +2,17 @@
 FastAPI Application Entry Point
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.config import get_settings
 from app.api.routes import router as api_router
+from app.utils.blocking_io import shutdown_io_executor
 from app.utils.logger import setup_logger
+from app.utils.metrics import render_metrics
 
 # Setup logging
 setup_logger()
@@ -28,21 +31,39 @@ async def lifespan(app: FastAPI):
     logger.info(f"Default CLI Agent: {settings.DEFAULT_CLI_AGENT}")
     logger.info(f"Work Directory: {settings.WORK_DIR}")
     
-    # Verify CLI tools availability
-    from app.dependencies import get_review_service_instance
-    try:
-        review_service = get_review_service_instance()
-        health = await review_service.health_check()
-        logger.info(f"Cline CLI available: {health.get('cline_available', False)}")
-        logger.info(f"Qwen Code CLI available: {health.get('qwen_available', False)}")
-        logger.info(f"Model API connected: {health.get('model_api_connected', False)}")
-    except Exception as e:
-        logger.error(f"Health check failed during startup: {str(e)}")
+    # Warm up in background (prompts, rules, validator, first health check);
+    # the app accepts traffic now and reports ready once warm
+    from app.dependencies import (
+        get_health_monitor_instance,
+        get_loop_monitor_instance,
+        get_prefetcher_instance,
+        get_review_debouncer_instance,
+        get_warmup_instance,
+        get_workspace_janitor_instance
+    )
+    warmup = get_warmup_instance()
+    warmup.start()
+    loop_monitor = get_loop_monitor_instance()
+    loop_monitor.start()
+    # Sweeps orphaned checkouts, then deletes discarded ones and enforces the disk quota
+    janitor = get_workspace_janitor_instance()
+    janitor.start()
+    prefetcher = get_prefetcher_instance()
+    prefetcher.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    await warmup.stop()
+    await get_health_monitor_instance().stop()
+    await loop_monitor.stop()
+    await get_review_debouncer_instance().stop()
+    await prefetcher.stop()
+    await janitor.stop()
+    logger.info(f"Event loop lag: {loop_monitor.stats()}")
+    # Not run_blocking: this waits for the blocking I/O pool itself to drain
+    await asyncio.to_thread(shutdown_io_executor)
 
 
 # Create FastAPI app
@@ -86,3 +107,11 @@ async def health_check_simple():
         "status": "healthy",
         "version": settings.VERSION
     }
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics (text exposition format)"""
+        payload, content_type = render_metrics()
+        return Response(content=payload, media_type=content_type)
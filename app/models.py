@@ -7,7 +7,7 @@ Defines request/response models for the multi-agent code review system.
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
-from datetime import datetime
+from datetime import date, datetime
 
 
 # ========================
@@ -57,6 +57,16 @@ class IssueSeverity(str, Enum):
     INFO = "INFO"
 
 
+# Ordering of severities for thresholds and merging (higher is more severe)
+SEVERITY_RANK = {
+    IssueSeverity.CRITICAL: 4,
+    IssueSeverity.HIGH: 3,
+    IssueSeverity.MEDIUM: 2,
+    IssueSeverity.LOW: 1,
+    IssueSeverity.INFO: 0,
+}
+
+
 class RefactoringImpact(str, Enum):
     """Refactoring impact classification"""
     SIGNIFICANT = "SIGNIFICANT"  # Separate MR required
@@ -107,6 +117,20 @@ class ReviewRequest(BaseModel):
         None,
         description="Custom rules from Confluence (markdown content)"
     )
+    fail_fast: bool = Field(
+        False,
+        description="Pre-merge gating: run ERROR_DETECTION and SECURITY_AUDIT first and skip "
+                    "review types not started yet once the blocking threshold is reached"
+    )
+    fail_fast_severity: IssueSeverity = Field(
+        IssueSeverity.CRITICAL,
+        description="Lowest severity counted as blocking in fail_fast mode"
+    )
+    fail_fast_min_issues: int = Field(
+        1,
+        description="Blocking issues that stop the review in fail_fast mode",
+        ge=1
+    )
 
     @field_validator('review_types')
     @classmethod
@@ -123,6 +147,13 @@ class ValidateMRRequest(BaseModel):
     merge_request_iid: int = Field(..., gt=0)
 
 
+class PrefetchRequest(BaseModel):
+    """Request to fetch MR branches ahead of the review (sent by n8n on MR events)"""
+    project_id: int = Field(..., gt=0)
+    source_branch: str = Field(..., min_length=1)
+    target_branch: str = Field(..., min_length=1)
+
+
 # ========================
 # Issue Models
 # ========================
@@ -142,6 +173,14 @@ class ReviewIssue(BaseModel):
         default="default",
         description="Source of rule: 'default', 'project_custom', 'confluence'"
     )
+    review_types: List[ReviewType] = Field(
+        default_factory=list,
+        description="Review types that reported this issue (several after de-duplication)"
+    )
+    fingerprint: Optional[str] = Field(
+        None,
+        description="Line-independent issue identity used to compare review runs"
+    )
 
 
 class RefactoringSuggestion(BaseModel):
@@ -181,6 +220,45 @@ class ReviewSummary(BaseModel):
     info: int = 0
     files_analyzed: int = 0
     auto_fixable_count: int = 0
+    duplicates_collapsed: int = Field(0, description="Duplicate issues merged across review types")
+
+
+class FindingDelta(BaseModel):
+    """Findings of a review run compared with the previous run of the same MR"""
+    new_issues: List[ReviewIssue] = Field(default_factory=list)
+    persisting_issues: List[ReviewIssue] = Field(default_factory=list)
+    resolved_issues: List[ReviewIssue] = Field(default_factory=list)
+
+
+class ReviewTimings(BaseModel):
+    """Wall-time breakdown of one review by pipeline phase (seconds)"""
+    clone: float = 0.0
+    rules_load: float = 0.0
+    prompt_build: float = 0.0
+    cli: Dict[str, float] = Field(default_factory=dict, description="CLI wall time per review type")
+    queue_wait: Dict[str, float] = Field(default_factory=dict, description="Wait for a parallel slot per review type")
+    workspace_view: Dict[str, float] = Field(
+        default_factory=dict, description="Creation of the private workspace view per review type"
+    )
+    parse: float = Field(0.0, description="Parsing and validation of CLI output, summed over review types")
+    aggregate: float = 0.0
+    review: float = Field(0.0, description="Whole review execution (rules load to aggregation)")
+    post_actions: Dict[str, float] = Field(default_factory=dict, description="Post-processing time per step")
+
+    @property
+    def total(self) -> float:
+        """Clone, review execution and post-processing"""
+        return self.clone + self.review + sum(self.post_actions.values())
+
+    def flat(self) -> Dict[str, float]:
+        """Phases as flat 'phase' / 'phase.key' mapping"""
+        flat: Dict[str, float] = {}
+        for phase, value in self:
+            if isinstance(value, dict):
+                flat.update({f"{phase}.{key}": seconds for key, seconds in value.items()})
+            else:
+                flat[phase] = value
+        return flat
 
 
 class ReviewResult(BaseModel):
@@ -210,8 +288,26 @@ class ReviewResult(BaseModel):
     refactoring_mr_url: Optional[str] = Field(None, description="URL of created refactoring MR")
     refactoring_mr_iid: Optional[int] = Field(None, description="IID of created refactoring MR")
     
+    finding_delta: Optional[FindingDelta] = Field(
+        None,
+        description="New, persisting and resolved findings relative to the previous review"
+    )
+    
+    # Fail-fast (partial result)
+    stopped_early: bool = Field(False, description="Whether fail_fast stopped the review at blocking findings")
+    skipped_review_types: List[ReviewType] = Field(
+        default_factory=list,
+        description="Review types not run because the review stopped early"
+    )
+    
     # Metadata
     execution_time_seconds: float = Field(0.0, description="Time taken for review")
+    timings: ReviewTimings = Field(default_factory=ReviewTimings, description="Time per pipeline phase")
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Per review type details: agents (review type -> agent that produced it), "
+                    "json_repair (review type -> JSON repair report)"
+    )
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -224,6 +320,18 @@ class ValidationResult(BaseModel):
     warnings: List[str] = Field(default_factory=list)
 
 
+class WebhookResult(BaseModel):
+    """Outcome of a GitLab webhook event"""
+    status: str = Field(..., description="scheduled, duplicate, cancelled or ignored")
+    reason: Optional[str] = None
+
+
+class PrefetchResult(BaseModel):
+    """Outcome of a prefetch request"""
+    status: str = Field(..., description="queued, duplicate, rate_limited or queue_full")
+    pending: int = Field(0, description="Prefetches queued or running")
+
+
 # ========================
 # MR Models
 # ========================
@@ -248,6 +356,18 @@ class MRCreationResult(BaseModel):
     error: Optional[str] = None
 
 
+class InlinePublishResult(BaseModel):
+    """Result of publishing findings as inline MR discussions"""
+    drafts_created: int = 0
+    drafts_failed: int = 0  # transient failures (429, 5xx, transport); the run was rolled back
+    drafts_rejected: int = 0  # position or body refused by GitLab (4xx); skipped like findings outside the diff
+    skipped_outside_diff: int = 0
+    skipped_below_severity: int = 0
+    published: bool = False
+    error: Optional[str] = None
+    transient_error: bool = False  # error may go away on the next run (429, 5xx, transport)
+
+
 # ========================
 # Configuration Models
 # ========================
@@ -306,6 +426,103 @@ class SuccessResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+# ========================
+# Stored Results Models
+# ========================
+
+class StoredIssue(BaseModel):
+    """Issue row from the results store"""
+    id: int
+    review_id: int
+    project_id: int
+    mr_iid: int
+    file: str
+    line: Optional[int] = None
+    severity: IssueSeverity
+    category: str
+    message: str
+    suggestion: str
+    auto_fixable: bool = False
+    cwe: Optional[str] = None
+    fingerprint: Optional[str] = None
+    review_types: List[str] = Field(default_factory=list)
+
+
+class ReviewRecord(BaseModel):
+    """Review row from the results store"""
+    id: int
+    project_id: int
+    mr_iid: int
+    agent: CLIAgent
+    review_type: ReviewType
+    created_at: datetime
+    execution_time_seconds: float
+    total_issues: int
+    critical: int
+    high: int
+    medium: int
+    low: int
+    info: int
+    duplicates_collapsed: int = 0
+    fix_mr_iid: Optional[int] = None
+    refactoring_mr_iid: Optional[int] = None
+    doc_commit_sha: Optional[str] = None
+
+
+class ReviewDetail(ReviewRecord):
+    """Stored review with its findings and timings"""
+    issues: List[StoredIssue] = Field(default_factory=list)
+    refactorings: List[Dict[str, Any]] = Field(default_factory=list)
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+
+class ReviewPage(BaseModel):
+    """Keyset-paginated list of stored reviews"""
+    items: List[ReviewRecord]
+    next_cursor: Optional[int] = Field(None, description="Pass as 'cursor' to get the next page")
+
+
+class IssuePage(BaseModel):
+    """Keyset-paginated list of stored issues"""
+    items: List[StoredIssue]
+    next_cursor: Optional[int] = Field(None, description="Pass as 'cursor' to get the next page")
+
+
+class SeverityCounts(BaseModel):
+    """Issue counts by severity"""
+    total_issues: int = 0
+    critical: int = 0
+    high: int = 0
+    medium: int = 0
+    low: int = 0
+    info: int = 0
+
+
+class ProjectTotals(SeverityCounts):
+    """All-time project counters"""
+    reviews: int = 0
+
+
+class WeeklyTrendPoint(ProjectTotals):
+    """Reviews and issues of one ISO week"""
+    week_start: date = Field(..., description="Monday of the week")
+
+
+class CategoryTrend(SeverityCounts):
+    """Issues of one category over the trend window"""
+    category: str
+
+
+class ProjectTrends(BaseModel):
+    """Project quality trends (served from precomputed rollups)"""
+    project_id: int
+    totals: ProjectTotals
+    first_review_at: datetime
+    last_review_at: datetime
+    weeks: List[WeeklyTrendPoint]
+    categories: List[CategoryTrend]
+
+
 # ========================
 # Statistics Models
 # ========================
@@ -0,0 +1,170 @@
+"""
+Agent Failover
+
+Keeps a review type from waiting on a slow or failing CLI backend:
+
+- LatencyTracker learns the latency distribution of successful runs per
+  (agent, review type) from a rolling window.
+- CircuitBreaker per agent opens after consecutive failures; while open,
+  new work is routed to the other agent. After reset_seconds one trial
+  run is let through (half-open) and closes the breaker on success.
+- AgentFailover combines both for ReviewService: a run that exceeds the
+  agent's p95 latency is hedged on the other agent, and a failed run is
+  retried there (see ReviewService._run_with_failover).
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import logging
+import math
+import time
+
+from app.models import CLIAgent, ReviewType
+from app.utils.metrics import CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class LatencyTracker:
+    """Rolling latency window per (agent, review type)"""
+
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        """
+        Initialize tracker
+
+        Args:
+            window: Successful runs kept per key
+            min_samples: Runs required before a quantile is reported
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[Tuple[CLIAgent, ReviewType], Deque[float]] = {}
+
+    def record(self, agent: CLIAgent, review_type: ReviewType, seconds: float) -> None:
+        """Add latency of a successful run"""
+        key = (agent, review_type)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def quantile(self, agent: CLIAgent, review_type: ReviewType, q: float = 0.95) -> Optional[float]:
+        """Latency quantile (nearest rank), None until min_samples runs are known"""
+        samples = self._samples.get((agent, review_type))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker of one agent"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 60):
+        """
+        Initialize breaker
+
+        Args:
+            name: Agent name (metric label and logs)
+            failure_threshold: Consecutive failures that open the breaker
+            reset_seconds: Open time before a trial run is allowed
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        CIRCUIT_STATE.labels(agent=name).set(CIRCUIT_STATES["closed"])
+
+    @property
+    def state(self) -> str:
+        """closed, open or half_open"""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether new work may go to the agent (takes the single half-open trial slot)"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            CIRCUIT_STATE.labels(agent=self.name).set(CIRCUIT_STATES["half_open"])
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker"""
+        if self._opened_at is not None:
+            logger.info(f"Circuit of {self.name} closed")
+        self.failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        CIRCUIT_STATE.labels(agent=self.name).set(CIRCUIT_STATES["closed"])
+
+    def record_failure(self) -> None:
+        """Count failure; opens the breaker at the threshold or when the trial run failed"""
+        self.failures += 1
+        if self._trial_running or (self._opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning(f"Circuit of {self.name} opened after {self.failures} consecutive failures")
+            self._opened_at = time.monotonic()
+            self._trial_running = False
+            CIRCUIT_STATE.labels(agent=self.name).set(CIRCUIT_STATES["open"])
+
+    def release_trial(self) -> None:
+        """Give back the half-open trial slot of a run that was cancelled (no verdict)"""
+        self._trial_running = False
+
+
+class AgentFailover:
+    """Hedging and circuit-breaking policy across CLI agents"""
+
+    def __init__(
+        self,
+        hedge_quantile: float = 0.95,
+        min_samples: int = 20,
+        max_hedges: int = 2,
+        failure_threshold: int = 5,
+        reset_seconds: float = 60
+    ):
+        """
+        Initialize policy
+
+        Args:
+            hedge_quantile: Latency quantile after which a run is hedged
+            min_samples: Successful runs of (agent, review type) before hedging
+            max_hedges: Hedged runs in flight at once (0 disables hedging)
+            failure_threshold: Consecutive failures that open an agent's circuit
+            reset_seconds: Time before an open circuit lets a trial run through
+        """
+        self.hedge_quantile = hedge_quantile
+        self.max_hedges = max_hedges
+        self.latency = LatencyTracker(min_samples=min_samples)
+        self.breakers = {
+            agent: CircuitBreaker(agent.value, failure_threshold, reset_seconds) for agent in CLIAgent
+        }
+        self.hedges_in_flight = 0
+
+    def hedge_delay(self, agent: CLIAgent, review_type: ReviewType) -> Optional[float]:
+        """Time after which a run should be hedged, None if hedging is off or history is short"""
+        if self.max_hedges <= 0:
+            return None
+        return self.latency.quantile(agent, review_type, self.hedge_quantile)
+
+    def can_hedge(self) -> bool:
+        return self.hedges_in_flight < self.max_hedges
+
+    def record(self, agent: CLIAgent, review_type: ReviewType, seconds: Optional[float]) -> None:
+        """Record a finished run (seconds=None for a failed one)"""
+        breaker = self.breakers[agent]
+        if seconds is None:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self.latency.record(agent, review_type, seconds)
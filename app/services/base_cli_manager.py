@@ -5,13 +5,45 @@ Defines the interface that all CLI managers must implement.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from app.models import ReviewType, ReviewResult, CLIAgent
+from app.services.workspace_views import WorkspaceView, WorkspaceViewFactory
+from app.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from app.utils.blocking_io import run_blocking
+from app.utils.metrics import (
+    CLI_CANCELLATIONS,
+    CLI_DURATION,
+    CLI_RECLAIMED_CPU_SECONDS,
+    LIVE_SUBPROCESSES,
+    PARSE_DURATION,
+    QUEUE_WAIT,
+    observe_duration
+)
+from app.utils.process_group import process_group_cpu_seconds, terminate_process_group
+from app.utils.phase_timings import record_phase, timed_phase
+from app.utils.tracing import current_span, span, trace_environment, traced
 import asyncio
 import logging
+import os
+import re
+import tempfile
+import time
 
 logger = logging.getLogger(__name__)
 
+# Rate-limit errors of the model API as reported by the CLIs on stderr
+RATE_LIMIT_PATTERN = re.compile(r"\b429\b|rate[ _-]?limit|too many requests", re.IGNORECASE)
+
+
+@dataclass
+class TaskOutcome:
+    """Result of one parallel task as seen by the concurrency limit"""
+    latency: Optional[float] = None  # set for successful tasks
+    overload: Optional[str] = None  # timeout or rate_limited
+    key: str = ""  # review type
+
 
 class BaseCLIManager(ABC):
     """Abstract base class for CLI agent managers"""
@@ -19,6 +51,9 @@ class BaseCLIManager(ABC):
     # Class-level cache for system prompt
     _system_prompt_cache: Optional[str] = None
     
+    # SIGTERM -> SIGKILL delay when stopping a CLI process group
+    terminate_grace_seconds: float = 5.0
+    
     def __init__(
         self,
         model_api_url: str,
@@ -26,7 +61,9 @@ class BaseCLIManager(ABC):
         api_key: str,
         parallel_tasks: int,
         timeout_seconds: int = 300,
-        system_prompt_path: str = "prompts/system_prompt.md"
+        system_prompt_path: str = "prompts/system_prompt.md",
+        workspace_views: Optional[WorkspaceViewFactory] = None,
+        concurrency: Optional[AdaptiveConcurrencyLimiter] = None
     ):
         """
         Initialize CLI manager
@@ -38,6 +75,9 @@ class BaseCLIManager(ABC):
             parallel_tasks: Maximum number of parallel review tasks
             timeout_seconds: Timeout for each review task
             system_prompt_path: Path to system prompt file (loaded once, cached)
+            workspace_views: Gives each parallel task a private view of the checkout (shared if None)
+            concurrency: Adaptive limit shared by all reviews of this agent
+                (None: parallel_tasks per execute_parallel_reviews call)
         """
         self.model_api_url = model_api_url
         self.model_name = model_name
@@ -45,6 +85,8 @@ class BaseCLIManager(ABC):
         self.parallel_tasks = parallel_tasks
         self.timeout_seconds = timeout_seconds
         self.system_prompt_path = system_prompt_path
+        self.workspace_views = workspace_views
+        self.concurrency = concurrency
         
         # Load system prompt once (singleton pattern)
         if BaseCLIManager._system_prompt_cache is None:
@@ -95,47 +137,92 @@ class BaseCLIManager(ABC):
         repo_path: str,
         prompts: Dict[ReviewType, str],
         custom_rules: Optional[str] = None,
-        jira_context: Optional[str] = None
+        jira_context: Optional[str] = None,
+        stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        run_review: Optional[Callable[[ReviewType, str, TaskOutcome], Awaitable[Dict[str, Any]]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Execute multiple reviews in parallel with task limit
         
         Args:
-            review_types: List of review types to perform
+            review_types: List of review types to perform (slots are granted in this order)
             repo_path: Local path to cloned repository
             prompts: Mapping of review type to prompt content
             custom_rules: Custom rules content (optional)
             jira_context: JIRA task context (optional)
+            stop_when: Called with each finished result; once it returns True,
+                review types still waiting for a slot are skipped (optional)
+            run_review: Replaces execute_review; called with the review type, the
+                task's workspace path and the task's slot outcome, which it fills
+                with this agent's own latency or overload (optional, used for
+                agent failover)
             
         Returns:
-            List of review results
+            List of review results (skipped types as {"review_type": ..., "skipped": True})
             
         Note:
             Changed files are automatically determined by CLI via git diff
         """
-        semaphore = asyncio.Semaphore(self.parallel_tasks)
+        # Per-call limit unless the agent has a shared adaptive one
+        semaphore = asyncio.Semaphore(self.parallel_tasks) if self.concurrency is None else None
+        stop = asyncio.Event()
         
         async def bounded_review(review_type: ReviewType) -> Dict[str, Any]:
-            async with semaphore:
-                logger.info(f"Starting {review_type.value} review with {self.agent_type.value}")
-                try:
-                    result = await self.execute_review(
-                        review_type=review_type,
-                        repo_path=repo_path,
-                        prompt_content=prompts[review_type],
-                        custom_rules=custom_rules,
-                        jira_context=jira_context
-                    )
-                    logger.info(f"Completed {review_type.value} review")
-                    return result
-                except Exception as e:
-                    logger.error(f"Error in {review_type.value} review: {str(e)}", exc_info=True)
-                    return {
-                        "review_type": review_type.value,
-                        "error": str(e),
-                        "issues": [],
-                        "summary": {"total_issues": 0}
-                    }
+            with span("cli_review", agent=self.agent_type.value, review_type=review_type.value) as review_span:
+                queued_at = time.perf_counter()
+                async with self._task_slot(semaphore) as slot:
+                    if stop.is_set():
+                        review_span.set_attribute("status", "skipped")
+                        logger.info(f"Skipping {review_type.value} review: stopped early")
+                        return {"review_type": review_type.value, "skipped": True}
+                    started_at = time.perf_counter()
+                    QUEUE_WAIT.labels(agent=self.agent_type.value).observe(started_at - queued_at)
+                    record_phase("queue_wait", started_at - queued_at, key=review_type.value)
+                    review_span.set_attribute("queue_wait_seconds", round(started_at - queued_at, 3))
+                    logger.info(f"Starting {review_type.value} review with {self.agent_type.value}")
+                    status = "error"
+                    try:
+                        async with self.workspace(repo_path, review_type) as workspace_path:
+                            if run_review is not None:
+                                result = await run_review(review_type, workspace_path, slot)
+                            else:
+                                result = await self.execute_review(
+                                    review_type=review_type,
+                                    repo_path=workspace_path,
+                                    prompt_content=prompts[review_type],
+                                    custom_rules=custom_rules,
+                                    jira_context=jira_context
+                                )
+                        status = "ok"
+                        review_span.set_attribute("issues", len(result.get("issues", [])))
+                        logger.info(f"Completed {review_type.value} review")
+                        if stop_when is not None and not stop.is_set() and stop_when(result):
+                            logger.info(f"Stopping review after {review_type.value}: blocking findings")
+                            stop.set()
+                        return result
+                    except Exception as e:
+                        status = "timeout" if isinstance(e, TimeoutError) else "failed"
+                        if run_review is None:
+                            slot.overload = self.overload_reason(e)
+                        logger.error(f"Error in {review_type.value} review: {str(e)}", exc_info=True)
+                        return {
+                            "review_type": review_type.value,
+                            "error": str(e),
+                            "issues": [],
+                            "summary": {"total_issues": 0}
+                        }
+                    finally:
+                        elapsed = time.perf_counter() - started_at
+                        review_span.set_attribute("status", status)
+                        CLI_DURATION.labels(
+                            agent=self.agent_type.value,
+                            review_type=review_type.value,
+                            status=status
+                        ).observe(elapsed)
+                        record_phase("cli", elapsed, key=review_type.value)
+                        slot.key = review_type.value
+                        if status == "ok" and run_review is None:
+                            slot.latency = elapsed
         
         tasks = [bounded_review(rt) for rt in review_types]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -150,6 +237,160 @@ class BaseCLIManager(ABC):
             
         return valid_results
     
+    @asynccontextmanager
+    async def _task_slot(self, semaphore: Optional[asyncio.Semaphore]) -> AsyncIterator[TaskOutcome]:
+        """
+        Hold a parallel task slot (adaptive limiter, else the per-call semaphore)
+        
+        Yields:
+            Outcome the task fills in; the adaptive limiter adapts to it on exit
+        """
+        if self.concurrency is None:
+            async with semaphore:
+                yield TaskOutcome()
+            return
+        async with self.agent_slot() as outcome:
+            yield outcome
+    
+    @asynccontextmanager
+    async def agent_slot(self) -> AsyncIterator[TaskOutcome]:
+        """
+        Hold a slot of this agent's adaptive limit (no limit if there is none)
+        
+        Used for runs started outside execute_parallel_reviews, e.g. a review
+        type hedged or retried on this agent.
+        
+        Yields:
+            Outcome the run fills in; the adaptive limiter adapts to it on exit
+        """
+        outcome = TaskOutcome()
+        if self.concurrency is None:
+            yield outcome
+            return
+        started = await self.concurrency.acquire()
+        try:
+            yield outcome
+        finally:
+            self.concurrency.release(started, outcome.latency, outcome.overload, outcome.key)
+    
+    @staticmethod
+    def overload_reason(error: Exception) -> Optional[str]:
+        """Backend overload signal of a failed task: timeout, rate_limited or None"""
+        if isinstance(error, TimeoutError):
+            return "timeout"
+        if RATE_LIMIT_PATTERN.search(str(error)):
+            return "rate_limited"  # CLI stderr is part of the error message
+        return None
+    
+    @asynccontextmanager
+    async def workspace(self, repo_path: str, review_type: ReviewType) -> AsyncIterator[str]:
+        """
+        Private workspace view of the checkout for one review task
+        
+        Yields:
+            View path, or repo_path if isolation is disabled or failed
+        """
+        view = await self._create_view(repo_path, review_type)
+        if view is not None:
+            task_span = current_span()
+            if task_span is not None:
+                task_span.set_attribute("workspace_view", view.mode)
+        try:
+            yield view.path if view else repo_path
+        finally:
+            if view is not None:
+                await run_blocking(self.workspace_views.remove, view)
+    
+    async def _create_view(self, repo_path: str, review_type: ReviewType) -> Optional[WorkspaceView]:
+        """
+        Create private workspace view for one review task
+        
+        Returns:
+            View, None if isolation is disabled or failed (the task then uses the shared checkout)
+        """
+        if self.workspace_views is None:
+            return None
+        try:
+            view = await run_blocking(self.workspace_views.create, repo_path, review_type.value.lower())
+        except OSError as e:
+            logger.warning(f"Running {review_type.value} review in shared checkout: {str(e)}")
+            return None
+        record_phase("workspace_view", view.setup_seconds, key=review_type.value)
+        return view
+    
+    async def _run_cli(
+        self,
+        cmd: List[str],
+        cwd: str,
+        label: str
+    ) -> Tuple[asyncio.subprocess.Process, bytes, bytes]:
+        """
+        Run CLI in its own process group with timeout
+        
+        On timeout or cancellation of the calling task (client disconnected,
+        review superseded) the whole group, including processes spawned by
+        the CLI, is stopped with SIGTERM and then SIGKILL.
+        
+        Args:
+            cmd: Command and arguments
+            cwd: Working directory (repository)
+            label: CLI name for error messages (e.g. 'Cline')
+            
+        Returns:
+            Tuple of (finished process, stdout, stderr)
+            
+        Raises:
+            TimeoutError: If the CLI did not finish within timeout_seconds + 30
+        """
+        timeout = self.timeout_seconds + 30  # Add buffer
+        with LIVE_SUBPROCESSES.track_inprogress():
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env={**os.environ, **trace_environment()},  # Trace id for CLI-side logs
+                start_new_session=True
+            )
+            started = time.perf_counter()
+            
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                CLI_CANCELLATIONS.labels(agent=self.agent_type.value, reason="timeout").inc()
+                # Stop the group even if the caller is cancelled meanwhile
+                await asyncio.shield(terminate_process_group(process, self.terminate_grace_seconds))
+                raise TimeoutError(f"{label} CLI timed out after {self.timeout_seconds} seconds")
+            except asyncio.CancelledError:
+                # Shielded as a whole: a second cancellation (e.g. shutdown after a lost
+                # hedge race) must not leave the group running as an orphan session
+                await asyncio.shield(self._stop_cancelled_cli(process, label, started, timeout))
+                raise
+        
+        return process, stdout, stderr
+    
+    async def _stop_cancelled_cli(
+        self,
+        process: asyncio.subprocess.Process,
+        label: str,
+        started: float,
+        timeout: float
+    ) -> None:
+        """Record CPU time saved by the cancellation, then stop the CLI process group"""
+        elapsed = time.perf_counter() - started
+        try:
+            # Measured before the group is stopped: /proc entries vanish with the processes
+            cpu_seconds = await run_blocking(process_group_cpu_seconds, process.pid)
+            reclaimed = cpu_seconds / max(elapsed, 1e-3) * max(timeout - elapsed, 0.0)
+            CLI_CANCELLATIONS.labels(agent=self.agent_type.value, reason="cancelled").inc()
+            CLI_RECLAIMED_CPU_SECONDS.labels(agent=self.agent_type.value).inc(reclaimed)
+            logger.warning(
+                f"{label} CLI cancelled after {elapsed:.1f}s ({cpu_seconds:.1f} CPU-s used, "
+                f"~{reclaimed:.0f} CPU-s reclaimed), stopping process group {process.pid}"
+            )
+        finally:
+            await terminate_process_group(process, self.terminate_grace_seconds)
+    
     async def check_availability(self) -> bool:
         """
         Check if CLI tool is available and properly configured
@@ -278,6 +519,45 @@ class BaseCLIManager(ABC):
             
         return result
     
+    @staticmethod
+    def _create_io_files(prompt: str) -> Tuple[str, str]:
+        """
+        Write prompt to a temporary file and create an empty output file (blocking)
+        
+        Returns:
+            Tuple of (prompt path, output path)
+        """
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as prompt_file:
+            prompt_file.write(prompt)
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as output_file:
+            pass
+        return prompt_file.name, output_file.name
+    
+    @staticmethod
+    def _remove_io_files(*paths: str) -> None:
+        """Remove temporary files, ignoring missing ones (blocking)"""
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    
+    def _load_cli_result(self, output_path: str, stdout: bytes) -> Dict[str, Any]:
+        """
+        Read and parse CLI output file (blocking)
+        
+        Args:
+            output_path: Output file written by the CLI
+            stdout: CLI stdout (used when the CLI printed the result only there)
+            
+        Returns:
+            Parsed and validated review result
+        """
+        with open(output_path, 'r') as f:
+            output = f.read()
+        return self._parse_cli_output(output or stdout.decode())
+    
+    @traced("parse_cli_output")
     def _parse_cli_output(self, output: str) -> Dict[str, Any]:
         """
         Parse CLI output (expected to be JSON)
@@ -291,37 +571,42 @@ class BaseCLIManager(ABC):
             
         Raises:
             ValueError: If JSON cannot be parsed or is invalid
+            
+        Note:
+            CLI output often includes non-JSON text (logs, progress lines).
+            The largest embedded object shaped like a review result is used;
+            extraction is a single linear pass (see app.utils.json_extractor).
+            Broken or truncated review JSON is repaired and every complete
+            issue is kept (see app.utils.json_repair).
         """
-        import json
-        import re
+        from app.utils.json_extractor import extract_json_object, is_review_result_shaped
+        from app.utils.json_repair import repair_review_json
         from app.utils.json_validator import validate_review_result
         
-        # Try to find JSON in output
-        # Sometimes CLI outputs include non-JSON text
-        json_pattern = r'\{[\s\S]*\}'
-        match = re.search(json_pattern, output)
+        with timed_phase("parse"), observe_duration(PARSE_DURATION, stage="parse"):
+            result = extract_json_object(output)
+            
+            if result is None or not is_review_result_shaped(result):
+                repaired = repair_review_json(output)
+                if repaired is not None:
+                    logger.warning(
+                        f"Recovered CLI output by JSON repair: {repaired['metadata']['json_repair']}"
+                    )
+                    result = repaired
         
-        if match:
-            try:
-                result = json.loads(match.group(0))
-                
-                # Validate result against schema
-                is_valid, validation_errors = validate_review_result(result)
-                if not is_valid:
-                    logger.warning("CLI output validation failed:")
-                    for error in validation_errors:
-                        logger.warning(f"  - {error}")
-                    # Don't raise - allow processing but log warnings
-                    # This ensures backward compatibility and graceful degradation
-                
-                return result
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from CLI output: {str(e)}")
-                logger.debug(f"CLI output: {output[:500]}")
-                raise ValueError(f"Invalid JSON in CLI output: {str(e)}")
-        else:
+        if result is None:
             logger.error("No JSON found in CLI output")
-            logger.debug(f"CLI output: {output[:500]}")
+            logger.debug("CLI output: %.500s", output)
             raise ValueError("No JSON found in CLI output")
-
-
+        
+        # Validate result against schema
+        with timed_phase("parse"), observe_duration(PARSE_DURATION, stage="validate"):
+            is_valid, validation_errors = validate_review_result(result)
+        if not is_valid:
+            logger.warning("CLI output validation failed:")
+            for error in validation_errors:
+                logger.warning(f"  - {error}")
+            # Don't raise - allow processing but log warnings
+            # This ensures backward compatibility and graceful degradation
+        
+        return result
@@ -7,10 +7,8 @@ Supports 5 parallel review tasks.
 
 from app.services.base_cli_manager import BaseCLIManager
 from app.models import ReviewType, CLIAgent
+from app.utils.blocking_io import run_blocking
 from typing import List, Dict, Any, Optional
-import asyncio
-import tempfile
-import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,14 +58,8 @@ class ClineCLIManager(BaseCLIManager):
             jira_context=jira_context
         )
         
-        # Create temporary file for prompt
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as prompt_file:
-            prompt_file.write(processed_prompt)
-            prompt_path = prompt_file.name
-        
-        # Create temporary file for output
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as output_file:
-            output_path = output_file.name
+        # Create temporary files for prompt and output (off the event loop)
+        prompt_path, output_path = await run_blocking(self._create_io_files, processed_prompt)
         
         try:
             # Build Cline CLI command
@@ -85,25 +77,10 @@ class ClineCLIManager(BaseCLIManager):
                 '--timeout', str(self.timeout_seconds)
             ]
             
-            logger.debug(f"Executing Cline CLI: {' '.join(cmd[:6])}...")  # Don't log API key
-            
-            # Execute CLI
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=repo_path
-            )
+            logger.debug("Executing Cline CLI: %s...", ' '.join(cmd[:6]))  # Don't log API key
             
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.timeout_seconds + 30  # Add buffer
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                raise TimeoutError(f"Cline CLI timed out after {self.timeout_seconds} seconds")
+            # Execute CLI (own process group, stopped as a whole on timeout or cancellation)
+            process, stdout, stderr = await self._run_cli(cmd, cwd=repo_path, label="Cline")
             
             # Check return code
             if process.returncode != 0:
@@ -111,9 +88,8 @@ class ClineCLIManager(BaseCLIManager):
                 logger.error(f"Cline CLI failed: {error_msg}")
                 raise RuntimeError(f"Cline CLI failed with code {process.returncode}: {error_msg}")
             
-            # Read output file
-            with open(output_path, 'r') as f:
-                result = json.load(f)
+            # Read and parse output file (CLI may also print the result to stdout only)
+            result = await run_blocking(self._load_cli_result, output_path, stdout)
             
             # Add review type if not present
             if 'review_type' not in result:
@@ -123,15 +99,7 @@ class ClineCLIManager(BaseCLIManager):
             
         finally:
             # Cleanup temporary files
-            import os
-            try:
-                os.unlink(prompt_path)
-            except:
-                pass
-            try:
-                os.unlink(output_path)
-            except:
-                pass
+            await run_blocking(self._remove_io_files, prompt_path, output_path)
     
     def get_review_type_distribution(self, review_types: List[ReviewType]) -> List[List[ReviewType]]:
         """
@@ -9,7 +9,7 @@ Loads code review rules with priority:
 
 import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,8 @@ class CustomRulesLoader:
             default_rules_path: Path to default rules directory
         """
         self.default_rules_path = default_rules_path
+        # (file name, mtime_ns) signature of the rules directory and its loaded rules
+        self._default_rules_cache: Optional[Tuple[Tuple[Tuple[str, int], ...], Dict[str, str]]] = None
         
     def load_rules(
         self,
@@ -73,7 +75,7 @@ class CustomRulesLoader:
     
     def _load_default_rules(self, language: str) -> Dict[str, str]:
         """
-        Load default rules for language
+        Load default rules for language (cached until a rule file changes)
         
         Args:
             language: Programming language
@@ -90,11 +92,13 @@ class CustomRulesLoader:
             logger.error(f"Default rules directory not found: {rules_dir}")
             return {}
         
+        rule_files = sorted(f for f in rules_dir.glob("*.md") if f.name != "README.md")
+        signature = tuple((f.name, f.stat().st_mtime_ns) for f in rule_files)
+        if self._default_rules_cache is not None and self._default_rules_cache[0] == signature:
+            return dict(self._default_rules_cache[1])
+        
         rules = {}
-        for rule_file in rules_dir.glob("*.md"):
-            if rule_file.name == "README.md":
-                continue
-            
+        for rule_file in rule_files:
             category = rule_file.stem  # e.g., 'error_detection'
             try:
                 with open(rule_file, 'r', encoding='utf-8') as f:
@@ -102,7 +106,8 @@ class CustomRulesLoader:
             except Exception as e:
                 logger.error(f"Failed to load default rule file {rule_file}: {str(e)}")
         
-        return rules
+        self._default_rules_cache = (signature, rules)
+        return dict(rules)
     
     def _load_project_rules(self, repo_path: str) -> Dict[str, str]:
         """
@@ -116,7 +121,7 @@ class CustomRulesLoader:
         """
         project_rules_dir = Path(repo_path) / ".project-rules"
         if not project_rules_dir.exists():
-            logger.debug(f"No project-specific rules found in {repo_path}")
+            logger.debug("No project-specific rules found in %s", repo_path)
             return {}
         
         rules = {}
@@ -168,7 +173,7 @@ class CustomRulesLoader:
             # Normalize category name to snake_case
             category = category_name.strip().lower().replace(' ', '_')
             rules[category] = content.strip()
-            logger.debug(f"Parsed Confluence rule category: {category}")
+            logger.debug("Parsed Confluence rule category: %s", category)
         
         return rules
     
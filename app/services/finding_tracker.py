@@ -0,0 +1,250 @@
+"""
+Finding Tracker
+
+Gives review findings identities that survive line shifts and compares each
+review run of a merge request with the previous one.
+
+An issue fingerprint hashes the normalized file path, the normalized code
+snippet (message words when there is no snippet), the signature of the
+enclosing method and the category family - but never the line number.
+The method is the nearest declaration at or above the issue line in the
+reviewed checkout, so it does not depend on where diff hunks start.
+
+Fingerprints of the latest run are kept per MR in a local SQLite store;
+each run is split into new, persisting and resolved findings. The caller
+saves the current run only once its findings are published, otherwise
+unpublished new findings would count as persisting in the next run.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import logging
+import re
+
+from app.models import FindingDelta, ReviewIssue
+from app.services.issue_deduplicator import IssueDeduplicator
+from app.utils.blocking_io import run_blocking
+from app.utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_WORD = re.compile(r'[a-z0-9_]+')
+# Modifiers/return type words, then the name followed by '('
+_DECLARATION = re.compile(r'^(?:[\w$<>\[\],?@]+\s+)*([A-Za-z_$][\w$]*)\s*\(')
+_NOT_DECLARATION = {
+    "if", "for", "while", "switch", "catch", "return", "new", "else", "do", "try",
+    "throw", "synchronized", "await", "yield", "assert", "elif", "with", "except",
+}
+
+_deduplicator = IssueDeduplicator()
+
+
+def normalize_snippet(snippet: Optional[str]) -> str:
+    """Collapse whitespace so re-indentation does not change the fingerprint"""
+    return _WHITESPACE.sub(" ", snippet).strip() if snippet else ""
+
+
+def normalize_signature(declaration: Optional[str]) -> str:
+    """Normalize declaration line ('public User find(Long id) {' -> 'public User find(Long id)')"""
+    if not declaration:
+        return ""
+    return _WHITESPACE.sub(" ", declaration).strip().rstrip("{:").strip()
+
+
+def declaration_signature(line: str) -> Optional[str]:
+    """Normalized signature if the source line declares a method/function, else None"""
+    stripped = line.strip()
+    match = _DECLARATION.match(stripped)
+    if match is None or not stripped.endswith(("{", ":")):
+        return None
+    words = stripped[:match.start(1)].split() + [match.group(1)]
+    if any(word in _NOT_DECLARATION for word in words):
+        return None
+    return normalize_signature(stripped)
+
+
+def enclosing_method(source_lines: Optional[List[str]], line: Optional[int]) -> str:
+    """Signature of the nearest declaration at or above line (1-based), '' if there is none"""
+    if not source_lines or line is None:
+        return ""
+    for source_line in reversed(source_lines[:min(line, len(source_lines))]):
+        signature = declaration_signature(source_line)
+        if signature is not None:
+            return signature
+    return ""
+
+
+def read_source_lines(repo_path: str, file: str) -> Optional[List[str]]:
+    """Lines of a checkout file, None if it is missing, unreadable or outside the checkout"""
+    root = Path(repo_path).resolve()
+    path = (root / IssueDeduplicator.normalize_file(file).lstrip("/")).resolve()
+    if root not in path.parents:
+        return None
+    try:
+        return path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return None
+
+
+def compute_fingerprint(issue: ReviewIssue, method_signature: str = "") -> str:
+    """
+    Compute line-independent issue fingerprint
+
+    Args:
+        issue: Review issue
+        method_signature: Normalized enclosing method signature ('' if unknown)
+
+    Returns:
+        Hex digest (40 chars)
+    """
+    anchor = normalize_snippet(issue.code_snippet)
+    if not anchor:
+        anchor = " ".join(sorted(set(_WORD.findall(issue.message.lower()))))
+    parts = (
+        IssueDeduplicator.normalize_file(issue.file),
+        anchor,
+        method_signature,
+        _deduplicator.category_family(issue.category),
+    )
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class FingerprintStore(SQLiteStore):
+    """Local store of the latest finding fingerprints per merge request"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS issue_fingerprints (
+        project_id INTEGER NOT NULL,
+        mr_iid INTEGER NOT NULL,
+        fingerprint TEXT NOT NULL,
+        issue_json TEXT NOT NULL,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL,
+        PRIMARY KEY (project_id, mr_iid, fingerprint)
+    );
+    """
+
+    def load(self, project_id: int, mr_iid: int) -> Dict[str, ReviewIssue]:
+        """
+        Get findings of the previous run
+
+        Returns:
+            Dict mapping fingerprint to stored issue
+        """
+        rows = self._fetchall(
+            "SELECT fingerprint, issue_json FROM issue_fingerprints WHERE project_id = ? AND mr_iid = ?",
+            (project_id, mr_iid)
+        )
+        return {row["fingerprint"]: ReviewIssue.model_validate_json(row["issue_json"]) for row in rows}
+
+    def replace(self, project_id: int, mr_iid: int, issues: Dict[str, ReviewIssue]) -> None:
+        """
+        Replace stored findings with the current run (first_seen is preserved)
+
+        Args:
+            project_id: GitLab project ID
+            mr_iid: MR IID
+            issues: Dict mapping fingerprint to current issue
+        """
+        now = datetime.utcnow().isoformat()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS current_fingerprints (fingerprint TEXT PRIMARY KEY)"
+            )
+            conn.execute("DELETE FROM current_fingerprints")
+            conn.executemany(
+                "INSERT INTO current_fingerprints (fingerprint) VALUES (?)",
+                [(fingerprint,) for fingerprint in issues]
+            )
+            conn.execute(
+                "DELETE FROM issue_fingerprints WHERE project_id = ? AND mr_iid = ? "
+                "AND fingerprint NOT IN (SELECT fingerprint FROM current_fingerprints)",
+                (project_id, mr_iid)
+            )
+            conn.executemany(
+                "INSERT INTO issue_fingerprints "
+                "(project_id, mr_iid, fingerprint, issue_json, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (project_id, mr_iid, fingerprint) DO UPDATE SET "
+                "issue_json = excluded.issue_json, last_seen = excluded.last_seen",
+                [
+                    (project_id, mr_iid, fingerprint, issue.model_dump_json(), now, now)
+                    for fingerprint, issue in issues.items()
+                ]
+            )
+
+
+class FindingTracker:
+    """Splits review findings into new, persisting and resolved"""
+
+    def __init__(self, store: FingerprintStore):
+        """
+        Initialize tracker
+
+        Args:
+            store: Fingerprint store
+        """
+        self.store = store
+
+    def fingerprint_issues(self, issues: List[ReviewIssue], repo_path: Optional[str] = None) -> None:
+        """
+        Set fingerprint on every issue (blocking: reads the checkout)
+
+        Must run before the checkout is modified (documentation commit),
+        as issue lines refer to the reviewed revision.
+
+        Args:
+            issues: Issues of the current run
+            repo_path: Reviewed checkout for method signatures (optional)
+        """
+        sources: Dict[str, Optional[List[str]]] = {}
+        for issue in issues:
+            signature = ""
+            if repo_path is not None:
+                if issue.file not in sources:
+                    sources[issue.file] = read_source_lines(repo_path, issue.file)
+                signature = enclosing_method(sources[issue.file], issue.line)
+            issue.fingerprint = compute_fingerprint(issue, signature)
+
+    async def compare(self, project_id: int, mr_iid: int, issues: List[ReviewIssue]) -> FindingDelta:
+        """
+        Compare fingerprinted findings with the previous run (nothing is stored)
+
+        Args:
+            project_id: GitLab project ID
+            mr_iid: MR IID
+            issues: Issues of the current run (after fingerprint_issues)
+
+        Returns:
+            FindingDelta with new, persisting and resolved issues
+        """
+        previous = await run_blocking(self.store.load, project_id, mr_iid)
+        current = {issue.fingerprint for issue in issues}
+
+        delta = FindingDelta(
+            new_issues=[i for i in issues if i.fingerprint not in previous],
+            persisting_issues=[i for i in issues if i.fingerprint in previous],
+            resolved_issues=[issue for fp, issue in previous.items() if fp not in current],
+        )
+        logger.info(
+            f"MR !{mr_iid} findings: {len(delta.new_issues)} new, "
+            f"{len(delta.persisting_issues)} persisting, {len(delta.resolved_issues)} resolved"
+        )
+        return delta
+
+    async def save(self, project_id: int, mr_iid: int, issues: List[ReviewIssue]) -> None:
+        """
+        Store fingerprinted findings as the MR's latest run (call once they are published)
+
+        Args:
+            project_id: GitLab project ID
+            mr_iid: MR IID
+            issues: Issues of the current run (first issue wins on fingerprint collision)
+        """
+        current: Dict[str, ReviewIssue] = {}
+        for issue in issues:
+            current.setdefault(issue.fingerprint, issue)
+        await run_blocking(self.store.replace, project_id, mr_iid, current)
@@ -3,35 +3,88 @@ Git Repository Manager
 
 Handles local git operations: cloning, branching, committing.
 Minimal GitLab API usage - core logic for repository interaction.
+
+With a workspace pool (pool_size > 0) checkouts are kept per project after
+a review: the next review of the project leases one, fetches and runs
+`git checkout --force` to the MR head (only differing files are written),
+and returns it after `git reset --hard` + `git clean -ffdx`. Each project
+keeps at most pool_size idle workspaces; above pool_projects projects the
+least recently used project's workspaces are removed. prefetch() fetches
+MR branches into an idle workspace (or clones one into the pool) before
+the review arrives.
 """
 
 import os
+import secrets
 import shutil
 import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set
 import logging
+import time
+
+from app.services.workspace_janitor import WorkspaceJanitor
+from app.utils.blocking_io import run_blocking
+from app.utils.metrics import (
+    GIT_BYTES,
+    GIT_DURATION,
+    LIVE_SUBPROCESSES,
+    WORKSPACE_POOL_LEASES,
+    git_received_bytes,
+    observe_duration
+)
+from app.utils.process_group import terminate_process_group
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+LOW_PRIORITY_NICENESS = 10
+
+
+@dataclass
+class _Lease:
+    """Workspace handed out to a running review"""
+    project_id: int
+    review_key: str
+    pooled: bool
+
 
 class GitRepositoryManager:
     """Manager for git repository operations"""
     
-    def __init__(self, work_dir: str = "/tmp/review"):
+    def __init__(
+        self,
+        work_dir: str = "/tmp/review",
+        janitor: Optional[WorkspaceJanitor] = None,
+        pool_size: int = 0,
+        pool_projects: int = 10
+    ):
         """
         Initialize repository manager
         
         Args:
             work_dir: Base directory for cloned repositories
+            janitor: Workspace janitor for deferred deletion (checkouts are deleted inline if None)
+            pool_size: Idle workspaces kept per project for reuse (0 disables the pool)
+            pool_projects: Projects with pooled workspaces (least recently used is evicted)
         """
         self.work_dir = Path(work_dir)
         self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.janitor = janitor
+        self.pool_size = pool_size
+        self.pool_projects = pool_projects
+        
+        # project_id -> idle workspaces (last = most recently returned), in project LRU order
+        self._pool: "OrderedDict[int, List[Path]]" = OrderedDict()
+        self._leases: Dict[str, _Lease] = {}
         
         # Track active reviews to prevent concurrent reviews of same MR
         self._active_reviews: Set[str] = set()
         self._review_lock = asyncio.Lock()
         
+    @traced("clone_repository")
     async def clone_repository(
         self,
         clone_url: str,
@@ -71,25 +124,59 @@ class GitRepositoryManager:
             self._active_reviews.add(review_key)
             logger.info(f"Registered active review: {review_key}")
         
-        # Create unique directory for this MR
-        repo_dir = self.work_dir / f"project-{project_id}-mr-{mr_iid}"
-        
-        # Clean up if exists (from previous failed review)
-        if repo_dir.exists():
-            logger.info(f"Removing existing repository at {repo_dir}")
-            shutil.rmtree(repo_dir)
+        repo_dir: Optional[Path] = None
+        try:
+            # Reuse an idle workspace of the project if the pool has one
+            if self.pool_size:
+                pooled_dir = await self._lease_pooled(project_id, clone_url, branch, target_branch)
+                if pooled_dir is not None:
+                    self._leases[str(pooled_dir)] = _Lease(project_id, review_key, pooled=True)
+                    return str(pooled_dir)
+                repo_dir = self.work_dir / f"project-{project_id}-pool-{secrets.token_hex(4)}"
+            else:
+                # Create unique directory for this MR
+                repo_dir = self.work_dir / f"project-{project_id}-mr-{mr_iid}"
+            
+            # Clean up if exists (from previous failed review)
+            if repo_dir.exists():
+                logger.info(f"Removing existing repository at {repo_dir}")
+                await self._remove_workspace(str(repo_dir))
+            if self.janitor:
+                self.janitor.mark_active(str(repo_dir))
+            
+            await self._clone_into(repo_dir, clone_url, branch, target_branch)
+        except BaseException:
+            # Failed or cancelled (e.g. superseded by a newer push): nothing was leased,
+            # so the caller has no path to clean up and the MR must not stay locked
+            self._active_reviews.discard(review_key)
+            logger.info(f"Released active review after failed clone: {review_key}")
+            if repo_dir is not None and (self.janitor or repo_dir.exists()):
+                # Partial checkout would otherwise stay protected from eviction
+                await self._remove_workspace(str(repo_dir))
+            raise
+        
+        self._leases[str(repo_dir)] = _Lease(project_id, review_key, pooled=bool(self.pool_size))
+        return str(repo_dir)
+    
+    async def _clone_into(
+        self,
+        repo_dir: Path,
+        clone_url: str,
+        branch: str,
+        target_branch: str,
+        low_priority: bool = False
+    ) -> None:
+        """
+        Clone source branch into repo_dir and fetch target branch for diff comparison
         
+        Raises:
+            RuntimeError: If the clone fails
+        """
         # Clone source branch
         logger.info(f"Cloning {branch} to {repo_dir}")
-        cmd = ['git', 'clone', '--branch', branch, '--single-branch', clone_url, str(repo_dir)]
-        
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        cmd = ['git', 'clone', '--progress', '--branch', branch, '--single-branch', clone_url, str(repo_dir)]
         
-        stdout, stderr = await process.communicate()
+        process, stdout, stderr = await self._run_transfer("clone", cmd, low_priority=low_priority)
         
         if process.returncode != 0:
             error_msg = stderr.decode()
@@ -101,26 +188,235 @@ class GitRepositoryManager:
         # Fetch target branch for diff comparison
         logger.info(f"Fetching {target_branch} for comparison")
         cmd = [
-            'git', 'fetch', 'origin',
+            'git', 'fetch', '--progress', 'origin',
             f'{target_branch}:refs/remotes/origin/{target_branch}'
         ]
         
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=str(repo_dir)
+        process, stdout, stderr = await self._run_transfer(
+            "fetch", cmd, cwd=str(repo_dir), low_priority=low_priority
         )
         
-        stdout, stderr = await process.communicate()
-        
         if process.returncode != 0:
             # Not critical - can work without target branch in some cases
             logger.warning(f"Failed to fetch {target_branch}: {stderr.decode()}")
         else:
             logger.info(f"Successfully fetched {target_branch} for comparison")
+    
+    async def _lease_pooled(
+        self,
+        project_id: int,
+        clone_url: str,
+        branch: str,
+        target_branch: str
+    ) -> Optional[Path]:
+        """
+        Take an idle workspace of the project and check out the MR head
         
-        return str(repo_dir)
+        Returns:
+            Workspace path, None if the project has no usable idle workspace
+        """
+        idle = self._pool.get(project_id, [])
+        while idle:
+            workspace = idle.pop()
+            if not self._claim_pooled(workspace):
+                continue  # evicted by the janitor meanwhile
+            try:
+                await self._refresh_workspace(workspace, clone_url, branch, target_branch)
+            except asyncio.CancelledError:
+                await self._remove_workspace(str(workspace))  # may be half-fetched
+                raise
+            except Exception as e:
+                logger.warning(f"Pooled workspace {workspace} not reusable, discarding: {str(e)}")
+                await self._remove_workspace(str(workspace))
+                continue
+            WORKSPACE_POOL_LEASES.labels(outcome="hit").inc()
+            logger.info(f"Reusing pooled workspace {workspace} for {branch}")
+            return workspace
+        WORKSPACE_POOL_LEASES.labels(outcome="miss").inc()
+        return None
+    
+    def _claim_pooled(self, workspace: Path) -> bool:
+        """
+        Mark idle pooled workspace active before using it
+        
+        Returns:
+            False if the janitor evicted it meanwhile
+        """
+        if self.janitor is None:
+            return workspace.exists()
+        # Marked first: the janitor re-checks the active set before each eviction,
+        # so a workspace that still exists now stays in place
+        self.janitor.mark_active(str(workspace))
+        if workspace.exists():
+            return True
+        self.janitor.discard(str(workspace))  # drop the bookkeeping of the evicted path
+        return False
+    
+    async def _refresh_workspace(
+        self,
+        workspace: Path,
+        clone_url: str,
+        branch: str,
+        target_branch: str
+    ) -> None:
+        """Fetch source and target branch and force-checkout the source branch head"""
+        await self._fetch_branches(workspace, clone_url, branch, target_branch)
+        
+        # Only files differing from the previous checkout are written
+        with observe_duration(GIT_DURATION, operation="checkout"):
+            await self._run_git_command(
+                ['git', 'checkout', '--force', '-B', branch, f'origin/{branch}'], str(workspace), timeout=300
+            )
+    
+    async def _fetch_branches(
+        self,
+        workspace: Path,
+        clone_url: str,
+        branch: str,
+        target_branch: str,
+        low_priority: bool = False
+    ) -> None:
+        """Fetch source and target branch into remote-tracking refs of a workspace"""
+        cwd = str(workspace)
+        await self._run_git_command(['git', 'remote', 'set-url', 'origin', clone_url], cwd)
+        cmd = [
+            'git', 'fetch', '--progress', 'origin',
+            f'+refs/heads/{branch}:refs/remotes/origin/{branch}',
+            f'+refs/heads/{target_branch}:refs/remotes/origin/{target_branch}'
+        ]
+        process, stdout, stderr = await self._run_transfer("fetch", cmd, cwd=cwd, low_priority=low_priority)
+        if process.returncode != 0:
+            raise RuntimeError(f"Failed to fetch {branch}: {stderr.decode()}")
+    
+    async def prefetch(
+        self,
+        clone_url: str,
+        project_id: int,
+        branch: str,
+        target_branch: str
+    ) -> str:
+        """
+        Fetch MR branches into an idle pooled workspace ahead of the review (low priority)
+        
+        The project's most recently used idle workspace is updated; if the
+        project has none, a new one is cloned into the pool. The review that
+        leases the workspace then finds the objects locally.
+        
+        Args:
+            clone_url: Git clone URL with authentication
+            branch: MR source branch
+            project_id: Project ID
+            target_branch: MR target branch
+            
+        Returns:
+            "fetched", "cloned" or "skipped" (workspace pool disabled)
+            
+        Raises:
+            RuntimeError: If fetch or clone fails
+        """
+        if not self.pool_size:
+            return "skipped"
+        
+        idle = self._pool.get(project_id, [])
+        while idle:
+            # Taken out of the pool while fetching, so no review leases it half-updated
+            workspace = idle.pop()
+            if not self._claim_pooled(workspace):
+                continue
+            try:
+                await self._fetch_branches(workspace, clone_url, branch, target_branch, low_priority=True)
+            except BaseException:
+                # Failed or cancelled (prefetcher stopped): the workspace is out of the
+                # pool and marked active, so it would otherwise never be evicted
+                await self._remove_workspace(str(workspace))
+                raise
+            await self._add_to_pool(project_id, workspace)
+            return "fetched"
+        
+        workspace = self.work_dir / f"project-{project_id}-pool-{secrets.token_hex(4)}"
+        if self.janitor:
+            self.janitor.mark_active(str(workspace))
+        try:
+            await self._clone_into(workspace, clone_url, branch, target_branch, low_priority=True)
+        except BaseException:
+            if self.janitor or workspace.exists():
+                await self._remove_workspace(str(workspace))
+            raise
+        await self._add_to_pool(project_id, workspace)
+        return "cloned"
+    
+    async def _return_to_pool(self, project_id: int, workspace: Path) -> None:
+        """Reset and clean workspace and keep it for the next review of the project"""
+        try:
+            with observe_duration(GIT_DURATION, operation="reset"):
+                await self._run_git_command(['git', 'reset', '--hard'], str(workspace), timeout=300)
+                await self._run_git_command(['git', 'clean', '-ffdx'], str(workspace), timeout=300)
+        except Exception as e:
+            logger.warning(f"Failed to reset workspace {workspace}, discarding: {str(e)}")
+            await self._remove_workspace(str(workspace))
+            return
+        await self._add_to_pool(project_id, workspace)
+    
+    async def _add_to_pool(self, project_id: int, workspace: Path) -> None:
+        """Keep clean workspace as idle, within pool_size and pool_projects limits"""
+        idle = self._pool.setdefault(project_id, [])
+        self._pool.move_to_end(project_id)
+        if len(idle) >= self.pool_size:
+            await self._remove_workspace(str(workspace))
+        else:
+            idle.append(workspace)
+            if self.janitor:
+                self.janitor.mark_idle(str(workspace))
+            logger.info(f"Returned workspace {workspace} to pool of project {project_id}")
+        
+        while len(self._pool) > self.pool_projects:
+            evicted_project, workspaces = self._pool.popitem(last=False)
+            for evicted in workspaces:
+                await self._remove_workspace(str(evicted))
+            logger.info(f"Evicted {len(workspaces)} pooled workspaces of project {evicted_project}")
+    
+    async def _run_transfer(
+        self,
+        operation: str,
+        cmd: List[str],
+        cwd: Optional[str] = None,
+        low_priority: bool = False
+    ) -> Tuple[asyncio.subprocess.Process, bytes, bytes]:
+        """
+        Run git clone/fetch and record duration and received bytes
+        
+        Args:
+            operation: Metric label ('clone' or 'fetch')
+            cmd: Command and arguments (with --progress so git reports bytes)
+            cwd: Working directory (optional)
+            low_priority: Run under `nice` so reviews get the CPU first (prefetch)
+            
+        Returns:
+            Tuple of (finished process, stdout, stderr)
+        """
+        if low_priority and shutil.which('nice'):
+            cmd = ['nice', '-n', str(LOW_PRIORITY_NICENESS), *cmd]
+        start = time.perf_counter()
+        with LIVE_SUBPROCESSES.track_inprogress():
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                start_new_session=True  # git spawns remote helpers and index-pack
+            )
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                # Stop the group even if the caller is cancelled again meanwhile
+                await asyncio.shield(terminate_process_group(process))
+                raise
+        GIT_DURATION.labels(operation=operation).observe(time.perf_counter() - start)
+        
+        received = git_received_bytes(stderr.decode(errors='replace'))
+        if received is not None:
+            GIT_BYTES.labels(operation=operation).observe(received)
+        return process, stdout, stderr
     
     async def get_changed_files(
         self,
@@ -168,16 +464,16 @@ class GitRepositoryManager:
         Returns:
             List of source file paths
         """
-        source_files = []
         repo_pathlib = Path(repo_path)
         
-        # Look for Java files in src/
-        src_dir = repo_pathlib / "src"
-        if src_dir.exists():
-            for java_file in src_dir.rglob("*.java"):
-                relative_path = java_file.relative_to(repo_pathlib)
-                source_files.append(str(relative_path))
+        def scan() -> List[str]:
+            # Look for Java files in src/
+            src_dir = repo_pathlib / "src"
+            if not src_dir.exists():
+                return []
+            return [str(java_file.relative_to(repo_pathlib)) for java_file in src_dir.rglob("*.java")]
         
+        source_files = await run_blocking(scan)
         logger.info(f"Found {len(source_files)} source files (fallback)")
         return source_files
     
@@ -288,22 +584,27 @@ class GitRepositoryManager:
         Returns:
             Tuple of (stdout, stderr)
         """
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=cwd
-        )
-        
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
+        with LIVE_SUBPROCESSES.track_inprogress():
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd
             )
-        except asyncio.TimeoutError:
-            process.kill()
-            await process.wait()
-            raise TimeoutError(f"Git command timed out: {' '.join(cmd)}")
+            
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise TimeoutError(f"Git command timed out: {' '.join(cmd)}")
+            except asyncio.CancelledError:
+                process.kill()
+                await process.wait()
+                raise
         
         if process.returncode != 0:
             raise RuntimeError(f"Git command failed: {stderr.decode()}")
@@ -317,15 +618,19 @@ class GitRepositoryManager:
         Args:
             repo_path: Path to repository
         """
-        # Extract project_id and mr_iid from repo_path
-        # Format: /tmp/review/project-{project_id}-mr-{mr_iid}
+        lease = self._leases.pop(repo_path, None)
         try:
-            path_parts = Path(repo_path).name.split('-')
-            if len(path_parts) >= 4 and path_parts[0] == 'project' and path_parts[2] == 'mr':
-                project_id = path_parts[1]
-                mr_iid = path_parts[3]
-                review_key = f"{project_id}-{mr_iid}"
-                
+            if lease is not None:
+                review_key = lease.review_key
+            else:
+                # Extract project_id and mr_iid from repo_path
+                # Format: /tmp/review/project-{project_id}-mr-{mr_iid}
+                review_key = None
+                path_parts = Path(repo_path).name.split('-')
+                if len(path_parts) >= 4 and path_parts[0] == 'project' and path_parts[2] == 'mr':
+                    review_key = f"{path_parts[1]}-{path_parts[3]}"
+            
+            if review_key:
                 # Remove from active reviews
                 async with self._review_lock:
                     if review_key in self._active_reviews:
@@ -334,12 +639,22 @@ class GitRepositoryManager:
         except Exception as e:
             logger.warning(f"Failed to extract review key from path {repo_path}: {str(e)}")
         
-        # Clean up directory
+        # Return pooled workspace or clean up directory
         if os.path.exists(repo_path):
             try:
-                shutil.rmtree(repo_path)
-                logger.info(f"Cleaned up repository: {repo_path}")
+                if lease is not None and lease.pooled:
+                    await self._return_to_pool(lease.project_id, Path(repo_path))
+                else:
+                    await self._remove_workspace(repo_path)
+                    logger.info(f"Cleaned up repository: {repo_path}")
             except Exception as e:
                 logger.error(f"Failed to cleanup repository {repo_path}: {str(e)}")
+    
+    async def _remove_workspace(self, path: str) -> None:
+        """Hand workspace to the janitor (rename into trash) or delete it off the event loop"""
+        if self.janitor:
+            self.janitor.discard(path)
+        else:
+            await run_blocking(shutil.rmtree, path)
 
 
@@ -9,6 +9,8 @@ from typing import List, Dict, Any, Optional
 import logging
 import httpx
 
+from app.utils.metrics import timed_gitlab_call
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +32,7 @@ class GitLabService:
             "Content-Type": "application/json"
         }
         
+    @timed_gitlab_call("GET merge_requests/:iid")
     async def get_merge_request(
         self,
         project_id: int,
@@ -52,6 +55,7 @@ class GitLabService:
             response.raise_for_status()
             return response.json()
     
+    @timed_gitlab_call("GET projects/:id")
     async def get_project(self, project_id: int) -> Dict[str, Any]:
         """
         Get project details
@@ -69,6 +73,7 @@ class GitLabService:
             response.raise_for_status()
             return response.json()
     
+    @timed_gitlab_call("GET merge_requests/:iid/changes")
     async def get_mr_changes(
         self,
         project_id: int,
@@ -92,6 +97,7 @@ class GitLabService:
             data = response.json()
             return data.get('changes', [])
     
+    @timed_gitlab_call("POST merge_requests/:iid/notes")
     async def post_mr_comment(
         self,
         project_id: int,
@@ -121,7 +127,173 @@ class GitLabService:
             )
             response.raise_for_status()
             return response.json()
-    
+
+    @timed_gitlab_call("PUT merge_requests/:iid/notes/:id")
+    async def update_mr_comment(
+        self,
+        project_id: int,
+        mr_iid: int,
+        note_id: int,
+        comment: str
+    ) -> Dict[str, Any]:
+        """
+        Update existing merge request comment
+
+        Args:
+            project_id: Project ID
+            mr_iid: MR IID
+            note_id: Note ID returned by post_mr_comment()
+            comment: New comment text (markdown)
+
+        Returns:
+            Updated note data
+        """
+        url = f"{self.api_url}/projects/{project_id}/merge_requests/{mr_iid}/notes/{note_id}"
+        payload = {"body": comment}
+
+        async with httpx.AsyncClient() as client:
+            response = await client.put(
+                url,
+                headers=self.headers,
+                json=payload,
+                timeout=30
+            )
+            response.raise_for_status()
+            return response.json()
+
+    @timed_gitlab_call("POST merge_requests/:iid/draft_notes")
+    async def create_draft_note(
+        self,
+        project_id: int,
+        mr_iid: int,
+        note: str,
+        position: Optional[Dict[str, Any]] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
+        """
+        Create draft note (unpublished review comment) on merge request
+
+        Args:
+            project_id: Project ID
+            mr_iid: MR IID
+            note: Note text (markdown)
+            position: Diff position (base_sha, head_sha, start_sha, paths, lines)
+            client: Shared HTTP client for batch operations (optional)
+
+        Returns:
+            Created draft note data
+        """
+        url = f"{self.api_url}/projects/{project_id}/merge_requests/{mr_iid}/draft_notes"
+        payload: Dict[str, Any] = {"note": note}
+        if position:
+            payload["position"] = position
+
+        if client is not None:
+            response = await client.post(url, headers=self.headers, json=payload, timeout=30)
+            response.raise_for_status()
+            return response.json()
+
+        async with httpx.AsyncClient() as own_client:
+            response = await own_client.post(url, headers=self.headers, json=payload, timeout=30)
+            response.raise_for_status()
+            return response.json()
+
+    @timed_gitlab_call("GET merge_requests/:iid/draft_notes")
+    async def list_draft_notes(
+        self,
+        project_id: int,
+        mr_iid: int,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List pending draft notes of the current user on merge request (all pages)
+
+        Args:
+            project_id: Project ID
+            mr_iid: MR IID
+            client: Shared HTTP client for batch operations (optional)
+
+        Returns:
+            List of draft note dicts
+        """
+        url = f"{self.api_url}/projects/{project_id}/merge_requests/{mr_iid}/draft_notes"
+
+        if client is not None:
+            return await self._get_all_pages(client, url)
+
+        async with httpx.AsyncClient() as own_client:
+            return await self._get_all_pages(own_client, url)
+
+    async def _get_all_pages(self, client: httpx.AsyncClient, url: str) -> List[Dict[str, Any]]:
+        """GET a paginated list endpoint, following X-Next-Page until it is empty"""
+        items: List[Dict[str, Any]] = []
+        page = "1"
+        while page:
+            response = await client.get(
+                url, headers=self.headers, params={"per_page": 100, "page": page}, timeout=30
+            )
+            response.raise_for_status()
+            items.extend(response.json())
+            page = response.headers.get("X-Next-Page", "")
+        return items
+
+    @timed_gitlab_call("DELETE merge_requests/:iid/draft_notes/:id")
+    async def delete_draft_note(
+        self,
+        project_id: int,
+        mr_iid: int,
+        draft_note_id: int,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        """
+        Delete pending draft note from merge request
+
+        Args:
+            project_id: Project ID
+            mr_iid: MR IID
+            draft_note_id: Draft note ID
+            client: Shared HTTP client for batch operations (optional)
+        """
+        url = f"{self.api_url}/projects/{project_id}/merge_requests/{mr_iid}/draft_notes/{draft_note_id}"
+
+        if client is not None:
+            response = await client.delete(url, headers=self.headers, timeout=30)
+            if response.status_code != 404:
+                response.raise_for_status()
+            return
+
+        async with httpx.AsyncClient() as own_client:
+            response = await own_client.delete(url, headers=self.headers, timeout=30)
+            if response.status_code != 404:
+                response.raise_for_status()
+
+    @timed_gitlab_call("POST merge_requests/:iid/draft_notes/bulk_publish")
+    async def bulk_publish_draft_notes(
+        self,
+        project_id: int,
+        mr_iid: int,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        """
+        Publish all pending draft notes of the current user in one call
+
+        Args:
+            project_id: Project ID
+            mr_iid: MR IID
+            client: Shared HTTP client for batch operations (optional)
+        """
+        url = f"{self.api_url}/projects/{project_id}/merge_requests/{mr_iid}/draft_notes/bulk_publish"
+
+        if client is not None:
+            response = await client.post(url, headers=self.headers, timeout=60)
+            response.raise_for_status()
+            return
+
+        async with httpx.AsyncClient() as own_client:
+            response = await own_client.post(url, headers=self.headers, timeout=60)
+            response.raise_for_status()
+
+    @timed_gitlab_call("POST merge_requests")
     async def create_merge_request(
         self,
         project_id: int,
@@ -170,6 +342,7 @@ class GitLabService:
             response.raise_for_status()
             return response.json()
     
+    @timed_gitlab_call("POST repository/commits")
     async def commit_file_changes(
         self,
         project_id: int,
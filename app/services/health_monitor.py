@@ -0,0 +1,180 @@
+"""
+Health Monitor
+
+Runs the deep dependency checks (CLI binaries, model API, GitLab) in a
+background task every HEALTH_CHECK_INTERVAL_SECONDS and caches the result,
+so liveness/readiness probes answer from memory instead of spawning
+subprocesses and opening HTTP connections on every probe.
+
+Readiness only depends on this pod: the startup warm-up (if given) has
+finished, the cached state is fresh (younger than HEALTH_CHECK_TTL_SECONDS)
+and a review CLI is installed. Model API and GitLab outages are reported as
+"unhealthy" by /health and /health/deep but do not make the pod unready,
+since they would take every replica out of the Service at once. Deep checks
+on demand go through refresh(); concurrent refreshes share one run.
+"""
+
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from app.models import HealthCheckResponse
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Background dependency health checks with a cached state"""
+
+    def __init__(
+        self,
+        review_service,
+        gitlab_service,
+        version: str,
+        interval_seconds: float = 30,
+        ttl_seconds: float = 90,
+        check_timeout_seconds: float = 20,
+        warmup=None
+    ):
+        """
+        Initialize monitor
+
+        Args:
+            review_service: ReviewService (CLI and model API checks)
+            gitlab_service: GitLabService (GitLab API check)
+            version: API version reported in health responses
+            interval_seconds: Pause between background refreshes
+            ttl_seconds: Age after which the cached state is stale
+            check_timeout_seconds: Timeout of each deep check (a timeout counts as failed)
+            warmup: Startup Warmup that must finish before the service is ready
+        """
+        self.review_service = review_service
+        self.gitlab_service = gitlab_service
+        self.version = version
+        self.interval_seconds = interval_seconds
+        self.ttl_seconds = ttl_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self.warmup = warmup
+
+        self._state: Optional[HealthCheckResponse] = None
+        self._checked_at: Optional[float] = None  # time.monotonic() of last refresh
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def state(self) -> Optional[HealthCheckResponse]:
+        """Last deep check result, None before the first refresh"""
+        return self._state
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the last refresh, None before the first refresh"""
+        if self._checked_at is None:
+            return None
+        return time.monotonic() - self._checked_at
+
+    def is_fresh(self) -> bool:
+        """Whether cached state exists and is younger than the TTL"""
+        age = self.age_seconds
+        return age is not None and age <= self.ttl_seconds
+
+    def is_warm(self) -> bool:
+        """Whether startup warm-up has finished (always True without warm-up)"""
+        return self.warmup is None or self.warmup.ready
+
+    def is_ready(self) -> bool:
+        """Whether the service is warm, cached state is fresh and a review CLI is installed"""
+        return (
+            self.is_warm()
+            and self.is_fresh()
+            and (self._state.cline_available or self._state.qwen_available)
+        )
+
+    def probe(self) -> Dict[str, Any]:
+        """Readiness summary from the cached state (no I/O)"""
+        age = self.age_seconds
+        probe = {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "health": self._state.status if self._state else "unknown",
+            "checked_at": self._state.timestamp if self._state else None,
+            "age_seconds": round(age, 3) if age is not None else None,
+        }
+        if self.warmup is not None:
+            probe["warmup"] = self.warmup.status()
+        return probe
+
+    async def refresh(self) -> HealthCheckResponse:
+        """
+        Run deep checks now and update the cached state
+
+        Returns:
+            Fresh health state (shared with a refresh already in progress)
+        """
+        if self._refresh_lock.locked():
+            async with self._refresh_lock:
+                return self._state
+
+        async with self._refresh_lock:
+            cli_health, gitlab_connected = await asyncio.gather(
+                self._bounded(self.review_service.health_check(), {}),
+                self._bounded(self.gitlab_service.test_connection(), False)
+            )
+
+            healthy = all([
+                cli_health.get('cline_available') or cli_health.get('qwen_available'),
+                cli_health.get('model_api_connected'),
+                gitlab_connected
+            ])
+            self._state = HealthCheckResponse(
+                status="healthy" if healthy else "unhealthy",
+                version=self.version,
+                cline_available=cli_health.get('cline_available', False),
+                qwen_available=cli_health.get('qwen_available', False),
+                model_api_connected=cli_health.get('model_api_connected', False),
+                gitlab_connected=gitlab_connected,
+                timestamp=datetime.utcnow()
+            )
+            self._checked_at = time.monotonic()
+
+            if not healthy:
+                logger.warning(f"Dependency health check failed: {self._state.model_dump(exclude={'timestamp'})}")
+            return self._state
+
+    async def _bounded(self, check, default):
+        """Await check with timeout; failures and timeouts yield default"""
+        try:
+            return await asyncio.wait_for(check, timeout=self.check_timeout_seconds)
+        except Exception as e:
+            logger.error(f"Health check failed: {type(e).__name__}: {e}")
+            return default
+
+    def start(self) -> None:
+        """Start background refresh loop (no-op if running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        """Stop background refresh loop"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            # On-demand refreshes push the next background one back
+            age = self.age_seconds
+            if age is not None and age < self.interval_seconds:
+                await asyncio.sleep(self.interval_seconds - age)
+                continue
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health monitor refresh failed: {str(e)}", exc_info=True)
+                await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,346 @@
+"""
+Inline Discussion Publisher
+
+Publishes review findings as inline GitLab discussions anchored to MR diff
+positions. Findings are created as draft notes in parallel (bounded by a
+semaphore, retried on rate limits / server errors) and then published with
+a single bulk-publish call, so the MR receives one notification burst.
+Stale drafts are discarded up front. A draft GitLab rejects with a 4xx
+(e.g. a position it cannot anchor) is skipped and the rest is published;
+on transient failures (429, 5xx, transport errors) or a failed bulk
+publish this run's drafts are deleted again, so the next run recreates
+them all.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+
+import httpx
+
+from app.models import ReviewIssue, IssueSeverity, InlinePublishResult, SEVERITY_RANK
+from app.services.gitlab_service import GitLabService
+from app.utils.diff_parser import FileDiff, build_diff_index
+
+logger = logging.getLogger(__name__)
+
+
+SEVERITY_ICONS = {
+    IssueSeverity.CRITICAL: "🔴",
+    IssueSeverity.HIGH: "🟠",
+    IssueSeverity.MEDIUM: "🟡",
+    IssueSeverity.LOW: "🔵",
+    IssueSeverity.INFO: "⚪",
+}
+
+
+class InlineDiscussionPublisher:
+    """Publisher of review findings as inline MR diff discussions"""
+
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        gitlab_service: GitLabService,
+        concurrency: int = 5,
+        max_retries: int = 3,
+        min_severity: IssueSeverity = IssueSeverity.MEDIUM,
+        backoff_base_seconds: float = 0.5
+    ):
+        """
+        Initialize publisher
+
+        Args:
+            gitlab_service: GitLab API service
+            concurrency: Maximum number of concurrent draft note requests
+            max_retries: Retries per request on 429/5xx/transport errors
+            min_severity: Lowest severity published inline
+            backoff_base_seconds: Base delay for exponential backoff
+        """
+        self.gitlab = gitlab_service
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(0, max_retries)
+        self.min_severity = min_severity
+        self.backoff_base_seconds = backoff_base_seconds
+
+    async def publish(
+        self,
+        project_id: int,
+        mr_iid: int,
+        mr_data: Dict[str, Any],
+        issues: List[ReviewIssue],
+        changes: Optional[List[Dict[str, Any]]] = None
+    ) -> InlinePublishResult:
+        """
+        Publish issues as inline discussions on the MR diff
+
+        Args:
+            project_id: GitLab project ID
+            mr_iid: MR IID
+            mr_data: MR data from GitLabService.get_merge_request() (needs diff_refs)
+            issues: Issues to publish
+            changes: MR changes already fetched by the caller (fetched if None)
+
+        Returns:
+            InlinePublishResult with counters
+        """
+        result = InlinePublishResult()
+
+        diff_refs = mr_data.get('diff_refs') or {}
+        if not all(diff_refs.get(key) for key in ('base_sha', 'head_sha', 'start_sha')):
+            logger.warning(f"MR !{mr_iid} has no diff_refs, skipping inline discussions")
+            result.error = "MR diff_refs not available"
+            return result
+
+        min_rank = SEVERITY_RANK[self.min_severity]
+        candidates = []
+        for issue in issues:
+            if SEVERITY_RANK[issue.severity] < min_rank:
+                result.skipped_below_severity += 1
+            else:
+                candidates.append(issue)
+
+        if not candidates:
+            return result
+
+        if changes is None:
+            changes = await self._call_with_retry(
+                lambda: self.gitlab.get_mr_changes(project_id=project_id, mr_iid=mr_iid)
+            )
+        diff_index = build_diff_index(changes)
+
+        drafts = []
+        for issue in candidates:
+            position = self.build_position(issue, diff_index, diff_refs)
+            if position is None:
+                result.skipped_outside_diff += 1
+                continue
+            drafts.append((self.format_note(issue), position))
+
+        if not drafts:
+            logger.info(f"No findings map to the diff of MR !{mr_iid}")
+            return result
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with httpx.AsyncClient() as client:
+
+            # bulk_publish publishes every pending draft of the bot user, so
+            # leftovers of an earlier failed run must not ride along. This also
+            # deletes drafts of another review of the same MR still publishing;
+            # GitRepositoryManager rejects a second review of an MR while one
+            # is running on this pod, and review requests of a project must
+            # reach a single pod (see deployment/kubernetes/deployment.yaml).
+            await self._discard_stale_drafts(project_id, mr_iid, client)
+
+            async def create_draft(note: str, position: Dict[str, Any]) -> Optional[int]:
+                async with semaphore:
+                    try:
+                        draft = await self._call_with_retry(
+                            lambda: self.gitlab.create_draft_note(
+                                project_id=project_id,
+                                mr_iid=mr_iid,
+                                note=note,
+                                position=position,
+                                client=client
+                            ),
+                            idempotent=False
+                        )
+                        return draft.get('id')
+                    except Exception as e:
+                        location = f"{position.get('new_path')}:{position.get('new_line')}"
+                        if self.is_transient_error(e):
+                            result.drafts_failed += 1
+                            logger.error(f"Failed to create draft note at {location}: {str(e)}")
+                        else:
+                            # Same request fails the same way next run: skip the finding
+                            result.drafts_rejected += 1
+                            logger.warning(f"GitLab rejected draft note at {location}: {str(e)}")
+                        return None
+
+            outcomes = await asyncio.gather(*(create_draft(note, pos) for note, pos in drafts))
+            draft_ids = [draft_id for draft_id in outcomes if draft_id is not None]
+            result.drafts_created = len(draft_ids)
+
+            if result.drafts_failed:
+                # The caller keeps the previous finding state on transient
+                # failures, so the next run recreates every draft
+                result.error = f"{result.drafts_failed} draft notes could not be created"
+                result.transient_error = True
+                await self._delete_drafts(project_id, mr_iid, draft_ids, client)
+            elif draft_ids:
+                try:
+                    await self._call_with_retry(
+                        lambda: self.gitlab.bulk_publish_draft_notes(
+                            project_id=project_id,
+                            mr_iid=mr_iid,
+                            client=client
+                        )
+                    )
+                    result.published = True
+                except Exception as e:
+                    logger.error(f"Failed to bulk publish draft notes for MR !{mr_iid}: {str(e)}")
+                    result.error = str(e)
+                    result.transient_error = self.is_transient_error(e)
+                    await self._delete_drafts(project_id, mr_iid, draft_ids, client)
+
+        logger.info(
+            f"Inline discussions for MR !{mr_iid}: {result.drafts_created} published, "
+            f"{result.drafts_failed} failed, {result.drafts_rejected} rejected, "
+            f"{result.skipped_outside_diff} outside diff"
+        )
+        return result
+
+    def build_position(
+        self,
+        issue: ReviewIssue,
+        diff_index: Dict[str, FileDiff],
+        diff_refs: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Map issue file/line to GitLab diff position
+
+        Args:
+            issue: Review issue
+            diff_index: File path to FileDiff mapping
+            diff_refs: MR diff_refs (base_sha, head_sha, start_sha)
+
+        Returns:
+            Position payload or None if the line is not part of the diff
+        """
+        if issue.line is None:
+            return None
+
+        file_diff = diff_index.get(issue.file) or diff_index.get(issue.file.removeprefix('./'))
+        if file_diff is None or not file_diff.has_line(issue.line):
+            return None
+
+        position = {
+            "position_type": "text",
+            "base_sha": diff_refs['base_sha'],
+            "head_sha": diff_refs['head_sha'],
+            "start_sha": diff_refs['start_sha'],
+            "old_path": file_diff.old_path,
+            "new_path": file_diff.new_path,
+            "new_line": issue.line,
+        }
+        old_line = file_diff.old_line_for(issue.line)
+        if old_line is not None:
+            # Unchanged context lines must be anchored on both sides
+            position["old_line"] = old_line
+        return position
+
+    def format_note(self, issue: ReviewIssue) -> str:
+        """Render markdown body of an inline discussion"""
+        lines = [
+            f"{SEVERITY_ICONS[issue.severity]} **{issue.severity.value}** · {issue.category}",
+            "",
+            issue.message,
+        ]
+        if issue.suggestion:
+            lines.extend(["", f"**Fix**: {issue.suggestion}"])
+        if issue.cwe:
+            lines.extend(["", f"*{issue.cwe}*"])
+        return "\n".join(lines)
+
+    async def _discard_stale_drafts(
+        self,
+        project_id: int,
+        mr_iid: int,
+        client: httpx.AsyncClient
+    ) -> None:
+        """
+        Delete pending drafts of the bot user on the MR (all pages)
+
+        Meant for drafts left by an earlier interrupted run; it cannot tell
+        them apart from drafts of a review publishing concurrently, so
+        reviews of one MR must not publish at the same time.
+        """
+        try:
+            stale = await self._call_with_retry(
+                lambda: self.gitlab.list_draft_notes(project_id=project_id, mr_iid=mr_iid, client=client)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to list draft notes for MR !{mr_iid}: {str(e)}")
+            return
+
+        stale_ids = [draft['id'] for draft in stale if draft.get('id') is not None]
+        if stale_ids:
+            logger.info(f"Discarding {len(stale_ids)} stale draft notes on MR !{mr_iid}")
+            await self._delete_drafts(project_id, mr_iid, stale_ids, client)
+
+    async def _delete_drafts(
+        self,
+        project_id: int,
+        mr_iid: int,
+        draft_ids: List[int],
+        client: httpx.AsyncClient
+    ) -> None:
+        """Delete draft notes, logging (not raising) individual failures"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def delete_draft(draft_id: int) -> None:
+            async with semaphore:
+                try:
+                    await self._call_with_retry(
+                        lambda: self.gitlab.delete_draft_note(
+                            project_id=project_id,
+                            mr_iid=mr_iid,
+                            draft_note_id=draft_id,
+                            client=client
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to delete draft note {draft_id} on MR !{mr_iid}: {str(e)}")
+
+        await asyncio.gather(*(delete_draft(draft_id) for draft_id in draft_ids))
+
+    async def _call_with_retry(
+        self,
+        operation: Callable[[], Awaitable[Any]],
+        idempotent: bool = True
+    ) -> Any:
+        """
+        Execute GitLab call, retrying on rate limits and transient failures
+
+        Honors Retry-After header on 429 responses, otherwise uses
+        exponential backoff. Non-idempotent calls are retried only when the
+        request provably did not reach GitLab (429 or connect errors), since
+        a 5xx or read timeout may follow a successful write.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await operation()
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                retryable = status in self.RETRYABLE_STATUS_CODES if idempotent else status == 429
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, e.response.headers.get('Retry-After'))
+                logger.warning(f"GitLab returned {status}, retrying in {delay:.1f}s")
+            except httpx.TransportError as e:
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, None)
+                logger.warning(f"GitLab transport error ({str(e)}), retrying in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def is_transient_error(error: Exception) -> bool:
+        """Whether a failed GitLab call may succeed later: anything but a 4xx other than 429"""
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or not 400 <= status < 500
+        return True  # transport errors, unexpected responses
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Compute retry delay in seconds"""
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return self.backoff_base_seconds * (2 ** attempt)
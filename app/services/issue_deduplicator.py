@@ -0,0 +1,197 @@
+"""
+Issue Deduplicator
+
+Collapses issues reported by several review types (e.g. the same null
+dereference found by ERROR_DETECTION, BEST_PRACTICES and CONCURRENCY) into
+one issue that keeps the highest severity and all source review types.
+
+Two issues are duplicates when they share the normalized file and category
+family, their lines are within LINE_TOLERANCE, and their messages are
+similar (Jaccard similarity of word shingles) or their code snippets are
+identical. Issues are hashed into buckets by (file, family, line window),
+so each issue is only compared with cluster representatives in its own and
+the neighbouring windows - near-linear in the number of issues.
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from app.models import ReviewIssue, ReviewType, SEVERITY_RANK
+import logging
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r'[a-z0-9_]+')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_WHITESPACE = re.compile(r'\s+')
+
+# Bucket key: (file, category family, line window or None)
+BucketKey = Tuple[str, str, Optional[int]]
+
+
+class _Cluster:
+    """Group of duplicate issues (first member is the representative)"""
+
+    __slots__ = ("members", "line", "shingles", "snippet")
+
+    def __init__(self, issue: ReviewIssue, shingles: FrozenSet[str], snippet: str):
+        self.members = [issue]
+        self.line = issue.line
+        self.shingles = shingles
+        self.snippet = snippet
+
+
+class IssueDeduplicator:
+    """Merges duplicate issues across review types"""
+
+    # Lines closer than this are considered the same location
+    LINE_TOLERANCE = 3
+    # Bucket width in lines (>= LINE_TOLERANCE so neighbours cover the tolerance)
+    LINE_WINDOW = 3
+    # Minimum Jaccard similarity of message shingles
+    SIMILARITY_THRESHOLD = 0.3
+
+    # Category keywords -> family (first match wins, order matters:
+    # "NullPointerException" must map to null-safety, not exceptions)
+    CATEGORY_FAMILIES = [
+        ("null-safety", ("null", "npe", "optional")),
+        ("injection", ("injection", "sqli", "xss")),
+        ("concurrency", ("concurren", "thread", "race", "synchron", "deadlock", "atomic")),
+        ("transaction", ("transaction",)),
+        ("resource-leak", ("resource", "leak", "unclosed")),
+        ("security", ("security", "auth", "crypt", "secret", "password", "credential")),
+        ("performance", ("performance", "n+1", "query", "cache")),
+        ("exception-handling", ("exception", "error handling", "catch")),
+        ("documentation", ("javadoc", "documentation", "comment")),
+    ]
+
+    # Synonyms folded before shingling
+    TOKEN_ALIASES = {
+        "npe": "null",
+        "nullpointerexception": "null",
+        "nullpointer": "null",
+        "nullable": "null",
+        "dereference": "deref",
+        "dereferenced": "deref",
+        "dereferencing": "deref",
+    }
+
+    STOPWORDS = frozenset({
+        "the", "and", "for", "with", "this", "that", "can", "may", "might",
+        "could", "should", "when", "which", "from", "are", "was", "not",
+        "into", "its", "has", "have", "without", "before", "after",
+    })
+
+    def deduplicate(self, issues: List[ReviewIssue]) -> Tuple[List[ReviewIssue], int]:
+        """
+        Merge duplicate issues
+
+        Args:
+            issues: Issues from all review types (review_types set per issue)
+
+        Returns:
+            Tuple of (merged issues in order of first occurrence, duplicates collapsed)
+        """
+        clusters: List[_Cluster] = []
+        buckets: Dict[BucketKey, List[_Cluster]] = {}
+
+        for issue in issues:
+            file_key = self.normalize_file(issue.file)
+            family = self.category_family(issue.category)
+            window = issue.line // self.LINE_WINDOW if issue.line is not None else None
+            shingles = self.shingles(issue.message)
+            snippet = self._normalize_snippet(issue.code_snippet)
+
+            cluster = self._find_cluster(buckets, file_key, family, window, issue.line, shingles, snippet)
+            if cluster is None:
+                cluster = _Cluster(issue, shingles, snippet)
+                clusters.append(cluster)
+                buckets.setdefault((file_key, family, window), []).append(cluster)
+            else:
+                cluster.members.append(issue)
+
+        merged = [self._merge(cluster.members) for cluster in clusters]
+        collapsed = len(issues) - len(merged)
+        if collapsed:
+            logger.info(f"Collapsed {collapsed} duplicate issues ({len(issues)} -> {len(merged)})")
+        return merged, collapsed
+
+    def _find_cluster(
+        self,
+        buckets: Dict[BucketKey, List[_Cluster]],
+        file_key: str,
+        family: str,
+        window: Optional[int],
+        line: Optional[int],
+        shingles: FrozenSet[str],
+        snippet: str
+    ) -> Optional[_Cluster]:
+        """Find existing cluster this issue duplicates"""
+        windows = [None] if window is None else [window - 1, window, window + 1]
+        for candidate_window in windows:
+            for cluster in buckets.get((file_key, family, candidate_window), ()):
+                if line is not None and abs(cluster.line - line) > self.LINE_TOLERANCE:
+                    continue
+                if snippet and snippet == cluster.snippet:
+                    return cluster
+                if self._similarity(shingles, cluster.shingles) >= self.SIMILARITY_THRESHOLD:
+                    return cluster
+        return None
+
+    def _merge(self, members: List[ReviewIssue]) -> ReviewIssue:
+        """Merge duplicates: highest severity wins, review types are unioned"""
+        if len(members) == 1:
+            return members[0]
+
+        best = max(members, key=lambda issue: SEVERITY_RANK[issue.severity])
+        review_types: List[ReviewType] = []
+        for issue in members:
+            for review_type in issue.review_types:
+                if review_type not in review_types:
+                    review_types.append(review_type)
+
+        return best.model_copy(update={
+            "review_types": review_types,
+            "code_snippet": best.code_snippet or next(
+                (i.code_snippet for i in members if i.code_snippet), None
+            ),
+            "cwe": best.cwe or next((i.cwe for i in members if i.cwe), None),
+        })
+
+    @staticmethod
+    def normalize_file(path: str) -> str:
+        """Normalize file path (separators, leading './')"""
+        normalized = path.strip().replace("\\", "/")
+        while normalized.startswith("./"):
+            normalized = normalized[2:]
+        return normalized
+
+    def category_family(self, category: str) -> str:
+        """Map free-form category to a coarse family"""
+        lowered = category.lower()
+        for family, keywords in self.CATEGORY_FAMILIES:
+            if any(keyword in lowered for keyword in keywords):
+                return family
+        return _NON_ALNUM.sub("-", lowered).strip("-")
+
+    def shingles(self, message: str) -> FrozenSet[str]:
+        """Word unigram and bigram shingles of normalized message"""
+        tokens = [
+            self.TOKEN_ALIASES.get(token, token)
+            for token in _TOKEN.findall(message.lower())
+            if len(token) >= 3 or token in self.TOKEN_ALIASES
+        ]
+        tokens = [token for token in tokens if token not in self.STOPWORDS]
+        bigrams = (f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return frozenset(tokens).union(bigrams)
+
+    @staticmethod
+    def _similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+        """Jaccard similarity"""
+        if not a or not b:
+            return 0.0
+        intersection = len(a & b)
+        return intersection / (len(a) + len(b) - intersection)
+
+    @staticmethod
+    def _normalize_snippet(snippet: Optional[str]) -> str:
+        return _WHITESPACE.sub(" ", snippet).strip() if snippet else ""
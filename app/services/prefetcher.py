@@ -0,0 +1,142 @@
+"""
+Repository Prefetcher
+
+Speculative fetch of MR branches before /review is called: n8n (or a GitLab
+webhook) reports an MR event, the branches are fetched into the project's
+workspace pool in the background, and the review finds the objects local.
+
+- Requests for the same (project, source branch, target branch) that are
+  queued or running are deduplicated.
+- Each project is prefetched at most once per min_interval_seconds.
+- One worker runs prefetches one at a time and git runs under `nice`, so
+  prefetching never competes with reviews for more than one transfer.
+
+The workspace pool and the dedup/rate-limit state live in this process. A
+prefetch only helps if the review of the MR lands on the same pod, so with
+several replicas the /prefetch and /review requests of a project must be
+routed to the same pod (see deployment/kubernetes/deployment.yaml).
+"""
+
+from typing import Any, Dict, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+
+from app.services.git_repository_manager import GitRepositoryManager
+from app.services.gitlab_service import GitLabService
+from app.utils.metrics import PREFETCHES
+
+logger = logging.getLogger(__name__)
+
+PrefetchKey = Tuple[int, str, str]  # (project_id, source_branch, target_branch)
+
+
+class RepositoryPrefetcher:
+    """Deduplicated, rate-limited background prefetch queue"""
+
+    def __init__(
+        self,
+        git_manager: GitRepositoryManager,
+        gitlab_service: GitLabService,
+        min_interval_seconds: float = 60,
+        max_queued: int = 100
+    ):
+        """
+        Initialize prefetcher
+
+        Args:
+            git_manager: Repository manager owning the workspace pool
+            gitlab_service: GitLab client (resolves clone URLs)
+            min_interval_seconds: Minimum time between prefetches of one project
+            max_queued: Pending prefetches kept; further requests are rejected
+        """
+        self.git_manager = git_manager
+        self.gitlab_service = gitlab_service
+        self.min_interval_seconds = min_interval_seconds
+        self.max_queued = max_queued
+
+        self._queue: "asyncio.Queue[PrefetchKey]" = asyncio.Queue()
+        self._pending: Set[PrefetchKey] = set()  # queued or running
+        self._last_accepted: Dict[int, float] = {}  # project_id -> time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, project_id: int, source_branch: str, target_branch: str) -> str:
+        """
+        Queue prefetch of MR branches
+
+        Returns:
+            "queued", "duplicate", "rate_limited" or "queue_full"
+        """
+        key = (project_id, source_branch, target_branch)
+        now = time.monotonic()
+        if key in self._pending:
+            outcome = "duplicate"
+        elif now - self._last_accepted.get(project_id, float("-inf")) < self.min_interval_seconds:
+            outcome = "rate_limited"
+        elif len(self._pending) >= self.max_queued:
+            outcome = "queue_full"
+        else:
+            self._pending.add(key)
+            self._last_accepted[project_id] = now
+            self._queue.put_nowait(key)
+            outcome = "queued"
+        PREFETCHES.labels(outcome=outcome).inc()
+        logger.debug("Prefetch of project %s (%s -> %s): %s", project_id, source_branch, target_branch, outcome)
+        return outcome
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue summary"""
+        return {
+            "pending": len(self._pending),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def prefetch(self, key: PrefetchKey) -> str:
+        """Run one prefetch; returns outcome of GitRepositoryManager.prefetch"""
+        project_id, source_branch, target_branch = key
+        project_data = await self.gitlab_service.get_project(project_id)
+        clone_url = self.gitlab_service.get_clone_url(project_data)
+        return await self.git_manager.prefetch(
+            clone_url=clone_url,
+            project_id=project_id,
+            branch=source_branch,
+            target_branch=target_branch
+        )
+
+    def start(self) -> None:
+        """Start worker (no-op if running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="repository-prefetcher")
+
+    async def stop(self) -> None:
+        """Stop worker; queued prefetches are dropped"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            key = await self._queue.get()
+            started = time.perf_counter()
+            try:
+                outcome = await self.prefetch(key)
+                self.completed += 1
+                PREFETCHES.labels(outcome="done").inc()
+                logger.info(
+                    f"Prefetch of project {key[0]} ({key[1]} -> {key[2]}) {outcome} "
+                    f"in {time.perf_counter() - started:.1f}s"
+                )
+            except Exception as e:
+                self.failed += 1
+                PREFETCHES.labels(outcome="failed").inc()
+                logger.warning(f"Prefetch of project {key[0]} ({key[1]}) failed: {str(e)}")
+            finally:
+                self._pending.discard(key)
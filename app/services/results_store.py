@@ -0,0 +1,558 @@
+"""
+Review Results Store
+
+Persists every ReviewResult in a local SQLite database (WAL mode) so review
+history can be queried without re-running reviews.
+
+Tables (normalized, one row per entity):
+- reviews: one row per review run with summary counters
+- issues: findings of a review (file, severity, category, ...)
+- issue_review_types: review types that reported an issue
+- refactorings: refactoring suggestions of a review
+- timings: per-phase durations of a review
+
+Rollups (maintained incrementally in the same transaction as each review
+insert, so dashboards never scan raw issues):
+- project_rollups: all-time counters per project
+- project_weekly_rollups: reviews and issues by severity per ISO week
+- project_category_rollups: issues by severity per category and ISO week
+
+Queries use keyset pagination on the autoincrement id (newest first): the
+cursor is the last id of the previous page, so every page is an index range
+scan independent of how deep the client pages.
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from app.models import ReviewResult
+from app.utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Default and maximum page size of list queries
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Default and maximum number of weeks of trend queries
+DEFAULT_TREND_WEEKS = 12
+MAX_TREND_WEEKS = 104
+
+_SEVERITY_COLUMNS = ("critical", "high", "medium", "low", "info")
+
+_REVIEW_COLUMNS = (
+    "id, project_id, mr_iid, agent, review_type, created_at, execution_time_seconds, "
+    "total_issues, critical, high, medium, low, info, duplicates_collapsed, "
+    "fix_mr_iid, refactoring_mr_iid, doc_commit_sha"
+)
+
+
+class ReviewResultsStore(SQLiteStore):
+    """SQLite store of review results"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL,
+        mr_iid INTEGER NOT NULL,
+        agent TEXT NOT NULL,
+        review_type TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        execution_time_seconds REAL NOT NULL,
+        total_issues INTEGER NOT NULL,
+        critical INTEGER NOT NULL,
+        high INTEGER NOT NULL,
+        medium INTEGER NOT NULL,
+        low INTEGER NOT NULL,
+        info INTEGER NOT NULL,
+        duplicates_collapsed INTEGER NOT NULL DEFAULT 0,
+        fix_mr_iid INTEGER,
+        refactoring_mr_iid INTEGER,
+        doc_commit_sha TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_reviews_project ON reviews (project_id, id);
+    CREATE INDEX IF NOT EXISTS idx_reviews_project_mr ON reviews (project_id, mr_iid, id);
+
+    CREATE TABLE IF NOT EXISTS issues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        review_id INTEGER NOT NULL REFERENCES reviews (id) ON DELETE CASCADE,
+        file TEXT NOT NULL,
+        line INTEGER,
+        severity TEXT NOT NULL,
+        category TEXT NOT NULL,
+        message TEXT NOT NULL,
+        suggestion TEXT NOT NULL,
+        code_snippet TEXT,
+        auto_fixable INTEGER NOT NULL,
+        cwe TEXT,
+        rule_source TEXT NOT NULL,
+        fingerprint TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_issues_review ON issues (review_id);
+    CREATE INDEX IF NOT EXISTS idx_issues_file ON issues (file, id);
+    CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues (severity, id);
+
+    CREATE TABLE IF NOT EXISTS issue_review_types (
+        issue_id INTEGER NOT NULL REFERENCES issues (id) ON DELETE CASCADE,
+        review_type TEXT NOT NULL,
+        PRIMARY KEY (issue_id, review_type)
+    );
+    CREATE INDEX IF NOT EXISTS idx_issue_review_types_type ON issue_review_types (review_type, issue_id);
+
+    CREATE TABLE IF NOT EXISTS refactorings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        review_id INTEGER NOT NULL REFERENCES reviews (id) ON DELETE CASCADE,
+        file TEXT NOT NULL,
+        line INTEGER,
+        severity TEXT NOT NULL,
+        category TEXT NOT NULL,
+        message TEXT NOT NULL,
+        suggestion TEXT NOT NULL,
+        impact TEXT NOT NULL,
+        effort TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_refactorings_review ON refactorings (review_id);
+
+    CREATE TABLE IF NOT EXISTS timings (
+        review_id INTEGER NOT NULL REFERENCES reviews (id) ON DELETE CASCADE,
+        phase TEXT NOT NULL,
+        seconds REAL NOT NULL,
+        PRIMARY KEY (review_id, phase)
+    );
+
+    CREATE TABLE IF NOT EXISTS project_rollups (
+        project_id INTEGER PRIMARY KEY,
+        reviews INTEGER NOT NULL DEFAULT 0,
+        total_issues INTEGER NOT NULL DEFAULT 0,
+        critical INTEGER NOT NULL DEFAULT 0,
+        high INTEGER NOT NULL DEFAULT 0,
+        medium INTEGER NOT NULL DEFAULT 0,
+        low INTEGER NOT NULL DEFAULT 0,
+        info INTEGER NOT NULL DEFAULT 0,
+        first_review_at TEXT NOT NULL,
+        last_review_at TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS project_weekly_rollups (
+        project_id INTEGER NOT NULL,
+        week_start TEXT NOT NULL,
+        reviews INTEGER NOT NULL DEFAULT 0,
+        total_issues INTEGER NOT NULL DEFAULT 0,
+        critical INTEGER NOT NULL DEFAULT 0,
+        high INTEGER NOT NULL DEFAULT 0,
+        medium INTEGER NOT NULL DEFAULT 0,
+        low INTEGER NOT NULL DEFAULT 0,
+        info INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (project_id, week_start)
+    );
+
+    CREATE TABLE IF NOT EXISTS project_category_rollups (
+        project_id INTEGER NOT NULL,
+        week_start TEXT NOT NULL,
+        category TEXT NOT NULL,
+        total_issues INTEGER NOT NULL DEFAULT 0,
+        critical INTEGER NOT NULL DEFAULT 0,
+        high INTEGER NOT NULL DEFAULT 0,
+        medium INTEGER NOT NULL DEFAULT 0,
+        low INTEGER NOT NULL DEFAULT 0,
+        info INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (project_id, week_start, category)
+    );
+    """
+
+    def save_review(self, project_id: int, mr_iid: int, result: ReviewResult) -> int:
+        """
+        Insert review with its issues, refactorings, timings and rollups (one transaction)
+
+        Args:
+            project_id: GitLab project ID
+            mr_iid: MR IID
+            result: Review result
+
+        Returns:
+            Review id
+        """
+        with self._transaction() as conn:
+            return self._insert_review(conn, project_id, mr_iid, result)
+
+    def _insert_review(self, conn, project_id: int, mr_iid: int, result: ReviewResult) -> int:
+        """Insert review rows using an open transaction"""
+        summary = result.summary
+        cursor = conn.execute(
+            "INSERT INTO reviews (project_id, mr_iid, agent, review_type, created_at, "
+            "execution_time_seconds, total_issues, critical, high, medium, low, info, "
+            "duplicates_collapsed, fix_mr_iid, refactoring_mr_iid, doc_commit_sha) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                project_id, mr_iid, result.agent.value, result.review_type.value,
+                result.timestamp.isoformat(), result.execution_time_seconds,
+                summary.total_issues, summary.critical, summary.high, summary.medium,
+                summary.low, summary.info, summary.duplicates_collapsed,
+                result.fix_mr_iid, result.refactoring_mr_iid, result.doc_commit_sha,
+            )
+        )
+        review_id = cursor.lastrowid
+
+        for issue in result.issues:
+            issue_id = conn.execute(
+                "INSERT INTO issues (review_id, file, line, severity, category, message, "
+                "suggestion, code_snippet, auto_fixable, cwe, rule_source, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    review_id, issue.file, issue.line, issue.severity.value, issue.category,
+                    issue.message, issue.suggestion, issue.code_snippet, int(issue.auto_fixable),
+                    issue.cwe, issue.rule_source, issue.fingerprint,
+                )
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO issue_review_types (issue_id, review_type) VALUES (?, ?)",
+                [(issue_id, review_type.value) for review_type in issue.review_types]
+            )
+
+        conn.executemany(
+            "INSERT INTO refactorings (review_id, file, line, severity, category, message, "
+            "suggestion, impact, effort) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    review_id, r.file, r.line, r.severity.value, r.category, r.message,
+                    r.suggestion, r.impact.value, r.effort,
+                )
+                for r in result.refactoring_suggestions
+            ]
+        )
+
+        conn.executemany(
+            "INSERT INTO timings (review_id, phase, seconds) VALUES (?, ?, ?)",
+            [(review_id, phase, seconds) for phase, seconds in self._timings(result).items()]
+        )
+
+        self._update_rollups(
+            conn,
+            project_id,
+            result.timestamp.isoformat(),
+            [(issue.category, issue.severity.value) for issue in result.issues]
+        )
+        return review_id
+
+    def _update_rollups(
+        self,
+        conn,
+        project_id: int,
+        created_at: str,
+        issues: List[Tuple[str, str]]
+    ) -> None:
+        """
+        Add one review to the rollup tables using an open transaction
+
+        Args:
+            conn: Connection with an open transaction
+            project_id: GitLab project ID
+            created_at: Review timestamp (ISO format)
+            issues: (category, severity) of every stored issue
+        """
+        week = week_start(datetime.fromisoformat(created_at).date()).isoformat()
+        severities = Counter(severity.lower() for _, severity in issues)
+        counts = [len(issues)] + [severities[column] for column in _SEVERITY_COLUMNS]
+        increments = ", ".join(
+            f"{column} = {column} + excluded.{column}"
+            for column in ("reviews", "total_issues") + _SEVERITY_COLUMNS
+        )
+        columns = ", ".join(("total_issues",) + _SEVERITY_COLUMNS)
+
+        conn.execute(
+            f"INSERT INTO project_rollups (project_id, reviews, {columns}, first_review_at, last_review_at) "
+            "VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (project_id) DO UPDATE SET {increments}, "
+            "first_review_at = MIN(first_review_at, excluded.first_review_at), "
+            "last_review_at = MAX(last_review_at, excluded.last_review_at)",
+            [project_id] + counts + [created_at, created_at]
+        )
+        conn.execute(
+            f"INSERT INTO project_weekly_rollups (project_id, week_start, reviews, {columns}) "
+            "VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (project_id, week_start) DO UPDATE SET {increments}",
+            [project_id, week] + counts
+        )
+
+        by_category: Dict[str, Counter] = {}
+        for category, severity in issues:
+            by_category.setdefault(category, Counter())[severity.lower()] += 1
+        category_increments = ", ".join(
+            f"{column} = {column} + excluded.{column}" for column in ("total_issues",) + _SEVERITY_COLUMNS
+        )
+        conn.executemany(
+            f"INSERT INTO project_category_rollups (project_id, week_start, category, {columns}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (project_id, week_start, category) DO UPDATE SET {category_increments}",
+            [
+                [project_id, week, category, sum(severity_counts.values())]
+                + [severity_counts[column] for column in _SEVERITY_COLUMNS]
+                for category, severity_counts in by_category.items()
+            ]
+        )
+
+    def rebuild_rollups(self) -> None:
+        """Recompute all rollups from raw reviews and issues (one transaction)"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM project_rollups")
+            conn.execute("DELETE FROM project_weekly_rollups")
+            conn.execute("DELETE FROM project_category_rollups")
+            reviews = conn.execute("SELECT id, project_id, created_at FROM reviews ORDER BY id").fetchall()
+            for review in reviews:
+                issues = conn.execute(
+                    "SELECT category, severity FROM issues WHERE review_id = ?", (review["id"],)
+                ).fetchall()
+                self._update_rollups(
+                    conn,
+                    review["project_id"],
+                    review["created_at"],
+                    [(row["category"], row["severity"]) for row in issues]
+                )
+        logger.info(f"Rebuilt rollups from {len(reviews)} reviews")
+
+    def get_trends(
+        self,
+        project_id: int,
+        weeks: int = DEFAULT_TREND_WEEKS,
+        today: Optional[date] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get project quality trends from the rollups
+
+        Reads at most one row per week (and category), independent of how
+        many reviews are stored.
+
+        Args:
+            project_id: GitLab project ID
+            weeks: Number of most recent weeks (including the current one)
+            today: Reference date (defaults to today, UTC)
+
+        Returns:
+            Dict with totals, weekly series (gaps filled with zeros) and
+            per-category counts over the window, or None if project has no reviews
+        """
+        totals = self._fetchone("SELECT * FROM project_rollups WHERE project_id = ?", (project_id,))
+        if totals is None:
+            return None
+
+        weeks = max(1, min(weeks, MAX_TREND_WEEKS))
+        current = week_start(today or datetime.utcnow().date())
+        starts = [(current - timedelta(weeks=offset)).isoformat() for offset in range(weeks - 1, -1, -1)]
+
+        stored = {
+            row["week_start"]: dict(row) for row in self._fetchall(
+                "SELECT * FROM project_weekly_rollups WHERE project_id = ? AND week_start >= ? "
+                "ORDER BY week_start",
+                (project_id, starts[0])
+            )
+        }
+        empty = dict.fromkeys(("reviews", "total_issues") + _SEVERITY_COLUMNS, 0)
+        series = []
+        for start in starts:
+            point = {**empty, **stored.get(start, {}), "week_start": start}
+            point.pop("project_id", None)
+            series.append(point)
+
+        columns = ", ".join(f"SUM({column}) AS {column}" for column in ("total_issues",) + _SEVERITY_COLUMNS)
+        categories = [
+            dict(row) for row in self._fetchall(
+                f"SELECT category, {columns} FROM project_category_rollups "
+                "WHERE project_id = ? AND week_start >= ? "
+                "GROUP BY category ORDER BY total_issues DESC, category",
+                (project_id, starts[0])
+            )
+        ]
+
+        totals = dict(totals)
+        return {
+            "project_id": project_id,
+            "totals": {key: totals[key] for key in ("reviews", "total_issues") + _SEVERITY_COLUMNS},
+            "first_review_at": totals["first_review_at"],
+            "last_review_at": totals["last_review_at"],
+            "weeks": series,
+            "categories": categories,
+        }
+
+    @staticmethod
+    def _timings(result: ReviewResult) -> Dict[str, float]:
+        """Per-phase durations to persist ('cli.SECURITY_AUDIT', 'post_actions.cleanup', ...)"""
+        timings = {phase: seconds for phase, seconds in result.timings.flat().items() if seconds}
+        timings["total"] = result.timings.total or result.execution_time_seconds
+        return timings
+
+    def list_reviews(
+        self,
+        project_id: Optional[int] = None,
+        mr_iid: Optional[int] = None,
+        severity: Optional[str] = None,
+        review_type: Optional[str] = None,
+        file: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        List reviews, newest first
+
+        Args:
+            project_id: Filter by project
+            mr_iid: Filter by MR (requires project_id to use the index)
+            severity: Only reviews with at least one issue of this severity
+            review_type: Only reviews with an issue reported by this review type
+            file: Only reviews with an issue in this file
+            cursor: Id of the last review of the previous page
+            limit: Page size
+
+        Returns:
+            Tuple of (review rows, next cursor or None)
+        """
+        conditions, params = [], []
+        if project_id is not None:
+            conditions.append("project_id = ?")
+            params.append(project_id)
+        if mr_iid is not None:
+            conditions.append("mr_iid = ?")
+            params.append(mr_iid)
+        if severity is not None:
+            conditions.append("EXISTS (SELECT 1 FROM issues i WHERE i.review_id = reviews.id AND i.severity = ?)")
+            params.append(severity)
+        if file is not None:
+            conditions.append("EXISTS (SELECT 1 FROM issues i WHERE i.review_id = reviews.id AND i.file = ?)")
+            params.append(file)
+        if review_type is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM issues i JOIN issue_review_types t ON t.issue_id = i.id "
+                "WHERE i.review_id = reviews.id AND t.review_type = ?)"
+            )
+            params.append(review_type)
+
+        rows = self._page(f"SELECT {_REVIEW_COLUMNS} FROM reviews", conditions, params, "id", cursor, limit)
+        return self._split_page(rows, limit)
+
+    def list_issues(
+        self,
+        project_id: Optional[int] = None,
+        mr_iid: Optional[int] = None,
+        severity: Optional[str] = None,
+        review_type: Optional[str] = None,
+        file: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        List stored issues, newest first (same filters as list_reviews)
+
+        Returns:
+            Tuple of (issue rows with review_types list, next cursor or None)
+        """
+        conditions, params = [], []
+        if project_id is not None:
+            conditions.append("r.project_id = ?")
+            params.append(project_id)
+        if mr_iid is not None:
+            conditions.append("r.mr_iid = ?")
+            params.append(mr_iid)
+        if severity is not None:
+            conditions.append("i.severity = ?")
+            params.append(severity)
+        if file is not None:
+            conditions.append("i.file = ?")
+            params.append(file)
+        if review_type is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM issue_review_types t WHERE t.issue_id = i.id AND t.review_type = ?)"
+            )
+            params.append(review_type)
+
+        rows = self._page(
+            "SELECT i.id, i.review_id, r.project_id, r.mr_iid, i.file, i.line, i.severity, "
+            "i.category, i.message, i.suggestion, i.auto_fixable, i.cwe, i.fingerprint "
+            "FROM issues i JOIN reviews r ON r.id = i.review_id",
+            conditions, params, "i.id", cursor, limit
+        )
+        issues, next_cursor = self._split_page(rows, limit)
+        self._attach_review_types(issues)
+        return issues, next_cursor
+
+    def get_review(self, review_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get review with issues, refactorings and timings
+
+        Returns:
+            Review dict or None if not found
+        """
+        row = self._fetchone(f"SELECT {_REVIEW_COLUMNS} FROM reviews WHERE id = ?", (review_id,))
+        if row is None:
+            return None
+
+        review = dict(row)
+        review["issues"] = [
+            dict(r) for r in self._fetchall(
+                "SELECT i.id, i.review_id, ? AS project_id, ? AS mr_iid, i.file, i.line, i.severity, "
+                "i.category, i.message, i.suggestion, i.auto_fixable, i.cwe, i.fingerprint "
+                "FROM issues i WHERE i.review_id = ? ORDER BY i.id",
+                (review["project_id"], review["mr_iid"], review_id)
+            )
+        ]
+        self._attach_review_types(review["issues"])
+        review["refactorings"] = [
+            dict(r) for r in self._fetchall(
+                "SELECT file, line, severity, category, message, suggestion, impact, effort "
+                "FROM refactorings WHERE review_id = ? ORDER BY id",
+                (review_id,)
+            )
+        ]
+        review["timings"] = {
+            r["phase"]: r["seconds"] for r in self._fetchall(
+                "SELECT phase, seconds FROM timings WHERE review_id = ?", (review_id,)
+            )
+        }
+        return review
+
+    def _page(
+        self,
+        select: str,
+        conditions: List[str],
+        params: List[Any],
+        id_column: str,
+        cursor: Optional[int],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Run keyset-paginated query (one extra row tells whether a next page exists)"""
+        if cursor is not None:
+            conditions = conditions + [f"{id_column} < ?"]
+            params = params + [cursor]
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        sql = f"{select}{where} ORDER BY {id_column} DESC LIMIT ?"
+        return [dict(row) for row in self._fetchall(sql, params + [limit + 1])]
+
+    @staticmethod
+    def _split_page(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]["id"]
+        return rows, None
+
+    def _attach_review_types(self, issues: List[Dict[str, Any]]) -> None:
+        """Load review types of issues with one query"""
+        for issue in issues:
+            issue["auto_fixable"] = bool(issue["auto_fixable"])
+            issue["review_types"] = []
+        if not issues:
+            return
+        by_id = {issue["id"]: issue for issue in issues}
+        placeholders = ", ".join("?" for _ in by_id)
+        for row in self._fetchall(
+            f"SELECT issue_id, review_type FROM issue_review_types WHERE issue_id IN ({placeholders}) "
+            "ORDER BY rowid",
+            list(by_id)
+        ):
+            by_id[row["issue_id"]]["review_types"].append(row["review_type"])
+
+
+def week_start(day: date) -> date:
+    """Monday of the ISO week containing day"""
+    return day - timedelta(days=day.weekday())
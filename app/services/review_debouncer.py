@@ -0,0 +1,142 @@
+"""
+Review Debouncer
+
+Turns GitLab push events into reviews, one MR at a time:
+
+- A push schedules a review of the MR's head SHA after a quiet period;
+  further pushes within the period restart it, so a burst of pushes
+  results in one review of the last SHA.
+- A review waiting for a slot (max_concurrent reviews run at once) is
+  superseded by a newer push before it starts.
+- A running review of an older SHA is cancelled; the review of the new
+  SHA starts once the cancelled one has released its workspace.
+
+Pending reviews and slots are per process state. Pushes to one MR that land
+on different replicas are debounced separately and start overlapping
+reviews, so webhook deliveries must reach a single pod: run one replica or
+route all webhook requests to the same pod (see
+deployment/kubernetes/deployment.yaml).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+
+from app.utils.metrics import WEBHOOK_REVIEWS
+
+logger = logging.getLogger(__name__)
+
+MRKey = Tuple[int, int]  # (project_id, mr_iid)
+
+
+@dataclass
+class _PendingReview:
+    """Latest scheduled review of one MR"""
+    head_sha: str
+    task: asyncio.Task
+    stage: str = "quiet"  # quiet -> queued (waiting for a slot) -> running
+
+
+class ReviewDebouncer:
+    """Per-MR debouncing and supersession of webhook-triggered reviews"""
+
+    def __init__(
+        self,
+        run_review: Callable[[int, int, str], Awaitable[Any]],
+        quiet_seconds: float = 30,
+        max_concurrent: int = 2
+    ):
+        """
+        Initialize debouncer
+
+        Args:
+            run_review: Coroutine function (project_id, mr_iid, head_sha) running one review
+            quiet_seconds: Time without pushes before the review starts
+            max_concurrent: Webhook-triggered reviews running at once
+        """
+        self.run_review = run_review
+        self.quiet_seconds = quiet_seconds
+        self.max_concurrent = max_concurrent
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._pending: Dict[MRKey, _PendingReview] = {}
+
+    def submit(self, project_id: int, mr_iid: int, head_sha: str) -> str:
+        """
+        Schedule review of the MR head
+
+        Returns:
+            "scheduled", or "duplicate" if this SHA is already scheduled or being reviewed
+        """
+        key = (project_id, mr_iid)
+        previous = self._pending.get(key)
+        if previous is not None and previous.head_sha == head_sha:
+            WEBHOOK_REVIEWS.labels(outcome="duplicate").inc()
+            return "duplicate"
+        previous_task = self._supersede(key, reason=f"new head {head_sha[:8]}")
+        task = asyncio.create_task(
+            self._run(key, head_sha, previous_task),
+            name=f"webhook-review-{project_id}-{mr_iid}"
+        )
+        self._pending[key] = _PendingReview(head_sha=head_sha, task=task)
+        WEBHOOK_REVIEWS.labels(outcome="scheduled").inc()
+        return "scheduled"
+
+    def cancel(self, project_id: int, mr_iid: int) -> bool:
+        """Drop scheduled or running review of the MR (closed or merged); True if there was one"""
+        return self._supersede((project_id, mr_iid), reason="MR closed") is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Reviews per stage"""
+        stages = {"quiet": 0, "queued": 0, "running": 0}
+        for pending in self._pending.values():
+            stages[pending.stage] += 1
+        return stages
+
+    async def stop(self) -> None:
+        """Cancel all scheduled and running reviews and wait for them to finish"""
+        tasks = [pending.task for pending in self._pending.values()]
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def _supersede(self, key: MRKey, reason: str) -> Optional[asyncio.Task]:
+        """Cancel the MR's pending review; returns its task (it may still be cleaning up)"""
+        previous = self._pending.pop(key, None)
+        if previous is None or previous.task.done():
+            return None
+        # quiet: collapsed into the next push; queued: superseded before start; running: cancelled
+        outcome = {"quiet": "collapsed", "queued": "superseded", "running": "cancelled"}[previous.stage]
+        WEBHOOK_REVIEWS.labels(outcome=outcome).inc()
+        logger.info(
+            f"Review of project {key[0]}, MR !{key[1]} at {previous.head_sha[:8]} {outcome}: {reason}"
+        )
+        previous.task.cancel()
+        return previous.task
+
+    async def _run(self, key: MRKey, head_sha: str, previous: Optional[asyncio.Task]) -> None:
+        try:
+            await asyncio.sleep(self.quiet_seconds)
+            if previous is not None:
+                # Cancelled review of the older SHA still holds the MR's workspace
+                await asyncio.wait([previous])
+            self._set_stage(key, "queued")
+            async with self._slots:
+                self._set_stage(key, "running")
+                logger.info(f"Starting webhook review of project {key[0]}, MR !{key[1]} at {head_sha[:8]}")
+                await self.run_review(key[0], key[1], head_sha)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Webhook review of project {key[0]}, MR !{key[1]} failed: {str(e)}", exc_info=True)
+        finally:
+            pending = self._pending.get(key)
+            if pending is not None and pending.task is asyncio.current_task():
+                del self._pending[key]
+
+    def _set_stage(self, key: MRKey, stage: str) -> None:
+        pending = self._pending.get(key)
+        if pending is not None and pending.task is asyncio.current_task():
+            pending.stage = stage
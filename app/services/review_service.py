@@ -5,8 +5,9 @@ Main orchestrator for code reviews. Coordinates CLI managers, rules loading,
 GitLab integration, and MR creation.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
+import asyncio
 import logging
 import time
 from datetime import datetime
@@ -21,15 +22,25 @@ from app.models import (
     ReviewType,
     CLIAgent,
     IssueSeverity,
-    RefactoringImpact
+    RefactoringImpact,
+    SEVERITY_RANK
 )
-from app.services.base_cli_manager import BaseCLIManager
+from app.services.agent_failover import AgentFailover
+from app.services.base_cli_manager import BaseCLIManager, TaskOutcome
 from app.services.cline_cli_manager import ClineCLIManager
 from app.services.qwen_code_cli_manager import QwenCodeCLIManager
 from app.services.custom_rules_loader import CustomRulesLoader
+from app.services.issue_deduplicator import IssueDeduplicator
+from app.utils.blocking_io import run_blocking
+from app.utils.metrics import HEDGED_REVIEWS, PROMPT_BUILD_DURATION, PROMPT_SIZE
+from app.utils.phase_timings import collect_timings, current_timings, format_timings, record_phase, timed_phase
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+# Review types run first in fail_fast mode (most likely to find blocking issues)
+FAIL_FAST_PRIORITY = (ReviewType.ERROR_DETECTION, ReviewType.SECURITY_AUDIT)
+
 
 class ReviewService:
     """Main service for orchestrating code reviews"""
@@ -39,7 +50,9 @@ class ReviewService:
         cline_manager: ClineCLIManager,
         qwen_manager: QwenCodeCLIManager,
         rules_loader: CustomRulesLoader,
-        prompts_base_path: str = "prompts"
+        prompts_base_path: str = "prompts",
+        deduplicator: Optional[IssueDeduplicator] = None,
+        failover: Optional[AgentFailover] = None
     ):
         """
         Initialize review service
@@ -49,12 +62,19 @@ class ReviewService:
             qwen_manager: Qwen Code CLI manager instance
             rules_loader: Rules loader instance
             prompts_base_path: Base path for prompt files
+            deduplicator: Cross-review-type issue deduplicator (default instance if None)
+            failover: Hedging/circuit-breaking policy across agents (disabled if None)
         """
         self.cline_manager = cline_manager
         self.qwen_manager = qwen_manager
         self.rules_loader = rules_loader
         self.prompts_base_path = Path(prompts_base_path)
+        self.deduplicator = deduplicator or IssueDeduplicator()
+        self.failover = failover
+        # Prompt path -> (mtime_ns, prompt with embedded references)
+        self._prompt_cache: Dict[Path, Tuple[int, str]] = {}
         
+    @traced("execute_review")
     async def execute_review(
         self,
         request: ReviewRequest,
@@ -74,49 +94,72 @@ class ReviewService:
             Changed files are automatically determined by CLI agents via git diff.
             No need to pass changed_files list - CLI detects them automatically.
         """
-        start_time = time.time()
-        
-        # Select CLI manager
-        cli_manager = self._get_cli_manager(request.agent)
-        logger.info(f"Using {request.agent.value} for review")
-        
-        # Load rules
-        rules = self.rules_loader.load_rules(
-            language=request.language.value,
-            repo_path=repo_path,
-            confluence_rules=request.confluence_rules
-        )
-        logger.info(f"Loaded {len(rules)} rule categories")
-        
-        # Get combined rules content for prompts
-        combined_rules = self.rules_loader.get_combined_rules_content(rules)
-        
-        # Expand ALL review type
-        review_types = self._expand_review_types(request.review_types)
-        logger.info(f"Executing {len(review_types)} review types: {[rt.value for rt in review_types]}")
-        
-        # Load prompts for review types
-        prompts = self._load_prompts(request.agent, review_types)
-        
-        # Execute reviews in parallel
-        # Note: changed_files are automatically determined by CLI via git diff
-        raw_results = await cli_manager.execute_parallel_reviews(
-            review_types=review_types,
-            repo_path=repo_path,
-            prompts=prompts,
-            custom_rules=combined_rules,
-            jira_context=request.jira_context
-        )
-        
-        # Aggregate results
-        result = self._aggregate_results(
-            raw_results=raw_results,
-            agent=request.agent,
-            start_time=start_time
-        )
-        
-        logger.info(f"Review completed: {result.summary.total_issues} issues found")
-        return result
+        # Continue the caller's timings (clone is measured before) or start new ones
+        with collect_timings(current_timings()) as timings:
+            start_time = time.time()
+            
+            # Select CLI manager (the other agent if the requested one's circuit is open)
+            agent = self._route_agent(request.agent)
+            cli_manager = self._get_cli_manager(agent)
+            logger.info(f"Using {agent.value} for review")
+            
+            # Load rules
+            with timed_phase("rules_load"):
+                rules = await run_blocking(
+                    self.rules_loader.load_rules,
+                    language=request.language.value,
+                    repo_path=repo_path,
+                    confluence_rules=request.confluence_rules
+                )
+                logger.info(f"Loaded {len(rules)} rule categories")
+            
+                # Get combined rules content for prompts
+                combined_rules = self.rules_loader.get_combined_rules_content(rules)
+            
+            # Expand ALL review type
+            review_types = self._expand_review_types(request.review_types)
+            stop_when = None
+            if request.fail_fast:
+                review_types = self._prioritize_review_types(review_types)
+                stop_when = self._blocking_threshold(request.fail_fast_severity, request.fail_fast_min_issues)
+            logger.info(f"Executing {len(review_types)} review types: {[rt.value for rt in review_types]}")
+            
+            # Load prompts for review types (file reads off the event loop)
+            prompts = await run_blocking(self._load_prompts, agent, review_types)
+            
+            # Execute reviews in parallel
+            # Note: changed_files are automatically determined by CLI via git diff
+            raw_results = await cli_manager.execute_parallel_reviews(
+                review_types=review_types,
+                repo_path=repo_path,
+                prompts=prompts,
+                custom_rules=combined_rules,
+                jira_context=request.jira_context,
+                stop_when=stop_when,
+                run_review=self._failover_runner(
+                    cli_manager, repo_path, prompts, combined_rules, request.jira_context
+                )
+            )
+            skipped = [ReviewType(r['review_type']) for r in raw_results if r.get('skipped')]
+            raw_results = [r for r in raw_results if not r.get('skipped')]
+            
+            # Aggregate results
+            with timed_phase("aggregate"):
+                result = self._aggregate_results(
+                    raw_results=raw_results,
+                    agent=agent,
+                    start_time=start_time
+                )
+            if skipped:
+                result.stopped_early = True
+                result.skipped_review_types = skipped
+                logger.info(f"Review stopped early, skipped: {[rt.value for rt in skipped]}")
+            
+            timings.review = round(result.execution_time_seconds, 3)
+            result.timings = timings
+            logger.info(f"Review completed: {result.summary.total_issues} issues found")
+            logger.info(f"Review timings: {format_timings(timings)}")
+            return result
     
     def _get_cli_manager(self, agent: CLIAgent) -> BaseCLIManager:
         """Get appropriate CLI manager"""
@@ -127,6 +170,181 @@ class ReviewService:
         else:
             raise ValueError(f"Unknown CLI agent: {agent}")
     
+    @staticmethod
+    def _other_agent(agent: CLIAgent) -> CLIAgent:
+        return CLIAgent.QWEN_CODE if agent == CLIAgent.CLINE else CLIAgent.CLINE
+    
+    def _route_agent(self, requested: CLIAgent) -> CLIAgent:
+        """Requested agent, or the other one while the requested agent's circuit is open"""
+        if self.failover is None or self.failover.breakers[requested].allow():
+            return requested
+        other = self._other_agent(requested)
+        if self.failover.breakers[other].allow():
+            logger.warning(f"Circuit of {requested.value} is open, routing review to {other.value}")
+            return other
+        return requested
+    
+    def _failover_runner(
+        self,
+        primary: BaseCLIManager,
+        repo_path: str,
+        prompts: Dict[ReviewType, str],
+        custom_rules: Optional[str],
+        jira_context: Optional[str]
+    ) -> Optional[Callable[[ReviewType, str, TaskOutcome], Awaitable[Dict[str, Any]]]]:
+        """run_review callback for execute_parallel_reviews, None if failover is disabled"""
+        if self.failover is None:
+            return None
+        
+        async def run(review_type: ReviewType, workspace_path: str, slot: TaskOutcome) -> Dict[str, Any]:
+            return await self._run_with_failover(
+                primary, review_type, workspace_path, repo_path, prompts[review_type], custom_rules, jira_context,
+                slot
+            )
+        
+        return run
+    
+    async def _run_with_failover(
+        self,
+        primary: BaseCLIManager,
+        review_type: ReviewType,
+        workspace_path: str,
+        repo_path: str,
+        prompt: str,
+        custom_rules: Optional[str],
+        jira_context: Optional[str],
+        slot: Optional[TaskOutcome] = None
+    ) -> Dict[str, Any]:
+        """
+        Run one review type on the primary agent, hedged or retried on the other one
+        
+        - Still running after the primary's p95 latency for this review type:
+          the same review starts on the other agent, the first successful
+          result wins and the slower run is cancelled.
+        - Failed before a hedge was started: the review type is retried on
+          the other agent.
+        Both only happen while the other agent's circuit allows it. A result
+        produced by the other agent names it in metadata.agent.
+        
+        Each agent's adaptive limit only sees that agent's own run: the
+        primary's latency or overload goes into slot (the primary's task
+        slot), a hedge or failover run takes a slot of the other agent.
+        
+        Raises:
+            The last run's exception if no run succeeded
+        """
+        failover = self.failover
+        secondary = self._get_cli_manager(self._other_agent(primary.agent_type))
+        primary_task = asyncio.create_task(
+            self._timed_review(
+                primary, review_type, workspace_path, prompt, custom_rules, jira_context, slot or TaskOutcome()
+            )
+        )
+        runs = {primary_task: primary}
+        reason: Optional[str] = None
+        
+        def start_secondary(run_reason: str) -> asyncio.Task:
+            nonlocal reason
+            reason = run_reason
+            logger.info(
+                f"Starting {review_type.value} review on {secondary.agent_type.value} "
+                f"({run_reason} of {primary.agent_type.value})"
+            )
+            task = asyncio.create_task(
+                self._secondary_review(secondary, review_type, repo_path, custom_rules, jira_context, run_reason)
+            )
+            runs[task] = secondary
+            return task
+        
+        try:
+            done, pending = await asyncio.wait(
+                {primary_task}, timeout=failover.hedge_delay(primary.agent_type, review_type)
+            )
+            if pending and failover.can_hedge() and failover.breakers[secondary.agent_type].allow():
+                pending.add(start_secondary("hedge"))
+            while True:
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        winner = runs[task].agent_type
+                        if reason is not None:
+                            HEDGED_REVIEWS.labels(reason=reason, winner=winner.value).inc()
+                        result = task.result()
+                        if winner != primary.agent_type:
+                            # Reported per review type, ReviewResult.agent names the primary
+                            metadata = result.get('metadata')
+                            if not isinstance(metadata, dict):
+                                metadata = result['metadata'] = {}
+                            metadata['agent'] = winner.value
+                        return result
+                    logger.warning(f"{review_type.value} review on {runs[task].agent_type.value} failed: {str(error)}")
+                    if reason is None and failover.breakers[secondary.agent_type].allow():
+                        pending.add(start_secondary("failover"))
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in runs:
+                task.cancel()
+            await asyncio.gather(*runs, return_exceptions=True)
+    
+    async def _secondary_review(
+        self,
+        manager: BaseCLIManager,
+        review_type: ReviewType,
+        repo_path: str,
+        custom_rules: Optional[str],
+        jira_context: Optional[str],
+        reason: str
+    ) -> Dict[str, Any]:
+        """Hedge/failover run in its own workspace view and task slot, with the agent's own prompt"""
+        hedge = reason == "hedge"
+        if hedge:
+            self.failover.hedges_in_flight += 1
+        try:
+            prompts = await run_blocking(self._load_prompts, manager.agent_type, [review_type])
+            async with manager.agent_slot() as slot:
+                async with manager.workspace(repo_path, review_type) as workspace_path:
+                    return await self._timed_review(
+                        manager, review_type, workspace_path, prompts[review_type], custom_rules, jira_context, slot
+                    )
+        finally:
+            if hedge:
+                self.failover.hedges_in_flight -= 1
+    
+    async def _timed_review(
+        self,
+        manager: BaseCLIManager,
+        review_type: ReviewType,
+        workspace_path: str,
+        prompt: str,
+        custom_rules: Optional[str],
+        jira_context: Optional[str],
+        slot: TaskOutcome
+    ) -> Dict[str, Any]:
+        """execute_review reporting latency and outcome to the failover policy and the agent's task slot"""
+        slot.key = review_type.value
+        started = time.perf_counter()
+        try:
+            result = await manager.execute_review(
+                review_type=review_type,
+                repo_path=workspace_path,
+                prompt_content=prompt,
+                custom_rules=custom_rules,
+                jira_context=jira_context
+            )
+        except asyncio.CancelledError:
+            # Lost the race or review cancelled: no verdict on the agent
+            self.failover.breakers[manager.agent_type].release_trial()
+            raise
+        except Exception as e:
+            self.failover.record(manager.agent_type, review_type, None)
+            slot.overload = BaseCLIManager.overload_reason(e)
+            raise
+        slot.latency = time.perf_counter() - started
+        self.failover.record(manager.agent_type, review_type, slot.latency)
+        return result
+    
     def _expand_review_types(self, review_types: List[ReviewType]) -> List[ReviewType]:
         """
         Expand ALL review type to specific types
@@ -152,6 +370,41 @@ class ReviewService:
             ]
         return review_types
     
+    def _prioritize_review_types(self, review_types: List[ReviewType]) -> List[ReviewType]:
+        """Move FAIL_FAST_PRIORITY types to the front, keeping the order of the others"""
+        first = [rt for rt in FAIL_FAST_PRIORITY if rt in review_types]
+        return first + [rt for rt in review_types if rt not in first]
+    
+    def _blocking_threshold(
+        self,
+        min_severity: IssueSeverity,
+        min_issues: int
+    ) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Predicate telling when enough blocking issues have been found
+        
+        Args:
+            min_severity: Lowest severity counted as blocking
+            min_issues: Blocking issues (over all finished review types) that stop the review
+            
+        Returns:
+            Function called with each raw CLI result, True once the threshold is reached
+        """
+        found = 0
+        
+        def reached(raw_result: Dict[str, Any]) -> bool:
+            nonlocal found
+            for issue in raw_result.get('issues', []):
+                try:
+                    severity = IssueSeverity(issue.get('severity', 'MEDIUM'))
+                except ValueError:
+                    continue
+                if SEVERITY_RANK[severity] >= SEVERITY_RANK[min_severity]:
+                    found += 1
+            return found >= min_issues
+        
+        return reached
+    
     def _load_prompts(
         self,
         agent: CLIAgent,
@@ -168,6 +421,7 @@ class ReviewService:
             Dict mapping review type to prompt content with embedded references
         """
         prompts = {}
+        build_start = time.perf_counter()
         
         # Determine prompt directory based on agent
         if agent == CLIAgent.CLINE:
@@ -192,14 +446,8 @@ class ReviewService:
             
             if prompt_path.exists():
                 try:
-                    with open(prompt_path, 'r', encoding='utf-8') as f:
-                        prompt_content = f.read()
-                    
-                    # Embed referenced files
-                    prompt_content = self._embed_referenced_files(prompt_content)
-                    
-                    prompts[review_type] = prompt_content
-                    logger.debug(f"Loaded prompt for {review_type.value}: {prompt_path}")
+                    prompts[review_type] = self._read_prompt(prompt_path)
+                    logger.debug("Loaded prompt for %s: %s", review_type.value, prompt_path)
                 except Exception as e:
                     logger.error(f"Failed to load prompt {prompt_path}: {str(e)}")
                     prompts[review_type] = self._get_fallback_prompt(review_type)
@@ -207,8 +455,50 @@ class ReviewService:
                 logger.warning(f"Prompt file not found for {review_type.value}: {prompt_path}")
                 prompts[review_type] = self._get_fallback_prompt(review_type)
         
+        build_seconds = time.perf_counter() - build_start
+        PROMPT_BUILD_DURATION.labels(agent=agent.value).observe(build_seconds)
+        record_phase("prompt_build", build_seconds)
+        for review_type, prompt_content in prompts.items():
+            PROMPT_SIZE.labels(review_type=review_type.value).observe(len(prompt_content.encode('utf-8')))
+        
         return prompts
     
+    def _read_prompt(self, prompt_path: Path) -> str:
+        """
+        Read prompt file with embedded references (cached until the file changes)
+        
+        Args:
+            prompt_path: Prompt file path
+            
+        Returns:
+            Prompt content with embedded references
+        """
+        mtime_ns = prompt_path.stat().st_mtime_ns
+        cached = self._prompt_cache.get(prompt_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with open(prompt_path, 'r', encoding='utf-8') as f:
+            prompt_content = f.read()
+        
+        # Embed referenced files
+        prompt_content = self._embed_referenced_files(prompt_content)
+        
+        self._prompt_cache[prompt_path] = (mtime_ns, prompt_content)
+        return prompt_content
+    
+    def preload_prompts(self) -> int:
+        """
+        Read and cache prompts of all review types for every agent
+        
+        Returns:
+            Number of cached prompt files
+        """
+        review_types = self._expand_review_types([ReviewType.ALL])
+        for agent in (CLIAgent.CLINE, CLIAgent.QWEN_CODE):
+            self._load_prompts(agent, review_types)
+        return len(self._prompt_cache)
+    
     def _embed_referenced_files(self, prompt_content: str) -> str:
         """
         Find and embed referenced files into prompt content
@@ -365,6 +655,7 @@ Note: Changed files will be automatically determined by CLI via git diff
 ```
 """
     
+    @traced("aggregate_results")
     def _aggregate_results(
         self,
         raw_results: List[Dict[str, Any]],
@@ -385,8 +676,22 @@ Note: Changed files will be automatically determined by CLI via git diff
         all_issues = []
         all_refactoring = []
         all_documentation = []
+        json_repairs: Dict[str, Any] = {}
+        agents: Dict[str, str] = {}
         
         for result in raw_results:
+            try:
+                source_types = [ReviewType(result.get('review_type'))]
+            except ValueError:
+                source_types = []
+            
+            metadata = result.get('metadata')
+            if not isinstance(metadata, dict):
+                metadata = {}
+            agents[str(result.get('review_type'))] = metadata.get('agent', agent.value)
+            if metadata.get('json_repair') is not None:
+                json_repairs[str(result.get('review_type'))] = metadata['json_repair']
+            
             # Parse issues
             for issue_data in result.get('issues', []):
                 try:
@@ -400,7 +705,8 @@ Note: Changed files will be automatically determined by CLI via git diff
                         suggestion=issue_data.get('suggestion', ''),
                         auto_fixable=issue_data.get('auto_fixable', False),
                         cwe=issue_data.get('cwe'),
-                        rule_source=issue_data.get('rule_source', 'default')
+                        rule_source=issue_data.get('rule_source', 'default'),
+                        review_types=source_types
                     )
                     all_issues.append(issue)
                 except Exception as e:
@@ -439,6 +745,9 @@ Note: Changed files will be automatically determined by CLI via git diff
                 except Exception as e:
                     logger.error(f"Failed to parse documentation: {str(e)}")
         
+        # Merge the same finding reported by several review types
+        all_issues, duplicates_collapsed = self.deduplicator.deduplicate(all_issues)
+        
         # Calculate summary
         summary = ReviewSummary(
             total_issues=len(all_issues),
@@ -448,7 +757,8 @@ Note: Changed files will be automatically determined by CLI via git diff
             low=sum(1 for i in all_issues if i.severity == IssueSeverity.LOW),
             info=sum(1 for i in all_issues if i.severity == IssueSeverity.INFO),
             files_analyzed=len(set(i.file for i in all_issues)),
-            auto_fixable_count=sum(1 for i in all_issues if i.auto_fixable)
+            auto_fixable_count=sum(1 for i in all_issues if i.auto_fixable),
+            duplicates_collapsed=duplicates_collapsed
         )
         
         execution_time = time.time() - start_time
@@ -461,9 +771,18 @@ Note: Changed files will be automatically determined by CLI via git diff
             documentation_additions=all_documentation,
             summary=summary,
             execution_time_seconds=execution_time,
+            metadata=self._result_metadata(agents, json_repairs),
             timestamp=datetime.utcnow()
         )
     
+    @staticmethod
+    def _result_metadata(agents: Dict[str, str], json_repairs: Dict[str, Any]) -> Dict[str, Any]:
+        """ReviewResult.metadata: agent per review type and JSON repair reports"""
+        metadata: Dict[str, Any] = {"agents": agents}
+        if json_repairs:
+            metadata["json_repair"] = json_repairs
+        return metadata
+    
     async def health_check(self) -> Dict[str, bool]:
         """
         Check health of CLI agents and dependencies
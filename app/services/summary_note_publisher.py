@@ -0,0 +1,140 @@
+"""
+Summary Note Publisher
+
+Keeps a single review summary note per merge request. The note id and the
+hash of its rendered content are tracked in a local SQLite store; repeated
+review runs update the existing note in place (PUT) or skip the API call
+entirely when the content did not change.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+import hashlib
+import logging
+
+import httpx
+
+from app.services.gitlab_service import GitLabService
+from app.utils.blocking_io import run_blocking
+from app.utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class MRNoteStore(SQLiteStore):
+    """Local store of summary note ids per merge request"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS mr_summary_notes (
+        project_id INTEGER NOT NULL,
+        mr_iid INTEGER NOT NULL,
+        note_id INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (project_id, mr_iid)
+    );
+    """
+
+    def get(self, project_id: int, mr_iid: int) -> Optional[Tuple[int, str]]:
+        """
+        Get tracked summary note
+
+        Returns:
+            Tuple of (note_id, content_hash) or None if not tracked
+        """
+        row = self._fetchone(
+            "SELECT note_id, content_hash FROM mr_summary_notes WHERE project_id = ? AND mr_iid = ?",
+            (project_id, mr_iid)
+        )
+        return (row["note_id"], row["content_hash"]) if row else None
+
+    def save(self, project_id: int, mr_iid: int, note_id: int, content_hash: str) -> None:
+        """Insert or replace tracked summary note"""
+        self._execute(
+            "INSERT INTO mr_summary_notes (project_id, mr_iid, note_id, content_hash, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (project_id, mr_iid) DO UPDATE SET "
+            "note_id = excluded.note_id, content_hash = excluded.content_hash, updated_at = excluded.updated_at",
+            (project_id, mr_iid, note_id, content_hash, datetime.utcnow().isoformat())
+        )
+
+    def delete(self, project_id: int, mr_iid: int) -> None:
+        """Forget tracked summary note"""
+        self._execute(
+            "DELETE FROM mr_summary_notes WHERE project_id = ? AND mr_iid = ?",
+            (project_id, mr_iid)
+        )
+
+
+class SummaryNotePublisher:
+    """Publisher that maintains one summary note per MR"""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+
+    def __init__(self, gitlab_service: GitLabService, store: MRNoteStore):
+        """
+        Initialize publisher
+
+        Args:
+            gitlab_service: GitLab API service
+            store: Note id store
+        """
+        self.gitlab = gitlab_service
+        self.store = store
+
+    async def publish(
+        self,
+        project_id: int,
+        mr_iid: int,
+        comment: str,
+        content_key: Optional[str] = None
+    ) -> str:
+        """
+        Create, update or skip the MR summary note
+
+        Args:
+            project_id: GitLab project ID
+            mr_iid: MR IID
+            comment: Rendered note body
+            content_key: Text used for change detection (defaults to comment).
+                Pass a rendering without volatile parts (timings) to skip
+                updates that would only change those parts.
+
+        Returns:
+            Action taken: 'created', 'updated' or 'unchanged'
+        """
+        content_hash = hashlib.sha256((content_key or comment).encode('utf-8')).hexdigest()
+        tracked = await run_blocking(self.store.get, project_id, mr_iid)
+
+        if tracked:
+            note_id, previous_hash = tracked
+            if previous_hash == content_hash:
+                logger.info(f"Summary note {note_id} on MR !{mr_iid} is up to date, skipping")
+                return self.UNCHANGED
+
+            try:
+                await self.gitlab.update_mr_comment(
+                    project_id=project_id,
+                    mr_iid=mr_iid,
+                    note_id=note_id,
+                    comment=comment
+                )
+                await run_blocking(self.store.save, project_id, mr_iid, note_id, content_hash)
+                logger.info(f"Updated summary note {note_id} on MR !{mr_iid}")
+                return self.UPDATED
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                # Note was deleted by a user - fall through and create a new one
+                logger.info(f"Summary note {note_id} on MR !{mr_iid} no longer exists, creating new note")
+
+        note = await self.gitlab.post_mr_comment(
+            project_id=project_id,
+            mr_iid=mr_iid,
+            comment=comment
+        )
+        await run_blocking(self.store.save, project_id, mr_iid, note['id'], content_hash)
+        logger.info(f"Created summary note {note['id']} on MR !{mr_iid}")
+        return self.CREATED
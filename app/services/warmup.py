@@ -0,0 +1,135 @@
+"""
+Startup Warm-up
+
+Loads everything a first review would otherwise pay for (CLI managers and
+their system prompt, review prompts with embedded references, default rules,
+the compiled JSON schema validator) in a background task started by the
+application lifespan, so the app accepts traffic immediately.
+
+Blocking steps run in the blocking I/O pool (run_blocking); async steps are
+awaited. A failed step
+is retried with exponential backoff; if it still fails the warm-up finishes
+"degraded" (the first review loads what is missing lazily) instead of keeping
+the pod unready until restart. The service reports ready (see
+HealthMonitor.is_ready) only after the warm-up has finished.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import inspect
+import logging
+import time
+
+from app.utils.blocking_io import run_blocking
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Tuple[str, Callable[[], Any]]
+
+
+class Warmup:
+    """Runs warm-up steps once in background and tracks their outcome"""
+
+    def __init__(
+        self,
+        steps: List[WarmupStep],
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 2.0
+    ):
+        """
+        Initialize warm-up
+
+        Args:
+            steps: (name, callable) pairs run in order; sync callables run in a thread
+            max_attempts: Attempts per step before it is given up
+            retry_backoff_seconds: Delay before the first retry (doubles per retry)
+        """
+        self.steps = steps
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.state = "pending"  # pending -> running -> ready | degraded
+        self.durations: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether warm-up has finished (steps given up on are listed in errors)"""
+        return self.state in ("ready", "degraded")
+
+    @property
+    def elapsed_seconds(self) -> Optional[float]:
+        """Wall time of the warm-up so far (total once finished), None before start"""
+        if self._started_at is None:
+            return None
+        end = self._finished_at if self._finished_at is not None else time.monotonic()
+        return end - self._started_at
+
+    def status(self) -> Dict[str, Any]:
+        """Warm-up summary for readiness probes"""
+        elapsed = self.elapsed_seconds
+        return {
+            "state": self.state,
+            "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "steps": dict(self.durations),
+            "errors": dict(self.errors),
+        }
+
+    async def run(self) -> bool:
+        """
+        Run all steps (a step that keeps failing is logged and the remaining ones still run)
+
+        Returns:
+            True if every step succeeded
+        """
+        self.state = "running"
+        self._started_at = time.monotonic()
+        for name, step in self.steps:
+            start = time.perf_counter()
+            try:
+                await self._run_step(name, step)
+            except Exception as e:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+                logger.error(f"Warm-up step '{name}' failed: {self.errors[name]}", exc_info=True)
+            finally:
+                self.durations[name] = round(time.perf_counter() - start, 3)
+
+        self._finished_at = time.monotonic()
+        self.state = "degraded" if self.errors else "ready"
+        steps = " ".join(f"{name}={seconds:.2f}s" for name, seconds in self.durations.items())
+        logger.info(f"Warm-up {self.state} in {self.elapsed_seconds:.2f}s: {steps}")
+        return not self.errors
+
+    async def _run_step(self, name: str, step: Callable[[], Any]) -> None:
+        """Run one step, retrying failures with exponential backoff"""
+        for attempt in range(self.max_attempts):
+            try:
+                if inspect.iscoroutinefunction(step):
+                    await step()
+                else:
+                    await run_blocking(step)
+                return
+            except Exception as e:
+                if attempt + 1 >= self.max_attempts:
+                    raise
+                delay = self.retry_backoff_seconds * (2 ** attempt)
+                logger.warning(f"Warm-up step '{name}' failed ({type(e).__name__}: {e}), "
+                               f"retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """Start warm-up in background (no-op if already started)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="warmup")
+
+    async def stop(self) -> None:
+        """Cancel warm-up if still running"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,265 @@
+"""
+Workspace Janitor
+
+Keeps WORK_DIR bounded without deleting checkouts on the request path:
+
+- discard() atomically renames a workspace into WORK_DIR/.trash (a
+  metadata-only operation); a background task deletes the trash.
+- On start, workspaces left behind by a crashed process (per-MR and pooled
+  checkouts nobody has claimed, per-agent views) are moved to the trash.
+- When WORK_DIR exceeds WORKSPACE_QUOTA_BYTES, idle workspaces are evicted
+  least recently used first. Workspaces marked active are never evicted:
+  the sweep runs in a worker thread, so the active set is guarded by a lock
+  and re-checked right before each rename.
+- Disk usage and workspace counts are exported as metrics.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+import os
+import shutil
+import threading
+import time
+
+from app.utils.blocking_io import run_blocking
+from app.utils.metrics import WORKSPACE_DISK_BYTES, WORKSPACE_EVICTIONS, WORKSPACES
+
+logger = logging.getLogger(__name__)
+
+TRASH_DIR_NAME = ".trash"
+ORPHAN_PATTERNS = ("project-*-mr-*", "project-*-pool-*", ".views")
+
+
+def directory_size(path: Path) -> int:
+    """Total size of regular files under path in bytes (symlinks are not followed)"""
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue  # removed while scanning
+        except OSError:
+            continue
+    return total
+
+
+class WorkspaceJanitor:
+    """Deferred deletion, orphan sweep and disk quota for WORK_DIR"""
+
+    def __init__(self, work_dir: str, quota_bytes: int = 0, interval_seconds: float = 60):
+        """
+        Initialize janitor
+
+        Args:
+            work_dir: Directory holding the workspaces
+            quota_bytes: Disk quota of work_dir (0 = unlimited)
+            interval_seconds: Pause between background sweeps
+        """
+        self.work_dir = Path(work_dir)
+        self.trash_dir = self.work_dir / TRASH_DIR_NAME
+        self.quota_bytes = quota_bytes
+        self.interval_seconds = interval_seconds
+
+        self._active: Set[Path] = set()
+        self._last_used: Dict[Path, float] = {}  # workspace -> time.time() of last release
+        self._lock = threading.Lock()  # _active/_last_used: event loop vs. sweep thread
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.usage_bytes = 0
+        self.trash_bytes = 0
+
+    def mark_active(self, path: str) -> None:
+        """Protect workspace from eviction while it is in use (no eviction starts after this returns)"""
+        with self._lock:
+            self._active.add(Path(path))
+
+    def mark_idle(self, path: str) -> None:
+        """Release workspace; it becomes an eviction candidate (LRU by release time)"""
+        workspace = Path(path)
+        with self._lock:
+            self._active.discard(workspace)
+            self._last_used[workspace] = time.time()
+
+    def discard(self, path: str) -> Optional[Path]:
+        """
+        Move workspace into the trash for background deletion
+
+        Args:
+            path: Workspace directory inside work_dir
+
+        Returns:
+            Trash path, None if the workspace does not exist
+        """
+        target = self._move_to_trash(Path(path))
+        if target is not None:
+            self._wakeup.set()
+        return target
+
+    def _move_to_trash(self, workspace: Path, only_idle: bool = False) -> Optional[Path]:
+        """
+        Rename workspace into the trash
+
+        Args:
+            workspace: Workspace directory
+            only_idle: Leave the workspace alone if it is marked active (eviction,
+                orphan sweep); checked under the lock right before the rename
+
+        Returns:
+            Trash path, None if the workspace does not exist or is active
+        """
+        # Rename within the same filesystem: atomic, independent of checkout size
+        with self._lock:
+            if only_idle and workspace in self._active:
+                return None  # leased since it was chosen
+            self._active.discard(workspace)
+            self._last_used.pop(workspace, None)
+            self.trash_dir.mkdir(parents=True, exist_ok=True)
+            target = self.trash_dir / f"{workspace.name}.{time.time_ns()}"
+            try:
+                os.rename(workspace, target)
+            except FileNotFoundError:
+                return None
+        return target
+
+    def sweep_orphans(self) -> List[Path]:
+        """Move unclaimed checkouts and agent views (left by a crashed process) to the trash"""
+        candidates = [
+            entry for pattern in ORPHAN_PATTERNS for entry in self.work_dir.glob(pattern)
+            if entry.is_dir()
+        ]
+        orphans = [entry for entry in candidates if self._move_to_trash(entry, only_idle=True) is not None]
+        if orphans:
+            logger.info(f"Moved {len(orphans)} orphaned workspaces to trash")
+        return orphans
+
+    def empty_trash(self) -> int:
+        """Delete everything in the trash (blocking); returns number of removed entries"""
+        if not self.trash_dir.exists():
+            return 0
+        removed = 0
+        for entry in self.trash_dir.iterdir():
+            try:
+                if entry.is_dir() and not entry.is_symlink():
+                    shutil.rmtree(entry)
+                else:
+                    entry.unlink()
+                removed += 1
+            except OSError as e:
+                logger.error(f"Failed to delete {entry}: {e}")
+        return removed
+
+    def enforce_quota(self) -> List[Path]:
+        """
+        Measure usage and evict idle workspaces over quota, least recently used first (blocking)
+
+        Returns:
+            Evicted workspaces
+        """
+        sizes = self._workspace_sizes()
+        self.usage_bytes = sum(sizes.values())
+        evicted = []
+        if self.quota_bytes and self.usage_bytes > self.quota_bytes:
+            with self._lock:
+                active = set(self._active)
+                last_used = dict(self._last_used)
+            idle = sorted(
+                (workspace for workspace in sizes if workspace not in active),
+                key=lambda workspace: self._last_used_at(workspace, last_used)
+            )
+            for workspace in idle:
+                if self.usage_bytes <= self.quota_bytes:
+                    break
+                if self._move_to_trash(workspace, only_idle=True) is not None:
+                    self.usage_bytes -= sizes[workspace]
+                    evicted.append(workspace)
+                    WORKSPACE_EVICTIONS.inc()
+            if evicted:
+                logger.info(f"Evicted {len(evicted)} idle workspaces to stay within disk quota")
+            if self.usage_bytes > self.quota_bytes:
+                logger.warning(
+                    f"Workspace usage {self.usage_bytes} bytes exceeds quota {self.quota_bytes} "
+                    f"with only active workspaces left"
+                )
+
+        with self._lock:
+            active = sum(1 for workspace in sizes if workspace in self._active and workspace not in evicted)
+        WORKSPACES.labels(state="active").set(active)
+        WORKSPACES.labels(state="idle").set(len(sizes) - len(evicted) - active)
+        WORKSPACE_DISK_BYTES.labels(area="workspaces").set(self.usage_bytes)
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Usage summary as of the last sweep (trash: pending deletion when it started)"""
+        return {
+            "usage_bytes": self.usage_bytes,
+            "trash_bytes": self.trash_bytes,
+            "quota_bytes": self.quota_bytes,
+            "active": len(self._active),
+        }
+
+    def sweep(self) -> int:
+        """One janitor pass: enforce quota, then empty the trash (blocking); returns removed entries"""
+        self.enforce_quota()
+        self.trash_bytes = directory_size(self.trash_dir)
+        WORKSPACE_DISK_BYTES.labels(area="trash").set(self.trash_bytes)
+        return self.empty_trash()
+
+    def _workspace_sizes(self) -> Dict[Path, int]:
+        if not self.work_dir.exists():
+            return {}
+        return {
+            entry: directory_size(entry)
+            for entry in self.work_dir.iterdir()
+            if entry.is_dir() and not entry.name.startswith(".")  # trash, agent views
+        }
+
+    @staticmethod
+    def _last_used_at(workspace: Path, last_used_times: Dict[Path, float]) -> float:
+        last_used = last_used_times.get(workspace)
+        if last_used is not None:
+            return last_used
+        try:
+            return workspace.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def start(self) -> None:
+        """Sweep orphans and start background loop (no-op if running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="workspace-janitor")
+
+    async def stop(self) -> None:
+        """Stop background loop (trash left behind is deleted on next start)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await run_blocking(self.sweep_orphans)
+        except Exception as e:
+            logger.error(f"Orphan workspace sweep failed: {str(e)}", exc_info=True)
+        while True:
+            self._wakeup.clear()
+            try:
+                await run_blocking(self.sweep)
+            except Exception as e:
+                logger.error(f"Workspace janitor sweep failed: {str(e)}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,165 @@
+"""
+Per-Agent Workspace Views
+
+Parallel CLI review tasks of one review run in the same checkout. Agents
+that write scratch files or try out edits race with each other, so every
+task gets its own copy-on-write view of the checkout instead:
+
+- overlay:  overlayfs mount with the checkout as read-only lower layer;
+            writes land in a private upper directory (needs mount rights)
+- reflink:  `cp -a --reflink=always`; file data is shared until written
+            (btrfs, xfs, ...)
+- hardlink: copy of the working tree and git metadata, with only the
+            immutable files under .git/objects hard-linked (git never
+            rewrites an object file in place); works on any filesystem,
+            but costs a full working-tree copy (time and disk) per task
+
+mode="auto" tries overlay and reflink in that order and remembers the ones
+the host does not support; if neither works, the task runs in the shared
+checkout. hardlink is never picked by "auto", only when set explicitly.
+Views are created in a ".views" directory next to the checkout, on the same
+filesystem, which hard links and reflinks require.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Set
+import logging
+import os
+import shutil
+import subprocess
+import time
+
+from app.utils.metrics import WORKSPACE_VIEW_SETUP
+
+logger = logging.getLogger(__name__)
+
+VIEWS_DIR_NAME = ".views"
+VIEW_MODES = ("overlay", "reflink", "hardlink")
+AUTO_VIEW_MODES = ("overlay", "reflink")  # modes without a full copy per task
+
+
+@dataclass
+class WorkspaceView:
+    """Private view of a checkout used by one review task"""
+    path: str
+    mode: str
+    root: Path  # view directory (overlay: holds upper, work and merged)
+    setup_seconds: float
+
+
+class WorkspaceViewFactory:
+    """Creates and removes copy-on-write views of checkouts"""
+
+    def __init__(self, mode: str = "auto"):
+        """
+        Initialize factory
+
+        Args:
+            mode: "auto" or one of VIEW_MODES
+        """
+        if mode != "auto" and mode not in VIEW_MODES:
+            raise ValueError(f"Unknown workspace view mode: {mode}")
+        self.mode = mode
+        self._unsupported: Set[str] = set()
+
+    def create(self, repo_path: str, name: str) -> WorkspaceView:
+        """
+        Create view of a checkout (blocking)
+
+        Args:
+            repo_path: Checkout to isolate
+            name: Readable part of the view directory name (e.g. review type)
+
+        Returns:
+            Created view
+
+        Raises:
+            OSError: If no mode could create the view
+        """
+        source = Path(repo_path)
+        root = source.parent / VIEWS_DIR_NAME / f"{source.name}-{name}-{time.time_ns()}"
+        modes = AUTO_VIEW_MODES if self.mode == "auto" else (self.mode,)
+        last_error: Optional[Exception] = None
+        for mode in modes:
+            if mode in self._unsupported:
+                continue
+            started = time.perf_counter()
+            try:
+                path = getattr(self, f"_create_{mode}")(source, root)
+            except (OSError, subprocess.CalledProcessError) as e:
+                last_error = e
+                self._remove_root(root)
+                if self.mode == "auto":
+                    self._unsupported.add(mode)
+                    logger.info("Workspace view mode %s unavailable: %s", mode, e)
+                continue
+            elapsed = time.perf_counter() - started
+            WORKSPACE_VIEW_SETUP.labels(mode=mode).observe(elapsed)
+            logger.debug("Created %s view of %s in %.3fs", mode, source, elapsed)
+            return WorkspaceView(path=str(path), mode=mode, root=root, setup_seconds=elapsed)
+        raise OSError(f"Could not create workspace view of {repo_path}: {last_error}")
+
+    def remove(self, view: WorkspaceView) -> None:
+        """Unmount (overlay) and delete view (blocking)"""
+        if view.mode == "overlay":
+            subprocess.run(["umount", view.path], check=False, capture_output=True)
+        self._remove_root(view.root)
+
+    @staticmethod
+    def _remove_root(root: Path) -> None:
+        if root.exists():
+            shutil.rmtree(root, ignore_errors=True)
+
+    @staticmethod
+    def _create_overlay(source: Path, root: Path) -> Path:
+        upper, work, merged = root / "upper", root / "work", root / "merged"
+        for directory in (upper, work, merged):
+            directory.mkdir(parents=True)
+        try:
+            subprocess.run(
+                [
+                    "mount", "-t", "overlay", "overlay",
+                    "-o", f"lowerdir={source},upperdir={upper},workdir={work}",
+                    str(merged)
+                ],
+                check=True,
+                capture_output=True
+            )
+        except FileNotFoundError as e:
+            raise OSError(f"mount not available: {e}") from e
+        return merged
+
+    @staticmethod
+    def _create_reflink(source: Path, root: Path) -> Path:
+        root.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            subprocess.run(
+                ["cp", "-a", "--reflink=always", str(source), str(root)],
+                check=True,
+                capture_output=True
+            )
+        except FileNotFoundError as e:
+            raise OSError(f"cp not available: {e}") from e
+        return root
+
+    @staticmethod
+    def _create_hardlink(source: Path, root: Path) -> Path:
+        objects_dir = source / ".git" / "objects"
+        for directory, dirnames, filenames in os.walk(source):
+            target_dir = root / os.path.relpath(directory, source)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            # Working-tree files may be rewritten in place by an agent, so only
+            # the write-once object store is shared with the checkout
+            shared = Path(directory).is_relative_to(objects_dir)
+            for entry in dirnames + filenames:
+                source_entry = os.path.join(directory, entry)
+                if os.path.islink(source_entry):
+                    os.symlink(os.readlink(source_entry), target_dir / entry)
+                elif entry not in filenames:
+                    continue
+                elif shared:
+                    os.link(source_entry, target_dir / entry)
+                else:
+                    shutil.copy2(source_entry, target_dir / entry)
+        return root
@@ -0,0 +1,148 @@
+"""
+Adaptive Concurrency Limit
+
+AIMD limiter for parallel CLI tasks against a shared model backend:
+
+- Each successful task whose latency stays within latency_tolerance x the
+  usual latency of its review type raises the limit by 1/limit (about +1
+  per limit's worth of completions), as long as the limit was in use.
+- A timeout, a rate-limit error (HTTP 429 reported by the CLI) or a
+  latency spike multiplies the limit by backoff_ratio. Tasks started
+  before the last cut report the same congestion, so they don't cut again.
+
+The limit is shared by all reviews of an agent and stays within
+[min_limit, max_limit].
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+import asyncio
+import logging
+import math
+import time
+
+from app.utils.metrics import CLI_CONCURRENCY_DECREASES, CLI_CONCURRENCY_LIMIT
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase/multiplicative-decrease limit of concurrent tasks"""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.1
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            name: Agent name (metric label and logs)
+            initial_limit: Starting limit
+            min_limit: Lowest limit
+            max_limit: Highest limit (2 x initial_limit if None)
+            backoff_ratio: Factor applied to the limit on overload
+            latency_tolerance: Latency / usual latency ratio counted as overload
+            smoothing: Weight of a new sample in the usual latency (EWMA)
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit if max_limit is not None else 2 * initial_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self._limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self._last_decrease = float("-inf")
+        self._usual_latency: Dict[str, float] = {}
+        self._waiters: Deque[asyncio.Future] = deque()
+        CLI_CONCURRENCY_LIMIT.labels(agent=name).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        """Tasks allowed to run at once"""
+        return math.floor(self._limit)
+
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot (FIFO)
+
+        Returns:
+            Start time token for release()
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just before the cancellation
+                self.in_flight -= 1
+                self._wake_waiters()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return time.monotonic()
+
+    def release(
+        self,
+        started: float,
+        latency: Optional[float] = None,
+        overload: Optional[str] = None,
+        key: str = ""
+    ) -> None:
+        """
+        Free the slot and adapt the limit
+
+        Args:
+            started: Token returned by acquire()
+            latency: Task duration of a successful task (None for a failed one)
+            overload: Overload reason ("timeout", "rate_limited"), None if there was none
+            key: Latency class (review type); latencies are compared within a class
+        """
+        saturated = self.in_flight >= self.limit
+        self.in_flight -= 1
+        if overload is not None:
+            self._decrease(started, overload)
+        elif latency is not None:
+            usual = self._usual_latency.get(key)
+            if usual is not None and latency > usual * self.latency_tolerance:
+                self._decrease(started, "latency")
+            elif saturated:
+                self._increase()
+            self._usual_latency[key] = latency if usual is None else usual + self.smoothing * (latency - usual)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to waiters in arrival order"""
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _increase(self) -> None:
+        previous = self.limit
+        self._limit = min(self._limit + 1 / self._limit, float(self.max_limit))
+        if self.limit != previous:
+            logger.info(f"Concurrency limit of {self.name} raised to {self.limit}")
+            CLI_CONCURRENCY_LIMIT.labels(agent=self.name).set(self.limit)
+
+    def _decrease(self, started: float, reason: str) -> None:
+        if started < self._last_decrease:
+            return  # started under the previous limit, same congestion episode
+        self._limit = max(self._limit * self.backoff_ratio, float(self.min_limit))
+        self._last_decrease = time.monotonic()
+        logger.warning(f"Concurrency limit of {self.name} cut to {self.limit} ({reason})")
+        CLI_CONCURRENCY_DECREASES.labels(agent=self.name, reason=reason).inc()
+        CLI_CONCURRENCY_LIMIT.labels(agent=self.name).set(self.limit)
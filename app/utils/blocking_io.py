@@ -0,0 +1,54 @@
+"""
+Blocking I/O Offloading
+
+Dedicated bounded thread pool for blocking filesystem work done by async
+code paths (reading prompts and rules, CLI temp files, removing checkouts).
+
+A separate pool keeps slow disk operations (rmtree of a gigabyte checkout)
+from starving the default executor used by asyncio.to_thread, and bounds
+how many of them hit the disk at once (BLOCKING_IO_WORKERS). The caller's
+context is copied into the worker, so spans and phase timings recorded in
+the offloaded function belong to the calling review.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+import asyncio
+import contextvars
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+@lru_cache()
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get the blocking I/O thread pool (cached)"""
+    return ThreadPoolExecutor(
+        max_workers=get_settings().BLOCKING_IO_WORKERS,
+        thread_name_prefix="blocking-io"
+    )
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run blocking function in the I/O pool without blocking the event loop
+
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments of func
+
+    Returns:
+        Result of func (its exception is re-raised)
+    """
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), partial(context.run, func, *args, **kwargs))
+
+
+def shutdown_io_executor() -> None:
+    """Wait for running I/O tasks and release the pool (a new one is created on next use)"""
+    if get_io_executor.cache_info().currsize:
+        get_io_executor().shutdown(wait=True)
+        get_io_executor.cache_clear()
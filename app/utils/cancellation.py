@@ -0,0 +1,59 @@
+"""
+Client Disconnect Cancellation
+
+Long requests (/review runs for minutes) keep working after the client has
+given up. cancel_on_disconnect() polls the connection while the block runs
+and cancels the handler task when the client is gone; the cancellation
+propagates through the review task tree down to the CLI process groups.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import asyncio
+import logging
+
+from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+
+class DisconnectWatch:
+    """State of one watched request"""
+
+    def __init__(self) -> None:
+        self.disconnected = False
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(request: Request, poll_seconds: float = 1.0) -> AsyncIterator[DisconnectWatch]:
+    """
+    Cancel the current task when the client disconnects during the block
+
+    The block sees asyncio.CancelledError; watch.disconnected tells it apart
+    from a server shutdown.
+
+    Args:
+        request: Incoming request
+        poll_seconds: Connection check interval
+    """
+    watch = DisconnectWatch()
+    handler = asyncio.current_task()
+
+    async def poll() -> None:
+        while True:
+            await asyncio.sleep(poll_seconds)
+            if await request.is_disconnected():
+                watch.disconnected = True
+                logger.warning(f"Client disconnected from {request.url.path}, cancelling request")
+                handler.cancel()
+                return
+
+    watcher = asyncio.create_task(poll(), name="disconnect-watch")
+    try:
+        yield watch
+    finally:
+        watcher.cancel()
+        try:
+            await watcher
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,99 @@
+"""
+Unified Diff Parser
+
+Maps new-file line numbers of a unified diff (as returned by the GitLab
+MR changes API) to their old-file counterparts, so review findings can be
+anchored to diff positions.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+HUNK_HEADER_PATTERN = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+class FileDiff:
+    """Line mapping for a single file in a merge request diff"""
+
+    def __init__(self, old_path: str, new_path: str):
+        """
+        Initialize file diff
+
+        Args:
+            old_path: File path before the change
+            new_path: File path after the change
+        """
+        self.old_path = old_path
+        self.new_path = new_path
+        # new_line -> old_line (None for added lines)
+        self.new_lines: Dict[int, Optional[int]] = {}
+
+    def has_line(self, line: int) -> bool:
+        """Whether the new-file line is visible in the diff"""
+        return line in self.new_lines
+
+    def old_line_for(self, line: int) -> Optional[int]:
+        """Old-file line for a context line, None for added lines"""
+        return self.new_lines.get(line)
+
+
+def parse_unified_diff(diff_text: str, old_path: str = "", new_path: str = "") -> FileDiff:
+    """
+    Parse unified diff of a single file
+
+    Args:
+        diff_text: Diff body (starting with @@ hunk headers)
+        old_path: File path before the change
+        new_path: File path after the change
+
+    Returns:
+        FileDiff with line mapping
+    """
+    file_diff = FileDiff(old_path=old_path, new_path=new_path)
+    old_line = new_line = 0
+    in_hunk = False
+
+    for raw_line in diff_text.splitlines():
+        header = HUNK_HEADER_PATTERN.match(raw_line)
+        if header:
+            old_line = int(header.group(1))
+            new_line = int(header.group(3))
+            in_hunk = True
+            continue
+
+        if not in_hunk or not raw_line:
+            continue
+
+        marker = raw_line[0]
+        if marker == '+':
+            file_diff.new_lines[new_line] = None
+            new_line += 1
+        elif marker == '-':
+            old_line += 1
+        elif marker == ' ':
+            file_diff.new_lines[new_line] = old_line
+            old_line += 1
+            new_line += 1
+        # '\ No newline at end of file' and other markers are ignored
+
+    return file_diff
+
+
+def build_diff_index(changes: List[Dict[str, str]]) -> Dict[str, FileDiff]:
+    """
+    Build file path index from GitLab MR changes
+
+    Args:
+        changes: Changes list from GitLabService.get_mr_changes()
+
+    Returns:
+        Dict mapping new file path to FileDiff
+    """
+    index = {}
+    for change in changes:
+        if change.get('deleted_file'):
+            continue
+        new_path = change.get('new_path') or change.get('old_path', '')
+        old_path = change.get('old_path') or new_path
+        index[new_path] = parse_unified_diff(change.get('diff', ''), old_path, new_path)
+    return index
@@ -0,0 +1,191 @@
+"""
+JSON Extractor for CLI Output
+
+Finds JSON objects embedded in free-form CLI output (log lines, progress
+messages, markdown fences) in a single left-to-right pass.
+
+Every '{' is a candidate start position decoded with
+json.JSONDecoder.raw_decode. A successful decode skips past the whole
+object (nested candidates are never re-scanned); a failed decode resumes
+at the next '{', so a valid object following a stray brace (e.g. inside a
+quoted log message) is still found.
+
+A failed candidate ends at the first token the decoder rejects, and
+everything before that token is a valid JSON prefix. One string-aware pass
+over that prefix pairs every nested '{' with its closing '}'. A closed
+nested object is decoded once and skipped as a whole; an unclosed one
+would be rejected at the same token, so it is skipped without decoding.
+Only braces inside strings of the prefix are decoded as new candidates.
+The work stays linear in the output size however deep unclosed objects
+nest (see benchmarks/bench_json_extraction.py), unlike the greedy regex r'\\{[\\s\\S]*\\}' which backtracks
+quadratically on outputs with many unmatched braces.
+
+Candidates are decoded inside a window that starts small and doubles only
+while the decoder runs into the window end. Besides bounding the work per
+failed candidate, this keeps JSONDecodeError cheap: its constructor counts
+newlines from the start of the decoded document up to the error position,
+which would make failures O(position) on the full output.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_decoder = json.JSONDecoder()
+
+# Top-level keys that identify a review result object
+REVIEW_RESULT_KEYS = ("review_type", "issues", "summary")
+
+# Initial decode window (characters); doubled while a candidate is truncated
+_INITIAL_WINDOW = 256
+
+_WHITESPACE = " \t\r\n"
+
+_STRUCTURE_PATTERN = re.compile(r'[{}"]')
+_STRING_SPECIAL_PATTERN = re.compile(r'["\\]')
+
+
+def _object_ends(text: str, start: int, end: int) -> Dict[int, Optional[int]]:
+    """
+    Pair braces of the valid JSON prefix text[start:end]
+
+    Returns:
+        Position of every '{' outside strings -> end of its object (None if
+        it is still open at end)
+    """
+    ends: Dict[int, Optional[int]] = {}
+    open_braces: List[int] = []
+    pos = start
+    while True:
+        match = _STRUCTURE_PATTERN.search(text, pos, end)
+        if match is None:
+            return ends
+        pos = match.end()
+        char = match.group()
+        if char == '{':
+            open_braces.append(match.start())
+            ends[match.start()] = None
+        elif char == '}':
+            if open_braces:
+                ends[open_braces.pop()] = pos
+        else:
+            # Skip the string, including escaped quotes
+            while True:
+                special = _STRING_SPECIAL_PATTERN.search(text, pos, end)
+                if special is None:
+                    return ends
+                pos = special.end()
+                if special.group() == '"':
+                    break
+                pos += 1
+
+
+def iter_json_objects(text: str) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Iterate over top-level JSON objects embedded in text
+
+    Objects nested inside an unterminated outer object are not reported,
+    and regions nested deeper than the interpreter recursion limit are
+    skipped as a whole.
+
+    Args:
+        text: Arbitrary text (CLI stdout, output file content)
+
+    Yields:
+        Tuples of (start, end, object) in order of appearance
+    """
+    length = len(text)
+    pos = text.find('{')
+    # (end, object ends) of failed candidates enclosing pos, innermost last
+    failed: List[Tuple[int, Dict[int, Optional[int]]]] = []
+
+    while pos != -1:
+        next_pos = pos + 1
+
+        while failed and pos >= failed[-1][0]:
+            failed.pop()
+        if failed and pos in failed[-1][1]:
+            # Nested object of a failed candidate: decode it only if it closes
+            end = failed[-1][1][pos]
+            if end is not None:
+                try:
+                    value, _ = _decoder.raw_decode(text[pos:end])
+                except (json.JSONDecodeError, RecursionError):
+                    pass
+                else:
+                    if isinstance(value, dict):
+                        yield pos, end, value
+                    next_pos = end
+            pos = text.find('{', next_pos)
+            continue
+
+        # Cheap rejection: an object continues with a key or '}'
+        probe = pos + 1
+        while probe < length and text[probe] in _WHITESPACE:
+            probe += 1
+
+        if probe < length and text[probe] in '"}':
+            window = _INITIAL_WINDOW
+            while True:
+                limit = pos + window
+                complete = limit >= length
+                chunk = text[pos:] if complete else text[pos:limit]
+                try:
+                    value, end = _decoder.raw_decode(chunk)
+                except json.JSONDecodeError as e:
+                    unterminated = e.msg.startswith("Unterminated string")
+                    if not complete and (unterminated or e.pos >= len(chunk) - 8):
+                        # Decoder ran into the window end - widen and retry
+                        window *= 2
+                        continue
+                    if unterminated or (complete and e.pos >= len(chunk)):
+                        # Unterminated up to the end of text: any later candidate
+                        # is nested in this one and cannot be complete either
+                        return
+                    failed.append((pos + e.pos, _object_ends(text, pos, pos + e.pos)))
+                except RecursionError:
+                    next_pos = min(limit, length)
+                else:
+                    if isinstance(value, dict):
+                        yield pos, pos + end, value
+                    next_pos = pos + end
+                break
+
+        pos = text.find('{', next_pos)
+
+
+def is_review_result_shaped(obj: Dict[str, Any]) -> bool:
+    """Whether object looks like a review result (cheap check before schema validation)"""
+    return any(key in obj for key in REVIEW_RESULT_KEYS)
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the best JSON object from CLI output
+
+    Preference order:
+    1. Largest object shaped like a review result (has review_type/issues/summary)
+    2. Largest JSON object of any shape
+
+    Args:
+        text: CLI output
+
+    Returns:
+        Parsed object or None if output contains no JSON object
+    """
+    best_review: Optional[Tuple[int, Dict[str, Any]]] = None
+    best_any: Optional[Tuple[int, Dict[str, Any]]] = None
+
+    for start, end, obj in iter_json_objects(text):
+        size = end - start
+        if is_review_result_shaped(obj):
+            if best_review is None or size > best_review[0]:
+                best_review = (size, obj)
+        elif best_any is None or size > best_any[0]:
+            best_any = (size, obj)
+
+    if best_review is not None:
+        return best_review[1]
+    if best_any is not None:
+        return best_any[1]
+    return None
@@ -0,0 +1,282 @@
+"""
+Tolerant JSON Repair for CLI Review Output
+
+Recovers review results from slightly broken CLI JSON instead of discarding
+the whole review type:
+- unescaped control characters (raw newlines) inside strings
+- trailing commas before '}' / ']'
+- truncated output (timeout, token limit): the object is cut back to the
+  last complete top-level value or array element and closed, so every
+  syntactically complete issue object is kept
+
+Repairs are counted in module-level statistics (see get_repair_statistics)
+and exported as the Prometheus counters review_json_repairs_total{outcome}
+and review_json_repair_items_salvaged_total; the per-output report lands in
+the result's metadata.json_repair.
+"""
+
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.metrics import JSON_REPAIR_ITEMS_SALVAGED, JSON_REPAIRS
+
+# Lenient decoder: accepts raw control characters inside strings
+_lenient_decoder = json.JSONDecoder(strict=False)
+
+_STRUCTURAL = re.compile(r'[{}\[\],"]')
+# Remainder of a JSON string after its opening quote (unrolled loop)
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_NON_WHITESPACE = re.compile(r'\S')
+_ROOT_KEY = re.compile(r'"(?:review_type|issues)"\s*:')
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+# Container depth (root object = 1) up to which values are kept whole;
+# cut points deeper than this would leave half-written issue objects.
+_MAX_CUT_DEPTH = 2
+
+_ITEM_LISTS = ("issues", "refactoring_suggestions", "documentation")
+_SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO")
+
+
+class RepairStatistics:
+    """Process-wide counters of JSON repair outcomes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters"""
+        self.attempts = 0
+        self.recovered = 0
+        self.failed = 0
+        self.truncated_outputs = 0
+        self.trailing_commas_removed = 0
+        self.items_salvaged = 0
+        self.chars_dropped = 0
+
+    def record(self, report: Optional[Dict[str, Any]]) -> None:
+        """Record outcome of one repair attempt (None = nothing recovered)"""
+        with self._lock:
+            self.attempts += 1
+            if report is None:
+                self.failed += 1
+                JSON_REPAIRS.labels(outcome="failed").inc()
+                return
+            self.recovered += 1
+            JSON_REPAIRS.labels(outcome="truncated" if report["truncated"] else "recovered").inc()
+            JSON_REPAIR_ITEMS_SALVAGED.inc(report["items_salvaged"])
+            self.truncated_outputs += 1 if report["truncated"] else 0
+            self.trailing_commas_removed += report["trailing_commas_removed"]
+            self.items_salvaged += report["items_salvaged"]
+            self.chars_dropped += report["chars_dropped"]
+
+    def as_dict(self) -> Dict[str, int]:
+        """Snapshot of counters"""
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "recovered": self.recovered,
+                "failed": self.failed,
+                "truncated_outputs": self.truncated_outputs,
+                "trailing_commas_removed": self.trailing_commas_removed,
+                "items_salvaged": self.items_salvaged,
+                "chars_dropped": self.chars_dropped,
+            }
+
+
+_statistics = RepairStatistics()
+
+
+def get_repair_statistics() -> RepairStatistics:
+    """Get process-wide repair statistics"""
+    return _statistics
+
+
+def _depth_at(text: str, start: int, stop: int) -> Optional[int]:
+    """Container depth at stop when scanning from start (None if scan breaks)"""
+    depth = 0
+    pos = start
+    while True:
+        match = _STRUCTURAL.search(text, pos, stop)
+        if match is None:
+            return depth
+        char = match.group()
+        if char == '"':
+            tail = _STRING_TAIL.match(text, match.end())
+            if tail is None or tail.end() > stop:
+                return None
+            pos = tail.end()
+            continue
+        pos = match.end()
+        if char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth <= 0:
+                return None
+
+
+def _find_root(output: str, max_candidates: int = 64) -> int:
+    """
+    Find the '{' opening the object that holds the review keys
+
+    Returns:
+        Index of root brace or -1
+    """
+    key = _ROOT_KEY.search(output)
+    if key is None:
+        return -1
+    candidate = key.start()
+    for _ in range(max_candidates):
+        candidate = output.rfind('{', 0, candidate)
+        if candidate == -1:
+            return -1
+        if _depth_at(output, candidate, key.start()) == 1:
+            return candidate
+    return -1
+
+
+def _close_truncated(text: str) -> Tuple[str, bool, int]:
+    """
+    Drop trailing commas and close a possibly truncated JSON object
+
+    Args:
+        text: Text starting with the root '{'
+
+    Returns:
+        Tuple of (repaired_text, was_truncated, trailing_commas_removed)
+    """
+    stack: List[str] = []
+    dropped_commas: List[int] = []
+    # (cut index, open containers at that point)
+    safe_cut: Tuple[int, Tuple[str, ...]] = (0, ())
+    pos = 0
+    end = None
+
+    while True:
+        match = _STRUCTURAL.search(text, pos)
+        if match is None:
+            break
+        index = match.start()
+        char = text[index]
+
+        if char == '"':
+            tail = _STRING_TAIL.match(text, index + 1)
+            if tail is None:
+                break  # truncated inside a string
+            pos = tail.end()
+            continue
+
+        pos = index + 1
+        if char in '{[':
+            stack.append(char)
+            if len(stack) <= _MAX_CUT_DEPTH:
+                safe_cut = (index + 1, tuple(stack))
+        elif char in '}]':
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                end = index + 1
+                break
+            if len(stack) <= _MAX_CUT_DEPTH:
+                safe_cut = (index + 1, tuple(stack))
+        else:  # ','
+            following = _NON_WHITESPACE.search(text, index + 1)
+            if following is None:
+                break
+            if following.group() in '}]':
+                dropped_commas.append(index)
+            elif len(stack) <= _MAX_CUT_DEPTH:
+                safe_cut = (index, tuple(stack))
+
+    truncated = end is None
+    if truncated:
+        cut, open_containers = safe_cut
+        body = text[:cut]
+        dropped_commas = [i for i in dropped_commas if i < cut]
+    else:
+        body = text[:end]
+        open_containers = ()
+
+    if dropped_commas:
+        pieces = []
+        previous = 0
+        for comma in dropped_commas:
+            pieces.append(body[previous:comma])
+            previous = comma + 1
+        pieces.append(body[previous:])
+        body = "".join(pieces)
+
+    closers = "".join(_CLOSERS[c] for c in reversed(open_containers))
+    return body + closers, truncated, len(dropped_commas)
+
+
+def _recount_summary(result: Dict[str, Any], incomplete: bool) -> None:
+    """Rebuild summary counters from salvaged issues"""
+    issues = [i for i in result.get("issues", []) if isinstance(i, dict)]
+    summary = result.get("summary") if isinstance(result.get("summary"), dict) else {}
+    counts = {s.lower(): 0 for s in _SEVERITIES}
+    for issue in issues:
+        key = str(issue.get("severity", "")).lower()
+        if key in counts:
+            counts[key] += 1
+    summary.update(counts)
+    summary["total_issues"] = len(issues)
+    if incomplete:
+        summary["analysis_incomplete"] = True
+    result["summary"] = summary
+
+
+def repair_review_json(output: str) -> Optional[Dict[str, Any]]:
+    """
+    Repair broken review JSON and salvage complete items
+
+    Args:
+        output: Raw CLI output that failed strict extraction
+
+    Returns:
+        Recovered review result (with metadata.json_repair report) or None
+    """
+    start = _find_root(output)
+    if start == -1:
+        _statistics.record(None)
+        return None
+
+    text = output[start:]
+    repaired, truncated, commas_removed = _close_truncated(text)
+
+    try:
+        result, _ = _lenient_decoder.raw_decode(repaired)
+    except (json.JSONDecodeError, RecursionError):
+        _statistics.record(None)
+        return None
+
+    if not isinstance(result, dict):
+        _statistics.record(None)
+        return None
+
+    items_salvaged = sum(
+        len(result[name]) for name in _ITEM_LISTS if isinstance(result.get(name), list)
+    )
+    if truncated:
+        _recount_summary(result, incomplete=True)
+
+    report = {
+        "truncated": truncated,
+        "trailing_commas_removed": commas_removed,
+        "items_salvaged": items_salvaged,
+        "chars_dropped": max(0, len(text) - len(repaired)) if truncated else 0,
+    }
+    metadata = result.get("metadata") if isinstance(result.get("metadata"), dict) else {}
+    metadata["json_repair"] = report
+    if truncated:
+        metadata.setdefault("truncation_reason", "CLI output truncated, recovered by JSON repair")
+    result["metadata"] = metadata
+
+    _statistics.record(report)
+    return result
@@ -3,6 +3,10 @@ JSON Schema Validator for CLI Review Results
 
 Validates CLI agent output against the defined JSON schema to ensure
 proper structure and required fields are present.
+
+The schema is compiled once into a generated Python function (see
+app.utils.schema_codegen) that runs schema and semantic checks in a single
+pass; jsonschema is used when the schema cannot be compiled.
 """
 
 import json
@@ -18,6 +22,13 @@ except ImportError:
 
 from loguru import logger
 
+from app.utils.schema_codegen import (
+    REVIEW_RESULT_SEMANTICS,
+    UnsupportedSchemaError,
+    ValidatorFunction,
+    compile_validator,
+)
+
 
 class ReviewResultValidator:
     """Validator for code review results from CLI agents"""
@@ -36,9 +47,16 @@ class ReviewResultValidator:
         self.schema_path = schema_path
         self.schema = self._load_schema()
         self.validator = None
+        self.fast_validator: Optional[ValidatorFunction] = None
         
         if JSONSCHEMA_AVAILABLE and self.schema:
             self.validator = Draft7Validator(self.schema)
+        
+        if self.schema:
+            try:
+                self.fast_validator = compile_validator(self.schema, REVIEW_RESULT_SEMANTICS)
+            except UnsupportedSchemaError as e:
+                logger.warning(f"Schema not compilable, using jsonschema validation: {e}")
     
     def _load_schema(self) -> Optional[Dict[str, Any]]:
         """Load JSON schema from file"""
@@ -50,7 +68,7 @@ class ReviewResultValidator:
             with open(self.schema_path, 'r', encoding='utf-8') as f:
                 schema = json.load(f)
             
-            logger.debug(f"Loaded JSON schema from {self.schema_path}")
+            logger.debug("Loaded JSON schema from {}", self.schema_path)
             return schema
         except Exception as e:
             logger.error(f"Failed to load JSON schema: {e}")
@@ -66,6 +84,29 @@ class ReviewResultValidator:
         Returns:
             Tuple of (is_valid, error_messages)
         """
+        if self.fast_validator is not None:
+            try:
+                errors, semantic_errors = self.fast_validator(data)
+            except Exception as e:
+                logger.error(f"Validation error: {e}")
+                return False, [f"Validation exception: {str(e)}"]
+            
+            if errors:
+                return False, errors
+            if semantic_errors:
+                return False, semantic_errors
+            
+            logger.debug("Review result passed validation")
+            return True, []
+        
+        return self._validate_with_jsonschema(data)
+    
+    def _validate_with_jsonschema(self, data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Validate with jsonschema and separate semantic pass
+        
+        Reference implementation for the generated fast validator.
+        """
         if not JSONSCHEMA_AVAILABLE:
             logger.warning("jsonschema library not available, skipping validation")
             return self._basic_validation(data)
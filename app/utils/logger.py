@@ -1,26 +1,207 @@
+"""
+Logging Setup
+
+Queue-backed logging pipeline: a log call on the event loop only builds a
+record and puts it on a queue, sink output and file I/O happen in
+background threads.
+
+- stdlib loggers (used by the services) go through a QueueHandler on the
+  root logger; a QueueListener thread forwards the records to loguru.
+- loguru sinks (stdout, daily file under LOG_DIR) are enqueued and written
+  by loguru's writer thread, also for modules that log through loguru
+  directly. An empty LOG_DIR (as in the test suite) disables the file sink.
+- LogThrottle drops noisy stdlib records before they are queued: sampling
+  of DEBUG/INFO per logger name prefix (LOG_SAMPLE_RATES) and a limit per
+  call site (LOG_RATE_LIMIT_PER_MINUTE). ERROR and above always pass.
+- LOG_JSON switches stdout to one JSON object per line.
+
+Pass message arguments lazily (logger.debug("Output: %s", output)) so
+records of disabled levels are never formatted.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import atexit
+import json
+import logging
+import queue
+import random
 import sys
+import threading
+import time
+import traceback
+
 from loguru import logger
 from app.config import get_settings
+from app.utils.tracing import current_trace_id, install_log_record_factory
+
+TEXT_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} | {extra[trace_id]} - {message}"
+COLOR_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan> | {extra[trace_id]} - <level>{message}</level>"
+)
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+class LogThrottle(logging.Filter):
+    """Per-module sampling and per call site rate limiting of log records"""
+
+    def __init__(
+        self,
+        per_minute: int = 0,
+        sample_rates: Optional[Dict[str, float]] = None,
+        window_seconds: float = 60.0
+    ):
+        """
+        Initialize throttle
+
+        Args:
+            per_minute: Records passed per call site and window below ERROR (0 = unlimited)
+            sample_rates: Logger name prefix -> kept fraction of DEBUG/INFO records
+            window_seconds: Rate limit window
+        """
+        super().__init__()
+        self.per_minute = per_minute
+        self.sample_rates = sample_rates or {}
+        self.window_seconds = window_seconds
+        self._rates: Dict[str, float] = {}  # logger name -> resolved sample rate
+        self._sites: Dict[Tuple[str, int], List[Any]] = {}  # call site -> [window start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        if record.levelno < logging.WARNING and not self._sampled(record.name):
+            return False
+        if self.per_minute <= 0:
+            return True
+
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        suppressed = 0
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window_seconds:
+                suppressed = site[2] if site else 0
+                site = self._sites[key] = [now, 0, 0]
+            if site[1] >= self.per_minute:
+                site[2] += 1
+                return False
+            site[1] += 1
+
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar records suppressed]"
+        return True
+
+    def _sampled(self, name: str) -> bool:
+        rate = self._rates.get(name)
+        if rate is None:
+            rate = self._rates[name] = self._resolve_rate(name)
+        return rate >= 1.0 or random.random() < rate
+
+    def _resolve_rate(self, name: str) -> float:
+        """Sample rate of the longest matching logger name prefix (1.0 if none)"""
+        best, rate = -1, 1.0
+        for prefix, prefix_rate in self.sample_rates.items():
+            if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                best, rate = len(prefix), prefix_rate
+        return rate
+
+
+class _LoguruForwarder(logging.Handler):
+    """Re-emits stdlib records through loguru (runs in the listener thread)"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        logger.bind(
+            _origin=(record.name, record.funcName, record.lineno),
+            trace_id=getattr(record, "trace_id", "-")
+        ).log(level, record.getMessage())
+
+
+def _patch_record(record) -> None:
+    # Forwarded stdlib records keep their own module, function, line and trace
+    origin = record["extra"].pop("_origin", None)
+    if origin is not None:
+        record["name"], record["function"], record["line"] = origin
+    record["extra"].setdefault("trace_id", current_trace_id() or "-")
+
+
+def _json_sink(message) -> None:
+    """Write record as one JSON line to stdout (runs in loguru's writer thread)"""
+    record = message.record
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "trace_id": record["extra"].get("trace_id", "-"),
+        "message": record["message"],
+    }
+    if record["exception"] is not None:
+        exc_type, exc_value, exc_traceback = record["exception"]
+        entry["exception"] = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+    sys.stdout.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
 
 
 def setup_logger():
+    global _queue_handler, _listener
     settings = get_settings()
+    install_log_record_factory()
     logger.remove()
-    logger.add(
-        sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
-        level=settings.LOG_LEVEL,
-        colorize=True
-    )
-
-    logger.add(
-        "logs/app_{time:YYYY-MM-DD}.log",
-        rotation="00:00",
-        retention="30 days",
-        level="INFO",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} - {message}"
-    )
+    logger.configure(patcher=_patch_record)
+    if settings.LOG_JSON:
+        logger.add(_json_sink, format="{message}", level=settings.LOG_LEVEL, enqueue=True)
+    else:
+        logger.add(
+            sys.stdout,
+            format=COLOR_FORMAT,
+            level=settings.LOG_LEVEL,
+            colorize=True,
+            enqueue=True
+        )
+
+    if settings.LOG_DIR:
+        logger.add(
+            str(Path(settings.LOG_DIR) / "app_{time:YYYY-MM-DD}.log"),
+            rotation="00:00",
+            retention="30 days",
+            level="INFO",
+            format=TEXT_FORMAT,
+            enqueue=True
+        )
+
+    # stdlib loggers -> queue -> listener thread -> loguru
+    root = logging.getLogger()
+    if _listener is None:
+        atexit.register(_stop_listener)
+    else:
+        _stop_listener()
+    log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _queue_handler.addFilter(LogThrottle(
+        per_minute=settings.LOG_RATE_LIMIT_PER_MINUTE,
+        sample_rates=settings.LOG_SAMPLE_RATES
+    ))
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+    _listener = QueueListener(log_queue, _LoguruForwarder())
+    _listener.start()
 
     logger.info("Logger initialized")
 
 
+def _stop_listener() -> None:
+    """Flush queued stdlib records and detach the queue handler"""
+    if _listener is not None:
+        _listener.stop()
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
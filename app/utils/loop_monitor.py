@@ -0,0 +1,75 @@
+"""
+Event Loop Lag Monitor
+
+A background task sleeps for a fixed interval and measures how late it
+wakes up. The delay is the time the event loop was blocked by synchronous
+work; it is observed in the review_event_loop_lag_seconds histogram and
+logged when it exceeds LOOP_LAG_WARN_SECONDS.
+"""
+
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import time
+
+from app.utils.metrics import EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """Measures event loop responsiveness in background"""
+
+    def __init__(self, interval_seconds: float = 0.5, warn_seconds: float = 0.2):
+        """
+        Initialize monitor
+
+        Args:
+            interval_seconds: Sleep between measurements
+            warn_seconds: Lag logged as a warning
+        """
+        self.interval_seconds = interval_seconds
+        self.warn_seconds = warn_seconds
+        self.samples = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag summary since start"""
+        return {
+            "samples": self.samples,
+            "last_lag_seconds": round(self.last_lag_seconds, 4),
+            "max_lag_seconds": round(self.max_lag_seconds, 4),
+        }
+
+    def record(self, lag: float) -> None:
+        """Record one measured lag"""
+        self.samples += 1
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+        EVENT_LOOP_LAG.observe(lag)
+        if lag >= self.warn_seconds:
+            logger.warning("Event loop was blocked for %.3fs", lag)
+
+    def start(self) -> None:
+        """Start measuring (no-op if running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="event-loop-lag-monitor")
+
+    async def stop(self) -> None:
+        """Stop measuring"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval_seconds)
+            self.record(max(0.0, time.perf_counter() - started - self.interval_seconds))
@@ -0,0 +1,270 @@
+"""
+Prometheus Metrics
+
+Histograms and gauges for every phase of the review pipeline, exposed in
+Prometheus text format at /metrics (see app.main).
+
+Metrics are module-level singletons registered once at import; recording a
+sample is a lock-protected bucket increment, and the exposition is only
+rendered when /metrics is scraped. Without prometheus_client installed all
+metrics are no-ops and /metrics reports that metrics are unavailable.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, Tuple
+import re
+import time
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; charset=utf-8"
+
+
+class _NoopMetric:
+    """Stand-in for metrics when prometheus_client is not installed"""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        yield
+
+
+def _histogram(name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=None):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    if buckets is None:
+        return Histogram(name, documentation, labelnames)
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def _gauge(name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Gauge(name, documentation, labelnames)
+
+
+def _counter(name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames)
+
+
+# Buckets for long-running phases (git, CLI agents): 0.5s .. 30min
+LONG_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+# Buckets for sizes in bytes: 1KiB .. 1GiB
+SIZE_BUCKETS = tuple(float(1024 * 4 ** power) for power in range(11))
+
+GIT_DURATION = _histogram(
+    "review_git_duration_seconds",
+    "Duration of git clone/fetch and pooled workspace checkout/reset operations",
+    ("operation",),
+    LONG_BUCKETS
+)
+GIT_BYTES = _histogram(
+    "review_git_transfer_bytes",
+    "Bytes received by git clone/fetch (as reported by git progress)",
+    ("operation",),
+    SIZE_BUCKETS
+)
+PROMPT_BUILD_DURATION = _histogram(
+    "review_prompt_build_duration_seconds",
+    "Time to load prompts and embed referenced files for one review",
+    ("agent",)
+)
+PROMPT_SIZE = _histogram(
+    "review_prompt_size_bytes",
+    "Size of built prompts (before variable substitution)",
+    ("review_type",),
+    SIZE_BUCKETS
+)
+CLI_DURATION = _histogram(
+    "review_cli_duration_seconds",
+    "Wall time of one CLI agent review task",
+    ("agent", "review_type", "status"),
+    LONG_BUCKETS
+)
+QUEUE_WAIT = _histogram(
+    "review_queue_wait_seconds",
+    "Time a review task waited for a parallel task slot",
+    ("agent",),
+    LONG_BUCKETS
+)
+PARSE_DURATION = _histogram(
+    "review_output_processing_seconds",
+    "Time to parse and validate CLI output",
+    ("stage",)
+)
+GITLAB_LATENCY = _histogram(
+    "review_gitlab_request_duration_seconds",
+    "GitLab API call latency",
+    ("endpoint", "outcome")
+)
+REVIEWS_IN_FLIGHT = _gauge(
+    "review_in_flight",
+    "Reviews currently being executed"
+)
+EVENT_LOOP_LAG = _histogram(
+    "review_event_loop_lag_seconds",
+    "Delay of event loop wake-ups (time the loop was blocked)",
+    (),
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+LIVE_SUBPROCESSES = _gauge(
+    "review_live_subprocesses",
+    "Running git and CLI agent subprocesses"
+)
+CLI_CANCELLATIONS = _counter(
+    "review_cli_cancellations_total",
+    "CLI process groups stopped before finishing (cancelled: client gone or review superseded)",
+    ("agent", "reason")
+)
+CLI_RECLAIMED_CPU_SECONDS = _counter(
+    "review_cli_reclaimed_cpu_seconds_total",
+    "Estimated CPU seconds saved by cancelling CLI runs (CPU rate so far x remaining timeout)",
+    ("agent",)
+)
+HEDGED_REVIEWS = _counter(
+    "review_hedged_runs_total",
+    "Review types run on the second agent (hedge: primary slower than its p95, failover: primary failed)",
+    ("reason", "winner")
+)
+CIRCUIT_STATE = _gauge(
+    "review_agent_circuit_state",
+    "Circuit breaker state per CLI agent (0 closed, 1 half-open, 2 open)",
+    ("agent",)
+)
+CLI_CONCURRENCY_LIMIT = _gauge(
+    "review_cli_concurrency_limit",
+    "Current adaptive limit of parallel CLI tasks per agent",
+    ("agent",)
+)
+CLI_CONCURRENCY_DECREASES = _counter(
+    "review_cli_concurrency_decreases_total",
+    "Multiplicative cuts of the adaptive CLI concurrency limit (timeout, rate_limited, latency)",
+    ("agent", "reason")
+)
+JSON_REPAIRS = _counter(
+    "review_json_repairs_total",
+    "Broken CLI review JSON passed to the repair fallback, by outcome (recovered, truncated, failed)",
+    ("outcome",)
+)
+JSON_REPAIR_ITEMS_SALVAGED = _counter(
+    "review_json_repair_items_salvaged_total",
+    "Issues, refactoring suggestions and documentation items kept by JSON repair"
+)
+WORKSPACE_DISK_BYTES = _gauge(
+    "review_workspace_disk_bytes",
+    "Disk usage of WORK_DIR as of the last janitor sweep (workspaces, trash awaiting deletion)",
+    ("area",)
+)
+WORKSPACES = _gauge(
+    "review_workspaces",
+    "Workspaces in WORK_DIR by state",
+    ("state",)
+)
+WORKSPACE_EVICTIONS = _counter(
+    "review_workspace_evictions_total",
+    "Idle workspaces evicted to stay within the disk quota"
+)
+WORKSPACE_POOL_LEASES = _counter(
+    "review_workspace_pool_leases_total",
+    "Workspace requests served from the pool (hit) or by a fresh clone (miss)",
+    ("outcome",)
+)
+WORKSPACE_VIEW_SETUP = _histogram(
+    "review_workspace_view_setup_seconds",
+    "Time to create the copy-on-write workspace view of one CLI review task",
+    ("mode",),
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+WEBHOOK_REVIEWS = _counter(
+    "review_webhook_reviews_total",
+    "Webhook-triggered reviews by outcome (scheduled, duplicate, collapsed, superseded, cancelled)",
+    ("outcome",)
+)
+PREFETCHES = _counter(
+    "review_prefetches_total",
+    "Repository prefetch requests by outcome (queued, duplicate, rate_limited, queue_full, done, failed)",
+    ("outcome",)
+)
+
+_GIT_RECEIVED = re.compile(r'Receiving objects:[^\r\n]*?,\s*([\d.]+)\s*(bytes|KiB|MiB|GiB)')
+_UNIT_BYTES = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+
+
+def git_received_bytes(progress: str) -> Optional[int]:
+    """
+    Bytes received from git --progress output
+
+    Returns:
+        Size of the last 'Receiving objects' report, None if git did not report it
+    """
+    matches = _GIT_RECEIVED.findall(progress)
+    if not matches:
+        return None
+    value, unit = matches[-1]
+    return int(float(value) * _UNIT_BYTES[unit])
+
+
+@contextmanager
+def observe_duration(histogram, **labels: str) -> Iterator[None]:
+    """Observe wall time of the block"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def timed_gitlab_call(endpoint: str) -> Callable:
+    """
+    Decorator recording GitLab API latency of an async method
+
+    Args:
+        endpoint: Low-cardinality endpoint label (e.g. 'GET merge_requests/:iid')
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                GITLAB_LATENCY.labels(endpoint=endpoint, outcome=outcome).observe(
+                    time.perf_counter() - start
+                )
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render current metrics in Prometheus text format
+
+    Returns:
+        Tuple of (payload, content type)
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,75 @@
+"""
+Phase Timings
+
+Collects the ReviewTimings breakdown of the review running in the current
+context. The collector is bound to a context variable, so CLI tasks started
+with asyncio.gather record into the review that spawned them without the
+timings being threaded through every call.
+
+Outside collect_timings() recording is a no-op.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import time
+
+from app.models import ReviewTimings
+
+_current_timings: ContextVar[Optional[ReviewTimings]] = ContextVar("review_timings", default=None)
+
+
+@contextmanager
+def collect_timings(timings: Optional[ReviewTimings] = None) -> Iterator[ReviewTimings]:
+    """
+    Record phases of the block into timings
+
+    Args:
+        timings: Collector to continue (a new one is created if None)
+    """
+    timings = timings if timings is not None else ReviewTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def current_timings() -> Optional[ReviewTimings]:
+    """Collector of the running review, None outside collect_timings()"""
+    return _current_timings.get()
+
+
+def record_phase(phase: str, seconds: float, key: Optional[str] = None) -> None:
+    """
+    Add duration to a phase of the running review
+
+    Args:
+        phase: ReviewTimings field name
+        seconds: Duration to add
+        key: Entry of a per-key phase (review type or post-processing step)
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return
+    seconds = round(seconds, 3)
+    if key is None:
+        setattr(timings, phase, round(getattr(timings, phase) + seconds, 3))
+    else:
+        entries = getattr(timings, phase)
+        entries[key] = round(entries.get(key, 0.0) + seconds, 3)
+
+
+@contextmanager
+def timed_phase(phase: str, key: Optional[str] = None) -> Iterator[None]:
+    """Record wall time of the block as a phase of the running review"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - start, key)
+
+
+def format_timings(timings: ReviewTimings) -> str:
+    """One-line breakdown for logs ('clone=1.2s rules_load=0.1s cli.SECURITY_AUDIT=40.0s ...')"""
+    return " ".join(f"{phase}={seconds:.1f}s" for phase, seconds in timings.flat().items() if seconds)
@@ -0,0 +1,69 @@
+"""
+Process Group Termination
+
+CLI agents spawn their own children (language servers, node workers, git).
+Killing only the direct child leaves those running, so CLI processes are
+started in a new session (start_new_session=True) and stopped as a whole
+group: SIGTERM, a grace period, then SIGKILL.
+
+CPU time of a group is read from /proc (Linux); elsewhere it is reported
+as 0.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def process_group_cpu_seconds(pgid: int) -> float:
+    """User + system CPU time of the live processes in a process group"""
+    total_ticks = 0
+    try:
+        entries = list(Path("/proc").iterdir())
+    except OSError:
+        return 0.0
+    for entry in entries:
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue  # exited meanwhile
+        # Fields after the parenthesized command: state ppid pgrp ... utime(14) stime(15)
+        fields = stat[stat.rfind(")") + 2:].split()
+        if len(fields) > 12 and int(fields[2]) == pgid:
+            total_ticks += int(fields[11]) + int(fields[12])
+    return total_ticks / _CLOCK_TICKS
+
+
+async def terminate_process_group(process: asyncio.subprocess.Process, grace_seconds: float = 5.0) -> None:
+    """
+    Stop a process started with start_new_session=True and all its descendants
+
+    Args:
+        process: Group leader
+        grace_seconds: Time between SIGTERM and SIGKILL
+    """
+    if process.returncode is not None:
+        return  # already reaped, its group id may be reused
+    pgid = process.pid
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        await asyncio.wait_for(process.wait(), timeout=grace_seconds)
+    except asyncio.TimeoutError:
+        logger.warning(f"Process group {pgid} ignored SIGTERM for {grace_seconds}s, sending SIGKILL")
+    # Descendants may outlive the leader, so the group is killed in any case
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    await process.wait()
@@ -0,0 +1,319 @@
+"""
+JSON Schema Code Generator
+
+Compiles a JSON schema into a plain Python validation function once, so
+validating a review result is a single pass over the data instead of an
+interpreted walk through jsonschema keyword handlers.
+
+Supported (Draft 7) subset - everything schemas/review_result_schema.json
+uses: type, enum (strings), minimum, pattern, required, properties, items.
+Annotation keywords ($schema, $id, title, description) are ignored; any
+other keyword raises UnsupportedSchemaError so callers can fall back to
+jsonschema.
+
+Error messages and their order match Draft7Validator.iter_errors as
+formatted by ReviewResultValidator ("Validation error at <path>: <msg>").
+
+Extra single-pass checks can be woven into the generated function with
+GeneratedChecks (see REVIEW_RESULT_SEMANTICS): code run once before and
+after validation and per item of a given array.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# (schema_errors, semantic_errors)
+ValidatorFunction = Callable[[Any], Tuple[List[str], List[str]]]
+
+_ANNOTATION_KEYWORDS = {"$schema", "$id", "title", "description"}
+
+# Python expression checking a JSON type (Draft 6+ semantics: 1.0 is an integer)
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": (
+        "((isinstance({v}, int) and not isinstance({v}, bool))"
+        " or (isinstance({v}, float) and {v}.is_integer()))"
+    ),
+}
+
+# Path segment: static key or name of a loop index variable
+PathSegment = Union[str, "_Index"]
+
+
+class UnsupportedSchemaError(ValueError):
+    """Schema uses a keyword the code generator does not implement"""
+
+
+@dataclass
+class GeneratedChecks:
+    """
+    Extra checks woven into a generated validator
+
+    Code snippets are Python statements. Item hooks may use the
+    placeholders ITEM (current element) and INDEX (its position).
+    Epilogue runs only when the schema checks passed and appends messages
+    to the list semantic_errors.
+    """
+    prologue: str = ""
+    item_hooks: Dict[Tuple[str, ...], str] = field(default_factory=dict)
+    epilogue: str = ""
+
+
+class _Index(str):
+    """Marker for a path segment holding a loop index variable name"""
+
+
+class _Emitter:
+    """Accumulates generated source lines"""
+
+    def __init__(self, checks: GeneratedChecks):
+        self.lines: List[str] = []
+        self.constants: List[str] = []
+        self.checks = checks
+        self._counter = 0
+
+    def name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def constant(self, source: str) -> str:
+        const_name = f"_C{len(self.constants)}"
+        self.constants.append(f"{const_name} = {source}")
+        return const_name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def emit_block(self, indent: int, block: str) -> None:
+        for line in block.strip("\n").splitlines():
+            self.emit(indent, line)
+
+
+def _path_expr(path: List[PathSegment]) -> str:
+    """Python expression building the formatted error path ('issues -> 3 -> line')"""
+    if not path:
+        return repr("root")
+    pieces: List[str] = []
+    static = ""
+    for position, segment in enumerate(path):
+        if position:
+            static += " -> "
+        if isinstance(segment, _Index):
+            if static:
+                pieces.append(repr(static))
+                static = ""
+            pieces.append(f"str({segment})")
+        else:
+            static += str(segment)
+    if static:
+        pieces.append(repr(static))
+    return " + ".join(pieces)
+
+
+def _error(emitter: _Emitter, indent: int, path: List[PathSegment], message_expr: str) -> None:
+    emitter.emit(
+        indent,
+        f"errors.append('Validation error at ' + {_path_expr(path)} + ': ' + {message_expr})"
+    )
+
+
+def _static_path(path: List[PathSegment]) -> Tuple[str, ...]:
+    """Schema location of a path (indices dropped), used to look up item hooks"""
+    return tuple(segment for segment in path if not isinstance(segment, _Index))
+
+
+def _emit_schema(
+    emitter: _Emitter,
+    schema: Dict[str, Any],
+    var: str,
+    path: List[PathSegment],
+    indent: int
+) -> None:
+    """Emit checks of one (sub)schema for the value held in var"""
+    if not isinstance(schema, dict):
+        raise UnsupportedSchemaError(f"Boolean or non-object schema at {path}")
+
+    for keyword, value in schema.items():
+        if keyword in _ANNOTATION_KEYWORDS:
+            continue
+
+        if keyword == "type":
+            types = value if isinstance(value, list) else [value]
+            unknown = [t for t in types if t not in _TYPE_CHECKS]
+            if unknown:
+                raise UnsupportedSchemaError(f"Unknown type {unknown}")
+            condition = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in types)
+            reprs = repr(", ".join(repr(t) for t in types))
+            emitter.emit(indent, f"if not ({condition}):")
+            _error(emitter, indent + 1, path, f"repr({var}) + ' is not of type ' + {reprs}")
+
+        elif keyword == "enum":
+            if not all(isinstance(item, str) for item in value):
+                raise UnsupportedSchemaError("Only string enums are supported")
+            members = emitter.constant(f"frozenset({sorted(value)!r})")
+            message = repr(f" is not one of {value!r}")
+            emitter.emit(indent, f"if not (isinstance({var}, str) and {var} in {members}):")
+            _error(emitter, indent + 1, path, f"repr({var}) + {message}")
+
+        elif keyword == "minimum":
+            number = _TYPE_CHECKS["number"].format(v=var)
+            message = repr(f" is less than the minimum of {value!r}")
+            emitter.emit(indent, f"if {number} and {var} < {value!r}:")
+            _error(emitter, indent + 1, path, f"repr({var}) + {message}")
+
+        elif keyword == "pattern":
+            regex = emitter.constant(f"re.compile({value!r})")
+            message = repr(f" does not match {value!r}")
+            emitter.emit(indent, f"if isinstance({var}, str) and not {regex}.search({var}):")
+            _error(emitter, indent + 1, path, f"repr({var}) + {message}")
+
+        elif keyword == "required":
+            emitter.emit(indent, f"if isinstance({var}, dict):")
+            for prop in value:
+                emitter.emit(indent + 1, f"if {prop!r} not in {var}:")
+                _error(emitter, indent + 2, path, repr(f"{prop!r} is a required property"))
+
+        elif keyword == "properties":
+            emitter.emit(indent, f"if isinstance({var}, dict):")
+            body_start = len(emitter.lines)
+            for prop, subschema in value.items():
+                child = emitter.name("v")
+                emitter.emit(indent + 1, f"if {prop!r} in {var}:")
+                emitter.emit(indent + 2, f"{child} = {var}[{prop!r}]")
+                mark = len(emitter.lines)
+                _emit_schema(emitter, subschema, child, path + [prop], indent + 2)
+                if len(emitter.lines) == mark:
+                    # Unconstrained property: drop the useless lookup
+                    del emitter.lines[mark - 2:]
+            if len(emitter.lines) == body_start:
+                emitter.emit(indent + 1, "pass")
+
+        elif keyword == "items":
+            if not isinstance(value, dict):
+                raise UnsupportedSchemaError("Only single-schema 'items' is supported")
+            index = _Index(emitter.name("i"))
+            child = emitter.name("v")
+            emitter.emit(indent, f"if isinstance({var}, list):")
+            emitter.emit(indent + 1, f"for {index}, {child} in enumerate({var}):")
+            mark = len(emitter.lines)
+            _emit_schema(emitter, value, child, path + [index], indent + 2)
+            hook = emitter.checks.item_hooks.get(_static_path(path))
+            if hook:
+                emitter.emit_block(
+                    indent + 2, hook.replace("ITEM", child).replace("INDEX", index)
+                )
+            if len(emitter.lines) == mark:
+                emitter.emit(indent + 2, "pass")
+
+        else:
+            raise UnsupportedSchemaError(f"Keyword '{keyword}' is not supported")
+
+
+def generate_validator_source(
+    schema: Dict[str, Any],
+    checks: Optional[GeneratedChecks] = None,
+    function_name: str = "validate"
+) -> str:
+    """
+    Generate Python source of a validator function for schema
+
+    The generated function takes the instance and returns
+    (schema_errors, semantic_errors); semantic errors are only collected
+    when there are no schema errors.
+
+    Args:
+        schema: JSON schema (supported subset, see module docstring)
+        checks: Extra checks woven into the same pass (optional)
+        function_name: Name of generated function
+
+    Returns:
+        Module source code
+
+    Raises:
+        UnsupportedSchemaError: If schema uses unsupported keywords
+    """
+    checks = checks or GeneratedChecks()
+    emitter = _Emitter(checks)
+
+    emitter.emit(0, f"def {function_name}(data):")
+    emitter.emit(1, "errors = []")
+    emitter.emit(1, "semantic_errors = []")
+    if checks.prologue:
+        emitter.emit_block(1, checks.prologue)
+    _emit_schema(emitter, schema, "data", [], 1)
+    if checks.epilogue:
+        emitter.emit(1, "if not errors:")
+        emitter.emit_block(2, checks.epilogue)
+    emitter.emit(1, "return errors, semantic_errors")
+
+    header = ["import re", ""] + emitter.constants + ["", ""]
+    return "\n".join(header + emitter.lines) + "\n"
+
+
+def compile_validator(
+    schema: Dict[str, Any],
+    checks: Optional[GeneratedChecks] = None
+) -> ValidatorFunction:
+    """
+    Generate and compile a validator function for schema
+
+    Args:
+        schema: JSON schema (supported subset, see module docstring)
+        checks: Extra checks woven into the same pass (optional)
+
+    Returns:
+        Function returning (schema_errors, semantic_errors)
+
+    Raises:
+        UnsupportedSchemaError: If schema uses unsupported keywords
+    """
+    source = generate_validator_source(schema, checks)
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<generated schema validator>", "exec"), namespace)
+    function = namespace["validate"]
+    function.__source__ = source
+    return function
+
+
+# Semantic checks of review results (see ReviewResultValidator), evaluated
+# while the issues array is validated instead of in separate passes.
+REVIEW_RESULT_SEMANTICS = GeneratedChecks(
+    prologue="""
+severity_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "INFO": 0}
+path_errors = []
+line_errors = []
+""",
+    item_hooks={
+        ("issues",): """
+if isinstance(ITEM, dict):
+    severity = ITEM.get("severity")
+    if isinstance(severity, str) and severity in severity_counts:
+        severity_counts[severity] += 1
+    file_path = ITEM.get("file", "")
+    if isinstance(file_path, str) and (file_path.startswith("/") or (len(file_path) > 2 and file_path[1] == ":")):
+        path_errors.append(f"Issue #{INDEX + 1}: File path should be relative, not absolute: {file_path}")
+    if "line" in ITEM:
+        line = ITEM["line"]
+        if not isinstance(line, int) or line < 1:
+            line_errors.append(f"Issue #{INDEX + 1}: Line number must be positive integer, got: {line}")
+""",
+    },
+    epilogue="""
+summary = data["summary"]
+actual_count = len(data["issues"])
+reported_count = summary.get("total_issues", 0)
+if actual_count != reported_count:
+    semantic_errors.append(f"Mismatch: summary.total_issues ({reported_count}) != actual issues count ({actual_count})")
+for severity, actual_count in severity_counts.items():
+    reported_count = summary.get(severity.lower(), 0)
+    if actual_count != reported_count:
+        semantic_errors.append(f"Severity count mismatch for {severity}: summary reports {reported_count}, actual is {actual_count}")
+semantic_errors.extend(path_errors)
+semantic_errors.extend(line_errors)
+""",
+)
@@ -0,0 +1,74 @@
+"""
+SQLite Store Base
+
+Shared plumbing for local SQLite-backed stores: WAL journal mode, schema
+bootstrap and a single connection serialized by a lock, so store methods
+can be called from worker threads (run_blocking) safely.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteStore:
+    """Base class for SQLite-backed stores"""
+
+    # DDL executed on open (CREATE TABLE/INDEX IF NOT EXISTS statements)
+    SCHEMA: str = ""
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) SQLite database
+
+        Args:
+            db_path: Path to database file, or ':memory:' for tests
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            if self.SCHEMA:
+                self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+
+        logger.debug("Opened %s at %s", self.__class__.__name__, db_path)
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> int:
+        """Execute single write statement in its own transaction, return rowcount"""
+        with self._lock, self._conn:
+            return self._conn.execute(sql, tuple(params)).rowcount
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run several statements in one transaction (commit on success, rollback on error)"""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def _fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[sqlite3.Row]:
+        """Fetch single row"""
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchone()
+
+    def _fetchall(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        """Fetch all rows"""
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def close(self) -> None:
+        """Close database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,277 @@
+"""
+Review Tracing
+
+Lightweight per-review spans for debugging individual slow MRs.
+
+A trace starts at the review request; nested spans (clone, CLI tasks,
+parsing, post-processing steps) find their parent through a context
+variable, so asyncio tasks created inside a span inherit it. The trace id
+is propagated to CLI subprocesses (TRACEPARENT, REVIEW_TRACE_ID) and added
+to every log record.
+
+Sampling is decided once per trace (TRACING_SAMPLE_RATIO); unsampled traces
+still carry ids for logs but record nothing. Finished sampled spans are
+queued and a background thread writes them as one JSON object per line in
+the OTLP/JSON span shape to a size-rotated file (TRACING_EXPORT_PATH,
+default DATA_DIR/traces.jsonl), so ending a span never touches the disk on
+the event loop.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+import atexit
+import inspect
+import json
+import logging
+import queue
+import random
+import secrets
+import time
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("review_trace_span", default=None)
+
+SERVICE_NAME = "code-review-api"
+
+
+@dataclass
+class Span:
+    """Single timed operation of a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    sampled: bool
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach attribute (ignored for unsampled spans)"""
+        if self.sampled:
+            self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value"""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Span in OTLP/JSON shape"""
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": "STATUS_CODE_ERROR", "message": self.error}
+                if self.error else {"code": "STATUS_CODE_OK"}
+            ),
+            "resource": {
+                "attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]
+            },
+        }
+        if self.parent_span_id:
+            otlp["parentSpanId"] = self.parent_span_id
+        return otlp
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class _OtlpJsonFormatter(logging.Formatter):
+    """Serializes the span carried in record.msg (runs in the writer thread)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg.to_otlp(), separators=(",", ":"), default=str)
+
+
+class JsonlSpanExporter:
+    """Writes finished spans to a size-rotated JSONL file from a background thread"""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        """
+        Initialize exporter and start its writer thread
+
+        Args:
+            path: JSONL file path (parent directories are created)
+            max_bytes: Rotate when the file reaches this size
+            backup_count: Number of rotated files to keep
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self._handler.setFormatter(_OtlpJsonFormatter())
+        self._queue: queue.Queue = queue.Queue()
+        self._listener = QueueListener(self._queue, self._handler)
+        self._listener.start()
+        self._closed = False
+
+    def export(self, span: Span) -> None:
+        """Queue span for writing (non-blocking)"""
+        self._queue.put_nowait(logging.makeLogRecord({"msg": span}))
+
+    def flush(self) -> None:
+        """Block until every queued span has been written"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write remaining spans, stop the writer thread and close the file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._listener.stop()
+        self._handler.close()
+
+
+class Tracer:
+    """Creates spans and exports the sampled ones"""
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None, sample_ratio: float = 1.0):
+        """
+        Initialize tracer
+
+        Args:
+            exporter: Span exporter (None: ids are propagated, nothing is recorded)
+            sample_ratio: Fraction of traces to record (0.0 - 1.0)
+        """
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Run block inside a new span
+
+        Args:
+            name: Span name
+            parent: Explicit parent (defaults to the current span; a new trace is started if none)
+            **attributes: Span attributes
+        """
+        parent = parent or _current_span.get()
+        if parent is None:
+            trace_id = secrets.token_hex(16)
+            sampled = self.exporter is not None and random.random() < self.sample_ratio
+        else:
+            trace_id = parent.trace_id
+            sampled = parent.sampled
+
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            sampled=sampled,
+            attributes=dict(attributes) if sampled else {},
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            if sampled:
+                span.end_time_ns = time.time_ns()
+                self._export(span)
+
+    def _export(self, span: Span) -> None:
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            logger.warning(f"Failed to export span {span.name}: {e}")
+
+
+@lru_cache()
+def get_tracer() -> Tracer:
+    """Get tracer configured from settings (cached)"""
+    settings = get_settings()
+    exporter = None
+    if settings.TRACING_ENABLED:
+        exporter = JsonlSpanExporter(
+            settings.TRACING_EXPORT_PATH or str(Path(settings.DATA_DIR) / "traces.jsonl"),
+            max_bytes=settings.TRACING_MAX_BYTES,
+            backup_count=settings.TRACING_BACKUP_COUNT
+        )
+        atexit.register(exporter.close)
+    return Tracer(exporter, sample_ratio=settings.TRACING_SAMPLE_RATIO)
+
+
+def span(name: str, parent: Optional[Span] = None, **attributes: Any):
+    """Run block inside a new span of the global tracer"""
+    return get_tracer().span(name, parent=parent, **attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorator running a sync or async function inside a span"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """Span of the running code, None outside traces"""
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the running code, None outside traces"""
+    active = _current_span.get()
+    return active.trace_id if active else None
+
+
+def trace_environment() -> Dict[str, str]:
+    """Environment variables propagating the current trace to a subprocess"""
+    active = _current_span.get()
+    if active is None:
+        return {}
+    return {"TRACEPARENT": active.traceparent, "REVIEW_TRACE_ID": active.trace_id}
+
+
+def install_log_record_factory() -> None:
+    """Add trace_id attribute ('-' outside traces) to every stdlib log record"""
+    previous = logging.getLogRecordFactory()
+    if getattr(previous, "_adds_trace_id", False):
+        return
+
+    def factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = previous(*args, **kwargs)
+        record.trace_id = current_trace_id() or "-"
+        return record
+
+    factory._adds_trace_id = True
+    logging.setLogRecordFactory(factory)
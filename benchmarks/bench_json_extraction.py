@@ -0,0 +1,101 @@
+"""
+Micro-benchmark: JSON extraction from CLI output
+
+Compares the legacy greedy regex (r'\\{[\\s\\S]*\\}' + json.loads) with the
+linear raw_decode scanner from app.utils.json_extractor on pathological
+inputs.
+
+Run from the repository root:
+    python -m benchmarks.bench_json_extraction
+"""
+
+import json
+import re
+import time
+from typing import Callable, Optional
+
+from app.utils.json_extractor import extract_json_object
+
+REVIEW = {
+    "review_type": "ERROR_DETECTION",
+    "issues": [
+        {"file": f"src/Service{i}.java", "line": i + 1, "severity": "HIGH", "category": "NPE",
+         "message": "Possible null dereference", "suggestion": "Add null check", "auto_fixable": False}
+        for i in range(50)
+    ],
+    "summary": {"total_issues": 50, "critical": 0, "high": 50, "medium": 0, "low": 0}
+}
+
+# Legacy implementation is skipped above this size (quadratic backtracking)
+LEGACY_MAX_CHARS = 200_000
+
+
+def legacy_extract(output: str) -> Optional[dict]:
+    """Greedy regex extraction used before app.utils.json_extractor"""
+    match = re.search(r'\{[\s\S]*\}', output)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def unmatched_braces(size: int) -> str:
+    """Many '{' without a closing brace anywhere (regex worst case)"""
+    line = "[progress] { scanning module\n"
+    return line * (size // len(line))
+
+
+def log_noise_around_result(size: int) -> str:
+    """Valid result surrounded by log lines containing braces"""
+    body = json.dumps(REVIEW)
+    noise = "INFO {ctx} step done {}\n" * (max(0, size - len(body)) // 48)
+    return noise + body + "\n" + noise
+
+
+def broken_objects(size: int) -> str:
+    """Many objects that start valid and break mid-way"""
+    line = '{"progress": 1, "detail": {"file": "A.java", broken\n'
+    return line * (size // len(line)) + json.dumps(REVIEW)
+
+
+def unclosed_nesting(size: int) -> str:
+    """Large body nested in 50 levels that never close (one decode per level before)"""
+    item = '{"file": "A.java", "line": 1}, '
+    return '{"a": ' * 50 + "[" + item * (size // len(item)) + "0] broken\n" + json.dumps(REVIEW)
+
+
+def measure(func: Callable[[str], Optional[dict]], text: str, repeat: int = 3) -> float:
+    """Best wall time of several runs in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    cases = [
+        ("unmatched braces", unmatched_braces),
+        ("log noise + result", log_noise_around_result),
+        ("broken objects + result", broken_objects),
+        ("unclosed nesting + result", unclosed_nesting),
+    ]
+    sizes = [50_000, 200_000, 1_000_000, 4_000_000]
+
+    print(f"{'case':<26}{'size':>10}{'legacy ms':>14}{'scanner ms':>14}")
+    for name, generator in cases:
+        for size in sizes:
+            text = generator(size)
+            scanner_ms = measure(extract_json_object, text)
+            if len(text) <= LEGACY_MAX_CHARS:
+                legacy_ms = f"{measure(legacy_extract, text, repeat=1):.1f}"
+            else:
+                legacy_ms = "skipped"
+            print(f"{name:<26}{len(text):>10}{legacy_ms:>14}{scanner_ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
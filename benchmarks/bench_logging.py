@@ -0,0 +1,123 @@
+"""
+Benchmark: event-loop latency with logging on vs. off
+
+A probe coroutine sleeps 1 ms in a loop and records how late it wakes up
+while a producer coroutine logs bursts of INFO records through a stdlib
+logger, the way the services do. Compared setups:
+
+- off:    INFO disabled, records are dropped by isEnabledFor
+- sync:   stdlib records forwarded to a loguru file sink on the event loop
+- queued: the app pipeline (QueueHandler -> listener thread -> enqueued sink)
+
+Run from the repository root:
+    python -m benchmarks.bench_logging
+"""
+
+import asyncio
+import logging
+import queue
+import statistics
+import tempfile
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from loguru import logger as loguru_logger
+
+from app.utils.logger import TEXT_FORMAT, LogThrottle, _LoguruForwarder, _patch_record
+
+DURATION_SECONDS = 2.0
+BURST = 5  # records per producer tick (about 1 ms apart)
+PAYLOAD = "x" * 400
+
+bench_logger = logging.getLogger("app.bench")
+
+
+async def probe(stop_at: float) -> List[float]:
+    """Wake-up delays of 1 ms sleeps in milliseconds"""
+    lags = []
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - started - 0.001) * 1000)
+    return lags
+
+
+async def produce(stop_at: float) -> int:
+    """Log a burst of records every tick until stop_at"""
+    count = 0
+    while time.perf_counter() < stop_at:
+        for _ in range(BURST):
+            bench_logger.info("Review step %d finished: %s", count, PAYLOAD)
+            count += 1
+        await asyncio.sleep(0.001)
+    return count
+
+
+async def measure() -> Dict[str, float]:
+    stop_at = time.perf_counter() + DURATION_SECONDS
+    lags, records = await asyncio.gather(probe(stop_at), produce(stop_at))
+    lags.sort()
+    return {
+        "p50": statistics.median(lags),
+        "p99": lags[int(len(lags) * 0.99)],
+        "max": lags[-1],
+        "records": records,
+    }
+
+
+def setup_off(log_file: Path) -> Callable[[], None]:
+    root = logging.getLogger()
+    root.setLevel(logging.WARNING)
+    return lambda: None
+
+
+def setup_sync(log_file: Path) -> Callable[[], None]:
+    loguru_logger.add(log_file, format=TEXT_FORMAT)
+    root = logging.getLogger()
+    handler = _LoguruForwarder()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return lambda: root.removeHandler(handler)
+
+
+def setup_queued(log_file: Path) -> Callable[[], None]:
+    loguru_logger.add(log_file, format=TEXT_FORMAT, enqueue=True)
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    handler = QueueHandler(log_queue)
+    handler.addFilter(LogThrottle())
+    listener = QueueListener(log_queue, _LoguruForwarder())
+    listener.start()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+    def teardown() -> None:
+        root.removeHandler(handler)
+        listener.stop()
+    return teardown
+
+
+def main() -> None:
+    loguru_logger.remove()
+    loguru_logger.configure(patcher=_patch_record)
+    setups = [("off", setup_off), ("sync", setup_sync), ("queued", setup_queued)]
+
+    print(f"{'setup':<10}{'records':>10}{'lag p50 ms':>12}{'lag p99 ms':>12}{'lag max ms':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, setup in setups:
+            teardown = setup(Path(tmp) / f"{name}.log")
+            try:
+                result = asyncio.run(measure())
+            finally:
+                teardown()
+                loguru_logger.remove()
+            print(
+                f"{name:<10}{result['records']:>10}{result['p50']:>12.3f}"
+                f"{result['p99']:>12.3f}{result['max']:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: application startup
+
+Measures, each in a fresh interpreter:
+- import time of app.main (settings, routes, services),
+- time until the lifespan yields (the app accepts traffic),
+- time until the background warm-up has finished, with per-step durations,
+- time until the readiness probe reports ready (only reached when the CLI
+  agents, model API and GitLab are available; otherwise reported as '-').
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [runs]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Seconds to wait for warm-up / readiness in one run
+WAIT_TIMEOUT = 60
+
+CHILD = f"""
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def measure():
+    from app.dependencies import get_health_monitor_instance, get_warmup_instance
+    result = {{"import": imported - start}}
+    async with app.main.lifespan(app.main.app):
+        result["lifespan"] = time.perf_counter() - imported
+        warmup = get_warmup_instance()
+        monitor = get_health_monitor_instance()
+        deadline = time.perf_counter() + {WAIT_TIMEOUT}
+        while time.perf_counter() < deadline:
+            if "warm" not in result and warmup.state in ("ready", "failed"):
+                result["warm"] = time.perf_counter() - imported
+                result["warmup_state"] = warmup.state
+                result["steps"] = warmup.durations
+            if monitor.is_ready():
+                result["ready"] = time.perf_counter() - imported
+                break
+            if "warm" in result and warmup.state == "failed":
+                break
+            if "warm" in result and monitor.state is not None and not monitor.is_ready():
+                break
+            await asyncio.sleep(0.01)
+    print(json.dumps(result))
+
+asyncio.run(measure())
+"""
+
+
+def run_once() -> Dict[str, Any]:
+    """Start a fresh interpreter and return its measurements"""
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        capture_output=True,
+        text=True,
+        timeout=WAIT_TIMEOUT * 2
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"Startup run failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def median_ms(runs: List[Dict[str, Any]], key: str) -> str:
+    values = [run[key] for run in runs if key in run]
+    if len(values) < len(runs):
+        return "-"
+    return f"{statistics.median(values) * 1000:.0f}"
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    runs = [run_once() for _ in range(count)]
+
+    print(f"{'phase':<28}{'median ms':>12}")
+    print(f"{'import app.main':<28}{median_ms(runs, 'import'):>12}")
+    print(f"{'lifespan startup':<28}{median_ms(runs, 'lifespan'):>12}")
+    print(f"{'time to warm':<28}{median_ms(runs, 'warm'):>12}")
+    print(f"{'time to ready':<28}{median_ms(runs, 'ready'):>12}")
+
+    states = {run.get("warmup_state", "timeout") for run in runs}
+    print(f"\nwarm-up state: {', '.join(sorted(states))}")
+    step_names = runs[0].get("steps", {}).keys()
+    for name in step_names:
+        values = [run["steps"][name] for run in runs if name in run.get("steps", {})]
+        print(f"  {name:<26}{statistics.median(values) * 1000:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: review result validation
+
+Compares the jsonschema path (Draft7Validator.iter_errors + separate
+semantic passes) with the generated single-pass validator from
+app.utils.schema_codegen on large payloads.
+
+Run from the repository root:
+    python -m benchmarks.bench_validator
+"""
+
+import time
+from typing import Any, Callable, Dict
+
+from app.utils.json_validator import ReviewResultValidator
+
+
+def make_payload(issue_count: int) -> Dict[str, Any]:
+    """Valid review result with issue_count issues"""
+    severities = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]
+    issues = [
+        {
+            "file": f"src/main/java/com/example/Service{i % 400}.java",
+            "line": i % 900 + 1,
+            "severity": severities[i % 5],
+            "category": "Null Safety",
+            "message": "Possible null dereference of repository result",
+            "code_snippet": "return repository.findById(id).get();",
+            "suggestion": "Use orElseThrow with a domain exception",
+            "auto_fixable": i % 3 == 0,
+            "cwe": "CWE-476",
+            "rule_source": "default",
+        }
+        for i in range(issue_count)
+    ]
+    summary = {"total_issues": issue_count}
+    for severity in severities:
+        summary[severity.lower()] = sum(1 for issue in issues if issue["severity"] == severity)
+    return {"review_type": "ERROR_DETECTION", "issues": issues, "summary": summary}
+
+
+def make_invalid_payload(issue_count: int) -> Dict[str, Any]:
+    """Payload where every 10th issue breaks the schema"""
+    payload = make_payload(issue_count)
+    for issue in payload["issues"][::10]:
+        issue["line"] = 0
+        issue["severity"] = "SEVERE"
+    return payload
+
+
+def measure(func: Callable[[Dict[str, Any]], Any], payload: Dict[str, Any], repeat: int = 5) -> float:
+    """Best wall time of several runs in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(payload)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    validator = ReviewResultValidator()
+    if validator.fast_validator is None:
+        raise SystemExit("Schema could not be compiled")
+
+    cases = [("valid", make_payload), ("10% invalid", make_invalid_payload)]
+    sizes = [100, 1_000, 10_000]
+
+    print(f"{'case':<14}{'issues':>8}{'jsonschema ms':>16}{'generated ms':>16}{'speedup':>10}")
+    for name, generator in cases:
+        for size in sizes:
+            payload = generator(size)
+            reference_ms = measure(validator._validate_with_jsonschema, payload)
+            fast_ms = measure(validator.validate, payload)
+            print(f"{name:<14}{size:>8}{reference_ms:>16.1f}{fast_ms:>16.1f}{reference_ms / fast_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,8 +27,10 @@ def pytest_configure(config):
         "DEFAULT_LANGUAGE": "java",
         "VERSION": "2.0.0-test",
         "LOG_LEVEL": "INFO",
+        "LOG_DIR": "",
         "CONFLUENCE_RULES_ENABLED": "false",
-        "MCP_RAG_ENABLED": "false"
+        "MCP_RAG_ENABLED": "false",
+        "TRACING_ENABLED": "false"
     }
     
     # Apply test environment
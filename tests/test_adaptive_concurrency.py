@@ -0,0 +1,90 @@
+"""
+Tests for adaptive (AIMD) concurrency limiter
+"""
+
+import asyncio
+import pytest
+
+from app.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_additively_while_saturated():
+    """Test healthy completions at full use raise the limit by about one per limit's worth"""
+    limiter = AdaptiveConcurrencyLimiter("cline", initial_limit=2, max_limit=3)
+    tokens = [await limiter.acquire() for _ in range(2)]
+    for _ in range(2):
+        limiter.release(tokens.pop(0), latency=10.0, key="SECURITY_AUDIT")
+        tokens.append(await limiter.acquire())
+    assert limiter.limit == 2  # 2 + 1/2 + 1/2.5
+    
+    for _ in range(10):
+        limiter.release(tokens.pop(0), latency=10.0, key="SECURITY_AUDIT")
+        tokens.append(await limiter.acquire())
+    assert limiter.limit == 3  # max_limit
+
+
+@pytest.mark.asyncio
+async def test_limit_does_not_grow_when_unused():
+    """Test completions below the limit leave it unchanged"""
+    limiter = AdaptiveConcurrencyLimiter("cline", initial_limit=4)
+    for _ in range(20):
+        limiter.release(await limiter.acquire(), latency=10.0)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_overload_cuts_limit_once_per_episode():
+    """Test tasks started before a cut don't cut the limit again"""
+    limiter = AdaptiveConcurrencyLimiter("qwen", initial_limit=8)
+    tokens = [await limiter.acquire() for _ in range(4)]
+    
+    limiter.release(tokens[0], overload="rate_limited")
+    limiter.release(tokens[1], overload="timeout")
+    assert limiter.limit == 4
+    
+    later = await limiter.acquire()
+    limiter.release(later, overload="rate_limited")
+    assert limiter.limit == 2
+    
+    for token in tokens[2:]:
+        limiter.release(token, overload="timeout")
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_latency_spike_cuts_limit():
+    """Test a task much slower than its review type's usual latency counts as overload"""
+    limiter = AdaptiveConcurrencyLimiter("cline", initial_limit=4, latency_tolerance=2.0)
+    limiter.release(await limiter.acquire(), latency=10.0, key="PERFORMANCE")
+    limiter.release(await limiter.acquire(), latency=100.0, key="ERROR_DETECTION")  # other class
+    assert limiter.limit == 4
+    
+    limiter.release(await limiter.acquire(), latency=25.0, key="PERFORMANCE")
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_get_slots_in_order_and_cancellation_frees_them():
+    """Test FIFO hand-over of freed slots; a cancelled waiter does not hold one"""
+    limiter = AdaptiveConcurrencyLimiter("cline", initial_limit=1, max_limit=1)
+    first = await limiter.acquire()
+    order = []
+    
+    async def wait(name):
+        token = await limiter.acquire()
+        order.append(name)
+        limiter.release(token)
+    
+    cancelled = asyncio.create_task(wait("cancelled"))
+    waiting = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    
+    limiter.release(first)
+    await asyncio.gather(*waiting)
+    
+    assert order == ["a", "b"]
+    assert limiter.in_flight == 0
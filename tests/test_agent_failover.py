@@ -0,0 +1,77 @@
+"""
+Tests for agent failover policy (latency tracking, circuit breaker)
+"""
+
+from unittest.mock import patch
+
+from app.models import CLIAgent, ReviewType
+from app.services.agent_failover import AgentFailover, CircuitBreaker, LatencyTracker
+
+
+def test_latency_quantile_needs_min_samples():
+    """Test quantile is unknown until enough runs are recorded"""
+    tracker = LatencyTracker(window=100, min_samples=20)
+    for seconds in range(1, 20):
+        tracker.record(CLIAgent.CLINE, ReviewType.SECURITY_AUDIT, float(seconds))
+    assert tracker.quantile(CLIAgent.CLINE, ReviewType.SECURITY_AUDIT) is None
+    
+    tracker.record(CLIAgent.CLINE, ReviewType.SECURITY_AUDIT, 20.0)
+    assert tracker.quantile(CLIAgent.CLINE, ReviewType.SECURITY_AUDIT, 0.95) == 19.0
+    assert tracker.quantile(CLIAgent.QWEN_CODE, ReviewType.SECURITY_AUDIT) is None
+
+
+def test_latency_window_drops_old_samples():
+    """Test only the last `window` runs count"""
+    tracker = LatencyTracker(window=5, min_samples=5)
+    for seconds in [100.0] * 5 + [1.0] * 5:
+        tracker.record(CLIAgent.CLINE, ReviewType.PERFORMANCE, seconds)
+    assert tracker.quantile(CLIAgent.CLINE, ReviewType.PERFORMANCE, 0.95) == 1.0
+
+
+def test_circuit_opens_after_consecutive_failures():
+    """Test breaker opens at the threshold and a success resets the count"""
+    breaker = CircuitBreaker("cline", failure_threshold=3, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+
+def test_circuit_half_open_allows_single_trial():
+    """Test one trial run after reset_seconds; its outcome closes or reopens the breaker"""
+    breaker = CircuitBreaker("qwen", failure_threshold=1, reset_seconds=60)
+    with patch("app.services.agent_failover.time.monotonic", return_value=1000.0):
+        breaker.record_failure()
+    
+    with patch("app.services.agent_failover.time.monotonic", return_value=1060.0):
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # trial in flight
+        breaker.record_failure()
+        assert breaker.state == "open"
+    
+    with patch("app.services.agent_failover.time.monotonic", return_value=1120.0):
+        assert breaker.allow() is True
+        breaker.release_trial()  # cancelled trial gives the slot back
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+def test_hedge_delay_disabled_without_hedges():
+    """Test max_hedges=0 turns hedging off"""
+    failover = AgentFailover(min_samples=1, max_hedges=0)
+    failover.record(CLIAgent.CLINE, ReviewType.REFACTORING, 10.0)
+    assert failover.hedge_delay(CLIAgent.CLINE, ReviewType.REFACTORING) is None
+    
+    failover = AgentFailover(min_samples=1, max_hedges=1)
+    failover.record(CLIAgent.CLINE, ReviewType.REFACTORING, 10.0)
+    failover.record(CLIAgent.CLINE, ReviewType.REFACTORING, None)
+    assert failover.hedge_delay(CLIAgent.CLINE, ReviewType.REFACTORING) == 10.0
+    assert failover.breakers[CLIAgent.CLINE].failures == 1
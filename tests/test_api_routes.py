@@ -80,20 +80,38 @@ def mock_git_manager():
     return manager
 
 
-def test_health_check_endpoint_with_mocks(mock_review_service, mock_gitlab_service):
-    """Test detailed health check endpoint with mocks"""
-    with patch('app.api.routes.get_review_service', return_value=mock_review_service), \
-         patch('app.api.routes.get_gitlab_service', return_value=mock_gitlab_service):
-        
+@pytest.mark.asyncio
+async def test_health_check_endpoint_with_mocks(mock_review_service, mock_gitlab_service):
+    """Test /health serves the HealthMonitor cache: unknown before the first refresh, then cached"""
+    from app.api.routes import get_health_monitor
+    from app.services.health_monitor import HealthMonitor
+    
+    monitor = HealthMonitor(mock_review_service, mock_gitlab_service, version="test")
+    app.dependency_overrides[get_health_monitor] = lambda: monitor
+    try:
+        before = client.get("/api/v1/health").json()
+        await monitor.refresh()
         response = client.get("/api/v1/health")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "healthy"
-        assert data["cline_available"] is True
-        assert data["qwen_available"] is True
-        assert data["model_api_connected"] is True
-        assert data["gitlab_connected"] is True
+        mock_gitlab_service.test_connection = AsyncMock(return_value=False)
+        cached = client.get("/api/v1/health").json()
+    finally:
+        app.dependency_overrides.pop(get_health_monitor, None)
+    
+    assert before["status"] == "unknown"
+    assert before["cline_available"] is False
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["version"] == "test"
+    assert data["cline_available"] is True
+    assert data["qwen_available"] is True
+    assert data["model_api_connected"] is True
+    assert data["gitlab_connected"] is True
+    
+    # Requests never run the deep checks themselves
+    assert cached == data
+    mock_review_service.health_check.assert_awaited_once()
 
 
 def test_validate_mr_success(mock_gitlab_service):
@@ -274,3 +292,368 @@ def test_review_endpoint_missing_fields():
     response = client.post("/api/v1/review", json={})
     
     assert response.status_code == 422  # Validation error
+
+
+def test_generate_review_comment_without_timing():
+    """Test timing-free rendering used for change detection"""
+    from app.api.routes import generate_review_comment
+    
+    result = ReviewResult(
+        review_type=ReviewType.ALL,
+        agent=CLIAgent.CLINE,
+        summary=ReviewSummary(),
+        execution_time_seconds=10.5
+    )
+    
+    comment = generate_review_comment(result, include_timing=False)
+    
+    assert "Execution Time" not in comment
+    assert "PASSED" in comment
+
+
+def test_generate_review_comment_with_finding_delta():
+    """Test comment lists only new critical issues and resolved findings"""
+    from app.api.routes import generate_review_comment
+    from app.models import ReviewIssue, IssueSeverity, FindingDelta
+    
+    persisting = ReviewIssue(file="A.java", line=1, severity=IssueSeverity.CRITICAL,
+                             category="Old Problem", message="m", suggestion="s")
+    new = ReviewIssue(file="B.java", line=2, severity=IssueSeverity.CRITICAL,
+                      category="Fresh Problem", message="m", suggestion="s")
+    resolved = ReviewIssue(file="C.java", line=3, severity=IssueSeverity.HIGH,
+                           category="Fixed Problem", message="m", suggestion="s")
+    result = ReviewResult(
+        review_type=ReviewType.ALL,
+        agent=CLIAgent.CLINE,
+        issues=[persisting, new],
+        summary=ReviewSummary(total_issues=2, critical=2),
+        finding_delta=FindingDelta(
+            new_issues=[new], persisting_issues=[persisting], resolved_issues=[resolved]
+        )
+    )
+    
+    comment = generate_review_comment(result)
+    
+    assert "New: 1" in comment and "Persisting: 1" in comment and "Resolved: 1" in comment
+    assert "Fresh Problem" in comment
+    assert "Old Problem" not in comment
+    assert "~~Fixed Problem~~" in comment
+
+
+def test_list_reviews_endpoint(tmp_path):
+    """Test stored reviews are served with keyset pagination"""
+    from app.api.routes import get_results_store
+    from app.services.results_store import ReviewResultsStore
+    
+    store = ReviewResultsStore(str(tmp_path / "results.db"))
+    for mr_iid in (1, 2, 3):
+        store.save_review(5, mr_iid, ReviewResult(
+            review_type=ReviewType.ALL, agent=CLIAgent.CLINE, summary=ReviewSummary()
+        ))
+    app.dependency_overrides[get_results_store] = lambda: store
+    try:
+        first = client.get("/api/v1/reviews", params={"project_id": 5, "limit": 2}).json()
+        second = client.get("/api/v1/reviews", params={"project_id": 5, "cursor": first["next_cursor"]}).json()
+        detail = client.get(f"/api/v1/reviews/{second['items'][0]['id']}")
+        missing = client.get("/api/v1/reviews/999")
+    finally:
+        app.dependency_overrides.pop(get_results_store)
+        store.close()
+    
+    assert [r["mr_iid"] for r in first["items"]] == [3, 2]
+    assert [r["mr_iid"] for r in second["items"]] == [1]
+    assert second["next_cursor"] is None
+    assert detail.status_code == 200
+    assert detail.json()["issues"] == []
+    assert missing.status_code == 404
+
+
+def test_project_trends_endpoint(tmp_path):
+    """Test trends endpoint answers from rollups and 404s for unknown projects"""
+    from app.api.routes import get_results_store
+    from app.services.results_store import ReviewResultsStore
+    
+    store = ReviewResultsStore(str(tmp_path / "results.db"))
+    store.save_review(5, 1, ReviewResult(
+        review_type=ReviewType.ALL, agent=CLIAgent.CLINE, summary=ReviewSummary()
+    ))
+    app.dependency_overrides[get_results_store] = lambda: store
+    try:
+        response = client.get("/api/v1/projects/5/trends", params={"weeks": 4})
+        missing = client.get("/api/v1/projects/6/trends")
+    finally:
+        app.dependency_overrides.pop(get_results_store)
+        store.close()
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["totals"]["reviews"] == 1
+    assert len(data["weeks"]) == 4
+    assert data["weeks"][-1]["reviews"] == 1
+    assert missing.status_code == 404
+
+
+def test_generate_review_comment_timing_breakdown():
+    """Test timing breakdown is in the footer but not in the content key rendering"""
+    from app.api.routes import generate_review_comment
+    from app.models import ReviewTimings
+    
+    result = ReviewResult(
+        review_type=ReviewType.ALL,
+        agent=CLIAgent.CLINE,
+        summary=ReviewSummary(),
+        timings=ReviewTimings(clone=3.0, review=40.0, cli={"SECURITY_AUDIT": 35.0}, post_actions={"summary_comment": 1.0})
+    )
+    
+    comment = generate_review_comment(result)
+    
+    assert "Timing breakdown (44.0s)" in comment
+    assert "| cli.SECURITY_AUDIT | 35.0 |" in comment
+    assert "| post_actions.summary_comment | 1.0 |" in comment
+    assert "Timing breakdown" not in generate_review_comment(result, include_timing=False)
+
+
+def test_prefetch_endpoint():
+    """Test prefetch requests are queued and answered immediately"""
+    from app.api.routes import get_prefetcher
+    
+    prefetcher = MagicMock()
+    prefetcher.submit.return_value = "queued"
+    prefetcher.stats.return_value = {"pending": 1, "completed": 0, "failed": 0}
+    app.dependency_overrides[get_prefetcher] = lambda: prefetcher
+    try:
+        response = client.post(
+            "/api/v1/prefetch",
+            json={"project_id": 7, "source_branch": "feature", "target_branch": "main"}
+        )
+        invalid = client.post("/api/v1/prefetch", json={"project_id": 7, "source_branch": "feature"})
+    finally:
+        app.dependency_overrides.pop(get_prefetcher)
+    
+    assert response.status_code == 202
+    assert response.json() == {"status": "queued", "pending": 1}
+    prefetcher.submit.assert_called_once_with(project_id=7, source_branch="feature", target_branch="main")
+    assert invalid.status_code == 422
+
+
+def _merge_request_event(action: str = "update", **attributes) -> dict:
+    """Minimal GitLab Merge Request Hook payload"""
+    return {
+        "object_kind": "merge_request",
+        "project": {"id": 7},
+        "object_attributes": {
+            "iid": 3,
+            "action": action,
+            "source_branch": "feature",
+            "target_branch": "main",
+            "last_commit": {"id": "0123456789abcdef"},
+            **attributes
+        }
+    }
+
+
+def test_gitlab_webhook_schedules_review_for_new_commits():
+    """Test pushes to an MR schedule a debounced review and a prefetch"""
+    from app.api.routes import get_prefetcher, get_review_debouncer
+    
+    debouncer = MagicMock()
+    debouncer.submit.return_value = "scheduled"
+    prefetcher = MagicMock()
+    app.dependency_overrides[get_review_debouncer] = lambda: debouncer
+    app.dependency_overrides[get_prefetcher] = lambda: prefetcher
+    try:
+        with patch('app.api.routes.get_settings') as mock_settings:
+            mock_settings.return_value.GITLAB_WEBHOOK_SECRET = "s3cret"
+            headers = {"X-Gitlab-Token": "s3cret"}
+            pushed = client.post("/api/v1/webhooks/gitlab", json=_merge_request_event(oldrev="abc"), headers=headers)
+            edited = client.post("/api/v1/webhooks/gitlab", json=_merge_request_event(), headers=headers)
+            debouncer.cancel.return_value = True
+            closed = client.post("/api/v1/webhooks/gitlab", json=_merge_request_event("close"), headers=headers)
+            forbidden = client.post("/api/v1/webhooks/gitlab", json=_merge_request_event(), headers={"X-Gitlab-Token": "x"})
+    finally:
+        app.dependency_overrides.pop(get_review_debouncer)
+        app.dependency_overrides.pop(get_prefetcher)
+    
+    assert pushed.status_code == 202
+    assert pushed.json()["status"] == "scheduled"
+    debouncer.submit.assert_called_once_with(7, 3, "0123456789abcdef")
+    prefetcher.submit.assert_called_once_with(7, "feature", "main")
+    assert edited.json()["status"] == "ignored"
+    assert closed.json()["status"] == "cancelled"
+    debouncer.cancel.assert_called_once_with(7, 3)
+    assert forbidden.status_code == 401
+
+
+def test_gitlab_webhook_disabled_without_secret():
+    """Test receiver rejects events when no secret is configured"""
+    with patch('app.api.routes.get_settings') as mock_settings:
+        mock_settings.return_value.GITLAB_WEBHOOK_SECRET = ""
+        response = client.post("/api/v1/webhooks/gitlab", json=_merge_request_event())
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_cancelled_webhook_review_releases_workspace():
+    """Test an outdated webhook review cancelled mid-review cleans up its checkout"""
+    import asyncio
+    from app.api.routes import run_webhook_review
+    
+    review_service = MagicMock()
+    review_started = asyncio.Event()
+    
+    async def slow_review(**kwargs):
+        review_started.set()
+        await asyncio.sleep(10)
+    
+    review_service.execute_review = AsyncMock(side_effect=slow_review)
+    gitlab_service = MagicMock()
+    gitlab_service.get_merge_request = AsyncMock(return_value={"source_branch": "feature", "target_branch": "main"})
+    gitlab_service.get_project = AsyncMock(return_value={})
+    git_manager = MagicMock()
+    git_manager.clone_repository = AsyncMock(return_value="/tmp/review/project-7-pool-x")
+    git_manager.cleanup_repository = AsyncMock()
+    
+    with patch('app.api.routes.get_review_service', return_value=review_service), \
+            patch('app.api.routes.get_gitlab_service', return_value=gitlab_service), \
+            patch('app.api.routes.get_git_manager', return_value=git_manager):
+        task = asyncio.create_task(run_webhook_review(7, 3, "0123abcd"))
+        await review_started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    git_manager.cleanup_repository.assert_awaited_once_with("/tmp/review/project-7-pool-x")
+
+
+def _finding_diff_settings(**overrides):
+    settings = MagicMock(
+        FINDING_DIFF_ENABLED=True,
+        INLINE_COMMENTS_ENABLED=False,
+        SUMMARY_NOTE_UPDATE_IN_PLACE=False,
+        RESULTS_STORE_ENABLED=False
+    )
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return settings
+
+
+async def _process_with_findings(tmp_path, gitlab_service, settings, mr_data=None):
+    from app.api.routes import process_review_results
+    from app.models import ReviewIssue, IssueSeverity, ReviewRequest
+    from app.services.finding_tracker import FingerprintStore
+    
+    store = FingerprintStore(str(tmp_path / "state.db"))
+    result = ReviewResult(
+        review_type=ReviewType.ALL,
+        agent=CLIAgent.CLINE,
+        issues=[ReviewIssue(file="A.java", line=1, severity=IssueSeverity.HIGH,
+                            category="Null Safety", message="m", suggestion="s")],
+        summary=ReviewSummary(total_issues=1, high=1)
+    )
+    git_manager = MagicMock(cleanup_repository=AsyncMock())
+    with patch('app.api.routes.get_settings', return_value=settings), \
+            patch('app.dependencies.get_fingerprint_store_instance', return_value=store):
+        await process_review_results(
+            result=result,
+            request=ReviewRequest(project_id=1, merge_request_iid=2),
+            mr_data=mr_data or {"source_branch": "feature", "target_branch": "main"},
+            repo_path=str(tmp_path),
+            gitlab_service=gitlab_service,
+            git_manager=git_manager
+        )
+    saved = store.load(1, 2)
+    store.close()
+    return result, saved
+
+
+@pytest.mark.asyncio
+async def test_finding_fingerprints_saved_after_publishing(tmp_path):
+    """Test this run's findings are stored only once the summary comment is posted"""
+    gitlab_service = MagicMock(
+        get_mr_changes=AsyncMock(return_value=[]),
+        post_mr_comment=AsyncMock(side_effect=RuntimeError("GitLab unavailable"))
+    )
+    
+    result, saved = await _process_with_findings(tmp_path, gitlab_service, _finding_diff_settings())
+    
+    assert len(result.finding_delta.new_issues) == 1
+    assert saved == {}  # next run still reports the finding as new
+    
+    gitlab_service.post_mr_comment = AsyncMock()
+    result, saved = await _process_with_findings(tmp_path, gitlab_service, _finding_diff_settings())
+    
+    assert len(result.finding_delta.new_issues) == 1
+    assert list(saved) == [result.issues[0].fingerprint]
+
+
+@pytest.mark.asyncio
+async def test_finding_diff_does_not_need_mr_changes(tmp_path):
+    """Test findings are compared and stored without fetching the diff (inline comments off)"""
+    gitlab_service = MagicMock(
+        get_mr_changes=AsyncMock(side_effect=RuntimeError("timeout")),
+        post_mr_comment=AsyncMock()
+    )
+    
+    result, saved = await _process_with_findings(tmp_path, gitlab_service, _finding_diff_settings())
+    
+    assert len(result.finding_delta.new_issues) == 1
+    assert list(saved) == [result.issues[0].fingerprint]
+    gitlab_service.get_mr_changes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_findings_rejected_inline_are_stored_as_published(tmp_path):
+    """Test a draft GitLab always rejects (400) does not keep the finding new run after run"""
+    import httpx
+    
+    request = httpx.Request("POST", "https://gitlab.example.com")
+    bad_request = httpx.HTTPStatusError("Bad Request", request=request, response=httpx.Response(400, request=request))
+    gitlab_service = MagicMock(
+        get_mr_changes=AsyncMock(return_value=[
+            {"old_path": "A.java", "new_path": "A.java", "diff": "@@ -0,0 +1,1 @@\n+line1\n"}
+        ]),
+        post_mr_comment=AsyncMock(),
+        list_draft_notes=AsyncMock(return_value=[]),
+        create_draft_note=AsyncMock(side_effect=bad_request),
+        bulk_publish_draft_notes=AsyncMock()
+    )
+    settings = _finding_diff_settings(
+        INLINE_COMMENTS_ENABLED=True,
+        INLINE_COMMENTS_CONCURRENCY=2,
+        INLINE_COMMENTS_MAX_RETRIES=0,
+        INLINE_COMMENTS_MIN_SEVERITY="MEDIUM"
+    )
+    mr_data = {
+        "source_branch": "feature",
+        "target_branch": "main",
+        "diff_refs": {"base_sha": "base", "head_sha": "head", "start_sha": "start"}
+    }
+    
+    result, saved = await _process_with_findings(tmp_path, gitlab_service, settings, mr_data)
+    
+    assert len(result.finding_delta.new_issues) == 1
+    assert list(saved) == [result.issues[0].fingerprint]
+    
+    result, saved = await _process_with_findings(tmp_path, gitlab_service, settings, mr_data)
+    
+    assert result.finding_delta.new_issues == []
+    assert len(result.finding_delta.persisting_issues) == 1
+    assert gitlab_service.create_draft_note.await_count == 1  # not posted again
+
+
+@pytest.mark.asyncio
+async def test_findings_stored_when_mr_has_no_diff_refs(tmp_path):
+    """Test an MR without diff_refs does not report the same findings as new on every run"""
+    gitlab_service = MagicMock(get_mr_changes=AsyncMock(return_value=[]), post_mr_comment=AsyncMock())
+    settings = _finding_diff_settings(
+        INLINE_COMMENTS_ENABLED=True,
+        INLINE_COMMENTS_CONCURRENCY=2,
+        INLINE_COMMENTS_MAX_RETRIES=0,
+        INLINE_COMMENTS_MIN_SEVERITY="MEDIUM"
+    )
+    
+    await _process_with_findings(tmp_path, gitlab_service, settings)
+    result, saved = await _process_with_findings(tmp_path, gitlab_service, settings)
+    
+    assert result.finding_delta.new_issues == []
+    assert list(saved) == [result.issues[0].fingerprint]
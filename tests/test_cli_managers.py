@@ -2,12 +2,14 @@
 Tests for CLI Managers (Cline and Qwen)
 """
 
+import os
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 from app.services.base_cli_manager import BaseCLIManager
 from app.services.cline_cli_manager import ClineCLIManager
 from app.services.qwen_code_cli_manager import QwenCodeCLIManager
 from app.models import ReviewType, CLIAgent
+from app.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
 
 
 @pytest.fixture
@@ -238,6 +240,20 @@ def test_parse_cli_output_invalid(cline_manager):
         cline_manager._parse_cli_output(output)
 
 
+def test_parse_cli_output_truncated_json(cline_manager):
+    """Test truncated JSON keeps complete issues instead of failing"""
+    output = (
+        '{"review_type": "ERROR_DETECTION", "issues": ['
+        '{"file": "A.java", "line": 3, "severity": "HIGH", "category": "NPE", "message": "m"}, '
+        '{"file": "B.java", "line": 8, "sev'
+    )
+    
+    result = cline_manager._parse_cli_output(output)
+    
+    assert len(result["issues"]) == 1
+    assert result["summary"]["analysis_incomplete"] is True
+
+
 def test_cline_review_type_distribution(cline_manager):
     """Test Cline review type distribution strategy"""
     distribution = cline_manager.get_review_type_distribution([ReviewType.ALL])
@@ -246,3 +262,93 @@ def test_cline_review_type_distribution(cline_manager):
     assert len(distribution) == 5
     assert ReviewType.ERROR_DETECTION in distribution[0]
 
+
+
+@pytest.mark.asyncio
+async def test_parallel_reviews_run_in_private_views(tmp_path):
+    """Each parallel task reviews its own workspace view, removed afterwards"""
+    from app.services.workspace_views import WorkspaceViewFactory
+    
+    repo = tmp_path / "project-1-mr-2"
+    repo.mkdir()
+    (repo / "App.java").write_text("class App {}")
+    with patch('app.services.base_cli_manager.BaseCLIManager._load_system_prompt', return_value="System prompt"):
+        manager = ClineCLIManager(
+            model_api_url="https://api.example.com/v1",
+            model_name="deepseek-v3.1",
+            api_key="test-key",
+            parallel_tasks=2,
+            workspace_views=WorkspaceViewFactory(mode="hardlink")
+        )
+    
+    seen = []
+    
+    async def fake_review(review_type, repo_path, **kwargs):
+        seen.append(repo_path)
+        assert (tmp_path / ".views").exists() and repo_path != str(repo)
+        return {"review_type": review_type.value, "issues": [], "summary": {"total_issues": 0}}
+    
+    with patch.object(manager, 'execute_review', side_effect=fake_review):
+        results = await manager.execute_parallel_reviews(
+            review_types=[ReviewType.ERROR_DETECTION, ReviewType.SECURITY_AUDIT],
+            repo_path=str(repo),
+            prompts={ReviewType.ERROR_DETECTION: "p", ReviewType.SECURITY_AUDIT: "p"}
+        )
+    
+    assert len(results) == 2
+    assert len(set(seen)) == 2
+    assert not any(os.path.exists(path) for path in seen)
+
+
+@pytest.mark.asyncio
+async def test_parallel_reviews_skip_queued_types_once_stopped(cline_manager):
+    """Types still waiting for a slot are skipped after stop_when returns True"""
+    cline_manager.parallel_tasks = 1
+    started = []
+    
+    async def fake_review(review_type, **kwargs):
+        started.append(review_type)
+        severity = "CRITICAL" if review_type == ReviewType.ERROR_DETECTION else "LOW"
+        return {"review_type": review_type.value, "issues": [{"severity": severity}]}
+    
+    review_types = [ReviewType.ERROR_DETECTION, ReviewType.SECURITY_AUDIT, ReviewType.PERFORMANCE]
+    with patch.object(cline_manager, 'execute_review', side_effect=fake_review):
+        results = await cline_manager.execute_parallel_reviews(
+            review_types=review_types,
+            repo_path="/tmp/repo",
+            prompts={rt: "p" for rt in review_types},
+            stop_when=lambda result: any(i["severity"] == "CRITICAL" for i in result["issues"])
+        )
+    
+    assert started == [ReviewType.ERROR_DETECTION]
+    assert [r.get("skipped", False) for r in results] == [False, True, True]
+
+
+@pytest.mark.asyncio
+async def test_parallel_reviews_rate_limit_cuts_shared_limit(cline_manager):
+    """A 429 in CLI stderr cuts the agent's adaptive limit; the per-call semaphore is not used"""
+    cline_manager.concurrency = AdaptiveConcurrencyLimiter("cline", initial_limit=4)
+    
+    async def fake_review(review_type, **kwargs):
+        if review_type == ReviewType.SECURITY_AUDIT:
+            raise RuntimeError("Cline CLI failed with code 1: HTTP 429 Too Many Requests")
+        return {"review_type": review_type.value, "issues": []}
+    
+    review_types = [ReviewType.ERROR_DETECTION, ReviewType.SECURITY_AUDIT]
+    with patch.object(cline_manager, 'execute_review', side_effect=fake_review):
+        results = await cline_manager.execute_parallel_reviews(
+            review_types=review_types,
+            repo_path="/tmp/repo",
+            prompts={rt: "p" for rt in review_types}
+        )
+    
+    assert "429" in results[1]["error"]
+    assert cline_manager.concurrency.limit == 2
+    assert cline_manager.concurrency.in_flight == 0
+
+
+def test_overload_reason():
+    """Timeouts and rate-limit errors are overload signals, other failures are not"""
+    assert BaseCLIManager.overload_reason(TimeoutError("Cline CLI timed out")) == "timeout"
+    assert BaseCLIManager.overload_reason(RuntimeError("openai.RateLimitError: rate limit exceeded")) == "rate_limited"
+    assert BaseCLIManager.overload_reason(RuntimeError("Invalid JSON in output")) is None
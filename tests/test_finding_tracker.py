@@ -0,0 +1,148 @@
+"""
+Tests for issue fingerprints and run-to-run finding diffing
+"""
+
+import pytest
+from app.models import ReviewIssue, IssueSeverity
+from app.services.finding_tracker import (
+    FindingTracker,
+    FingerprintStore,
+    compute_fingerprint,
+    declaration_signature,
+    enclosing_method,
+)
+
+
+SOURCE = """public class UserService {
+
+    public User findUser(Long id) {
+        // lookup
+        return repo.findById(id).get();
+    }
+
+    public User findAdmin(Long id) {
+        return repo.findById(id).get();
+    }
+}
+"""
+
+
+def _issue(line=11, snippet="return repo.findById(id).get();", category="Null Safety", **kwargs):
+    return ReviewIssue(
+        file=kwargs.pop("file", "src/UserService.java"),
+        line=line,
+        severity=kwargs.pop("severity", IssueSeverity.HIGH),
+        category=category,
+        message=kwargs.pop("message", "Optional.get() without presence check"),
+        code_snippet=snippet,
+        suggestion="Use orElseThrow",
+        **kwargs
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create FingerprintStore in temp directory"""
+    instance = FingerprintStore(str(tmp_path / "state.db"))
+    yield instance
+    instance.close()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Checkout with UserService.java"""
+    (tmp_path / "repo" / "src").mkdir(parents=True)
+    (tmp_path / "repo" / "src" / "UserService.java").write_text(SOURCE)
+    return tmp_path / "repo"
+
+
+def test_fingerprint_ignores_line_and_whitespace():
+    """Test fingerprint survives line shifts, re-indentation and rewording"""
+    moved = _issue(line=57, snippet="  return repo.findById(id).get();\n",
+                   message="Different wording of the same problem")
+    
+    assert compute_fingerprint(moved) == compute_fingerprint(_issue())
+
+
+def test_fingerprint_depends_on_method_and_category():
+    """Test same snippet in another method or family is a different finding"""
+    base = compute_fingerprint(_issue(), "public User findUser(Long id)")
+    
+    assert base != compute_fingerprint(_issue(), "public User findAdmin(Long id)")
+    assert base != compute_fingerprint(_issue(category="SQL Injection"), "public User findUser(Long id)")
+    # Category wording within the same family does not matter
+    assert base == compute_fingerprint(_issue(category="NullPointerException Risk"), "public User findUser(Long id)")
+
+
+def test_declaration_signature():
+    """Test declarations are recognized, calls and control statements are not"""
+    assert declaration_signature("    public User findUser(Long id) {") == "public User findUser(Long id)"
+    assert declaration_signature("def find_user(self, user_id):") == "def find_user(self, user_id)"
+    assert declaration_signature("        return repo.findById(id).get();") is None
+    assert declaration_signature("        if (user == null) {") is None
+    assert declaration_signature("    } else if (admin) {") is None
+    assert declaration_signature("        users.forEach(user -> {") is None
+
+
+def test_enclosing_method_from_source():
+    """Test method is the nearest declaration at or above the line, independent of any diff"""
+    lines = SOURCE.splitlines()
+    
+    assert enclosing_method(lines, 5) == "public User findUser(Long id)"
+    assert enclosing_method(lines, 9) == "public User findAdmin(Long id)"
+    assert enclosing_method(lines, 1) == ""
+    assert enclosing_method(None, 5) == ""
+
+
+def test_fingerprint_issues_reads_checkout(repo):
+    """Test same snippet in two methods of the checkout gets two identities"""
+    tracker = FindingTracker(store=None)
+    in_find_user, in_find_admin = _issue(line=5), _issue(line=9)
+    outside = _issue(line=5, file="../etc/passwd")
+    
+    tracker.fingerprint_issues([in_find_user, in_find_admin, outside], str(repo))
+    
+    assert in_find_user.fingerprint == compute_fingerprint(_issue(), "public User findUser(Long id)")
+    assert in_find_admin.fingerprint == compute_fingerprint(_issue(), "public User findAdmin(Long id)")
+    assert outside.fingerprint == compute_fingerprint(_issue(file="../etc/passwd"))
+
+
+@pytest.mark.asyncio
+async def test_compare_splits_new_persisting_resolved(store, repo):
+    """Test second run is split against the saved first one"""
+    tracker = FindingTracker(store)
+    kept = _issue(line=5)
+    fixed = _issue(line=9, snippet="String sql = \"SELECT \" + name;", category="SQL Injection")
+    tracker.fingerprint_issues([kept, fixed], str(repo))
+    
+    first = await tracker.compare(1, 5, [kept, fixed])
+    assert len(first.new_issues) == 2
+    assert first.persisting_issues == [] and first.resolved_issues == []
+    assert store.load(1, 5) == {}  # compare does not store
+    await tracker.save(1, 5, [kept, fixed])
+    
+    # Same finding after a push added a line above it
+    (repo / "src" / "UserService.java").write_text(SOURCE.replace("// lookup", "// lookup\n        audit();"))
+    shifted = _issue(line=6)
+    added = _issue(line=5, snippet="user.getName().trim()", message="getName may return null")
+    tracker.fingerprint_issues([shifted, added], str(repo))
+    second = await tracker.compare(1, 5, [shifted, added])
+    
+    assert second.persisting_issues == [shifted]
+    assert second.new_issues == [added]
+    assert [i.category for i in second.resolved_issues] == ["SQL Injection"]
+    assert shifted.fingerprint == kept.fingerprint
+
+
+@pytest.mark.asyncio
+async def test_save_is_scoped_per_mr(store):
+    """Test fingerprints of another MR are not compared"""
+    tracker = FindingTracker(store)
+    issue = _issue()
+    tracker.fingerprint_issues([issue])
+    await tracker.save(1, 5, [issue])
+    
+    delta = await tracker.compare(1, 6, [issue])
+    
+    assert len(delta.new_issues) == 1
+    assert len(store.load(1, 5)) == 1
@@ -7,6 +7,7 @@ import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.services.git_repository_manager import GitRepositoryManager
+from app.services.workspace_janitor import WorkspaceJanitor
 
 
 @pytest.fixture
@@ -80,6 +81,46 @@ async def test_clone_repository_failure(git_manager):
             )
 
 
+@pytest.mark.asyncio
+async def test_failed_clone_releases_review(origin_repo, tmp_path):
+    """Test a failed clone does not leave the MR locked; the next clone of the MR succeeds"""
+    manager = GitRepositoryManager(work_dir=str(tmp_path / "work"))
+    
+    with pytest.raises(RuntimeError, match="Failed to clone repository"):
+        await manager.clone_repository(origin_repo, "no-such-branch", project_id=1, mr_iid=10, target_branch="main")
+    assert "1-10" not in manager._active_reviews
+    
+    repo_path = await manager.clone_repository(origin_repo, "feature-a", project_id=1, mr_iid=10, target_branch="main")
+    
+    assert (Path(repo_path) / "Service.java").read_text() == "feature-a"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_clone_releases_review_and_workspace(tmp_path):
+    """Test cancellation during the clone releases the MR and the janitor's active mark"""
+    janitor = WorkspaceJanitor(str(tmp_path))
+    manager = GitRepositoryManager(work_dir=str(tmp_path), janitor=janitor)
+    clone_started = asyncio.Event()
+    
+    async def hanging_clone(repo_dir, *args, **kwargs):
+        repo_dir.mkdir()
+        clone_started.set()
+        await asyncio.sleep(3600)
+    
+    with patch.object(manager, '_clone_into', side_effect=hanging_clone):
+        task = asyncio.create_task(
+            manager.clone_repository("https://gitlab.example.com/r.git", "feature", project_id=1, mr_iid=10)
+        )
+        await clone_started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    assert "1-10" not in manager._active_reviews
+    assert janitor._active == set()
+    assert not (tmp_path / "project-1-mr-10").exists()
+
+
 @pytest.mark.asyncio
 async def test_get_changed_files_success(git_manager, tmp_path):
     """Test getting changed files via git diff"""
@@ -203,3 +244,117 @@ async def test_run_git_command_failure(git_manager, tmp_path):
         with pytest.raises(RuntimeError, match="Git command failed"):
             await git_manager._run_git_command(['git', 'invalid'], str(tmp_path))
 
+
+
+def _git(cwd, *args):
+    import subprocess
+    subprocess.run(
+        ['git', '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def origin_repo(tmp_path):
+    """Local repository with main, feature-a and feature-b branches"""
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    _git(origin, 'init', '-b', 'main')
+    (origin / "Service.java").write_text("main")
+    _git(origin, 'add', '.')
+    _git(origin, 'commit', '-m', 'init')
+    for branch in ("feature-a", "feature-b"):
+        _git(origin, 'checkout', '-b', branch, 'main')
+        (origin / "Service.java").write_text(branch)
+        _git(origin, 'commit', '-am', branch)
+    _git(origin, 'checkout', 'main')
+    return str(origin)
+
+
+@pytest.mark.asyncio
+async def test_workspace_pool_reuses_checkout(origin_repo, tmp_path):
+    """Test a returned workspace is cleaned and reused for the next MR of the project"""
+    manager = GitRepositoryManager(work_dir=str(tmp_path / "work"), pool_size=1, pool_projects=1)
+    
+    first = await manager.clone_repository(origin_repo, "feature-a", project_id=1, mr_iid=10, target_branch="main")
+    assert (Path(first) / "Service.java").read_text() == "feature-a"
+    (Path(first) / "Service.java").write_text("edited by review")
+    (Path(first) / "build").mkdir()
+    await manager.cleanup_repository(first)
+    
+    assert manager._pool[1] == [Path(first)]
+    assert "1-10" not in manager._active_reviews
+    
+    second = await manager.clone_repository(origin_repo, "feature-b", project_id=1, mr_iid=11, target_branch="main")
+    
+    assert second == first
+    assert (Path(second) / "Service.java").read_text() == "feature-b"
+    assert not (Path(second) / "build").exists()
+    assert (Path(second) / ".git" / "refs" / "remotes" / "origin" / "main").exists()
+    assert manager._pool[1] == []
+
+
+@pytest.mark.asyncio
+async def test_workspace_pool_evicts_least_recently_used_project(origin_repo, tmp_path):
+    """Test pool keeps at most pool_projects projects"""
+    manager = GitRepositoryManager(work_dir=str(tmp_path / "work"), pool_size=1, pool_projects=1)
+    
+    first = await manager.clone_repository(origin_repo, "feature-a", project_id=1, mr_iid=10, target_branch="main")
+    await manager.cleanup_repository(first)
+    second = await manager.clone_repository(origin_repo, "feature-a", project_id=2, mr_iid=10, target_branch="main")
+    await manager.cleanup_repository(second)
+    
+    assert list(manager._pool) == [2]
+    assert not Path(first).exists()
+    assert Path(second).exists()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_fills_pool_for_next_review(origin_repo, tmp_path):
+    """Test prefetch clones into the pool, then only fetches; the review leases the prefetched workspace"""
+    manager = GitRepositoryManager(work_dir=str(tmp_path / "work"), pool_size=1, pool_projects=1)
+    
+    assert await manager.prefetch(origin_repo, project_id=1, branch="feature-a", target_branch="main") == "cloned"
+    workspace = manager._pool[1][0]
+    assert await manager.prefetch(origin_repo, project_id=1, branch="feature-b", target_branch="main") == "fetched"
+    assert manager._pool[1] == [workspace]
+    assert (workspace / ".git" / "refs" / "remotes" / "origin" / "feature-b").exists()
+    
+    repo_path = await manager.clone_repository(origin_repo, "feature-b", project_id=1, mr_iid=11, target_branch="main")
+    
+    assert repo_path == str(workspace)
+    assert (workspace / "Service.java").read_text() == "feature-b"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_prefetch_removes_workspace(origin_repo, tmp_path):
+    """Test cancelling a prefetch fetch drops the pooled workspace and its active mark"""
+    work_dir = tmp_path / "work"
+    janitor = WorkspaceJanitor(str(work_dir))
+    manager = GitRepositoryManager(work_dir=str(work_dir), pool_size=1, pool_projects=1, janitor=janitor)
+    await manager.prefetch(origin_repo, project_id=1, branch="feature-a", target_branch="main")
+    workspace = manager._pool[1][0]
+    fetch_started = asyncio.Event()
+    
+    async def hanging_fetch(*args, **kwargs):
+        fetch_started.set()
+        await asyncio.sleep(3600)
+    
+    with patch.object(manager, '_fetch_branches', side_effect=hanging_fetch):
+        task = asyncio.create_task(
+            manager.prefetch(origin_repo, project_id=1, branch="feature-b", target_branch="main")
+        )
+        await fetch_started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    assert manager._pool[1] == []
+    assert janitor._active == set()
+    assert not workspace.exists()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_skipped_without_pool(git_manager):
+    """Test prefetch is a no-op when the workspace pool is disabled"""
+    assert await git_manager.prefetch("https://invalid.git", 1, "feature", "main") == "skipped"
@@ -200,3 +200,97 @@ async def test_commit_file_changes_success(gitlab_service):
         )
         
         assert result["id"] == "abc123"
+
+
+@pytest.mark.asyncio
+async def test_create_draft_note_with_position(gitlab_service):
+    """Test creating draft note with diff position"""
+    mock_response = MagicMock()
+    mock_response.json = MagicMock(return_value={"id": 55})
+    mock_response.raise_for_status = MagicMock()
+    
+    mock_client = MagicMock()
+    mock_client.post = AsyncMock(return_value=mock_response)
+    
+    position = {"position_type": "text", "new_path": "A.java", "new_line": 3}
+    result = await gitlab_service.create_draft_note(
+        project_id=123,
+        mr_iid=1,
+        note="Issue",
+        position=position,
+        client=mock_client
+    )
+    
+    assert result["id"] == 55
+    url = mock_client.post.call_args.args[0]
+    assert url.endswith("/projects/123/merge_requests/1/draft_notes")
+    assert mock_client.post.call_args.kwargs["json"] == {"note": "Issue", "position": position}
+
+
+@pytest.mark.asyncio
+async def test_bulk_publish_draft_notes(gitlab_service):
+    """Test bulk publishing draft notes"""
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_post = AsyncMock(return_value=mock_response)
+        mock_client.return_value.__aenter__.return_value.post = mock_post
+        
+        await gitlab_service.bulk_publish_draft_notes(project_id=123, mr_iid=1)
+        
+        assert mock_post.call_args.args[0].endswith("/draft_notes/bulk_publish")
+
+
+@pytest.mark.asyncio
+async def test_delete_draft_note_ignores_missing_draft(gitlab_service):
+    """Test deleting an already removed draft note is not an error"""
+    mock_response = MagicMock()
+    mock_response.status_code = 404
+    mock_response.raise_for_status = MagicMock(side_effect=Exception("not found"))
+
+    mock_client = MagicMock()
+    mock_client.delete = AsyncMock(return_value=mock_response)
+
+    await gitlab_service.delete_draft_note(project_id=123, mr_iid=1, draft_note_id=9, client=mock_client)
+
+    assert mock_client.delete.call_args.args[0].endswith("/merge_requests/1/draft_notes/9")
+    mock_response.raise_for_status.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_mr_comment_success(gitlab_service):
+    """Test updating existing MR comment"""
+    mock_response = MagicMock()
+    mock_response.json = MagicMock(return_value={"id": 999, "body": "Updated"})
+    mock_response.raise_for_status = MagicMock()
+    
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_put = AsyncMock(return_value=mock_response)
+        mock_client.return_value.__aenter__.return_value.put = mock_put
+        
+        result = await gitlab_service.update_mr_comment(
+            project_id=123,
+            mr_iid=1,
+            note_id=999,
+            comment="Updated"
+        )
+        
+        assert result["body"] == "Updated"
+        assert mock_put.call_args.args[0].endswith("/merge_requests/1/notes/999")
+
+
+@pytest.mark.asyncio
+async def test_list_draft_notes_follows_pagination(gitlab_service):
+    """Test draft notes are collected from every page until X-Next-Page is empty"""
+    pages = [
+        MagicMock(json=MagicMock(return_value=[{"id": 1}, {"id": 2}]), headers={"X-Next-Page": "2"}),
+        MagicMock(json=MagicMock(return_value=[{"id": 3}]), headers={"X-Next-Page": ""}),
+    ]
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(side_effect=pages)
+
+    drafts = await gitlab_service.list_draft_notes(project_id=123, mr_iid=1, client=mock_client)
+
+    assert [draft["id"] for draft in drafts] == [1, 2, 3]
+    assert [call.kwargs["params"]["page"] for call in mock_client.get.await_args_list] == ["1", "2"]
@@ -0,0 +1,141 @@
+"""
+Tests for HealthMonitor and cached health probes
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.routes import get_health_monitor
+from app.services.health_monitor import HealthMonitor
+
+CLI_HEALTHY = {"cline_available": True, "qwen_available": False, "model_api_connected": True}
+
+
+def _monitor(cli_health=None, gitlab_connected=True, **kwargs):
+    review_service = MagicMock()
+    review_service.health_check = AsyncMock(return_value=cli_health or CLI_HEALTHY)
+    gitlab_service = MagicMock()
+    gitlab_service.test_connection = AsyncMock(return_value=gitlab_connected)
+    return HealthMonitor(review_service, gitlab_service, version="test", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_refresh_caches_state():
+    """Test deep checks run once per refresh and the result is cached"""
+    monitor = _monitor()
+    assert monitor.state is None
+    assert not monitor.is_ready()
+    
+    state = await monitor.refresh()
+    
+    assert state.status == "healthy"
+    assert monitor.state is state
+    assert monitor.is_ready()
+    monitor.review_service.health_check.assert_awaited_once()
+    monitor.gitlab_service.test_connection.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stale_state_or_missing_cli_not_ready():
+    """Test TTL expiry and a missing review CLI make the service not ready"""
+    monitor = _monitor(ttl_seconds=10)
+    await monitor.refresh()
+    monitor._checked_at -= 11
+    assert monitor.probe()["status"] == "not_ready"
+    
+    no_cli = _monitor(cli_health={"cline_available": False, "qwen_available": False, "model_api_connected": True})
+    await no_cli.refresh()
+    assert not no_cli.is_ready()
+
+
+@pytest.mark.asyncio
+async def test_external_outage_keeps_service_ready():
+    """Test model API and GitLab outages are reported but do not fail readiness"""
+    monitor = _monitor(
+        cli_health={"cline_available": True, "qwen_available": False, "model_api_connected": False},
+        gitlab_connected=False
+    )
+    await monitor.refresh()
+    
+    assert monitor.probe()["health"] == "unhealthy"
+    assert monitor.is_ready()
+
+
+@pytest.mark.asyncio
+async def test_check_timeout_counts_as_failure():
+    """Test a hanging dependency check does not hang the refresh"""
+    monitor = _monitor(check_timeout_seconds=0.01)
+    
+    async def hang():
+        await asyncio.sleep(10)
+    
+    monitor.gitlab_service.test_connection = hang
+    
+    state = await monitor.refresh()
+    
+    assert state.gitlab_connected is False
+    assert state.status == "unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_run():
+    """Test on-demand deep checks during a refresh reuse its result"""
+    monitor = _monitor()
+    
+    first, second = await asyncio.gather(monitor.refresh(), monitor.refresh())
+    
+    assert first is second
+    monitor.review_service.health_check.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_background_loop_refreshes_and_stops():
+    """Test start() refreshes in background and stop() cancels the loop"""
+    monitor = _monitor(interval_seconds=0.01)
+    
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    
+    assert monitor.review_service.health_check.await_count >= 2
+    assert monitor._task is None
+
+
+def test_probe_endpoints_answer_from_cache():
+    """Test health, readiness and liveness endpoints do not run deep checks"""
+    monitor = _monitor()
+    asyncio.run(monitor.refresh())
+    app.dependency_overrides[get_health_monitor] = lambda: monitor
+    try:
+        client = TestClient(app)
+        health = client.get("/api/v1/health")
+        ready = client.get("/api/v1/health/ready")
+        live = client.get("/api/v1/health/live")
+        monitor._checked_at -= monitor.ttl_seconds + 1
+        stale = client.get("/api/v1/health/ready")
+    finally:
+        app.dependency_overrides.pop(get_health_monitor)
+    
+    assert health.status_code == 200
+    assert health.json()["status"] == "healthy"
+    assert ready.status_code == 200
+    assert ready.json()["status"] == "ready"
+    assert live.json() == {"status": "alive"}
+    assert stale.status_code == 503
+    monitor.review_service.health_check.assert_awaited_once()
+
+
+def test_deep_health_check_refreshes_cache():
+    """Test deep check runs dependency checks on demand"""
+    monitor = _monitor()
+    app.dependency_overrides[get_health_monitor] = lambda: monitor
+    try:
+        response = TestClient(app).get("/api/v1/health/deep")
+    finally:
+        app.dependency_overrides.pop(get_health_monitor)
+    
+    assert response.status_code == 200
+    assert response.json()["gitlab_connected"] is True
+    assert monitor.state is not None
@@ -0,0 +1,256 @@
+"""
+Tests for InlineDiscussionPublisher and diff parsing
+"""
+
+import pytest
+import httpx
+from unittest.mock import ANY, AsyncMock, MagicMock
+from app.services.inline_publisher import InlineDiscussionPublisher
+from app.services.gitlab_service import GitLabService
+from app.utils.diff_parser import parse_unified_diff, build_diff_index
+from app.models import ReviewIssue, IssueSeverity
+
+
+SAMPLE_DIFF = (
+    "@@ -10,4 +10,5 @@ public class UserService {\n"
+    " line10\n"
+    "-removed11\n"
+    "+added11\n"
+    "+added12\n"
+    " line12\n"
+    " line13\n"
+)
+
+DIFF_REFS = {"base_sha": "base123", "head_sha": "head456", "start_sha": "start789"}
+
+
+def make_issue(file="src/UserService.java", line=11, severity=IssueSeverity.HIGH):
+    return ReviewIssue(
+        file=file,
+        line=line,
+        severity=severity,
+        category="NullPointer",
+        message="Possible NPE",
+        suggestion="Add null check",
+        auto_fixable=False
+    )
+
+
+@pytest.fixture
+def gitlab_service():
+    """Create mock GitLabService"""
+    service = MagicMock(spec=GitLabService)
+    service.get_mr_changes = AsyncMock(return_value=[
+        {"old_path": "src/UserService.java", "new_path": "src/UserService.java", "diff": SAMPLE_DIFF}
+    ])
+    service.create_draft_note = AsyncMock(return_value={"id": 1})
+    service.bulk_publish_draft_notes = AsyncMock(return_value=None)
+    service.list_draft_notes = AsyncMock(return_value=[])
+    service.delete_draft_note = AsyncMock(return_value=None)
+    return service
+
+
+@pytest.fixture
+def publisher(gitlab_service):
+    """Create publisher without backoff delays"""
+    return InlineDiscussionPublisher(gitlab_service, concurrency=2, max_retries=2, backoff_base_seconds=0)
+
+
+def test_parse_unified_diff_line_mapping():
+    """Test added and context lines are mapped to new/old lines"""
+    file_diff = parse_unified_diff(SAMPLE_DIFF, "a.java", "a.java")
+
+    assert file_diff.old_line_for(10) == 10  # context
+    assert file_diff.has_line(11) and file_diff.old_line_for(11) is None  # added
+    assert file_diff.has_line(12) and file_diff.old_line_for(12) is None  # added
+    assert file_diff.old_line_for(13) == 12  # context after removal
+    assert not file_diff.has_line(50)
+
+
+def test_build_diff_index_skips_deleted_files():
+    """Test deleted files are not indexed"""
+    index = build_diff_index([
+        {"old_path": "Old.java", "new_path": "Old.java", "diff": SAMPLE_DIFF, "deleted_file": True},
+        {"old_path": "A.java", "new_path": "B.java", "diff": SAMPLE_DIFF}
+    ])
+
+    assert list(index.keys()) == ["B.java"]
+    assert index["B.java"].old_path == "A.java"
+
+
+def test_build_position_for_context_line(publisher):
+    """Test context lines are anchored with old_line as well"""
+    index = build_diff_index([{"old_path": "src/UserService.java", "new_path": "src/UserService.java", "diff": SAMPLE_DIFF}])
+
+    position = publisher.build_position(make_issue(line=13), index, DIFF_REFS)
+
+    assert position["new_line"] == 13
+    assert position["old_line"] == 12
+    assert position["head_sha"] == "head456"
+
+
+def test_build_position_outside_diff(publisher):
+    """Test issues outside the diff are not positioned"""
+    index = build_diff_index([{"old_path": "src/UserService.java", "new_path": "src/UserService.java", "diff": SAMPLE_DIFF}])
+
+    assert publisher.build_position(make_issue(line=200), index, DIFF_REFS) is None
+    assert publisher.build_position(make_issue(file="Other.java"), index, DIFF_REFS) is None
+
+
+@pytest.mark.asyncio
+async def test_publish_creates_drafts_and_bulk_publishes(publisher, gitlab_service):
+    """Test drafts are created per mapped issue and published once"""
+    issues = [
+        make_issue(line=11),
+        make_issue(line=12, severity=IssueSeverity.CRITICAL),
+        make_issue(line=300),
+        make_issue(line=11, severity=IssueSeverity.LOW)
+    ]
+
+    result = await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, issues)
+
+    assert result.drafts_created == 2
+    assert result.skipped_outside_diff == 1
+    assert result.skipped_below_severity == 1
+    assert result.published is True
+    assert gitlab_service.create_draft_note.await_count == 2
+    gitlab_service.bulk_publish_draft_notes.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_publish_without_diff_refs(publisher, gitlab_service):
+    """Test publishing is skipped when MR has no diff_refs"""
+    result = await publisher.publish(123, 1, {}, [make_issue()])
+
+    assert result.published is False
+    assert result.error is not None
+    gitlab_service.get_mr_changes.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_publish_retries_rate_limited_requests(publisher, gitlab_service):
+    """Test 429 responses are retried"""
+    request = httpx.Request("POST", "https://gitlab.example.com")
+    rate_limited = httpx.HTTPStatusError(
+        "Too Many Requests",
+        request=request,
+        response=httpx.Response(429, headers={"Retry-After": "0"}, request=request)
+    )
+    gitlab_service.create_draft_note = AsyncMock(side_effect=[rate_limited, {"id": 1}])
+
+    result = await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, [make_issue()])
+
+    assert result.drafts_created == 1
+    assert gitlab_service.create_draft_note.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_retry_client_errors(publisher, gitlab_service):
+    """Test 4xx errors other than 429 reject the draft without retries"""
+    request = httpx.Request("POST", "https://gitlab.example.com")
+    bad_request = httpx.HTTPStatusError(
+        "Bad Request",
+        request=request,
+        response=httpx.Response(400, request=request)
+    )
+    gitlab_service.create_draft_note = AsyncMock(side_effect=bad_request)
+
+    result = await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, [make_issue()])
+
+    assert result.drafts_created == 0
+    assert result.drafts_rejected == 1
+    assert result.drafts_failed == 0
+    assert result.published is False
+    assert gitlab_service.create_draft_note.await_count == 1
+    gitlab_service.bulk_publish_draft_notes.assert_not_awaited()
+
+
+def http_error(status):
+    request = httpx.Request("POST", "https://gitlab.example.com")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+@pytest.mark.asyncio
+async def test_publish_discards_stale_drafts_first(publisher, gitlab_service):
+    """Test drafts left by an earlier run are deleted before publishing"""
+    gitlab_service.list_draft_notes = AsyncMock(return_value=[{"id": 7}, {"id": 8}])
+
+    result = await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, [make_issue()])
+
+    assert result.published is True
+    deleted = {call.kwargs["draft_note_id"] for call in gitlab_service.delete_draft_note.await_args_list}
+    assert deleted == {7, 8}
+
+
+@pytest.mark.asyncio
+async def test_publish_skips_rejected_drafts_and_publishes_the_rest(publisher, gitlab_service):
+    """Test a draft rejected with 4xx does not roll back the other drafts"""
+    gitlab_service.create_draft_note = AsyncMock(side_effect=[{"id": 1}, http_error(400)])
+
+    result = await publisher.publish(
+        123, 1, {"diff_refs": DIFF_REFS}, [make_issue(line=11), make_issue(line=12)]
+    )
+
+    assert result.published is True
+    assert result.drafts_created == 1
+    assert result.drafts_rejected == 1
+    assert result.error is None
+    gitlab_service.bulk_publish_draft_notes.assert_awaited_once()
+    gitlab_service.delete_draft_note.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_publish_deletes_drafts_when_some_fail(publisher, gitlab_service):
+    """Test created drafts are deleted and not published when another draft fails transiently"""
+    gitlab_service.create_draft_note = AsyncMock(side_effect=[{"id": 1}, http_error(502)])
+
+    result = await publisher.publish(
+        123, 1, {"diff_refs": DIFF_REFS}, [make_issue(line=11), make_issue(line=12)]
+    )
+
+    assert result.published is False
+    assert result.drafts_failed == 1
+    assert result.error is not None
+    assert result.transient_error is True
+    gitlab_service.bulk_publish_draft_notes.assert_not_awaited()
+    gitlab_service.delete_draft_note.assert_awaited_once_with(
+        project_id=123, mr_iid=1, draft_note_id=1, client=ANY
+    )
+
+
+@pytest.mark.asyncio
+async def test_publish_deletes_drafts_when_bulk_publish_fails(publisher, gitlab_service):
+    """Test this run's drafts are deleted when bulk publish fails"""
+    gitlab_service.bulk_publish_draft_notes = AsyncMock(side_effect=http_error(403))
+
+    result = await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, [make_issue()])
+
+    assert result.published is False
+    assert result.error is not None
+    assert result.transient_error is False
+    gitlab_service.delete_draft_note.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_retry_draft_creation_on_server_errors(publisher, gitlab_service):
+    """Test the non-idempotent draft POST is not retried after a 5xx or read timeout"""
+    gitlab_service.create_draft_note = AsyncMock(side_effect=http_error(502))
+
+    result = await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, [make_issue()])
+    assert result.drafts_failed == 1
+    assert gitlab_service.create_draft_note.await_count == 1
+
+    gitlab_service.create_draft_note = AsyncMock(side_effect=httpx.ReadTimeout("timeout"))
+    await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, [make_issue()])
+    assert gitlab_service.create_draft_note.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_retries_draft_creation_on_connect_errors(publisher, gitlab_service):
+    """Test draft POST is retried when the request never reached GitLab"""
+    gitlab_service.create_draft_note = AsyncMock(side_effect=[httpx.ConnectError("refused"), {"id": 1}])
+
+    result = await publisher.publish(123, 1, {"diff_refs": DIFF_REFS}, [make_issue()])
+
+    assert result.published is True
+    assert gitlab_service.create_draft_note.await_count == 2
@@ -0,0 +1,127 @@
+"""
+Tests for cross-review-type issue de-duplication
+"""
+
+import time
+import pytest
+from app.models import ReviewIssue, ReviewType, IssueSeverity
+from app.services.issue_deduplicator import IssueDeduplicator
+
+
+def _issue(
+    file="src/UserService.java",
+    line=42,
+    severity=IssueSeverity.HIGH,
+    category="NullPointerException Risk",
+    message="Possible NPE when user is null",
+    review_type=ReviewType.ERROR_DETECTION,
+    **kwargs
+):
+    return ReviewIssue(
+        file=file,
+        line=line,
+        severity=severity,
+        category=category,
+        message=message,
+        suggestion="Add null check",
+        review_types=[review_type],
+        **kwargs
+    )
+
+
+@pytest.fixture
+def deduplicator():
+    """Create deduplicator instance"""
+    return IssueDeduplicator()
+
+
+def test_merges_same_finding_across_review_types(deduplicator):
+    """Test same NPE from three review types collapses into one issue"""
+    issues = [
+        _issue(),
+        _issue(line=43, severity=IssueSeverity.MEDIUM, category="Null Safety",
+               message="user may be null, NullPointerException possible",
+               review_type=ReviewType.BEST_PRACTICES),
+        _issue(file="./src/UserService.java", severity=IssueSeverity.CRITICAL,
+               category="Optional misuse", message="Dereference of possibly null user",
+               review_type=ReviewType.CONCURRENCY, cwe="CWE-476"),
+    ]
+    
+    merged, collapsed = deduplicator.deduplicate(issues)
+    
+    assert collapsed == 2
+    assert len(merged) == 1
+    assert merged[0].severity == IssueSeverity.CRITICAL
+    assert merged[0].cwe == "CWE-476"
+    assert merged[0].review_types == [
+        ReviewType.ERROR_DETECTION, ReviewType.BEST_PRACTICES, ReviewType.CONCURRENCY
+    ]
+
+
+def test_keeps_distinct_findings(deduplicator):
+    """Test different location, family or message are not merged"""
+    issues = [
+        _issue(),
+        _issue(line=80),
+        _issue(file="src/OrderService.java"),
+        _issue(category="SQL Injection", message="Query built by string concatenation"),
+        _issue(message="Transaction rollback missing for checked exception"),
+    ]
+    
+    merged, collapsed = deduplicator.deduplicate(issues)
+    
+    assert collapsed == 0
+    assert merged == issues
+
+
+def test_identical_snippet_merges_despite_different_wording(deduplicator):
+    """Test identical code snippet is enough to merge nearby issues"""
+    snippet = "return repo.findById(id).get();"
+    issues = [
+        _issue(message="Unchecked Optional.get()", code_snippet=snippet),
+        _issue(line=44, message="Missing presence check",
+               code_snippet="return  repo.findById(id).get();",
+               review_type=ReviewType.BEST_PRACTICES),
+    ]
+    
+    merged, collapsed = deduplicator.deduplicate(issues)
+    
+    assert collapsed == 1
+    assert merged[0].review_types == [ReviewType.ERROR_DETECTION, ReviewType.BEST_PRACTICES]
+
+
+def test_issues_without_line(deduplicator):
+    """Test file-level issues only merge with other file-level issues"""
+    issues = [
+        _issue(line=None),
+        _issue(line=None, review_type=ReviewType.BEST_PRACTICES),
+        _issue(line=1),
+    ]
+    
+    merged, collapsed = deduplicator.deduplicate(issues)
+    
+    assert collapsed == 1
+    assert [i.line for i in merged] == [None, 1]
+
+
+def test_category_family(deduplicator):
+    """Test categories map to coarse families"""
+    assert deduplicator.category_family("NullPointerException Risk") == "null-safety"
+    assert deduplicator.category_family("Race Condition") == "concurrency"
+    assert deduplicator.category_family("Information Disclosure") == "information-disclosure"
+
+
+def test_near_linear_on_large_input(deduplicator):
+    """Test many distinct issues are processed without pairwise comparison"""
+    issues = [
+        _issue(file=f"src/File{i % 500}.java", line=i * 10 + 1, message=f"Issue number {i}")
+        for i in range(20_000)
+    ]
+    
+    started = time.perf_counter()
+    merged, collapsed = deduplicator.deduplicate(issues)
+    elapsed = time.perf_counter() - started
+    
+    assert collapsed == 0
+    assert len(merged) == 20_000
+    assert elapsed < 5
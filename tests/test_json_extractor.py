@@ -0,0 +1,119 @@
+"""
+Tests for linear-time JSON extraction from CLI output
+"""
+
+import json
+import time
+from app.utils.json_extractor import extract_json_object, iter_json_objects
+
+
+REVIEW = {"review_type": "ERROR_DETECTION", "issues": [], "summary": {"total_issues": 0}}
+
+
+def test_extract_plain_object():
+    """Test output that is exactly one JSON object"""
+    assert extract_json_object(json.dumps(REVIEW)) == REVIEW
+
+
+def test_extract_ignores_trailing_log_braces():
+    """Test braces in log lines after the result are not captured"""
+    output = "Starting review {repo}\n" + json.dumps(REVIEW) + "\nDone in {elapsed}s {}"
+    
+    assert extract_json_object(output) == REVIEW
+
+
+def test_extract_prefers_review_shaped_object():
+    """Test review-shaped object wins over larger unrelated objects"""
+    telemetry = {"event": "progress", "payload": {"x" * 50: "y" * 500}}
+    output = json.dumps(telemetry) + "\n" + json.dumps(REVIEW)
+    
+    assert extract_json_object(output) == REVIEW
+
+
+def test_extract_picks_largest_review_object():
+    """Test the largest of several review-shaped objects is returned"""
+    partial = {"issues": []}
+    output = json.dumps(partial) + "\n" + json.dumps(REVIEW)
+    
+    assert extract_json_object(output) == REVIEW
+
+
+def test_extract_after_unmatched_brace():
+    """Test an unclosed brace before the result does not hide it"""
+    output = "Thinking: {\n" + json.dumps(REVIEW)
+    
+    assert extract_json_object(output) == REVIEW
+
+
+def test_extract_after_quoted_brace():
+    """Test a stray brace inside a quoted log message does not swallow the result"""
+    output = 'x "{" y {"review_type":"X","issues":[]}'
+    
+    assert extract_json_object(output) == {"review_type": "X", "issues": []}
+
+
+def test_nested_objects_not_reported_separately():
+    """Test nested objects are skipped once their parent decodes"""
+    objects = list(iter_json_objects(json.dumps(REVIEW)))
+    
+    assert len(objects) == 1
+
+
+def test_extract_returns_none_without_json():
+    """Test output without JSON objects"""
+    assert extract_json_object("no json here [1, 2]") is None
+
+
+def test_extract_handles_deep_nesting():
+    """Test pathologically deep nesting does not raise"""
+    output = '{"a":' * 100000 + 'oops\n' + json.dumps(REVIEW)
+    
+    assert extract_json_object(output) == REVIEW
+
+
+def test_extract_is_linear_on_unmatched_braces():
+    """Test multi-MB output full of unmatched braces is processed quickly"""
+    output = '{"progress": 1, broken\n' * 100000 + json.dumps(REVIEW)
+    
+    started = time.perf_counter()
+    result = extract_json_object(output)
+    elapsed = time.perf_counter() - started
+    
+    assert result == REVIEW
+    assert elapsed < 2.0
+
+
+def test_extract_is_linear_in_unclosed_nesting_depth():
+    """Test objects nested in many unclosed levels are decoded once, not once per level"""
+    body = json.dumps([{"k": i} for i in range(50000)])
+    output = '{"a": ' * 50 + body + ' broken\n' + json.dumps(REVIEW)
+    
+    started = time.perf_counter()
+    objects = list(iter_json_objects(output))
+    elapsed = time.perf_counter() - started
+    
+    assert len(objects) == 50001
+    assert objects[-1][2] == REVIEW
+    assert elapsed < 2.0
+
+
+def test_extract_result_nested_in_broken_wrapper():
+    """Test a complete object inside a wrapper with a trailing comma is found"""
+    output = '{"result": ' + json.dumps(REVIEW) + ',}'
+    
+    assert extract_json_object(output) == REVIEW
+
+
+def test_extract_object_larger_than_initial_window():
+    """Test objects spanning many decode windows are returned whole"""
+    review = dict(REVIEW, issues=[{"file": "A.java", "message": "x" * 100} for _ in range(5000)])
+    output = "log line\n" + json.dumps(review) + "\ntrailing {"
+    
+    assert extract_json_object(output) == review
+
+
+def test_extract_stops_at_unterminated_string():
+    """Test unterminated string to end of output does not hang"""
+    output = json.dumps(REVIEW) + '\n{"message": "' + "x" * 1000000
+    
+    assert extract_json_object(output) == REVIEW
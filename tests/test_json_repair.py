@@ -0,0 +1,108 @@
+"""
+Tests for tolerant repair of broken or truncated review JSON
+"""
+
+import json
+import pytest
+from app.utils.json_repair import repair_review_json, get_repair_statistics
+
+
+def _issue(index, severity="HIGH"):
+    return {
+        "file": f"src/Service{index}.java",
+        "line": index + 1,
+        "severity": severity,
+        "category": "NPE",
+        "message": "Possible null dereference"
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_statistics():
+    """Reset process-wide repair counters between tests"""
+    get_repair_statistics().reset()
+    yield
+    get_repair_statistics().reset()
+
+
+def test_repair_trailing_commas():
+    """Test trailing commas before closing brackets are dropped"""
+    output = '{"review_type": "ERROR_DETECTION", "issues": [{"line": 1,},], "summary": {"total_issues": 1,},}'
+    
+    result = repair_review_json(output)
+    
+    assert result["issues"] == [{"line": 1}]
+    assert result["metadata"]["json_repair"]["trailing_commas_removed"] == 4
+    assert result["metadata"]["json_repair"]["truncated"] is False
+
+
+def test_repair_raw_newline_in_string():
+    """Test unescaped newline inside a string value is accepted"""
+    output = '{"review_type": "BEST_PRACTICES", "issues": [{"message": "line one\nline two"}]}'
+    
+    result = repair_review_json(output)
+    
+    assert result["issues"][0]["message"] == "line one\nline two"
+
+
+def test_repair_truncated_keeps_complete_issues():
+    """Test truncated output keeps every complete issue and drops the partial one"""
+    complete = ", ".join(json.dumps(_issue(i)) for i in range(3))
+    output = (
+        'Running review...\n'
+        '{"review_type": "ERROR_DETECTION", "issues": [' + complete +
+        ', {"file": "src/Partial.java", "line": 7, "message": "cut here'
+    )
+    
+    result = repair_review_json(output)
+    
+    assert [issue["line"] for issue in result["issues"]] == [1, 2, 3]
+    assert result["metadata"]["json_repair"]["truncated"] is True
+    assert result["metadata"]["json_repair"]["items_salvaged"] == 3
+    assert "truncation_reason" in result["metadata"]
+
+
+def test_repair_truncated_recounts_summary():
+    """Test summary counters are rebuilt from salvaged issues"""
+    issues = [_issue(0, "CRITICAL"), _issue(1, "LOW")]
+    output = (
+        '{"review_type": "SECURITY_AUDIT", "summary": {"total_issues": 9, "critical": 4}, '
+        '"issues": [' + ", ".join(json.dumps(i) for i in issues) + ', {"file": "A.java", "li'
+    )
+    
+    result = repair_review_json(output)
+    
+    assert result["summary"]["total_issues"] == 2
+    assert result["summary"]["critical"] == 1
+    assert result["summary"]["low"] == 1
+    assert result["summary"]["analysis_incomplete"] is True
+
+
+def test_repair_finds_root_after_nested_object():
+    """Test root object is found when review keys follow a nested object"""
+    output = 'log {x}\n{"summary": {"total_issues": 1}, "issues": [' + json.dumps(_issue(0)) + ','
+    
+    result = repair_review_json(output)
+    
+    assert len(result["issues"]) == 1
+    assert result["summary"]["total_issues"] == 1
+
+
+def test_repair_without_review_keys_returns_none():
+    """Test output without review keys is not repaired"""
+    assert repair_review_json('{"event": "progress", "step": 3,}') is None
+    assert repair_review_json("No JSON here") is None
+
+
+def test_repair_statistics_recorded():
+    """Test repair outcomes are counted"""
+    repair_review_json('{"review_type": "ERROR_DETECTION", "issues": [' + json.dumps(_issue(0)) + ', {')
+    repair_review_json("nothing to repair")
+    
+    stats = get_repair_statistics().as_dict()
+    
+    assert stats["attempts"] == 2
+    assert stats["recovered"] == 1
+    assert stats["failed"] == 1
+    assert stats["truncated_outputs"] == 1
+    assert stats["items_salvaged"] == 1
@@ -0,0 +1,97 @@
+"""
+Tests for the queue-backed logging pipeline
+"""
+
+import json
+import logging
+import time
+from loguru import logger
+from app.config import get_settings
+from app.main import app  # noqa: F401  (runs setup_logger)
+from app.utils.logger import LogThrottle, _json_sink, setup_logger
+from app.utils.tracing import Tracer
+
+
+def _record(name="app.services.x", level=logging.INFO, lineno=10, msg="noisy %s", args=("line",)):
+    return logging.LogRecord(name, level, "/app/services/x.py", lineno, msg, args, None)
+
+
+def test_rate_limit_per_call_site():
+    """Test records over the limit are dropped and counted in the next window"""
+    throttle = LogThrottle(per_minute=2, window_seconds=0.05)
+    
+    passed = [throttle.filter(_record()) for _ in range(5)]
+    other_site = throttle.filter(_record(lineno=11))
+    error = throttle.filter(_record(level=logging.ERROR))
+    time.sleep(0.06)
+    next_window = _record()
+    
+    assert passed == [True, True, False, False, False]
+    assert other_site and error
+    assert throttle.filter(next_window)
+    assert next_window.getMessage() == "noisy line [3 similar records suppressed]"
+
+
+def test_sampling_by_logger_prefix():
+    """Test sampling uses the longest prefix and never drops warnings"""
+    throttle = LogThrottle(sample_rates={"app.services": 0.0, "app.services.keep": 1.0})
+    
+    assert not throttle.filter(_record(name="app.services.x"))
+    assert throttle.filter(_record(name="app.services.keep.sub"))
+    assert throttle.filter(_record(name="app.services.x", level=logging.WARNING))
+    assert throttle.filter(_record(name="app.api.routes"))
+
+
+def test_stdlib_records_forwarded_to_loguru_in_background():
+    """Test stdlib records reach loguru sinks with their origin and trace id"""
+    messages = []
+    sink_id = logger.add(messages.append, format="{name}:{function} {extra[trace_id]} {message}")
+    try:
+        with Tracer().span("review") as active:
+            logging.getLogger("app.tests.forwarding").warning("queued %s", "record")
+        deadline = time.monotonic() + 2
+        while not messages and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        logger.remove(sink_id)
+    
+    assert messages[0].strip() == (
+        f"app.tests.forwarding:test_stdlib_records_forwarded_to_loguru_in_background "
+        f"{active.trace_id} queued record"
+    )
+
+
+def test_json_sink_writes_one_object_per_line(capsys):
+    """Test structured output contains the record fields and exception"""
+    sink_id = logger.add(_json_sink, format="{message}")
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.bind(trace_id="abc").exception("Review failed")
+    finally:
+        logger.remove(sink_id)
+    
+    entry = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == "Review failed"
+    assert entry["trace_id"] == "abc"
+    assert entry["function"] == "test_json_sink_writes_one_object_per_line"
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_file_sink_written_to_log_dir(tmp_path, monkeypatch):
+    """Test the daily log file is written under LOG_DIR"""
+    monkeypatch.setattr(get_settings(), "LOG_DIR", str(tmp_path / "logs"))
+    try:
+        setup_logger()
+        logger.info("to file")
+        logger.complete()
+    finally:
+        monkeypatch.setattr(get_settings(), "LOG_DIR", "")
+        setup_logger()
+    
+    files = list((tmp_path / "logs").glob("app_*.log"))
+    assert len(files) == 1
+    assert "to file" in files[0].read_text()
@@ -0,0 +1,104 @@
+"""
+Tests for event loop lag monitoring and blocking I/O offloading
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.models import ReviewType
+from app.services.cline_cli_manager import ClineCLIManager
+from app.services.git_repository_manager import GitRepositoryManager
+from app.utils.blocking_io import run_blocking
+from app.utils.loop_monitor import EventLoopLagMonitor
+from app.utils.phase_timings import collect_timings, record_phase
+
+RESULT = {"review_type": "ERROR_DETECTION", "issues": [], "summary": {"total_issues": 0}}
+
+
+async def _measure_lag(work) -> EventLoopLagMonitor:
+    monitor = EventLoopLagMonitor(interval_seconds=0.005, warn_seconds=10)
+    monitor.start()
+    try:
+        await work()
+    finally:
+        await monitor.stop()
+    return monitor
+
+
+@pytest.mark.asyncio
+async def test_monitor_detects_blocked_loop():
+    """Test synchronous work on the loop shows up as lag"""
+    async def block():
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+    
+    monitor = await _measure_lag(block)
+    
+    assert monitor.samples > 0
+    assert monitor.max_lag_seconds >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_keeps_caller_context():
+    """Test offloaded functions record into the calling review"""
+    with collect_timings() as timings:
+        await run_blocking(record_phase, "parse", 1.5)
+    
+    assert timings.parse == 1.5
+
+
+@pytest.mark.asyncio
+async def test_loop_responsive_during_concurrent_reviews(tmp_path):
+    """Test slow output parsing of parallel CLI reviews does not block the loop"""
+    manager = ClineCLIManager(
+        model_api_url="https://api.example.com/v1",
+        model_name="deepseek-v3.1-terminus",
+        api_key="test-api-key",
+        parallel_tasks=5
+    )
+    process = AsyncMock()
+    process.returncode = 0
+    process.communicate = AsyncMock(return_value=(b"", b""))
+    
+    def slow_parse(output):
+        time.sleep(0.1)  # parsing and validating a large output
+        return dict(RESULT)
+    
+    async def reviews():
+        return await manager.execute_parallel_reviews(
+            review_types=[ReviewType.ERROR_DETECTION] * 5,
+            repo_path=str(tmp_path),
+            prompts={ReviewType.ERROR_DETECTION: "Review {repo_path}"}
+        )
+    
+    with patch('asyncio.create_subprocess_exec', return_value=process), \
+         patch.object(manager, "_parse_cli_output", side_effect=slow_parse):
+        monitor = await _measure_lag(reviews)
+    
+    assert monitor.samples >= 10
+    assert monitor.max_lag_seconds < 0.08
+
+
+@pytest.mark.asyncio
+async def test_loop_responsive_during_checkout_cleanup(tmp_path):
+    """Test removing large checkouts does not block the loop"""
+    manager = GitRepositoryManager(work_dir=str(tmp_path))
+    checkouts = []
+    for mr_iid in range(4):
+        checkout = tmp_path / f"project-1-mr-{mr_iid}"
+        checkout.mkdir()
+        checkouts.append(str(checkout))
+    
+    def slow_rmtree(path):
+        time.sleep(0.1)  # gigabyte-sized checkout
+    
+    async def cleanup():
+        await asyncio.gather(*(manager.cleanup_repository(path) for path in checkouts))
+    
+    with patch('shutil.rmtree', side_effect=slow_rmtree) as rmtree:
+        monitor = await _measure_lag(cleanup)
+    
+    assert rmtree.call_count == 4
+    assert monitor.max_lag_seconds < 0.08
@@ -0,0 +1,93 @@
+"""
+Tests for Prometheus metrics
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+from app.main import app
+from app.models import ReviewType
+from app.services.cline_cli_manager import ClineCLIManager
+from app.utils.metrics import git_received_bytes, timed_gitlab_call
+
+
+def _sample(name, **labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_git_received_bytes():
+    """Test transfer size is taken from the last git progress report"""
+    progress = (
+        "Cloning into 'repo'...\n"
+        "Receiving objects:  50% (5/10), 512.00 KiB | 1.00 MiB/s\r"
+        "Receiving objects: 100% (10/10), 1.50 MiB | 2.00 MiB/s, done.\n"
+    )
+    
+    assert git_received_bytes(progress) == int(1.5 * 1024 * 1024)
+    assert git_received_bytes("Receiving objects: 100% (3/3), done.") is None
+
+
+def test_json_repair_outcomes_counted():
+    """Test JSON repair outcomes and salvaged items are exported"""
+    from app.utils.json_repair import repair_review_json
+    
+    before_truncated = _sample("review_json_repairs_total", outcome="truncated")
+    before_failed = _sample("review_json_repairs_total", outcome="failed")
+    before_items = _sample("review_json_repair_items_salvaged_total")
+    
+    repair_review_json('{"review_type": "ERROR_DETECTION", "issues": [{"file": "A.java", "line": 1}, {"file"')
+    repair_review_json("nothing to repair")
+    
+    assert _sample("review_json_repairs_total", outcome="truncated") == before_truncated + 1
+    assert _sample("review_json_repairs_total", outcome="failed") == before_failed + 1
+    assert _sample("review_json_repair_items_salvaged_total") == before_items + 1
+
+
+@pytest.mark.asyncio
+async def test_timed_gitlab_call_records_outcome():
+    """Test GitLab latency is recorded per endpoint and outcome"""
+    @timed_gitlab_call("GET test/:id")
+    async def failing():
+        raise RuntimeError("boom")
+    
+    before = _sample("review_gitlab_request_duration_seconds_count", endpoint="GET test/:id", outcome="error")
+    with pytest.raises(RuntimeError):
+        await failing()
+    
+    after = _sample("review_gitlab_request_duration_seconds_count", endpoint="GET test/:id", outcome="error")
+    assert after == before + 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_reviews_record_cli_and_queue_metrics():
+    """Test CLI wall time is labelled by agent, review type and status"""
+    with patch('app.services.base_cli_manager.BaseCLIManager._load_system_prompt', return_value=""):
+        manager = ClineCLIManager("https://api.example.com/v1", "model", "key", parallel_tasks=1)
+    manager.execute_review = AsyncMock(side_effect=[{"issues": []}, TimeoutError("slow")])
+    labels = {"agent": "CLINE", "review_type": "SECURITY_AUDIT"}
+    before_ok = _sample("review_cli_duration_seconds_count", status="ok", **labels)
+    before_timeout = _sample("review_cli_duration_seconds_count", status="timeout", **labels)
+    before_queue = _sample("review_queue_wait_seconds_count", agent="CLINE")
+    
+    await manager.execute_parallel_reviews(
+        [ReviewType.SECURITY_AUDIT, ReviewType.SECURITY_AUDIT],
+        "/tmp/repo",
+        {ReviewType.SECURITY_AUDIT: "prompt"}
+    )
+    
+    assert _sample("review_cli_duration_seconds_count", status="ok", **labels) == before_ok + 1
+    assert _sample("review_cli_duration_seconds_count", status="timeout", **labels) == before_timeout + 1
+    assert _sample("review_queue_wait_seconds_count", agent="CLINE") == before_queue + 2
+
+
+def test_metrics_endpoint():
+    """Test /metrics serves Prometheus exposition"""
+    response = TestClient(app).get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "review_in_flight" in response.text
+    assert "review_live_subprocesses" in response.text
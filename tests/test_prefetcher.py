@@ -0,0 +1,58 @@
+"""
+Tests for RepositoryPrefetcher
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.prefetcher import RepositoryPrefetcher
+
+
+@pytest.fixture
+def prefetcher():
+    """Prefetcher with mocked git manager and GitLab client"""
+    git_manager = MagicMock()
+    git_manager.prefetch = AsyncMock(return_value="cloned")
+    gitlab_service = MagicMock()
+    gitlab_service.get_project = AsyncMock(return_value={"http_url_to_repo": "https://gitlab/p.git"})
+    gitlab_service.get_clone_url = MagicMock(return_value="https://oauth2:t@gitlab/p.git")
+    return RepositoryPrefetcher(git_manager, gitlab_service, min_interval_seconds=60, max_queued=2)
+
+
+def test_submit_deduplicates_and_rate_limits(prefetcher):
+    """Same MR branches are queued once; the project is rate-limited in between"""
+    assert prefetcher.submit(1, "feature", "main") == "queued"
+    assert prefetcher.submit(1, "feature", "main") == "duplicate"
+    assert prefetcher.submit(1, "other", "main") == "rate_limited"
+    assert prefetcher.submit(2, "feature", "main") == "queued"
+    assert prefetcher.submit(3, "feature", "main") == "queue_full"
+    assert prefetcher.stats()["pending"] == 2
+
+
+def test_rate_limit_expires(prefetcher):
+    """Project can be prefetched again after the interval"""
+    prefetcher.min_interval_seconds = 0
+    assert prefetcher.submit(1, "feature", "main") == "queued"
+    assert prefetcher.submit(1, "other", "main") == "queued"
+
+
+@pytest.mark.asyncio
+async def test_worker_prefetches_queued_requests(prefetcher):
+    """Worker resolves the clone URL and fetches into the workspace pool"""
+    prefetcher.git_manager.prefetch.side_effect = ["cloned", RuntimeError("fetch failed")]
+    prefetcher.submit(1, "feature", "main")
+    prefetcher.submit(2, "feature", "main")
+    prefetcher.start()
+    for _ in range(100):
+        if not prefetcher.stats()["pending"]:
+            break
+        await asyncio.sleep(0.01)
+    await prefetcher.stop()
+    
+    assert prefetcher.stats() == {"pending": 0, "completed": 1, "failed": 1}
+    prefetcher.git_manager.prefetch.assert_any_await(
+        clone_url="https://oauth2:t@gitlab/p.git", project_id=1, branch="feature", target_branch="main"
+    )
+    # Dedup key is released after the run
+    assert prefetcher.submit(1, "feature", "main") == "rate_limited"
@@ -0,0 +1,153 @@
+"""
+Tests for process group termination and CLI cancellation
+"""
+
+import asyncio
+import os
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.cline_cli_manager import ClineCLIManager
+from app.utils.cancellation import cancel_on_disconnect
+from app.utils.process_group import process_group_cpu_seconds, terminate_process_group
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Zombies of reparented children count as gone
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+async def _read_pid(path, timeout: float = 5.0) -> int:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists() and path.read_text().strip():
+            return int(path.read_text())
+        await asyncio.sleep(0.01)
+    raise AssertionError("child did not write its pid")
+
+
+@pytest.mark.asyncio
+async def test_terminate_process_group_stops_grandchildren(tmp_path):
+    """SIGTERM reaches processes spawned by the group leader"""
+    pid_file = tmp_path / "child.pid"
+    process = await asyncio.create_subprocess_exec(
+        "sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait",
+        start_new_session=True
+    )
+    grandchild = await _read_pid(pid_file)
+
+    await terminate_process_group(process, grace_seconds=2)
+
+    assert process.returncode is not None
+    for _ in range(100):
+        if not _alive(grandchild):
+            break
+        await asyncio.sleep(0.01)
+    assert not _alive(grandchild)
+
+
+@pytest.mark.asyncio
+async def test_process_group_cpu_seconds_counts_busy_group():
+    """CPU time of a busy process group is read from /proc"""
+    if not os.path.isdir("/proc"):
+        pytest.skip("requires /proc")
+    process = await asyncio.create_subprocess_exec(
+        "sh", "-c", "while :; do :; done",
+        start_new_session=True
+    )
+    await asyncio.sleep(0.5)
+    try:
+        assert process_group_cpu_seconds(process.pid) > 0.1
+    finally:
+        await terminate_process_group(process, grace_seconds=1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_cli_run_kills_process_group(tmp_path):
+    """Cancelling a review task stops the CLI and everything it spawned"""
+    with patch('app.services.base_cli_manager.BaseCLIManager._load_system_prompt', return_value=""):
+        manager = ClineCLIManager(
+            model_api_url="https://api.example.com/v1",
+            model_name="model",
+            api_key="key",
+            parallel_tasks=1,
+            timeout_seconds=300
+        )
+    pid_file = tmp_path / "child.pid"
+    task = asyncio.create_task(manager._run_cli(
+        ["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"], cwd=str(tmp_path), label="Test"
+    ))
+    grandchild = await _read_pid(pid_file)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    for _ in range(100):
+        if not _alive(grandchild):
+            break
+        await asyncio.sleep(0.01)
+    assert not _alive(grandchild)
+
+
+@pytest.mark.asyncio
+async def test_cli_process_group_stopped_when_cancelled_twice(tmp_path):
+    """A second cancellation during cleanup does not leave the group running"""
+    with patch('app.services.base_cli_manager.BaseCLIManager._load_system_prompt', return_value=""):
+        manager = ClineCLIManager(
+            model_api_url="https://api.example.com/v1",
+            model_name="model",
+            api_key="key",
+            parallel_tasks=1,
+            timeout_seconds=300
+        )
+    pid_file = tmp_path / "child.pid"
+    task = asyncio.create_task(manager._run_cli(
+        ["sh", "-c", f"trap '' TERM; sleep 30 & echo $! > {pid_file}; wait"], cwd=str(tmp_path), label="Test"
+    ))
+    grandchild = await _read_pid(pid_file)
+
+    manager.terminate_grace_seconds = 0.2
+    
+    def slow_cpu_seconds(pgid):
+        time.sleep(0.2)
+        return 0.0
+    
+    with patch('app.services.base_cli_manager.process_group_cpu_seconds', side_effect=slow_cpu_seconds):
+        task.cancel()
+        await asyncio.sleep(0.05)  # cleanup is measuring CPU time of the group
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    for _ in range(800):
+        if not _alive(grandchild):
+            break
+        await asyncio.sleep(0.01)
+    assert not _alive(grandchild)
+
+
+@pytest.mark.asyncio
+async def test_cancel_on_disconnect_cancels_handler():
+    """Handler block is cancelled once the client is gone"""
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(side_effect=[False, True])
+
+    async def handler():
+        async with cancel_on_disconnect(request, poll_seconds=0.01) as watch:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                return watch.disconnected
+        return None
+
+    assert await asyncio.wait_for(handler(), timeout=2) is True
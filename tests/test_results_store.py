@@ -0,0 +1,161 @@
+"""
+Tests for ReviewResultsStore
+"""
+
+import pytest
+from datetime import date, datetime
+from app.models import (
+    ReviewResult,
+    ReviewSummary,
+    ReviewIssue,
+    RefactoringSuggestion,
+    RefactoringImpact,
+    ReviewType,
+    CLIAgent,
+    IssueSeverity
+)
+from app.services.results_store import ReviewResultsStore
+
+
+def _result(issues=(), refactorings=(), timestamp=None):
+    issues = list(issues)
+    return ReviewResult(
+        timestamp=timestamp or datetime.utcnow(),
+        review_type=ReviewType.ALL,
+        agent=CLIAgent.CLINE,
+        issues=issues,
+        refactoring_suggestions=list(refactorings),
+        summary=ReviewSummary(
+            total_issues=len(issues),
+            critical=sum(1 for i in issues if i.severity == IssueSeverity.CRITICAL),
+            high=sum(1 for i in issues if i.severity == IssueSeverity.HIGH)
+        ),
+        execution_time_seconds=12.5
+    )
+
+
+def _issue(
+    file="src/A.java",
+    severity=IssueSeverity.HIGH,
+    review_types=(ReviewType.ERROR_DETECTION,),
+    category="Null Safety"
+):
+    return ReviewIssue(
+        file=file,
+        line=3,
+        severity=severity,
+        category=category,
+        message="Possible NPE",
+        suggestion="Add null check",
+        review_types=list(review_types)
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create ReviewResultsStore in temp directory"""
+    instance = ReviewResultsStore(str(tmp_path / "results.db"))
+    yield instance
+    instance.close()
+
+
+def test_save_and_get_review(store):
+    """Test review is stored with issues, refactorings and timings"""
+    refactoring = RefactoringSuggestion(
+        file="src/A.java", severity=IssueSeverity.LOW, category="Extract Method",
+        message="Long method", suggestion="Split", impact=RefactoringImpact.MINOR, effort="LOW"
+    )
+    review_id = store.save_review(7, 3, _result(
+        [_issue(review_types=(ReviewType.ERROR_DETECTION, ReviewType.CONCURRENCY))], [refactoring]
+    ))
+    
+    review = store.get_review(review_id)
+    
+    assert review["project_id"] == 7 and review["mr_iid"] == 3
+    assert review["total_issues"] == 1
+    assert review["issues"][0]["review_types"] == ["ERROR_DETECTION", "CONCURRENCY"]
+    assert review["issues"][0]["auto_fixable"] is False
+    assert review["refactorings"][0]["category"] == "Extract Method"
+    assert review["timings"] == {"total": 12.5}
+    assert store.get_review(review_id + 100) is None
+
+
+def test_list_reviews_keyset_pagination(store):
+    """Test pages follow the cursor without gaps or repeats"""
+    ids = [store.save_review(1, mr, _result()) for mr in range(1, 8)]
+    
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = store.list_reviews(project_id=1, cursor=cursor, limit=3)
+        seen += [row["id"] for row in page]
+        if cursor is None:
+            break
+    
+    assert seen == sorted(ids, reverse=True)
+
+
+def test_list_reviews_filters(store):
+    """Test filters by MR, severity, review type and file"""
+    critical = store.save_review(1, 1, _result([_issue(severity=IssueSeverity.CRITICAL)]))
+    security = store.save_review(1, 2, _result([_issue(file="src/B.java", review_types=(ReviewType.SECURITY_AUDIT,))]))
+    store.save_review(2, 1, _result())
+    
+    assert [r["id"] for r in store.list_reviews(project_id=1, mr_iid=1)[0]] == [critical]
+    assert [r["id"] for r in store.list_reviews(severity="CRITICAL")[0]] == [critical]
+    assert [r["id"] for r in store.list_reviews(review_type="SECURITY_AUDIT")[0]] == [security]
+    assert [r["id"] for r in store.list_reviews(file="src/B.java")[0]] == [security]
+    assert len(store.list_reviews(project_id=2)[0]) == 1
+
+
+def test_list_issues(store):
+    """Test issue listing with review types and pagination"""
+    store.save_review(1, 1, _result([_issue(), _issue(file="src/B.java", severity=IssueSeverity.LOW)]))
+    store.save_review(1, 2, _result([_issue(file="src/C.java")]))
+    
+    page, cursor = store.list_issues(project_id=1, severity="HIGH", limit=1)
+    assert [i["file"] for i in page] == ["src/C.java"]
+    assert page[0]["mr_iid"] == 2
+    assert page[0]["review_types"] == ["ERROR_DETECTION"]
+    
+    page, cursor = store.list_issues(project_id=1, severity="HIGH", cursor=cursor, limit=1)
+    assert [i["file"] for i in page] == ["src/A.java"]
+    assert cursor is None
+
+
+def test_rollups_updated_with_each_review(store):
+    """Test trends come from rollups: weekly series, gaps and categories"""
+    store.save_review(1, 1, _result(
+        [_issue(severity=IssueSeverity.CRITICAL), _issue(category="SQL Injection")],
+        timestamp=datetime(2026, 3, 2, 10)
+    ))
+    store.save_review(1, 2, _result([_issue()], timestamp=datetime(2026, 3, 4, 10)))
+    store.save_review(1, 3, _result(timestamp=datetime(2026, 3, 18, 10)))
+    store.save_review(2, 1, _result([_issue()], timestamp=datetime(2026, 3, 18, 10)))
+    
+    trends = store.get_trends(1, weeks=3, today=date(2026, 3, 19))
+    
+    assert trends["totals"]["reviews"] == 3
+    assert trends["totals"]["total_issues"] == 3
+    assert trends["totals"]["critical"] == 1
+    assert [w["week_start"] for w in trends["weeks"]] == ["2026-03-02", "2026-03-09", "2026-03-16"]
+    assert [w["reviews"] for w in trends["weeks"]] == [2, 0, 1]
+    assert [w["high"] for w in trends["weeks"]] == [2, 0, 0]
+    assert trends["categories"][0]["category"] == "Null Safety"
+    assert trends["categories"][0]["total_issues"] == 2
+    assert trends["categories"][0]["critical"] == 1
+    assert store.get_trends(3) is None
+
+
+def test_rebuild_rollups_matches_incremental(store):
+    """Test full recomputation yields the incrementally maintained rollups"""
+    for mr_iid in range(1, 6):
+        store.save_review(1, mr_iid, _result(
+            [_issue(severity=IssueSeverity.LOW, category=f"Cat{mr_iid % 2}")] * mr_iid,
+            timestamp=datetime(2026, 1, mr_iid * 5)
+        ))
+    before = store.get_trends(1, weeks=10, today=date(2026, 2, 1))
+    
+    store.rebuild_rollups()
+    
+    assert store.get_trends(1, weeks=10, today=date(2026, 2, 1)) == before
@@ -0,0 +1,136 @@
+"""
+Tests for ReviewDebouncer
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from app.services.git_repository_manager import GitRepositoryManager
+from app.services.review_debouncer import ReviewDebouncer
+
+
+class RecordingRunner:
+    """Review runner that records started and finished reviews"""
+
+    def __init__(self, duration: float = 0.0):
+        self.duration = duration
+        self.started = []
+        self.finished = []
+        self.cancelled = []
+
+    async def __call__(self, project_id: int, mr_iid: int, head_sha: str) -> None:
+        self.started.append(head_sha)
+        try:
+            await asyncio.sleep(self.duration)
+        except asyncio.CancelledError:
+            self.cancelled.append(head_sha)
+            raise
+        self.finished.append(head_sha)
+
+
+async def _drain(debouncer: ReviewDebouncer) -> None:
+    for _ in range(200):
+        if not debouncer._pending:
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_burst_of_pushes_collapses_into_one_review():
+    """Only the last SHA of a burst within the quiet period is reviewed"""
+    runner = RecordingRunner()
+    debouncer = ReviewDebouncer(runner, quiet_seconds=0.05)
+
+    assert debouncer.submit(1, 10, "aaa") == "scheduled"
+    assert debouncer.submit(1, 10, "bbb") == "scheduled"
+    assert debouncer.submit(1, 10, "bbb") == "duplicate"
+    assert debouncer.submit(1, 10, "ccc") == "scheduled"
+    await _drain(debouncer)
+
+    assert runner.started == ["ccc"]
+    assert runner.finished == ["ccc"]
+
+
+@pytest.mark.asyncio
+async def test_running_review_of_outdated_sha_is_cancelled():
+    """A push during a review cancels it; the new SHA is reviewed afterwards"""
+    runner = RecordingRunner(duration=0.2)
+    debouncer = ReviewDebouncer(runner, quiet_seconds=0.01)
+
+    debouncer.submit(1, 10, "aaa")
+    await asyncio.sleep(0.05)
+    assert debouncer.stats()["running"] == 1
+
+    debouncer.submit(1, 10, "bbb")
+    await _drain(debouncer)
+
+    assert runner.cancelled == ["aaa"]
+    assert runner.started == ["aaa", "bbb"]
+    assert runner.finished == ["bbb"]
+
+
+@pytest.mark.asyncio
+async def test_queued_review_is_superseded_before_start():
+    """A review waiting for a slot is replaced by the newer SHA without starting"""
+    runner = RecordingRunner(duration=0.1)
+    debouncer = ReviewDebouncer(runner, quiet_seconds=0.01, max_concurrent=1)
+
+    debouncer.submit(1, 1, "other-mr")
+    await asyncio.sleep(0.03)
+    debouncer.submit(1, 10, "aaa")
+    await asyncio.sleep(0.03)
+    assert debouncer.stats() == {"quiet": 0, "queued": 1, "running": 1}
+
+    debouncer.submit(1, 10, "bbb")
+    await _drain(debouncer)
+
+    assert runner.started == ["other-mr", "bbb"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_drops_pending_review():
+    """Closing the MR cancels its scheduled review"""
+    runner = RecordingRunner()
+    debouncer = ReviewDebouncer(runner, quiet_seconds=0.05)
+
+    debouncer.submit(1, 10, "aaa")
+    assert debouncer.cancel(1, 10) is True
+    assert debouncer.cancel(1, 10) is False
+    await asyncio.sleep(0.1)
+
+    assert runner.started == []
+    await debouncer.stop()
+
+
+@pytest.mark.asyncio
+async def test_review_cancelled_mid_clone_does_not_block_next_sha(tmp_path):
+    """A review superseded while cloning releases the MR, so the new head's review can clone it"""
+    git_manager = GitRepositoryManager(work_dir=str(tmp_path))
+    clone_started = asyncio.Event()
+    reviewed = []
+    
+    async def clone_into(repo_dir, clone_url, branch, target_branch, low_priority=False):
+        repo_dir.mkdir()
+        if branch == "sha-1":
+            clone_started.set()
+            await asyncio.sleep(3600)  # slow clone, cancelled by the next push
+    
+    async def run_review(project_id, mr_iid, head_sha):
+        repo_path = await git_manager.clone_repository(
+            "https://gitlab.example.com/r.git", head_sha, project_id=project_id, mr_iid=mr_iid
+        )
+        try:
+            reviewed.append(head_sha)
+        finally:
+            await git_manager.cleanup_repository(repo_path)
+    
+    debouncer = ReviewDebouncer(run_review, quiet_seconds=0.01)
+    with patch.object(git_manager, '_clone_into', side_effect=clone_into):
+        debouncer.submit(1, 10, "sha-1")
+        await asyncio.wait_for(clone_started.wait(), timeout=1)
+        debouncer.submit(1, 10, "sha-2")
+        await _drain(debouncer)
+    
+    assert reviewed == ["sha-2"]
+    assert git_manager._active_reviews == set()
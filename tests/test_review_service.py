@@ -2,9 +2,14 @@
 Tests for ReviewService
 """
 
+import asyncio
 import pytest
+from contextlib import asynccontextmanager
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from app.services.agent_failover import AgentFailover
+from app.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from app.services.base_cli_manager import TaskOutcome
 from app.services.review_service import ReviewService
 from app.services.cline_cli_manager import ClineCLIManager
 from app.services.qwen_code_cli_manager import QwenCodeCLIManager
@@ -207,6 +212,25 @@ def test_load_prompts_success(review_service, tmp_path):
     assert "Test prompt" in prompts[ReviewType.ERROR_DETECTION]
 
 
+def test_load_prompts_cached_until_file_changes(review_service, tmp_path):
+    """Test prompts are read once and reloaded after the file changes"""
+    import os
+    prompt_file = tmp_path / "prompts" / "cline" / "error_detection.md"
+    
+    assert review_service.preload_prompts() == 1
+    with patch.object(review_service, "_embed_referenced_files", wraps=review_service._embed_referenced_files) as embed:
+        review_service._load_prompts(CLIAgent.CLINE, [ReviewType.ERROR_DETECTION])
+        embed.assert_not_called()
+        
+        prompt_file.write_text("# Error Detection\nUpdated prompt")
+        stat = prompt_file.stat()
+        os.utime(prompt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        prompts = review_service._load_prompts(CLIAgent.CLINE, [ReviewType.ERROR_DETECTION])
+    
+    assert embed.call_count == 1
+    assert "Updated prompt" in prompts[ReviewType.ERROR_DETECTION]
+
+
 def test_load_prompts_fallback(review_service):
     """Test loading prompts with fallback"""
     prompts = review_service._load_prompts(
@@ -301,3 +325,263 @@ def test_aggregate_results_success(review_service):
     assert result.summary.high == 1
     assert result.summary.auto_fixable_count == 1
     assert len(result.issues) == 2
+
+
+def test_aggregate_results_deduplicates_across_review_types(review_service):
+    """Test same finding from two review types is reported once"""
+    issue = {
+        "file": "Test.java",
+        "line": 10,
+        "severity": "MEDIUM",
+        "category": "Null Safety",
+        "message": "Possible NPE on user",
+        "suggestion": "Add null check",
+        "auto_fixable": True
+    }
+    raw_results = [
+        {"review_type": "ERROR_DETECTION", "issues": [dict(issue, severity="HIGH")]},
+        {"review_type": "BEST_PRACTICES", "issues": [issue]}
+    ]
+    
+    result = review_service._aggregate_results(
+        raw_results=raw_results,
+        agent=CLIAgent.CLINE,
+        start_time=0
+    )
+    
+    assert result.summary.total_issues == 1
+    assert result.summary.high == 1
+    assert result.summary.duplicates_collapsed == 1
+    assert result.issues[0].review_types == [ReviewType.ERROR_DETECTION, ReviewType.BEST_PRACTICES]
+
+
+def test_aggregate_results_keeps_json_repair_reports(review_service):
+    """Test JSON repair reports of the per-type results survive aggregation"""
+    report = {"truncated": True, "trailing_commas_removed": 0, "items_salvaged": 2, "chars_dropped": 40}
+    raw_results = [
+        {"review_type": "ERROR_DETECTION", "issues": [], "metadata": {"json_repair": report}},
+        {"review_type": "BEST_PRACTICES", "issues": [], "metadata": {"model": "x"}}
+    ]
+    
+    result = review_service._aggregate_results(
+        raw_results=raw_results,
+        agent=CLIAgent.CLINE,
+        start_time=0
+    )
+    
+    assert result.metadata["json_repair"] == {"ERROR_DETECTION": report}
+
+
+def test_aggregate_results_reports_agent_per_review_type(review_service):
+    """Test review types taken over by the other agent are attributed to it"""
+    raw_results = [
+        {"review_type": "ERROR_DETECTION", "issues": []},
+        {"review_type": "SECURITY_AUDIT", "issues": [], "metadata": {"agent": "QWEN_CODE"}}
+    ]
+    
+    result = review_service._aggregate_results(
+        raw_results=raw_results,
+        agent=CLIAgent.CLINE,
+        start_time=0
+    )
+    
+    assert result.agent == CLIAgent.CLINE
+    assert result.metadata["agents"] == {"ERROR_DETECTION": "CLINE", "SECURITY_AUDIT": "QWEN_CODE"}
+
+
+@pytest.mark.asyncio
+async def test_execute_review_records_phase_timings(review_service, mock_cline_manager, tmp_path):
+    """Test timings continue the caller's collector and include CLI phases"""
+    from app.models import ReviewTimings
+    from app.utils.phase_timings import collect_timings, record_phase
+    
+    async def fake_reviews(**kwargs):
+        record_phase("cli", 2.5, key="ERROR_DETECTION")
+        record_phase("queue_wait", 0.5, key="ERROR_DETECTION")
+        return []
+    
+    mock_cline_manager.execute_parallel_reviews = AsyncMock(side_effect=fake_reviews)
+    request = ReviewRequest(
+        agent=CLIAgent.CLINE,
+        review_types=[ReviewType.ERROR_DETECTION],
+        project_id=123,
+        merge_request_iid=1,
+        language=Language.JAVA
+    )
+    timings = ReviewTimings(clone=1.0)
+    
+    with collect_timings(timings):
+        result = await review_service.execute_review(request, str(tmp_path))
+    
+    assert result.timings is timings
+    assert timings.clone == 1.0
+    assert timings.cli == {"ERROR_DETECTION": 2.5}
+    assert timings.queue_wait == {"ERROR_DETECTION": 0.5}
+    assert timings.review == round(result.execution_time_seconds, 3)
+    assert "rules_load" in timings.flat()
+
+
+@pytest.mark.asyncio
+async def test_execute_review_fail_fast_returns_partial_result(review_service, mock_cline_manager, tmp_path):
+    """Test fail_fast runs priority types first and marks skipped types"""
+    async def fake_reviews(review_types, stop_when, **kwargs):
+        first = {
+            "review_type": review_types[0].value,
+            "issues": [{"file": "A.java", "line": 1, "severity": "CRITICAL", "message": "SQL injection"}]
+        }
+        assert stop_when(first) is True
+        return [first] + [{"review_type": rt.value, "skipped": True} for rt in review_types[1:]]
+    
+    mock_cline_manager.execute_parallel_reviews = AsyncMock(side_effect=fake_reviews)
+    request = ReviewRequest(
+        agent=CLIAgent.CLINE,
+        review_types=[ReviewType.PERFORMANCE, ReviewType.SECURITY_AUDIT, ReviewType.ERROR_DETECTION],
+        project_id=123,
+        merge_request_iid=1,
+        fail_fast=True
+    )
+    
+    result = await review_service.execute_review(request, str(tmp_path))
+    
+    review_types = mock_cline_manager.execute_parallel_reviews.call_args[1]["review_types"]
+    assert review_types == [ReviewType.ERROR_DETECTION, ReviewType.SECURITY_AUDIT, ReviewType.PERFORMANCE]
+    assert result.stopped_early is True
+    assert result.skipped_review_types == [ReviewType.SECURITY_AUDIT, ReviewType.PERFORMANCE]
+    assert result.summary.critical == 1
+
+
+def test_blocking_threshold_counts_across_results(review_service):
+    """Test threshold counts issues at or above the severity over all results"""
+    reached = review_service._blocking_threshold(IssueSeverity.HIGH, min_issues=2)
+    
+    assert reached({"issues": [{"severity": "MEDIUM"}, {"severity": "HIGH"}]}) is False
+    assert reached({"issues": [{"severity": "LOW"}]}) is False
+    assert reached({"issues": [{"severity": "CRITICAL"}]}) is True
+
+
+def _failover_service(review_service, min_samples=1):
+    review_service.failover = AgentFailover(min_samples=min_samples, max_hedges=1, failure_threshold=2)
+    
+    @asynccontextmanager
+    async def workspace(repo_path, review_type):
+        yield repo_path
+    
+    @asynccontextmanager
+    async def agent_slot():
+        yield TaskOutcome()
+    
+    review_service.qwen_manager.workspace = workspace
+    review_service.qwen_manager.agent_slot = agent_slot
+    return review_service
+
+
+@pytest.mark.asyncio
+async def test_run_with_failover_hedges_slow_primary(review_service, mock_cline_manager, mock_qwen_manager, tmp_path):
+    """Test a run slower than its p95 is hedged on the other agent and the first result wins"""
+    service = _failover_service(review_service)
+    service.failover.record(CLIAgent.CLINE, ReviewType.ERROR_DETECTION, 0.01)
+    primary_cancelled = asyncio.Event()
+    
+    async def slow_review(**kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+    
+    mock_cline_manager.execute_review = AsyncMock(side_effect=slow_review)
+    mock_qwen_manager.execute_review = AsyncMock(return_value={"review_type": "ERROR_DETECTION", "issues": []})
+    
+    result = await service._run_with_failover(
+        mock_cline_manager, ReviewType.ERROR_DETECTION, str(tmp_path), str(tmp_path), "prompt", None, None
+    )
+    
+    assert result == {"review_type": "ERROR_DETECTION", "issues": [], "metadata": {"agent": "QWEN_CODE"}}
+    assert primary_cancelled.is_set()
+    assert service.failover.hedges_in_flight == 0
+    assert service.failover.breakers[CLIAgent.CLINE].failures == 0  # losing the race is no failure
+
+
+@pytest.mark.asyncio
+async def test_run_with_failover_retries_failed_primary(review_service, mock_cline_manager, mock_qwen_manager, tmp_path):
+    """Test a failed run is retried on the other agent and counted against the primary's circuit"""
+    service = _failover_service(review_service)
+    mock_cline_manager.execute_review = AsyncMock(side_effect=RuntimeError("Cline CLI failed"))
+    mock_qwen_manager.execute_review = AsyncMock(return_value={"review_type": "SECURITY_AUDIT", "issues": []})
+    
+    result = await service._run_with_failover(
+        mock_cline_manager, ReviewType.SECURITY_AUDIT, str(tmp_path), str(tmp_path), "prompt", None, None
+    )
+    
+    assert result["review_type"] == "SECURITY_AUDIT"
+    assert service.failover.breakers[CLIAgent.CLINE].failures == 1
+    
+    mock_qwen_manager.execute_review = AsyncMock(side_effect=RuntimeError("Qwen CLI failed"))
+    with pytest.raises(RuntimeError, match="Qwen CLI failed"):
+        await service._run_with_failover(
+            mock_cline_manager, ReviewType.SECURITY_AUDIT, str(tmp_path), str(tmp_path), "prompt", None, None
+        )
+
+
+@pytest.mark.asyncio
+async def test_execute_review_routes_around_open_circuit(review_service, mock_cline_manager, mock_qwen_manager, tmp_path):
+    """Test reviews go to the other agent while the requested agent's circuit is open"""
+    service = _failover_service(review_service)
+    service.failover.record(CLIAgent.CLINE, ReviewType.ERROR_DETECTION, None)
+    service.failover.record(CLIAgent.CLINE, ReviewType.ERROR_DETECTION, None)
+    request = ReviewRequest(
+        agent=CLIAgent.CLINE,
+        review_types=[ReviewType.ERROR_DETECTION],
+        project_id=123,
+        merge_request_iid=1
+    )
+    
+    result = await service.execute_review(request, str(tmp_path))
+    
+    mock_cline_manager.execute_parallel_reviews.assert_not_called()
+    mock_qwen_manager.execute_parallel_reviews.assert_called_once()
+    assert result.agent == CLIAgent.QWEN_CODE
+
+
+@pytest.mark.asyncio
+async def test_failover_reports_each_agent_to_its_own_limiter(mock_rules_loader, tmp_path):
+    """Test a 429 of the primary cuts its limit although the failover run on the other agent succeeds"""
+    managers = {}
+    with patch('app.services.base_cli_manager.BaseCLIManager._load_system_prompt', return_value="System prompt"):
+        for manager_class, name in ((ClineCLIManager, "cline"), (QwenCodeCLIManager, "qwen")):
+            managers[name] = manager_class(
+                model_api_url="https://api.example.com/v1",
+                model_name="model",
+                api_key="test-key",
+                parallel_tasks=4,
+                concurrency=AdaptiveConcurrencyLimiter(name, initial_limit=4)
+            )
+    service = ReviewService(
+        cline_manager=managers["cline"],
+        qwen_manager=managers["qwen"],
+        rules_loader=mock_rules_loader,
+        prompts_base_path=str(tmp_path),
+        failover=AgentFailover(min_samples=1, max_hedges=1)
+    )
+    cline_limiter, qwen_limiter = managers["cline"].concurrency, managers["qwen"].concurrency
+    qwen_slots_in_use = []
+    
+    async def qwen_review(review_type, **kwargs):
+        qwen_slots_in_use.append(qwen_limiter.in_flight)
+        return {"review_type": review_type.value, "issues": []}
+    
+    prompts = {ReviewType.SECURITY_AUDIT: "p"}
+    with patch.object(managers["cline"], 'execute_review', side_effect=RuntimeError("HTTP 429 Too Many Requests")), \
+            patch.object(managers["qwen"], 'execute_review', side_effect=qwen_review):
+        results = await managers["cline"].execute_parallel_reviews(
+            review_types=list(prompts),
+            repo_path=str(tmp_path),
+            prompts=prompts,
+            run_review=service._failover_runner(managers["cline"], str(tmp_path), prompts, None, None)
+        )
+    
+    assert results[0]["metadata"] == {"agent": "QWEN_CODE"}
+    assert cline_limiter.limit == 2
+    assert qwen_limiter.limit == 4
+    assert qwen_slots_in_use == [1]  # the failover run held a slot of its own agent
+    assert cline_limiter.in_flight == qwen_limiter.in_flight == 0
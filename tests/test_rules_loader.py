@@ -36,3 +36,23 @@ def test_get_rule_for_review_type():
     assert error_rule is None or isinstance(error_rule, str)
 
 
+
+
+def test_default_rules_cached_until_file_changes(tmp_path):
+    """Test default rules are read once and reloaded after a rule file changes"""
+    import os
+    rule_file = tmp_path / "errors.md"
+    rule_file.write_text("v1")
+    loader = CustomRulesLoader(default_rules_path=str(tmp_path))
+    
+    first = loader.load_rules(language="java")
+    first["errors"] = "mutated by caller"
+    stat = rule_file.stat()
+    rule_file.write_text("v2")
+    os.utime(rule_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    cached = loader.load_rules(language="java")
+    os.utime(rule_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = loader.load_rules(language="java")
+    
+    assert cached == {"errors": "v1"}
+    assert reloaded == {"errors": "v2"}
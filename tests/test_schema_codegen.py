@@ -0,0 +1,159 @@
+"""
+Tests for generated schema validator (jsonschema is the reference oracle)
+"""
+
+import copy
+import random
+import pytest
+from app.utils.json_validator import ReviewResultValidator
+from app.utils.schema_codegen import (
+    GeneratedChecks,
+    UnsupportedSchemaError,
+    compile_validator,
+    generate_validator_source,
+)
+
+
+def _issue(index, severity="HIGH"):
+    return {
+        "file": f"src/main/java/Service{index}.java",
+        "line": index + 1,
+        "severity": severity,
+        "category": "Null Safety",
+        "message": "Potential NPE",
+        "suggestion": "Add null check",
+        "auto_fixable": index % 2 == 0,
+        "cwe": "CWE-476"
+    }
+
+
+def _result(issue_count=3):
+    issues = [_issue(i) for i in range(issue_count)]
+    return {
+        "review_type": "ERROR_DETECTION",
+        "changed_files": ["src/main/java/Service0.java"],
+        "issues": issues,
+        "summary": {"total_issues": issue_count, "critical": 0, "high": issue_count, "medium": 0, "low": 0},
+        "metadata": {"execution_time_seconds": 1.5}
+    }
+
+
+# (path, replacement value) mutations producing schema or semantic errors
+MUTATIONS = [
+    (("review_type",), "INVALID"),
+    (("review_type",), 7),
+    (("issues",), {}),
+    (("issues", 0), "not an object"),
+    (("issues", 0, "severity"), "VERY_HIGH"),
+    (("issues", 1, "severity"), "CRITICAL"),
+    (("issues", 1, "line"), 0),
+    (("issues", 1, "line"), 3.0),
+    (("issues", 1, "line"), 2.5),
+    (("issues", 2, "line"), True),
+    (("issues", 2, "file"), "/abs/Service.java"),
+    (("issues", 2, "file"), "C:\\src\\Service.java"),
+    (("issues", 0, "cwe"), "CWE-XYZ"),
+    (("issues", 0, "auto_fixable"), "yes"),
+    (("issues", 0, "severity"), ["HIGH"]),
+    (("summary",), []),
+    (("summary", "total_issues"), -1),
+    (("summary", "total_issues"), 10),
+    (("summary", "high"), False),
+    (("metadata", "execution_time_seconds"), "fast"),
+    (("changed_files", 0), None),
+    (("error_type",), "OOPS"),
+]
+
+
+def _apply(data, path, value):
+    target = data
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = value
+
+
+@pytest.fixture(scope="module")
+def validator():
+    """Validator with both fast and reference paths"""
+    instance = ReviewResultValidator()
+    assert instance.fast_validator is not None
+    return instance
+
+
+def test_valid_result_matches_oracle(validator):
+    """Test valid payload passes both validators"""
+    data = _result()
+
+    assert validator.validate(data) == (True, [])
+    assert validator._validate_with_jsonschema(data) == (True, [])
+
+
+@pytest.mark.parametrize("path,value", MUTATIONS)
+def test_mutation_matches_oracle(validator, path, value):
+    """Test every single mutation yields exactly the oracle's errors"""
+    data = _result()
+    _apply(data, path, value)
+
+    assert validator.validate(data) == validator._validate_with_jsonschema(data)
+
+
+def test_missing_fields_match_oracle(validator):
+    """Test required-field errors (root and nested) match the oracle"""
+    data = _result()
+    del data["summary"]["low"]
+    del data["issues"][1]["message"]
+
+    result = validator.validate(data)
+
+    assert result == validator._validate_with_jsonschema(data)
+    assert not result[0]
+
+
+def test_random_mutations_match_oracle(validator):
+    """Test random combinations of mutations match the oracle"""
+    rng = random.Random(1234)
+    for _ in range(200):
+        data = _result(issue_count=4)
+        for path, value in rng.sample(MUTATIONS, rng.randint(1, 4)):
+            try:
+                _apply(data, path, copy.deepcopy(value))
+            except (KeyError, IndexError, TypeError):
+                continue
+
+        assert validator.validate(data) == validator._validate_with_jsonschema(data)
+
+
+def test_large_payload_matches_oracle(validator):
+    """Test 10k-issue payload with a few bad items matches the oracle"""
+    data = _result(issue_count=10_000)
+    data["issues"][5000]["line"] = -1
+    data["issues"][9999]["file"] = "/etc/passwd"
+
+    assert validator.validate(data) == validator._validate_with_jsonschema(data)
+
+
+def test_non_object_root_matches_oracle(validator):
+    """Test non-object instance matches the oracle"""
+    assert validator.validate([]) == validator._validate_with_jsonschema([])
+
+
+def test_unsupported_keyword_raises():
+    """Test schemas outside the supported subset are rejected"""
+    with pytest.raises(UnsupportedSchemaError):
+        compile_validator({"type": "object", "additionalProperties": False})
+
+
+def test_item_hook_runs_per_element():
+    """Test item hooks are woven into the array loop"""
+    checks = GeneratedChecks(
+        prologue="seen = []",
+        item_hooks={("values",): "seen.append((INDEX, ITEM))"},
+        epilogue="semantic_errors.extend(f'{i}={v}' for i, v in seen)",
+    )
+    validate = compile_validator(
+        {"type": "object", "properties": {"values": {"type": "array", "items": {"type": "integer"}}}},
+        checks
+    )
+
+    assert validate({"values": [5, 6]}) == ([], ["0=5", "1=6"])
+    assert "def validate(data):" in generate_validator_source({"type": "object"})
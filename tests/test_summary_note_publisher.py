@@ -0,0 +1,99 @@
+"""
+Tests for SummaryNotePublisher and MRNoteStore
+"""
+
+import pytest
+import httpx
+from unittest.mock import AsyncMock, MagicMock
+from app.services.summary_note_publisher import MRNoteStore, SummaryNotePublisher
+from app.services.gitlab_service import GitLabService
+
+
+@pytest.fixture
+def note_store(tmp_path):
+    """Create MRNoteStore in temp directory"""
+    store = MRNoteStore(str(tmp_path / "state.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def gitlab_service():
+    """Create mock GitLabService"""
+    service = MagicMock(spec=GitLabService)
+    service.post_mr_comment = AsyncMock(return_value={"id": 101})
+    service.update_mr_comment = AsyncMock(return_value={"id": 101})
+    return service
+
+
+def test_note_store_roundtrip(note_store):
+    """Test saving and overwriting tracked note"""
+    assert note_store.get(1, 2) is None
+    
+    note_store.save(1, 2, 101, "hash-a")
+    note_store.save(1, 2, 102, "hash-b")
+    
+    assert note_store.get(1, 2) == (102, "hash-b")
+    
+    note_store.delete(1, 2)
+    assert note_store.get(1, 2) is None
+
+
+def test_note_store_uses_wal(note_store):
+    """Test database is opened in WAL mode"""
+    row = note_store._fetchone("PRAGMA journal_mode")
+    assert row[0] == "wal"
+
+
+@pytest.mark.asyncio
+async def test_first_run_creates_note(note_store, gitlab_service):
+    """Test first publish posts a new note and tracks its id"""
+    publisher = SummaryNotePublisher(gitlab_service, note_store)
+    
+    action = await publisher.publish(1, 2, "Summary v1")
+    
+    assert action == SummaryNotePublisher.CREATED
+    gitlab_service.post_mr_comment.assert_awaited_once()
+    assert note_store.get(1, 2)[0] == 101
+
+
+@pytest.mark.asyncio
+async def test_changed_content_updates_in_place(note_store, gitlab_service):
+    """Test later runs update existing note instead of posting"""
+    publisher = SummaryNotePublisher(gitlab_service, note_store)
+    await publisher.publish(1, 2, "Summary v1")
+    
+    action = await publisher.publish(1, 2, "Summary v2")
+    
+    assert action == SummaryNotePublisher.UPDATED
+    assert gitlab_service.post_mr_comment.await_count == 1
+    gitlab_service.update_mr_comment.assert_awaited_once()
+    assert gitlab_service.update_mr_comment.call_args.kwargs["note_id"] == 101
+
+
+@pytest.mark.asyncio
+async def test_unchanged_content_skips_api_call(note_store, gitlab_service):
+    """Test identical content key does not touch GitLab"""
+    publisher = SummaryNotePublisher(gitlab_service, note_store)
+    await publisher.publish(1, 2, "Summary took 10s", content_key="Summary")
+    
+    action = await publisher.publish(1, 2, "Summary took 12s", content_key="Summary")
+    
+    assert action == SummaryNotePublisher.UNCHANGED
+    gitlab_service.update_mr_comment.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_deleted_note_is_recreated(note_store, gitlab_service):
+    """Test a note deleted in GitLab is posted again"""
+    note_store.save(1, 2, 55, "old-hash")
+    request = httpx.Request("PUT", "https://gitlab.example.com")
+    gitlab_service.update_mr_comment = AsyncMock(side_effect=httpx.HTTPStatusError(
+        "Not Found", request=request, response=httpx.Response(404, request=request)
+    ))
+    publisher = SummaryNotePublisher(gitlab_service, note_store)
+    
+    action = await publisher.publish(1, 2, "Summary")
+    
+    assert action == SummaryNotePublisher.CREATED
+    assert note_store.get(1, 2)[0] == 101
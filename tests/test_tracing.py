@@ -0,0 +1,124 @@
+"""
+Tests for review tracing
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import pytest
+from app.utils.tracing import (
+    JsonlSpanExporter,
+    Tracer,
+    current_trace_id,
+    install_log_record_factory,
+    trace_environment
+)
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    return tmp_path / "traces" / "spans.jsonl"
+
+
+@pytest.fixture
+def tracer(export_path):
+    """Tracer recording every trace"""
+    exporter = JsonlSpanExporter(str(export_path), max_bytes=1024 * 1024, backup_count=1)
+    yield Tracer(exporter, sample_ratio=1.0)
+    exporter.close()
+
+
+def _spans(path, tracer):
+    tracer.exporter.flush()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_nested_spans_exported_in_otlp_shape(tracer, export_path):
+    """Test child spans (including asyncio tasks) share the trace and link to parent"""
+    async def child(index):
+        with tracer.span("cli_review", review_type=f"T{index}"):
+            await asyncio.sleep(0)
+    
+    with tracer.span("review_merge_request", project_id=1) as root:
+        await asyncio.gather(child(1), child(2))
+    
+    spans = _spans(export_path, tracer)
+    assert [s["name"] for s in spans] == ["cli_review", "cli_review", "review_merge_request"]
+    assert {s["traceId"] for s in spans} == {root.trace_id}
+    assert all(s["parentSpanId"] == root.span_id for s in spans[:2])
+    assert "parentSpanId" not in spans[2]
+    assert spans[2]["attributes"] == [{"key": "project_id", "value": {"intValue": "1"}}]
+    assert spans[2]["status"] == {"code": "STATUS_CODE_OK"}
+    assert int(spans[2]["endTimeUnixNano"]) >= int(spans[2]["startTimeUnixNano"])
+
+
+def test_error_status_recorded(tracer, export_path):
+    """Test exceptions mark the span as failed and propagate"""
+    with pytest.raises(ValueError):
+        with tracer.span("parse_cli_output"):
+            raise ValueError("No JSON found")
+    
+    status = _spans(export_path, tracer)[0]["status"]
+    assert status == {"code": "STATUS_CODE_ERROR", "message": "ValueError: No JSON found"}
+
+
+def test_explicit_parent_continues_trace(tracer, export_path):
+    """Test background work continues a finished request trace"""
+    with tracer.span("review_merge_request") as root:
+        pass
+    with tracer.span("process_review_results", parent=root):
+        pass
+    
+    spans = _spans(export_path, tracer)
+    assert spans[1]["traceId"] == root.trace_id
+    assert spans[1]["parentSpanId"] == root.span_id
+
+
+def test_spans_written_off_the_calling_thread(export_path):
+    """Test span export only queues; the file is written by the exporter thread"""
+    exporter = JsonlSpanExporter(str(export_path), max_bytes=1024 * 1024, backup_count=1)
+    writers = []
+    emit = exporter._handler.emit
+    
+    def recording_emit(record):
+        writers.append(threading.current_thread())
+        emit(record)
+    
+    exporter._handler.emit = recording_emit
+    with Tracer(exporter, sample_ratio=1.0).span("clone_repository"):
+        pass
+    exporter.close()
+    exporter.close()
+    
+    assert writers and threading.current_thread() not in writers
+    assert json.loads(export_path.read_text())["name"] == "clone_repository"
+
+
+def test_unsampled_trace_propagates_ids_without_export(export_path):
+    """Test sampling ratio 0 keeps trace ids but records nothing"""
+    exporter = JsonlSpanExporter(str(export_path), max_bytes=1024, backup_count=1)
+    tracer = Tracer(exporter, sample_ratio=0.0)
+    
+    with tracer.span("review_merge_request") as root:
+        env = trace_environment()
+        assert current_trace_id() == root.trace_id
+    exporter.close()
+    
+    assert env == {"TRACEPARENT": f"00-{root.trace_id}-{root.span_id}-00", "REVIEW_TRACE_ID": root.trace_id}
+    assert export_path.read_text() == ""
+    assert trace_environment() == {}
+
+
+def test_log_records_carry_trace_id(tracer):
+    """Test stdlib log records get the current trace id"""
+    install_log_record_factory()
+    logger = logging.getLogger("test.tracing")
+    
+    with tracer.span("execute_review") as active:
+        inside = logger.makeRecord("test", logging.INFO, __file__, 1, "msg", (), None)
+    outside = logger.makeRecord("test", logging.INFO, __file__, 1, "msg", (), None)
+    
+    assert inside.trace_id == active.trace_id
+    assert outside.trace_id == "-"
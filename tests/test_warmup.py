@@ -0,0 +1,117 @@
+"""
+Tests for startup Warmup and readiness gating
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.routes import get_health_monitor
+from app.services.health_monitor import HealthMonitor
+from app.services.warmup import Warmup
+
+
+def _monitor(warmup):
+    review_service = MagicMock()
+    review_service.health_check = AsyncMock(return_value={
+        "cline_available": True, "qwen_available": False, "model_api_connected": True
+    })
+    gitlab_service = MagicMock()
+    gitlab_service.test_connection = AsyncMock(return_value=True)
+    return HealthMonitor(review_service, gitlab_service, version="test", warmup=warmup)
+
+
+@pytest.mark.asyncio
+async def test_runs_sync_and_async_steps():
+    """Test sync steps run in worker threads, async steps are awaited"""
+    calls = []
+    loop_thread = threading.get_ident()
+    
+    def load():
+        calls.append(("load", threading.get_ident() != loop_thread))
+    
+    async def check():
+        calls.append(("check", True))
+    
+    warmup = Warmup([("load", load), ("check", check)])
+    assert warmup.state == "pending"
+    
+    assert await warmup.run() is True
+    
+    assert calls == [("load", True), ("check", True)]
+    assert warmup.ready
+    assert set(warmup.status()["steps"]) == {"load", "check"}
+
+
+@pytest.mark.asyncio
+async def test_failed_step_is_retried():
+    """Test a transiently failing step is retried and the warm-up still succeeds"""
+    step = MagicMock(side_effect=[OSError("prompts missing"), None])
+    
+    warmup = Warmup([("prompts", step)], max_attempts=3, retry_backoff_seconds=0)
+    
+    assert await warmup.run() is True
+    
+    assert step.call_count == 2
+    assert warmup.state == "ready"
+    assert warmup.status()["errors"] == {}
+
+
+@pytest.mark.asyncio
+async def test_persistently_failing_step_finishes_degraded():
+    """Test a step that keeps failing is reported, later steps still run and the service gets warm"""
+    later = MagicMock()
+    broken = MagicMock(side_effect=OSError("prompts missing"))
+    
+    warmup = Warmup([("prompts", broken), ("rules", later)], max_attempts=2, retry_backoff_seconds=0)
+    
+    assert await warmup.run() is False
+    
+    assert broken.call_count == 2
+    later.assert_called_once()
+    assert warmup.state == "degraded"
+    assert warmup.ready
+    assert warmup.status()["errors"] == {"prompts": "OSError: prompts missing"}
+
+
+@pytest.mark.asyncio
+async def test_start_runs_in_background_and_stop_cancels():
+    """Test start() returns immediately and stop() cancels an unfinished warm-up"""
+    started = asyncio.Event()
+    
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+    
+    warmup = Warmup([("slow", slow)])
+    warmup.start()
+    assert warmup.state != "ready"
+    await asyncio.wait_for(started.wait(), timeout=1)
+    
+    await warmup.stop()
+    
+    assert warmup._task.cancelled()
+    assert not warmup.ready
+
+
+def test_readiness_probe_waits_for_warmup():
+    """Test healthy cached state is not ready until warm-up has finished"""
+    warmup = Warmup([])
+    monitor = _monitor(warmup)
+    asyncio.run(monitor.refresh())
+    app.dependency_overrides[get_health_monitor] = lambda: monitor
+    try:
+        client = TestClient(app)
+        cold = client.get("/api/v1/health/ready")
+        asyncio.run(warmup.run())
+        warm = client.get("/api/v1/health/ready")
+    finally:
+        app.dependency_overrides.pop(get_health_monitor)
+    
+    assert cold.status_code == 503
+    assert cold.json()["warmup"]["state"] == "pending"
+    assert warm.status_code == 200
+    assert warm.json()["status"] == "ready"
+    assert warm.json()["warmup"]["state"] == "ready"
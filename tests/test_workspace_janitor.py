@@ -0,0 +1,126 @@
+"""
+Tests for WorkspaceJanitor
+"""
+
+import asyncio
+import os
+import pytest
+from unittest.mock import patch
+from app.services.git_repository_manager import GitRepositoryManager
+from app.services.workspace_janitor import WorkspaceJanitor, directory_size
+
+
+def _workspace(root, name, size=0, last_used=None):
+    workspace = root / name
+    workspace.mkdir()
+    (workspace / "data.bin").write_bytes(b"x" * size)
+    if last_used is not None:
+        os.utime(workspace, (last_used, last_used))
+    return workspace
+
+
+def test_discard_renames_into_trash_and_sweep_deletes(tmp_path):
+    """Test discard is a rename and the files are deleted by the sweep"""
+    janitor = WorkspaceJanitor(str(tmp_path))
+    workspace = _workspace(tmp_path, "project-1-mr-2", size=10)
+    
+    trashed = janitor.discard(str(workspace))
+    
+    assert not workspace.exists()
+    assert trashed.parent == tmp_path / ".trash"
+    assert (trashed / "data.bin").exists()
+    assert janitor.discard(str(workspace)) is None
+    
+    assert janitor.sweep() == 1
+    assert janitor.stats()["trash_bytes"] == 10
+    assert list((tmp_path / ".trash").iterdir()) == []
+
+
+def test_sweep_orphans_skips_active_and_unrelated(tmp_path):
+    """Test only unclaimed per-MR checkouts are swept on startup"""
+    janitor = WorkspaceJanitor(str(tmp_path))
+    orphan = _workspace(tmp_path, "project-1-mr-1")
+    active = _workspace(tmp_path, "project-1-mr-2")
+    other = _workspace(tmp_path, "mirrors")
+    janitor.mark_active(str(active))
+    
+    assert janitor.sweep_orphans() == [orphan]
+    assert active.exists() and other.exists()
+
+
+def test_quota_evicts_least_recently_used_idle_workspaces(tmp_path):
+    """Test eviction stops under quota and never touches active workspaces"""
+    janitor = WorkspaceJanitor(str(tmp_path), quota_bytes=250)
+    oldest = _workspace(tmp_path, "a", size=100, last_used=1_000)
+    active = _workspace(tmp_path, "b", size=100, last_used=500)
+    newer = _workspace(tmp_path, "c", size=100, last_used=2_000)
+    newest = _workspace(tmp_path, "d", size=100)
+    janitor.mark_active(str(active))
+    janitor.mark_idle(str(newest))
+    
+    evicted = janitor.enforce_quota()
+    
+    assert evicted == [oldest, newer]
+    assert janitor.stats()["usage_bytes"] == 200
+    assert active.exists() and newest.exists()
+    assert directory_size(tmp_path / ".trash") == 200
+
+
+def test_quota_skips_workspace_leased_during_sweep(tmp_path):
+    """Test a workspace marked active after the candidates were chosen is not evicted"""
+    janitor = WorkspaceJanitor(str(tmp_path), quota_bytes=50)
+    leased = _workspace(tmp_path, "project-1-pool-abc", size=100)
+    janitor.mark_idle(str(leased))
+    last_used_at = WorkspaceJanitor._last_used_at
+    
+    def lease_while_sorting(workspace, last_used_times):
+        janitor.mark_active(str(leased))  # the event loop leases it from the pool
+        return last_used_at(workspace, last_used_times)
+    
+    with patch.object(WorkspaceJanitor, "_last_used_at", side_effect=lease_while_sorting):
+        evicted = janitor.enforce_quota()
+    
+    assert evicted == []
+    assert leased.exists()
+    assert janitor.stats()["active"] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_loop_sweeps_orphans_and_deletes_discarded(tmp_path):
+    """Test start() sweeps orphans and discard() wakes the loop"""
+    janitor = WorkspaceJanitor(str(tmp_path), interval_seconds=60)
+    _workspace(tmp_path, "project-1-mr-1")
+    (tmp_path / ".trash").mkdir()
+    
+    janitor.start()
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not any((tmp_path / ".trash").iterdir()):
+                break
+        assert not (tmp_path / "project-1-mr-1").exists()
+        
+        janitor.discard(str(_workspace(tmp_path, "project-1-mr-2")))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not any((tmp_path / ".trash").iterdir()):
+                break
+    finally:
+        await janitor.stop()
+    
+    assert list((tmp_path / ".trash").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_git_manager_cleanup_defers_deletion_to_janitor(tmp_path):
+    """Test cleanup_repository only moves the checkout into the trash"""
+    janitor = WorkspaceJanitor(str(tmp_path))
+    manager = GitRepositoryManager(work_dir=str(tmp_path), janitor=janitor)
+    checkout = _workspace(tmp_path, "project-3-mr-4", size=10)
+    janitor.mark_active(str(checkout))
+    
+    await manager.cleanup_repository(str(checkout))
+    
+    assert not checkout.exists()
+    assert len(list((tmp_path / ".trash").iterdir())) == 1
+    assert janitor.stats()["active"] == 0
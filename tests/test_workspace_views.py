@@ -0,0 +1,116 @@
+"""
+Tests for per-agent copy-on-write workspace views
+"""
+
+import os
+import shutil
+import pytest
+from unittest.mock import patch
+
+from app.services.workspace_views import VIEWS_DIR_NAME, WorkspaceViewFactory
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    """Small checkout with nested directory and symlink"""
+    repo = tmp_path / "project-1-pool-abc"
+    (repo / "src" / "main").mkdir(parents=True)
+    (repo / "src" / "main" / "App.java").write_text("class App {}")
+    (repo / "README.md").write_text("readme")
+    os.symlink("README.md", repo / "LINK.md")
+    (repo / ".git" / "objects" / "ab").mkdir(parents=True)
+    (repo / ".git" / "objects" / "ab" / "cdef").write_bytes(b"blob")
+    return repo
+
+
+def _copy_tree(source, root):
+    """Stand-in for cp --reflink on filesystems without reflinks"""
+    return shutil.copytree(source, root, symlinks=True)
+
+
+def test_hardlink_view_isolates_working_tree_writes(checkout):
+    """Scratch files, replaced and in-place rewritten files stay inside the view"""
+    factory = WorkspaceViewFactory(mode="hardlink")
+    view = factory.create(str(checkout), "security_audit")
+    view_path = checkout.parent / VIEWS_DIR_NAME / os.path.basename(view.path)
+
+    assert view.mode == "hardlink"
+    assert (view_path / "src" / "main" / "App.java").read_text() == "class App {}"
+    assert os.readlink(view_path / "LINK.md") == "README.md"
+
+    (view_path / "scratch.txt").write_text("tmp")
+    replacement = view_path / "README.md.tmp"
+    replacement.write_text("edited")
+    os.replace(replacement, view_path / "README.md")
+    with open(view_path / "src" / "main" / "App.java", "r+") as f:
+        f.write("edited in place")
+
+    assert not (checkout / "scratch.txt").exists()
+    assert (checkout / "README.md").read_text() == "readme"
+    assert (checkout / "src" / "main" / "App.java").read_text() == "class App {}"
+
+    factory.remove(view)
+    assert not view_path.exists()
+    assert (checkout / "README.md").exists()
+
+
+def test_hardlink_view_shares_only_git_objects(checkout):
+    """Object files are hard links, working-tree files are copies"""
+    factory = WorkspaceViewFactory(mode="hardlink")
+    view = factory.create(str(checkout), "performance")
+    view_path = checkout.parent / VIEWS_DIR_NAME / os.path.basename(view.path)
+
+    assert os.path.samefile(view_path / ".git" / "objects" / "ab" / "cdef", checkout / ".git" / "objects" / "ab" / "cdef")
+    assert not os.path.samefile(view_path / "README.md", checkout / "README.md")
+
+    factory.remove(view)
+
+
+def test_views_of_parallel_tasks_are_separate(checkout):
+    """Two views of one checkout do not see each other's files"""
+    factory = WorkspaceViewFactory(mode="hardlink")
+    first = factory.create(str(checkout), "error_detection")
+    second = factory.create(str(checkout), "error_detection")
+
+    assert first.path != second.path
+    (checkout.parent / VIEWS_DIR_NAME / os.path.basename(first.path) / "notes.txt").write_text("x")
+    assert not os.path.exists(os.path.join(second.path, "notes.txt"))
+
+    factory.remove(first)
+    factory.remove(second)
+
+
+def test_auto_mode_falls_back_and_remembers_unsupported(checkout):
+    """Unavailable modes are skipped after the first failure"""
+    factory = WorkspaceViewFactory(mode="auto")
+    with patch.object(WorkspaceViewFactory, "_create_overlay", side_effect=OSError("no mount")) as overlay, \
+            patch.object(WorkspaceViewFactory, "_create_reflink", side_effect=_copy_tree):
+        first = factory.create(str(checkout), "performance")
+        second = factory.create(str(checkout), "performance")
+
+    assert first.mode == second.mode == "reflink"
+    assert first.setup_seconds >= 0
+    assert overlay.call_count == 1
+    factory.remove(first)
+    factory.remove(second)
+
+
+def test_auto_mode_never_copies_working_tree(checkout):
+    """Without overlay and reflink, auto fails so the task uses the shared checkout"""
+    factory = WorkspaceViewFactory(mode="auto")
+    with patch.object(WorkspaceViewFactory, "_create_overlay", side_effect=OSError("no mount")), \
+            patch.object(WorkspaceViewFactory, "_create_reflink", side_effect=OSError("no reflink")) as reflink, \
+            patch.object(WorkspaceViewFactory, "_create_hardlink") as hardlink:
+        with pytest.raises(OSError):
+            factory.create(str(checkout), "performance")
+        with pytest.raises(OSError):
+            factory.create(str(checkout), "performance")
+
+    assert reflink.call_count == 1
+    hardlink.assert_not_called()
+
+
+def test_unknown_mode_rejected():
+    """Invalid mode fails at construction"""
+    with pytest.raises(ValueError):
+        WorkspaceViewFactory(mode="copy")